@@ -0,0 +1,487 @@
+"""
+Acceso a datos de las tablas de administración.
+
+Por defecto las consultas van a PostgREST. Con ORGM_BACKEND=postgres se
+conectan directo a la base de datos con el motor de SQLAlchemy de db.py
+(DATABASE_USER, DATABASE_PASSWORD, DATABASE_HOST, DATABASE_NAME), útil
+dentro de la red local. Ambos devuelven las filas como diccionarios con la
+misma forma que la respuesta JSON de PostgREST, incluidas las relaciones
+de `incluir` (cotizacion -> cliente(id, nombre)).
+"""
+import os
+import re
+import threading
+from contextlib import contextmanager, nullcontext
+from datetime import date, datetime, time
+from decimal import Decimal
+from typing import Optional
+from uuid import UUID
+
+_IDENTIFICADOR = re.compile(r"^[A-Za-z_][A-Za-z0-9_]*$")
+
+
+class FuncionNoEncontrada(Exception):
+    """La función RPC no existe en el servidor."""
+
+
+class ColumnaNoEncontrada(KeyError):
+    """La tabla no tiene la columna (p. ej. una migración sin aplicar)."""
+
+
+def nombre_backend() -> str:
+    """Backend configurado: "postgrest" (por defecto) o "postgres"."""
+    return os.getenv("ORGM_BACKEND", "postgrest").strip().lower()
+
+
+def _postgres() -> bool:
+    return nombre_backend() in ("postgres", "postgresql", "sql")
+
+
+# ----------------------------------------------------------------------
+# PostgREST
+# ----------------------------------------------------------------------
+
+
+def _valor_postgrest(valor) -> str:
+    """Entrecomilla un valor para los filtros or=(...) de PostgREST."""
+    return '"' + str(valor).replace("\\", "\\\\").replace('"', '\\"') + '"'
+
+
+def _parametros_postgrest(filtros, buscar, en, columnas, incluir, orden, limite, desplazamiento) -> dict:
+    parametros = {}
+    seleccion = ",".join(columnas) if columnas else "*"
+    for nombre, campos in (incluir or {}).items():
+        seleccion += f",{nombre}({','.join(campos)})"
+    parametros["select"] = seleccion
+    for columna, valor in (filtros or {}).items():
+        parametros[columna] = f"eq.{valor}"
+    if buscar and en:
+        patron = _valor_postgrest(f"*{buscar}*")
+        parametros["or"] = "(" + ",".join(f"{columna}.ilike.{patron}" for columna in en) + ")"
+    if orden:
+        parametros["order"] = orden
+    if limite is not None:
+        parametros["limit"] = limite
+    if desplazamiento:
+        parametros["offset"] = desplazamiento
+    return parametros
+
+
+def _columna_inexistente(response, tabla: str) -> None:
+    """Lanza ColumnaNoEncontrada si PostgREST responde 42703 (undefined_column)."""
+    if response.status_code != 400:
+        return
+    try:
+        error = response.json()
+    except ValueError:
+        return
+    if isinstance(error, dict) and error.get("code") == "42703":
+        raise ColumnaNoEncontrada(f"{tabla}: {error.get('message')}")
+
+
+def _postgrest(metodo: str, ruta: str, **kwargs):
+    from orgm.stuff.initialize_postgrest import initialize
+    from orgm.stuff.http import (
+        TIMEOUT,
+        invalidar_cache,
+        obtener_compartido,
+        obtener_en_cache,
+        obtener_sesion,
+        ttl_ruta,
+    )
+
+    POSTGREST_URL, headers = initialize()
+    url = f"{POSTGREST_URL}/{ruta}"
+    # Las tablas de referencia (TTL_RUTAS) se leen de la caché en disco y se
+    # revalidan con ETag/Last-Modified; escribir en ellas las invalida. Las
+    # demás lecturas idénticas que coinciden en el tiempo comparten respuesta.
+    if metodo == "GET" and set(kwargs) <= {"params"}:
+        if ttl_ruta(url):
+            return obtener_en_cache(url, params=kwargs.get("params"), headers=headers)
+        return obtener_compartido(url, params=kwargs.get("params"), headers=headers)
+    if metodo != "GET" and ttl_ruta(url):
+        invalidar_cache(url)
+    response = obtener_sesion().request(metodo, url, headers=headers, timeout=TIMEOUT, **kwargs)
+    return response
+
+
+# ----------------------------------------------------------------------
+# PostgreSQL directo
+# ----------------------------------------------------------------------
+
+_tablas = {}
+_bloqueo = threading.Lock()
+
+
+def _engine():
+    from orgm.apps.adm import db
+
+    if db.engine is None:
+        db.initialize_db()
+    if db.engine is None:
+        raise RuntimeError(
+            "No se pudo conectar a la base de datos: defina DATABASE_USER, DATABASE_PASSWORD, DATABASE_HOST y DATABASE_NAME"
+        )
+    return db.engine
+
+
+def _tabla(nombre: str):
+    """Tabla reflejada desde la base de datos (en caché)."""
+    from sqlalchemy import MetaData, Table
+
+    with _bloqueo:
+        if nombre not in _tablas:
+            _tablas[nombre] = Table(nombre, MetaData(), autoload_with=_engine())
+        return _tablas[nombre]
+
+
+def _columna(tabla, nombre: str):
+    try:
+        return tabla.c[nombre]
+    except KeyError:
+        raise ColumnaNoEncontrada(f"La tabla {tabla.name} no tiene la columna {nombre}") from None
+
+
+def _valor_json(valor):
+    """Un valor leído con SQLAlchemy tal como llega en el JSON de PostgREST."""
+    if isinstance(valor, Decimal):
+        return int(valor) if valor == valor.to_integral_value() and valor.as_tuple().exponent >= 0 else float(valor)
+    if isinstance(valor, (datetime, date, time)):
+        return valor.isoformat()
+    if isinstance(valor, UUID):
+        return str(valor)
+    if isinstance(valor, (bytes, memoryview)):
+        return "\\x" + bytes(valor).hex()
+    return valor
+
+
+def _fila(fila) -> dict:
+    return {columna: _valor_json(valor) for columna, valor in fila.items()}
+
+
+def _orden_sql(tabla, orden: str):
+    """Convierte "fecha.desc,id" en columnas de ORDER BY."""
+    resultado = []
+    for parte in orden.split(","):
+        nombre, _, direccion = parte.strip().partition(".")
+        columna = _columna(tabla, nombre)
+        resultado.append(columna.desc() if direccion.startswith("desc") else columna.asc())
+    return resultado
+
+
+def _consulta_sql(tabla_nombre, filtros, buscar, en, columnas, incluir, orden, limite, desplazamiento):
+    from sqlalchemy import String, cast, func, literal_column, or_, select
+
+    tabla = _tabla(tabla_nombre)
+    consulta = select(*([_columna(tabla, c) for c in columnas] if columnas else tabla.c))
+
+    # Relaciones a uno por la convención id_<tabla>, como las embebe PostgREST
+    for nombre, campos in (incluir or {}).items():
+        relacionada = _tabla(nombre)
+        argumentos = []
+        for campo in campos:
+            argumentos += [literal_column(f"'{_columna(relacionada, campo).name}'"), relacionada.c[campo]]
+        consulta = consulta.add_columns(
+            select(func.json_build_object(*argumentos))
+            .where(relacionada.c.id == _columna(tabla, f"id_{nombre}"))
+            .scalar_subquery()
+            .label(nombre)
+        )
+
+    for columna, valor in (filtros or {}).items():
+        consulta = consulta.where(_columna(tabla, columna) == valor)
+    if buscar and en:
+        consulta = consulta.where(
+            or_(*(cast(_columna(tabla, c), String).ilike(f"%{buscar}%") for c in en))
+        )
+    if orden:
+        consulta = consulta.order_by(*_orden_sql(tabla, orden))
+    if limite is not None:
+        consulta = consulta.limit(limite)
+    if desplazamiento:
+        consulta = consulta.offset(desplazamiento)
+    return consulta
+
+
+# ----------------------------------------------------------------------
+# Operaciones
+# ----------------------------------------------------------------------
+
+
+def consultar(
+    tabla: str,
+    filtros: Optional[dict] = None,
+    buscar: Optional[str] = None,
+    en: Optional[list] = None,
+    columnas: Optional[list] = None,
+    incluir: Optional[dict] = None,
+    orden: Optional[str] = None,
+    limite: Optional[int] = None,
+    desplazamiento: int = 0,
+) -> list[dict]:
+    """
+    Consulta filas de una tabla.
+
+    Args:
+        tabla: Nombre de la tabla.
+        filtros: {columna: valor} que deben ser iguales.
+        buscar: Texto a buscar (sin distinguir mayúsculas) en las columnas `en`.
+        en: Columnas donde se busca `buscar`.
+        columnas: Columnas a devolver (todas por defecto).
+        incluir: Relaciones a incluir, {"cliente": ["id", "nombre"]}.
+        orden: Orden al estilo PostgREST, por ejemplo "fecha.desc".
+        limite: Número máximo de filas.
+        desplazamiento: Filas a saltar.
+    """
+    if _postgres():
+        consulta = _consulta_sql(tabla, filtros, buscar, en, columnas, incluir, orden, limite, desplazamiento)
+        with _engine().connect() as conexion:
+            return [_fila(fila) for fila in conexion.execute(consulta).mappings()]
+
+    response = _postgrest(
+        "GET",
+        tabla,
+        params=_parametros_postgrest(filtros, buscar, en, columnas, incluir, orden, limite, desplazamiento),
+    )
+    _columna_inexistente(response, tabla)
+    response.raise_for_status()
+    return response.json()
+
+
+def iterar(
+    tabla: str,
+    filtros: Optional[dict] = None,
+    columnas: Optional[list] = None,
+    incluir: Optional[dict] = None,
+    orden: str = "id",
+    lote: int = 1000,
+):
+    """
+    Genera todas las filas de una tabla sin cargarlas juntas en memoria.
+
+    Con PostgreSQL directo se usa un cursor del lado del servidor; con
+    PostgREST se piden páginas de `lote` filas. Si se ordena por id las
+    páginas se piden a partir del último id recibido (id=gt.N), de modo que
+    cada página cuesta lo mismo sin importar cuántas filas se saltan.
+    """
+    if _postgres():
+        consulta = _consulta_sql(tabla, filtros, None, None, columnas, incluir, orden, None, 0)
+        with _engine().connect() as conexion:
+            resultado = conexion.execution_options(stream_results=True, yield_per=lote).execute(consulta)
+            for fila in resultado.mappings():
+                yield _fila(fila)
+        return
+
+    if orden == "id" and not (columnas and "id" not in columnas):
+        ultimo = None
+        while True:
+            parametros = _parametros_postgrest(filtros, None, None, columnas, incluir, orden, lote, 0)
+            if ultimo is not None:
+                parametros["id"] = f"gt.{ultimo}"
+            response = _postgrest("GET", tabla, params=parametros)
+            response.raise_for_status()
+            filas = response.json()
+            yield from filas
+            if len(filas) < lote:
+                return
+            ultimo = filas[-1]["id"]
+
+    desplazamiento = 0
+    while True:
+        filas = consultar(
+            tabla, filtros, columnas=columnas, incluir=incluir, orden=orden, limite=lote, desplazamiento=desplazamiento
+        )
+        yield from filas
+        if len(filas) < lote:
+            return
+        desplazamiento += lote
+
+
+def siguiente_id(tabla: str) -> int:
+    """ID máximo de la tabla + 1."""
+    filas = consultar(tabla, columnas=["id"], orden="id.desc", limite=1)
+    return filas[0]["id"] + 1 if filas else 1
+
+
+def _recordar(tabla: str, filas: list[dict]) -> None:
+    """
+    Pasa las filas devueltas por una escritura a la copia local de la tabla
+    (busqueda_local), para no tener que volver a leerlas.
+    """
+    from orgm.apps.adm.busqueda_local import guardar_en_cache
+
+    if filas:
+        guardar_en_cache(tabla, *filas)
+
+
+def insertar(tabla: str, datos: dict) -> Optional[dict]:
+    """Inserta una fila y devuelve la fila creada."""
+    if _postgres():
+        from sqlalchemy import insert
+
+        t = _tabla(tabla)
+        valores = {_columna(t, columna).name: valor for columna, valor in datos.items()}
+        with _engine().begin() as conexion:
+            fila = conexion.execute(insert(t).values(**valores).returning(*t.c)).mappings().first()
+        filas = [_fila(fila)] if fila else []
+    else:
+        response = _postgrest("POST", tabla, json=datos)
+        response.raise_for_status()
+        filas = response.json()
+    _recordar(tabla, filas)
+    return filas[0] if filas else None
+
+
+def _copiar(conexion, tabla, columnas: list, filas: list[dict]) -> None:
+    """Carga filas con COPY ... FROM STDIN (psycopg2 o psycopg 3)."""
+    import io
+    import json
+
+    def campo(valor) -> str:
+        # Campo vacío sin comillas = NULL; todo lo demás va entre comillas
+        if valor is None:
+            return ""
+        if isinstance(valor, (dict, list)):
+            valor = json.dumps(valor, ensure_ascii=False)
+        return '"' + str(valor).replace('"', '""') + '"'
+
+    buffer = io.StringIO()
+    for fila in filas:
+        buffer.write(",".join(campo(fila[c]) for c in columnas) + "\n")
+    buffer.seek(0)
+    nombres = ", ".join(f'"{c}"' for c in columnas)
+    sql = f'COPY "{tabla.name}" ({nombres}) FROM STDIN WITH (FORMAT csv)'
+    with conexion.connection.dbapi_connection.cursor() as cursor:
+        if hasattr(cursor, "copy_expert"):
+            cursor.copy_expert(sql, buffer)
+        else:
+            with cursor.copy(sql) as copia:
+                copia.write(buffer.getvalue())
+
+
+@contextmanager
+def transaccion():
+    """
+    Transacción para varias llamadas a insertar_varios.
+
+    Con PostgreSQL directo entrega una conexión dentro de una transacción:
+    se confirma al salir del bloque y se revierte completa si ocurre una
+    excepción. PostgREST no mantiene transacciones entre solicitudes, así que
+    entrega None y cada llamada se confirma por separado.
+    """
+    if not _postgres():
+        yield None
+        return
+    with _engine().begin() as conexion:
+        yield conexion
+
+
+def insertar_varios(tabla: str, filas: list[dict], conexion=None) -> int:
+    """
+    Inserta muchas filas en una sola operación y devuelve cuántas se
+    insertaron. Las filas se agrupan por sus columnas para que las que no
+    traen una columna tomen el valor por defecto de la tabla.
+
+    PostgREST recibe un arreglo JSON por grupo y cada solicitud se confirma
+    por separado. Con PostgreSQL directo se usa COPY en la conexión de
+    `conexion` (ver transaccion()) o, sin ella, en una transacción propia.
+    """
+    grupos = {}
+    for fila in filas:
+        grupos.setdefault(tuple(fila), []).append(fila)
+
+    if _postgres():
+        from sqlalchemy import insert
+
+        t = _tabla(tabla)
+        with transaccion() if conexion is None else nullcontext(conexion) as conexion:
+            for columnas, grupo in grupos.items():
+                columnas = [_columna(t, c).name for c in columnas]
+                if conexion.dialect.driver in ("psycopg2", "psycopg"):
+                    _copiar(conexion, t, columnas, grupo)
+                else:
+                    conexion.execute(insert(t), grupo)
+        return len(filas)
+
+    from orgm.stuff.initialize_postgrest import initialize
+    from orgm.stuff.http import obtener_sesion, invalidar_cache, TIMEOUT
+
+    POSTGREST_URL, headers = initialize()
+    headers = {**headers, "Prefer": "return=minimal"}
+    invalidar_cache(f"{POSTGREST_URL}/{tabla}")
+    sesion = obtener_sesion()
+    for grupo in grupos.values():
+        response = sesion.post(f"{POSTGREST_URL}/{tabla}", json=grupo, headers=headers, timeout=TIMEOUT)
+        response.raise_for_status()
+    return len(filas)
+
+
+def actualizar(tabla: str, filtros: dict, datos: dict) -> list[dict]:
+    """
+    Actualiza las filas que cumplen `filtros` y devuelve las filas
+    modificadas (RETURNING / Prefer: return=representation). Una lista vacía
+    significa que ninguna fila cumple los filtros, así que no hace falta
+    comprobar antes que existen.
+    """
+    if _postgres():
+        from sqlalchemy import update
+
+        t = _tabla(tabla)
+        valores = {_columna(t, columna).name: valor for columna, valor in datos.items()}
+        consulta = update(t).values(**valores).returning(*t.c)
+        for columna, valor in filtros.items():
+            consulta = consulta.where(_columna(t, columna) == valor)
+        with _engine().begin() as conexion:
+            filas = [_fila(fila) for fila in conexion.execute(consulta).mappings()]
+    else:
+        response = _postgrest(
+            "PATCH", tabla, params={columna: f"eq.{valor}" for columna, valor in filtros.items()}, json=datos
+        )
+        response.raise_for_status()
+        filas = response.json()
+    _recordar(tabla, filas)
+    return filas
+
+
+def llamar(funcion: str, **argumentos):
+    """
+    Llama a una función de la base de datos (RPC de PostgREST).
+
+    Devuelve el valor de la función, o la lista de filas si devuelve una
+    tabla. Lanza FuncionNoEncontrada si la función no existe.
+    """
+    if not _IDENTIFICADOR.match(funcion):
+        raise ValueError(f"Nombre de función inválido: {funcion}")
+
+    if _postgres():
+        from sqlalchemy import bindparam, text
+        from sqlalchemy.dialects.postgresql import JSONB
+        from sqlalchemy.exc import ProgrammingError
+
+        for nombre in argumentos:
+            if not _IDENTIFICADOR.match(nombre):
+                raise ValueError(f"Nombre de argumento inválido: {nombre}")
+        consulta = text(
+            f"SELECT * FROM {funcion}(" + ", ".join(f"{n} => :{n}" for n in argumentos) + ")"
+        ).bindparams(
+            *(bindparam(n, type_=JSONB) for n, v in argumentos.items() if isinstance(v, (dict, list)))
+        )
+        try:
+            with _engine().begin() as conexion:
+                resultado = conexion.execute(consulta, argumentos)
+                columnas = list(resultado.keys())
+                filas = [_fila(fila) for fila in resultado.mappings()]
+        except ProgrammingError as e:
+            # 42883: undefined_function (pgcode en psycopg2, sqlstate en psycopg 3)
+            if getattr(e.orig, "pgcode", None) == "42883" or getattr(e.orig, "sqlstate", None) == "42883":
+                raise FuncionNoEncontrada(funcion) from e
+            raise
+        if columnas == [funcion]:
+            return filas[0][funcion] if filas else None
+        return filas
+
+    response = _postgrest("POST", f"rpc/{funcion}", json=argumentos)
+    if response.status_code == 404:
+        raise FuncionNoEncontrada(funcion)
+    response.raise_for_status()
+    return response.json()
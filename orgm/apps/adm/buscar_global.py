@@ -0,0 +1,200 @@
+"""
+Búsqueda global: clientes, proyectos, cotizaciones, servicios y ubicaciones
+con un solo término.
+
+Clientes, proyectos y servicios se buscan en el índice local
+(busqueda_local), descargando en paralelo las tablas que falten, y las
+ubicaciones en el índice de ubicaciones del paquete. Las
+cotizaciones se piden al servidor en paralelo (por descripción y por los
+clientes y proyectos encontrados) sobre la misma sesión HTTP, y se puntúan
+con el mismo índice para ordenar todo en una sola escala.
+"""
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Optional
+import typer
+from rich.console import Console
+from rich.table import Table
+from orgm.stuff.texto import normalizar
+from orgm.stuff.spinner import spinner
+
+console = Console()
+
+TABLAS_LOCALES = ("cliente", "proyecto", "servicio", "ubicacion")
+
+TITULOS = {
+    "cliente": "Clientes",
+    "proyecto": "Proyectos",
+    "cotizacion": "Cotizaciones",
+    "servicio": "Servicios",
+    "ubicacion": "Ubicaciones",
+}
+
+# Campos con los que se puntúan las cotizaciones; cliente y proyecto son
+# los nombres de las tablas relacionadas
+CAMPOS_COTIZACION = {"descripcion": 1.0, "cliente": 0.9, "proyecto": 0.9}
+
+# Puntaje mínimo para mostrar un resultado
+PUNTAJE_MINIMO = 0.35
+
+# Clientes y proyectos encontrados cuyas cotizaciones también se consultan
+RELACIONADOS = 3
+
+TRABAJADORES = 8
+
+_ubicaciones = None
+
+
+def _indice_ubicaciones():
+    """Índice de búsqueda sobre el índice local de ubicaciones (sin red)."""
+    global _ubicaciones
+    from orgm.apps.adm.busqueda_local import CAMPOS_BUSQUEDA, IndiceBusqueda
+    from orgm.apps.adm.proyecto.indice_ubicaciones import filas_ubicaciones
+
+    filas = filas_ubicaciones()
+    if filas is None:
+        return None
+    if _ubicaciones is None or _ubicaciones.filas is not filas:
+        _ubicaciones = IndiceBusqueda(filas, CAMPOS_BUSQUEDA["ubicacion"])
+    return _ubicaciones
+
+
+def _buscar_tabla(tabla: str, termino: str, limite: int) -> list[tuple[float, dict]]:
+    """(puntaje, fila) de una tabla con índice local, o del servidor si no hay copia."""
+    from orgm.apps.adm.busqueda_local import CAMPOS_BUSQUEDA, IndiceBusqueda, buscar_servidor, indice_tabla
+
+    indice = _indice_ubicaciones() if tabla == "ubicacion" else indice_tabla(tabla)
+    if indice is None:
+        # Sin copia local: ILIKE en el servidor y se puntúa lo devuelto
+        indice = IndiceBusqueda(buscar_servidor(tabla, termino, limite=50), CAMPOS_BUSQUEDA[tabla])
+    return [(puntaje, indice.filas[i]) for puntaje, i in indice.buscar_indices(termino, limite)]
+
+
+def _patron(palabra: str) -> str:
+    """Patrón ILIKE (ya sin acentos) en el que cada vocal acepta también la acentuada."""
+    return "".join("_" if c in "aeiou" else c for c in palabra)
+
+
+def _consultas_cotizacion(termino: str, clientes: list[dict], proyectos: list[dict]) -> list[dict]:
+    """Argumentos de consultar() para las cotizaciones relacionadas con el término."""
+    incluir = {"cliente": ["id", "nombre"], "proyecto": ["id", "nombre_proyecto"]}
+    consultas = []
+    # Las palabras más largas son las más selectivas
+    palabras = sorted({p for p in normalizar(termino).split() if len(p) >= 4}, key=len, reverse=True)
+    for palabra in palabras[:3]:
+        consultas.append({"buscar": _patron(palabra), "en": ["descripcion"], "incluir": incluir, "limite": 50})
+    for cliente in clientes[:RELACIONADOS]:
+        consultas.append({"filtros": {"id_cliente": cliente["id"]}, "incluir": incluir, "limite": 50})
+    for proyecto in proyectos[:RELACIONADOS]:
+        consultas.append({"filtros": {"id_proyecto": proyecto["id"]}, "incluir": incluir, "limite": 50})
+    return consultas
+
+
+def _nombre_relacion(valor, campo: str) -> str:
+    return (valor.get(campo) or "") if isinstance(valor, dict) else ""
+
+
+def buscar_todo(termino: str, limite: int = 5) -> Optional[dict]:
+    """
+    Busca el término en todas las tablas.
+
+    Returns:
+        dict: {tabla: [(puntaje, fila), ...]} con las tablas que tienen
+        resultados, o None si el término está vacío.
+    """
+    from orgm.apps.adm.backend import consultar
+    from orgm.apps.adm.busqueda_local import IndiceBusqueda
+
+    if not normalizar(termino):
+        return None
+
+    resultados = {}
+    with ThreadPoolExecutor(max_workers=TRABAJADORES) as pool:
+        # Clientes y proyectos con más candidatos: también sirven para
+        # encontrar sus cotizaciones
+        futuros = {
+            tabla: pool.submit(_buscar_tabla, tabla, termino, max(limite, RELACIONADOS))
+            for tabla in TABLAS_LOCALES
+        }
+        for tabla, futuro in futuros.items():
+            try:
+                resultados[tabla] = futuro.result()
+            except Exception as e:
+                console.print(f"[bold red]Error al buscar {TITULOS[tabla].lower()}: {e}[/bold red]")
+                resultados[tabla] = []
+
+        relevantes = {
+            tabla: [fila for puntaje, fila in resultados[tabla] if puntaje >= PUNTAJE_MINIMO]
+            for tabla in ("cliente", "proyecto")
+        }
+        consultas = _consultas_cotizacion(termino, relevantes["cliente"], relevantes["proyecto"])
+        futuros = [pool.submit(consultar, "cotizacion", **argumentos) for argumentos in consultas]
+        cotizaciones = {}
+        for futuro in futuros:
+            try:
+                for fila in futuro.result():
+                    cotizaciones[fila["id"]] = fila
+            except Exception as e:
+                console.print(f"[bold red]Error al buscar cotizaciones: {e}[/bold red]")
+
+    filas = [
+        {
+            **fila,
+            "cliente": _nombre_relacion(fila.get("cliente"), "nombre"),
+            "proyecto": _nombre_relacion(fila.get("proyecto"), "nombre_proyecto"),
+        }
+        for fila in cotizaciones.values()
+    ]
+    indice = IndiceBusqueda(filas, CAMPOS_COTIZACION)
+    resultados["cotizacion"] = [(puntaje, filas[i]) for puntaje, i in indice.buscar_indices(termino, limite)]
+
+    return {
+        tabla: [(puntaje, fila) for puntaje, fila in filas_tabla if puntaje >= PUNTAJE_MINIMO][:limite]
+        for tabla, filas_tabla in resultados.items()
+        if any(puntaje >= PUNTAJE_MINIMO for puntaje, _ in filas_tabla)
+    }
+
+
+def _describir(tabla: str, fila: dict) -> tuple[str, str]:
+    """(nombre, detalle) para mostrar una fila."""
+    if tabla == "cliente":
+        detalle = " · ".join(str(v) for v in (fila.get("nombre_comercial"), fila.get("numero")) if v)
+        return fila.get("nombre") or "", detalle
+    if tabla == "proyecto":
+        return fila.get("nombre_proyecto") or "", fila.get("ubicacion") or ""
+    if tabla == "cotizacion":
+        detalle = " · ".join(v for v in (fila.get("cliente"), fila.get("proyecto")) if v)
+        return (fila.get("descripcion") or "")[:80], detalle
+    if tabla == "servicio":
+        return fila.get("nombre") or "", (fila.get("descripcion") or "")[:80]
+    return (
+        ", ".join(str(v) for v in (fila.get("distritomunicipal"), fila.get("distrito")) if v),
+        fila.get("provincia") or "",
+    )
+
+
+def buscar_global(
+    termino: str = typer.Argument(..., help="Texto a buscar (nombre, RNC, descripción, ubicación...)"),
+    limite: int = typer.Option(5, "--limite", "-l", help="Resultados por tipo"),
+):
+    """Busca en clientes, proyectos, cotizaciones, servicios y ubicaciones a la vez."""
+    inicio = time.perf_counter()
+    with spinner(f"Buscando '{termino}'..."):
+        resultados = buscar_todo(termino, limite)
+
+    if not resultados:
+        console.print(f"[yellow]No se encontraron resultados para '{termino}'[/yellow]")
+        return
+
+    # Los grupos con la mejor coincidencia primero
+    for tabla in sorted(resultados, key=lambda t: -resultados[t][0][0]):
+        tabla_rich = Table(title=TITULOS[tabla], title_justify="left", show_header=True, header_style="bold magenta")
+        tabla_rich.add_column("ID", style="cyan", justify="right")
+        tabla_rich.add_column("Nombre", style="green")
+        tabla_rich.add_column("Detalle")
+        for _, fila in resultados[tabla]:
+            nombre, detalle = _describir(tabla, fila)
+            tabla_rich.add_row(str(fila.get("id", "")), nombre, detalle)
+        console.print(tabla_rich)
+
+    console.print(f"[dim]Búsqueda completada en {time.perf_counter() - inicio:.2f} s[/dim]")
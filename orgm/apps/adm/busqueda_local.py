@@ -0,0 +1,469 @@
+"""
+Búsqueda local de clientes, proyectos, servicios y ubicaciones.
+
+Las tablas se descargan completas a ~/.orgm/cache/tablas/<tabla>.json y se
+vuelven a descargar cuando tienen más de ORGM_CACHE_TABLAS_TTL segundos
+(600 por defecto). Sobre esas filas se construye en memoria un índice de
+trigramas y de prefijos de palabras, sin acentos ni mayúsculas, que responde
+cada búsqueda sin ir al servidor. Los resultados se ordenan por similitud,
+coincidencia de prefijos y, a igualdad, por los registros más recientes.
+"""
+import heapq
+import json
+import math
+import os
+import re
+import threading
+import time
+import uuid
+from bisect import bisect_left
+from collections import Counter, defaultdict
+from typing import Callable, Optional
+from rich.console import Console
+from orgm.stuff.texto import normalizar, sin_acentos, trigramas, similitud
+
+console = Console()
+
+RUTA_CACHE_TABLAS = os.path.join(os.path.expanduser("~"), ".orgm", "cache", "tablas")
+
+TTL_TABLAS = int(os.getenv("ORGM_CACHE_TABLAS_TTL", "600"))
+
+# Campos de búsqueda de cada tabla y su peso en la puntuación
+CAMPOS_BUSQUEDA = {
+    "cliente": {"nombre": 1.0, "nombre_comercial": 0.9, "numero": 1.0, "representante": 0.6},
+    "proyecto": {"nombre_proyecto": 1.0, "ubicacion": 0.6, "descripcion": 0.4},
+    "servicio": {"nombre": 1.0, "descripcion": 0.5},
+    "ubicacion": {"distritomunicipal": 1.0, "distrito": 1.0, "provincia": 0.8},
+}
+
+# Tablas con la columna generada "busqueda" (sql/0003_indices_busqueda.sql),
+# indexada con trigramas para las búsquedas en el servidor, y las columnas
+# con que se calcula, donde se busca si la migración no se ha aplicado
+TABLAS_COLUMNA_BUSQUEDA = {
+    "cliente": ["nombre", "nombre_comercial"],
+    "proyecto": ["nombre_proyecto", "ubicacion", "descripcion"],
+    "ubicacion": ["provincia", "distrito", "distritomunicipal"],
+}
+
+# Tablas en las que el servidor respondió que no existe la columna
+_sin_columna_busqueda = set()
+
+# Campo con la fecha de la última modificación; sin él se usa el id
+CAMPO_FECHA = {"cliente": "fecha_actualizacion"}
+
+# Candidatos de la primera pasada que se puntúan con los campos completos
+# (solo en las búsquedas con límite: autocompletar y selector)
+MAX_CANDIDATOS = 100
+
+# Similitud mínima entre una palabra buscada y una palabra de la fila para
+# que cuente como encontrada aunque no aparezca tal cual (errores de
+# escritura) en los listados sin límite. "constructra" ~ "constructora"
+# (0.67) sí; "constructora" ~ "construcciones" (0.47) no
+SIMILITUD_PALABRA = 0.5
+
+# Resultados de las búsquedas mientras se escribe (interfaz gráfica,
+# autocompletado): se puntúan y validan solo estas filas
+LIMITE_INTERACTIVO = 50
+
+# Resultados de cada búsqueda del selector (orgm.stuff.selector)
+LIMITE_SELECTOR = 200
+
+_NO_DIGITO = re.compile(r"\D")
+_RNC = re.compile(r"^[\d\s-]+$")
+
+_memoria = {}
+_indices = {}
+_bloqueos = {}
+_bloqueo = threading.Lock()
+
+
+# ----------------------------------------------------------------------
+# Caché de tablas
+# ----------------------------------------------------------------------
+
+
+def _bloqueo_tabla(tabla: str) -> threading.Lock:
+    """Un bloqueo por tabla, para descargar varias tablas a la vez."""
+    with _bloqueo:
+        return _bloqueos.setdefault(tabla, threading.Lock())
+
+
+def _ruta(tabla: str) -> str:
+    return os.path.join(RUTA_CACHE_TABLAS, f"{tabla}.json")
+
+
+def _guardar(tabla: str, filas: list[dict], obtenida: float) -> None:
+    # Cada escritura lleva una versión nueva, también las de guardar_en_cache
+    version = uuid.uuid4().hex
+    _memoria[tabla] = (obtenida, filas, version)
+    os.makedirs(RUTA_CACHE_TABLAS, exist_ok=True)
+    temporal = f"{_ruta(tabla)}.tmp"
+    with open(temporal, "w", encoding="utf-8") as f:
+        json.dump({"obtenida": obtenida, "version": version, "filas": filas}, f, ensure_ascii=False, default=str)
+    os.replace(temporal, _ruta(tabla))
+
+
+def _leer(tabla: str) -> Optional[tuple[float, list[dict], str]]:
+    if tabla in _memoria:
+        return _memoria[tabla]
+    try:
+        with open(_ruta(tabla), "r", encoding="utf-8") as f:
+            datos = json.load(f)
+        version = datos.get("version") or str(datos["obtenida"])
+        _memoria[tabla] = (datos["obtenida"], datos["filas"], version)
+        return _memoria[tabla]
+    except (OSError, ValueError, KeyError):
+        return None
+
+
+def filas_tabla(tabla: str, refrescar: bool = False) -> Optional[list[dict]]:
+    """
+    Filas de una tabla desde la caché local, descargándolas si no existen o
+    están vencidas. Si la descarga falla se usa la copia vencida.
+
+    Returns:
+        list[dict]: Filas de la tabla, o None si no hay copia ni conexión.
+    """
+    from orgm.apps.adm.backend import iterar
+
+    with _bloqueo_tabla(tabla):
+        copia = _leer(tabla)
+        if copia and not refrescar and time.time() - copia[0] < TTL_TABLAS:
+            return copia[1]
+        try:
+            obtenida = time.time()
+            filas = list(iterar(tabla, orden="id"))
+            _guardar(tabla, filas, obtenida)
+            return filas
+        except Exception as e:
+            if copia:
+                return copia[1]
+            console.print(f"[bold yellow]No se pudo descargar {tabla} para la búsqueda local: {e}[/bold yellow]")
+            return None
+
+
+def fecha_tabla(tabla: str) -> Optional[float]:
+    """Momento (time.time()) en que se descargó la copia local de la tabla."""
+    copia = _leer(tabla)
+    return copia[0] if copia else None
+
+
+def version_tabla(tabla: str) -> Optional[str]:
+    """
+    Identificador de la copia local de la tabla. Cambia con cada descarga y
+    con cada guardar_en_cache, para saber cuándo reconstruir lo que se
+    deriva de las filas.
+    """
+    copia = _leer(tabla)
+    return copia[2] if copia else None
+
+
+def guardar_en_cache(tabla: str, *nuevas: dict) -> None:
+    """
+    Agrega o reemplaza (por id) filas en la caché local, para que los
+    registros creados o modificados aparezcan en la búsqueda sin esperar a
+    que la caché venza.
+    """
+    nuevas = {fila["id"]: fila for fila in nuevas if fila and fila.get("id") is not None}
+    if not nuevas:
+        return
+    with _bloqueo_tabla(tabla):
+        copia = _leer(tabla)
+        if copia is None:
+            return
+        obtenida, filas, _ = copia
+        filas = [f for f in filas if f.get("id") not in nuevas] + list(nuevas.values())
+        try:
+            _guardar(tabla, filas, obtenida)
+        except OSError:
+            pass
+
+
+def invalidar_tabla(tabla: str) -> None:
+    """Elimina la copia local de una tabla; la próxima búsqueda la descarga."""
+    with _bloqueo_tabla(tabla):
+        _memoria.pop(tabla, None)
+        _indices.pop(tabla, None)
+        try:
+            os.remove(_ruta(tabla))
+        except OSError:
+            pass
+
+
+# ----------------------------------------------------------------------
+# Índice
+# ----------------------------------------------------------------------
+
+
+class IndiceBusqueda:
+    """
+    Índice en memoria de trigramas y prefijos sobre los campos de texto de
+    unas filas.
+
+    Args:
+        filas: Filas de la tabla.
+        campos: {campo: peso} a indexar.
+        campo_fecha: Campo para ordenar por recientes (si no, el id).
+    """
+
+    def __init__(self, filas: list[dict], campos: dict, campo_fecha: Optional[str] = None):
+        self.filas = filas
+        self.campos = campos
+        self.textos = []
+        self.trigramas = []
+        self.unidos = []
+        self.digitos = []
+        postings = defaultdict(list)
+        por_palabra = defaultdict(list)
+
+        for i, fila in enumerate(filas):
+            textos = {campo: normalizar(fila.get(campo)) for campo in campos}
+            tris = {campo: trigramas(texto, normalizado=True) for campo, texto in textos.items()}
+            self.textos.append(textos)
+            self.trigramas.append(tris)
+            self.unidos.append("\n".join(textos.values()))
+            self.digitos.append(
+                " ".join(_NO_DIGITO.sub("", str(fila.get(c) or "")) for c in campos if c == "numero")
+            )
+            for tri in set().union(*tris.values()):
+                postings[tri].append(i)
+            for palabra in set(" ".join(textos.values()).split()):
+                por_palabra[palabra].append(i)
+
+        self.postings = dict(postings)
+
+        # Palabras distintas en orden alfabético, para buscar prefijos con bisect
+        self.palabras = sorted(por_palabra)
+        self.filas_palabra = [por_palabra[p] for p in self.palabras]
+
+        # Trigramas de cada palabra distinta, para las palabras mal escritas
+        self.trigramas_palabra = [trigramas(p, normalizado=True) for p in self.palabras]
+        postings_palabra = defaultdict(list)
+        for j, tris in enumerate(self.trigramas_palabra):
+            for tri in tris:
+                postings_palabra[tri].append(j)
+        self.postings_palabra = dict(postings_palabra)
+
+        # Rango de recencia entre 0 (más antiguo) y 1 (más reciente)
+        orden = sorted(
+            range(len(filas)),
+            key=lambda i: (str(filas[i].get(campo_fecha) or "") if campo_fecha else "", filas[i].get("id") or 0),
+        )
+        self.recencia = [0.0] * len(filas)
+        for posicion, i in enumerate(orden):
+            self.recencia[i] = posicion / max(1, len(filas) - 1)
+
+    def __len__(self):
+        return len(self.filas)
+
+    def _con_prefijo(self, prefijo: str) -> set[int]:
+        """Filas con alguna palabra que empieza por `prefijo`."""
+        resultado = set()
+        i = bisect_left(self.palabras, prefijo)
+        while i < len(self.palabras) and self.palabras[i].startswith(prefijo):
+            resultado.update(self.filas_palabra[i])
+            i += 1
+        return resultado
+
+    def buscar_indices(self, texto: str, limite: Optional[int] = 20) -> list[tuple[float, int]]:
+        """
+        (puntaje, posición) de las mejores filas para `texto`.
+
+        Con `limite` se devuelven las mejores filas aunque solo se parezcan
+        de lejos, para autocompletar y el selector. Con limite=None se
+        devuelven todas las que coinciden (ver _coincidencias).
+        """
+        consulta = normalizar(texto)
+        if not consulta:
+            return []
+        palabras = consulta.split()
+        tris = trigramas(consulta, normalizado=True)
+
+        # Todas las palabras como prefijo (lo que se está escribiendo)
+        por_prefijo = self._con_prefijo(palabras[0])
+        for palabra in palabras[1:]:
+            if not por_prefijo:
+                break
+            por_prefijo &= self._con_prefijo(palabra)
+
+        digitos = _NO_DIGITO.sub("", texto or "")
+        if limite is None:
+            candidatos = self._coincidencias(palabras, digitos)
+        else:
+            candidatos = self._candidatos(tris, por_prefijo, digitos)
+
+        resultados = []
+        for i in candidatos:
+            puntaje = 0.0
+            for campo, peso in self.campos.items():
+                valor = similitud(tris, self.trigramas[i][campo])
+                if consulta in self.textos[i][campo]:
+                    valor += 0.5 if self.textos[i][campo].startswith(consulta) else 0.3
+                puntaje = max(puntaje, valor * peso)
+            if i in por_prefijo:
+                puntaje += 0.3
+            if len(digitos) >= 3 and digitos in self.digitos[i]:
+                puntaje += 1.0
+            resultados.append((puntaje + 0.05 * self.recencia[i], i))
+
+        resultados.sort(key=lambda r: -r[0])
+        return resultados if limite is None else resultados[:limite]
+
+    def _candidatos(self, tris: set[str], por_prefijo: set[int], digitos: str) -> list[int]:
+        """
+        Primera pasada barata de las búsquedas con límite: hasta
+        MAX_CANDIDATOS filas, primero las del RNC, luego las que coinciden por
+        prefijo y luego las que tienen más trigramas en común. Cuando los
+        primeros grupos ya llenan el cupo no se recorre el resto.
+        """
+        conteo = Counter()
+        for tri in tris:
+            conteo.update(self.postings.get(tri, ()))
+
+        grupos = [por_prefijo]
+        if len(digitos) >= 3:
+            grupos.insert(0, {i for i, d in enumerate(self.digitos) if digitos in d})
+        candidatos = []
+        for grupo in grupos:
+            grupo = grupo.difference(candidatos)
+            candidatos += heapq.nlargest(MAX_CANDIDATOS - len(candidatos), grupo, key=conteo.__getitem__)
+        if len(candidatos) < MAX_CANDIDATOS:
+            umbral = max(1, math.ceil(len(tris) * 0.3))
+            vistas = set(candidatos)
+            resto = (i for i, n in conteo.items() if n >= umbral and i not in vistas)
+            candidatos += heapq.nlargest(MAX_CANDIDATOS - len(candidatos), resto, key=conteo.__getitem__)
+        return candidatos
+
+    def _con_palabra(self, palabra: str) -> set[int]:
+        """
+        Filas en las que aparece `palabra`: como inicio de una palabra, en
+        cualquier parte de un campo ("ab" en "cabrera") o, con errores de
+        escritura, una palabra con similitud de al menos SIMILITUD_PALABRA.
+        """
+        filas = self._con_prefijo(palabra)
+        filas.update(i for i, texto in enumerate(self.unidos) if palabra in texto)
+
+        tris = trigramas(palabra, normalizado=True)
+        conteo = Counter()
+        for tri in tris:
+            conteo.update(self.postings_palabra.get(tri, ()))
+        for j, n in conteo.items():
+            # Con menos trigramas en común no puede llegar a la similitud mínima
+            if n >= SIMILITUD_PALABRA * len(tris) and similitud(tris, self.trigramas_palabra[j]) >= SIMILITUD_PALABRA:
+                filas.update(self.filas_palabra[j])
+        return filas
+
+    def _coincidencias(self, palabras: list[str], digitos: str) -> set[int]:
+        """Filas en las que aparecen todas las palabras, o el RNC buscado."""
+        filas = None
+        for palabra in sorted(set(palabras), key=len, reverse=True):
+            filas = self._con_palabra(palabra) if filas is None else filas & self._con_palabra(palabra)
+            if not filas:
+                break
+        filas = filas or set()
+        if len(digitos) >= 3:
+            filas.update(i for i, d in enumerate(self.digitos) if digitos in d)
+        return filas
+
+    def buscar(self, texto: str, limite: Optional[int] = 20) -> list[dict]:
+        """Las filas que mejor coinciden con `texto`, de mayor a menor puntaje."""
+        return [self.filas[i] for _, i in self.buscar_indices(texto, limite)]
+
+
+def indice_tabla(tabla: str, refrescar: bool = False) -> Optional[IndiceBusqueda]:
+    """Índice de búsqueda de una tabla de CAMPOS_BUSQUEDA (se reutiliza mientras la caché no cambie)."""
+    filas = filas_tabla(tabla, refrescar)
+    if filas is None:
+        return None
+    indice = _indices.get(tabla)
+    if indice is None or indice.filas is not filas:
+        indice = IndiceBusqueda(filas, CAMPOS_BUSQUEDA[tabla], CAMPO_FECHA.get(tabla))
+        _indices[tabla] = indice
+    return indice
+
+
+def buscar_local(tabla: str, texto: str, limite: Optional[int] = None) -> Optional[list[dict]]:
+    """
+    Busca en la copia local de la tabla. Sin texto devuelve todas las filas.
+
+    Por defecto devuelve todas las filas que coinciden, para los listados;
+    con `limite` solo las mejores (ver IndiceBusqueda.buscar_indices).
+
+    Returns:
+        list[dict]: Filas encontradas, o None si no hay copia local disponible.
+    """
+    indice = indice_tabla(tabla)
+    if indice is None:
+        return None
+    if not normalizar(texto):
+        return list(indice.filas) if limite is None else indice.filas[:limite]
+    return indice.buscar(texto, limite)
+
+
+def buscar_servidor(tabla: str, texto: str, limite: Optional[int] = None) -> list[dict]:
+    """
+    Búsqueda ILIKE en el servidor, para cuando no hay copia local.
+
+    En las tablas de TABLAS_COLUMNA_BUSQUEDA se busca en la columna
+    "busqueda" con el texto sin acentos ni mayúsculas, como se calcula la
+    columna, para que use su índice de trigramas. Si la base de datos no
+    tiene la columna (sin 'orgm conf migrate') se busca en las columnas con
+    que se calcula. Un RNC (solo dígitos) se busca en cliente.numero.
+    """
+    from orgm.apps.adm.backend import ColumnaNoEncontrada, consultar
+
+    if tabla == "cliente" and _RNC.match(texto or ""):
+        return consultar(tabla, buscar=texto.strip(), en=["numero"], limite=limite)
+    if tabla not in TABLAS_COLUMNA_BUSQUEDA:
+        return consultar(tabla, buscar=texto, en=list(CAMPOS_BUSQUEDA[tabla]), limite=limite)
+    if tabla not in _sin_columna_busqueda:
+        try:
+            return consultar(tabla, buscar=sin_acentos(texto).strip(), en=["busqueda"], limite=limite)
+        except ColumnaNoEncontrada:
+            _sin_columna_busqueda.add(tabla)
+    return consultar(tabla, buscar=texto, en=TABLAS_COLUMNA_BUSQUEDA[tabla], limite=limite)
+
+
+def buscador_local(tabla: str, etiqueta: Callable[[dict], str], limite: int = LIMITE_SELECTOR):
+    """
+    Función texto -> [(id, etiqueta)] sobre el índice local, para
+    orgm.stuff.selector. Sin texto devuelve los registros más recientes.
+
+    Returns:
+        La función de búsqueda, o None si no hay copia local disponible.
+    """
+    indice = indice_tabla(tabla)
+    if indice is None:
+        return None
+
+    def buscar(texto: str) -> list:
+        if normalizar(texto):
+            filas = indice.buscar(texto, limite)
+        else:
+            filas = sorted(indice.filas, key=lambda f: f.get("id") or 0, reverse=True)[:limite]
+        return [(fila.get("id"), etiqueta(fila)) for fila in filas]
+
+    return buscar
+
+
+def completador_busqueda(tabla: str, campo: str, limite: int = 10):
+    """
+    Autocompletado de prompt_toolkit (para questionary.autocomplete) con la
+    búsqueda local. Sugiere el campo `campo` de las mejores filas.
+    """
+    from prompt_toolkit.completion import Completer, Completion
+
+    class CompletadorBusqueda(Completer):
+        def get_completions(self, document, complete_event):
+            texto = document.text_before_cursor
+            if len(normalizar(texto)) < 2:
+                return
+            indice = indice_tabla(tabla)
+            if indice is None:
+                return
+            for fila in indice.buscar(texto, limite):
+                valor = str(fila.get(campo) or "")
+                if valor:
+                    yield Completion(valor, start_position=-len(texto), display_meta=f"ID {fila.get('id')}")
+
+    return CompletadorBusqueda()
@@ -3,6 +3,7 @@ from rich.console import Console
 
 
 from orgm.apps.adm.cliente.gui import iniciar_gui as gui
+from orgm.apps.adm.cliente.bulk_clients import importar_clientes, exportar_clientes
 
 # Crear consola para salida con Rich
 console = Console()
@@ -14,6 +15,8 @@ app = typer.Typer(help="Comandos para interactuar con datos de clientes")
 # El docstring de ai_prompt se usará como ayuda
 
 app.command(name="gui")(gui)
+app.command(name="import")(importar_clientes)
+app.command(name="export")(exportar_clientes)
 
 
 @app.callback(invoke_without_command=True)
@@ -0,0 +1,31 @@
+import typer
+from pathlib import Path
+from typing import Optional
+from rich.console import Console
+from orgm.apps.adm.masivo import importar_tabla, exportar_tabla, TAMANO_LOTE
+
+console = Console()
+
+
+def importar_clientes(
+    archivo: Path = typer.Argument(..., exists=True, dir_okay=False, help="Archivo CSV o JSONL con los clientes"),
+    formato: Optional[str] = typer.Option(None, "--formato", "-f", help="csv o jsonl (por defecto según la extensión)"),
+    lote: int = typer.Option(TAMANO_LOTE, "--lote", help="Registros por solicitud"),
+    ignorar_errores: bool = typer.Option(False, "--ignorar-errores", help="Omite las filas inválidas e importa el resto"),
+    desde: int = typer.Option(0, "--desde", help="Línea del archivo desde la que continuar una importación interrumpida"),
+):
+    """Importa clientes desde un archivo CSV o JSONL, en lotes."""
+    from orgm.apps.adm.db import Cliente
+
+    if importar_tabla("cliente", Cliente, archivo, formato, lote, ignorar_errores, desde) is None:
+        raise typer.Exit(code=1)
+
+
+def exportar_clientes(
+    archivo: Path = typer.Argument(..., dir_okay=False, help="Archivo CSV o JSONL de destino"),
+    formato: Optional[str] = typer.Option(None, "--formato", "-f", help="csv o jsonl (por defecto según la extensión)"),
+    lote: int = typer.Option(TAMANO_LOTE, "--lote", help="Registros por página"),
+):
+    """Exporta todos los clientes a un archivo CSV o JSONL."""
+    if exportar_tabla("cliente", archivo, formato, lote) is None:
+        raise typer.Exit(code=1)
@@ -1,8 +1,6 @@
-from orgm.stuff.initialize_postgrest import initialize
 from rich.console import Console
 from typing import Dict, Optional
 from orgm.apps.adm.db import Cliente
-from orgm.apps.adm.cliente.get_client import obtener_cliente
 import typer
 from orgm.stuff.spinner import spinner
 from orgm.apps.adm.cliente.tipos import TipoFactura
@@ -13,30 +11,16 @@ console = Console()
 
 def actualizar_cliente(id_cliente: int, cliente_data: Dict) -> Optional[Cliente]:
     """Actualiza un cliente existente"""
-    # Asegurar que las variables estén inicializadas
-    POSTGREST_URL, headers = initialize()
-
-    import requests
     from orgm.apps.adm.db import Cliente
+    from orgm.apps.adm.backend import actualizar
 
     try:
-        # Verificar que el cliente existe
-        cliente_existente = obtener_cliente(id_cliente)
-        if not cliente_existente:
+        # Sin filas devueltas: no existe un cliente con ese ID
+        filas = actualizar("cliente", {"id": id_cliente}, cliente_data)
+        if not filas:
+            console.print(f"[bold red]Cliente con ID {id_cliente} no encontrado.[/bold red]")
             return None
-
-        update_headers = headers.copy()
-        update_headers["Prefer"] = "return=representation"
-
-        response = requests.patch(
-            f"{POSTGREST_URL}/cliente?id=eq.{id_cliente}",
-            headers=update_headers,
-            json=cliente_data,
-            timeout=10,
-        )
-        response.raise_for_status()
-
-        cliente_actualizado = Cliente.model_validate(response.json()[0])
+        cliente_actualizado = Cliente.model_validate(filas[0])
         console.print(
             f"[bold green]Cliente actualizado correctamente: {cliente_actualizado.nombre}[/bold green]"
         )
@@ -78,12 +62,6 @@ def actualizar(
     ),
 ):
     """Comando para actualizar un cliente existente."""
-    with spinner(f"Verificando cliente {id}..."):
-        cliente_existente = obtener_cliente(id)
-    if not cliente_existente:
-        console.print(f"[bold red]Cliente con ID {id} no encontrado.[/bold red]")
-        return
-
     # Recopilar todos los parámetros no None en un diccionario
     datos_actualizacion = {}
     if nombre is not None:
@@ -120,19 +98,9 @@ def actualizar(
         return
 
     with spinner(f"Actualizando cliente {id}..."):
-        cliente_actualizado_dict = actualizar_cliente(id, datos_actualizacion)
+        cliente_actualizado = actualizar_cliente(id, datos_actualizacion)
 
-    if cliente_actualizado_dict:
+    # actualizar_cliente ya informó si no existe o si hubo un error
+    if cliente_actualizado:
         console.print("[bold green]Cliente actualizado con éxito.[/bold green]")
-        with spinner(f"Obteniendo datos actualizados del cliente {id}..."):
-            cliente_obj = obtener_cliente(id)
-        if cliente_obj:
-            mostrar_tabla_clientes([cliente_obj])
-        else:
-            console.print(
-                "[yellow]No se pudo recuperar el cliente actualizado para mostrarlo.[/yellow]"
-            )
-    else:
-        console.print(
-            "[bold red]Error al actualizar el cliente (la API no devolvió datos).[/bold red]"
-        )
+        mostrar_tabla_clientes([cliente_actualizado])
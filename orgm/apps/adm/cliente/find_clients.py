@@ -8,32 +8,42 @@ from orgm.stuff.spinner import spinner
 console = Console()
 
 
-def buscar_clientes(search_term=None) -> Optional[List[Cliente]]:
+def buscar_clientes(search_term=None, limite: Optional[int] = None) -> Optional[List[Cliente]]:
     """
     Returns the clients that match the search term
-    """
-    # Asegurar que las variables estén inicializadas
-    POSTGREST_URL, headers = initialize()
 
-    import requests
+    Sin `limite` devuelve todas las coincidencias (listado de la CLI); la
+    interfaz gráfica y los selectores pasan un límite.
+    """
     from orgm.apps.adm.db import Cliente
+    from orgm.apps.adm.backend import consultar, nombre_backend
 
-    if not POSTGREST_URL:
-        console.print(
-            "[bold red]No se ha configurado la variable de entorno POSTGREST_URL[/bold red]"
-        )
-        return None
+    if nombre_backend() == "postgrest":
+        # Asegurar que las variables estén inicializadas
+        POSTGREST_URL, headers = initialize()
+        if not POSTGREST_URL:
+            console.print(
+                "[bold red]No se ha configurado la variable de entorno POSTGREST_URL[/bold red]"
+            )
+            return None
 
     search_term = search_term or ""
+    if search_term.strip():
+        # Índice local: sin acentos, tolera errores de escritura y no
+        # consulta el servidor mientras la copia de la tabla esté vigente
+        from orgm.apps.adm.busqueda_local import buscar_local
+
+        clientes_data = buscar_local("cliente", search_term, limite)
+        if clientes_data is not None:
+            return [Cliente.model_validate(cliente) for cliente in clientes_data]
+
     try:
-        response = requests.get(
-            f"{POSTGREST_URL}/cliente?nombre=ilike.*{search_term}*",
-            headers=headers,
-            timeout=10,
-        )
-        response.raise_for_status()
-
-        clientes_data = response.json()
+        if search_term.strip():
+            from orgm.apps.adm.busqueda_local import buscar_servidor
+
+            clientes_data = buscar_servidor("cliente", search_term, limite)
+        else:
+            clientes_data = consultar("cliente", limite=limite)
         clientes = [Cliente.model_validate(cliente) for cliente in clientes_data]
         return clientes
     except Exception as e:
@@ -1,4 +1,3 @@
-from orgm.stuff.initialize_postgrest import initialize
 from rich.console import Console
 from typing import Optional
 from orgm.apps.adm.db import Cliente
@@ -14,19 +13,11 @@ console = Console()
 
 def obtener_cliente(id_cliente: int) -> Optional[Cliente]:
     """Obtiene un cliente por su ID"""
-    # Asegurar que las variables estén inicializadas
-    POSTGREST_URL, headers = initialize()
-
-    import requests
     from orgm.apps.adm.db import Cliente
+    from orgm.apps.adm.backend import consultar
 
     try:
-        response = requests.get(
-            f"{POSTGREST_URL}/cliente?id=eq.{id_cliente}", headers=headers, timeout=10
-        )
-        response.raise_for_status()
-
-        clientes_data = response.json()
+        clientes_data = consultar("cliente", {"id": id_cliente})
         if not clientes_data:
             console.print(
                 f"[yellow]No se encontró el cliente con ID {id_cliente}[/yellow]"
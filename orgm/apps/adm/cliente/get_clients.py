@@ -1,4 +1,3 @@
-from orgm.stuff.initialize_postgrest import initialize
 from rich.console import Console
 from typing import List
 from orgm.apps.adm.db import Cliente
@@ -11,18 +10,12 @@ console = Console()
 
 
 def obtener_clientes() -> List[Cliente]:
-    """Obtiene todos los clientes desde PostgREST"""
-    # Asegurar que las variables estén inicializadas
-    POSTGREST_URL, headers = initialize()
-
-    import requests
+    """Obtiene todos los clientes"""
     from orgm.apps.adm.db import Cliente
+    from orgm.apps.adm.backend import consultar
 
     try:
-        response = requests.get(f"{POSTGREST_URL}/cliente", headers=headers, timeout=10)
-        response.raise_for_status()
-
-        clientes_data = response.json()
+        clientes_data = consultar("cliente")
         clientes = [Cliente.model_validate(cliente) for cliente in clientes_data]
         return clientes
     except Exception as e:
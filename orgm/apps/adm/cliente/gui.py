@@ -7,6 +7,7 @@ from nicegui import ui
 from typing import List, Optional
 from functools import partial
 from orgm.apps.adm.cliente.find_clients import buscar_clientes
+from orgm.apps.adm.busqueda_local import LIMITE_INTERACTIVO
 from orgm.apps.adm.cliente.get_client import obtener_cliente
 from orgm.apps.adm.cliente.edit_client import actualizar_cliente
 from orgm.apps.adm.cliente.new_client import crear_cliente
@@ -78,6 +79,10 @@ class ClienteGUI:
                         .style(f"color: {TEXTO_PRINCIPAL}")
                     )
                     self.barra_busqueda.on("keydown.enter", self.buscar_clientes)
+                    # Búsqueda mientras se escribe (índice local, sin ir al servidor)
+                    self.barra_busqueda.on(
+                        "update:model-value", self.buscar_mientras_escribe, throttle=0.2
+                    )
                     ui.button("Buscar", on_click=self.buscar_clientes).classes(
                         "bg-blue-600"
                     )
@@ -125,12 +130,17 @@ class ClienteGUI:
             cliente = obtener_cliente(cliente_id)
             self.clientes_encontrados = [cliente] if cliente else []
         except ValueError:
-            self.clientes_encontrados = buscar_clientes(termino) or []
+            self.clientes_encontrados = buscar_clientes(termino, LIMITE_INTERACTIVO) or []
         finally:
             spinner.delete()
 
         self.actualizar_lista_clientes()
 
+    async def buscar_mientras_escribe(self):
+        termino = (self.barra_busqueda.value or "").strip()
+        if len(termino) >= 2 and not termino.isdigit():
+            await self.buscar_clientes()
+
     def actualizar_lista_clientes(self):
         self.contenedor_resultados.clear()
 
@@ -1,4 +1,3 @@
-from orgm.stuff.initialize_postgrest import initialize
 from rich.console import Console
 
 console = Console()
@@ -11,18 +10,10 @@ def obtener_id_maximo() -> int:
     Returns:
         int: ID máximo + 1 (siguiente ID disponible).
     """
-    # Asegurar que las variables estén inicializadas
-    POSTGREST_URL, headers = initialize()
-
-    import requests
+    from orgm.apps.adm.backend import siguiente_id
 
     try:
-        response = requests.get(
-            f"{POSTGREST_URL}/cliente?select=id", headers=headers, timeout=10
-        )
-        response.raise_for_status()
-        clientes = response.json()
-        return max(cliente["id"] for cliente in clientes) + 1 if clientes else 1
+        return siguiente_id("cliente")
     except Exception as e:
         console.print(
             f"[bold red]Error al obtener ID máximo de clientes: {e}[/bold red]"
@@ -2,6 +2,7 @@ from rich.console import Console
 import questionary
 import subprocess
 from orgm.apps.adm.cliente.find_clients import buscar_clientes
+from orgm.apps.adm.busqueda_local import completador_busqueda
 from orgm.apps.adm.cliente.get_client import obtener_cliente
 from orgm.apps.adm.cliente.get_clients import obtener_clientes
 from orgm.apps.adm.cliente.edit_client import actualizar_cliente
@@ -44,7 +45,11 @@ def menu():
                 clientes_list = obtener_clientes()
             mostrar_tabla_clientes(clientes_list)
         elif accion == "Buscar clientes":
-            termino = questionary.text("Ingrese término de búsqueda:").ask()
+            termino = questionary.autocomplete(
+                "Ingrese término de búsqueda:",
+                choices=[],
+                completer=completador_busqueda("cliente", "nombre"),
+            ).ask()
             if termino:
                 with spinner(f"Buscando clientes por '{termino}'..."):
                     clientes_list = buscar_clientes(termino)
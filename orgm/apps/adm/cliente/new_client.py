@@ -1,4 +1,3 @@
-from orgm.stuff.initialize_postgrest import initialize
 from rich.console import Console
 from typing import Dict, Optional
 from orgm.apps.adm.db import Cliente
@@ -13,11 +12,8 @@ console = Console()
 
 def crear_cliente(cliente_data: Dict) -> Optional[Cliente]:
     """Crea un nuevo cliente"""
-    # Asegurar que las variables estén inicializadas
-    POSTGREST_URL, headers = initialize()
-
-    import requests
     from orgm.apps.adm.db import Cliente
+    from orgm.apps.adm.backend import insertar
 
     try:
         # Validar datos mínimos requeridos
@@ -31,12 +27,8 @@ def crear_cliente(cliente_data: Dict) -> Optional[Cliente]:
         if "id" not in cliente_data:
             cliente_data["id"] = obtener_id_maximo()
 
-        response = requests.post(
-            f"{POSTGREST_URL}/cliente", headers=headers, json=cliente_data, timeout=10
-        )
-        response.raise_for_status()
-
-        nuevo_cliente = Cliente.model_validate(response.json()[0])
+        fila = insertar("cliente", cliente_data)
+        nuevo_cliente = Cliente.model_validate(fila)
         console.print(
             f"[bold green]Cliente creado correctamente con ID: {nuevo_cliente.id}[/bold green]"
         )
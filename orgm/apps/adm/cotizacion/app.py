@@ -4,6 +4,8 @@ from rich.console import Console
 # Importar la función que define los argumentos y la lógica
 from orgm.apps.adm.cotizacion.get_quotations import listar_cotizaciones
 from orgm.apps.adm.cotizacion.gui import gui
+from orgm.apps.adm.cotizacion.bulk_quotations import importar_cotizaciones, exportar_cotizaciones
+from orgm.apps.adm.cotizacion.find_text import buscar_texto
 
 # Crear consola para salida con Rich
 console = Console()
@@ -19,6 +21,9 @@ app = typer.Typer(help="Comandos para interactuar con datos de cotizaciones")
 # app.command(name="create")(crear_cotizacion)
 # app.command(name="edit")(actualizar_cotizacion)
 # app.command(name="gui")(gui)
+app.command(name="import")(importar_cotizaciones)
+app.command(name="export")(exportar_cotizaciones)
+app.command(name="buscar-texto")(buscar_texto)
 
 
 @app.callback(invoke_without_command=True)
@@ -1,5 +1,4 @@
 from orgm.apps.adm.cotizacion.max_id import obtener_id_maximo
-from orgm.stuff.initialize_postgrest import initialize
 from rich.console import Console
 from typing import Optional
 from orgm.apps.adm.cotizacion.form_quotation import formulario_cotizacion
@@ -7,36 +6,77 @@ from orgm.apps.adm.cotizacion.form_quotation import formulario_cotizacion
 console = Console()
 
 
-def crear_cotizacion(datos: dict) -> Optional[dict]:
+def crear_cotizacion_completa(
+    datos: dict, presupuesto: Optional[dict] = None, notas: Optional[dict] = None
+) -> Optional[dict]:
     """
-    Crea una nueva cotización.
+    Crea una cotización junto con su presupuesto y sus notas en una sola
+    solicitud, mediante la función crear_cotizacion_completa de la base de datos
+    (orgm/apps/adm/sql/0002_crear_cotizacion_completa.sql). Todo se guarda en
+    la misma transacción.
+
+    Si la función no existe en el servidor se crean por separado.
 
     Args:
         datos (dict): Datos de la cotización a crear.
+        presupuesto (dict, opcional): Documento JSONB del presupuesto.
+        notas (dict, opcional): Documento JSONB de las notas.
 
     Returns:
-        Optional[dict]: Cotización creada o None si falla.
+        Optional[dict]: Cotización creada, con las claves "presupuesto" y
+        "notas" con las filas creadas, o None si falla.
     """
-    # Asegurar que las variables estén inicializadas
-    POSTGREST_URL, headers = initialize()
-
     import requests
     from datetime import datetime
+    from orgm.apps.adm.backend import llamar, FuncionNoEncontrada
+
+    # Asegurar que tenga fecha de creación
+    if "fecha_creacion" not in datos:
+        datos["fecha_creacion"] = datetime.now().isoformat()
 
     try:
-        # Asegurar que tenga fecha de creación
-        if "fecha_creacion" not in datos:
-            datos["fecha_creacion"] = datetime.now().isoformat()
+        return llamar(
+            "crear_cotizacion_completa",
+            p_cotizacion=datos,
+            p_presupuesto=presupuesto,
+            p_notas=notas,
+        )
+    except FuncionNoEncontrada:
+        pass
+    except requests.exceptions.HTTPError as e:
+        console.print(f"[bold red]Error en la solicitud HTTP: {e}[/bold red]")
+        return None
+    except requests.exceptions.RequestException as e:
+        console.print(f"[bold red]Error en la conexión: {e}[/bold red]")
+        return None
+    except Exception as e:
+        console.print(f"[bold red]Error inesperado: {e}[/bold red]")
+        return None
+
+    return _crear_por_partes(datos, presupuesto, notas)
+
 
+def _crear_por_partes(
+    datos: dict, presupuesto: Optional[dict], notas: Optional[dict]
+) -> Optional[dict]:
+    """Crea la cotización, el presupuesto y las notas con solicitudes separadas."""
+    import requests
+    from orgm.apps.adm.backend import insertar
+
+    try:
         # Asignar ID si no está definido
         if "id" not in datos:
             datos["id"] = obtener_id_maximo()
 
-        response = requests.post(
-            f"{POSTGREST_URL}/cotizacion", json=datos, headers=headers
-        )
-        response.raise_for_status()
-        return response.json()[0] if response.json() else None
+        nueva = insertar("cotizacion", datos)
+        if not nueva:
+            return None
+
+        for tabla, documento in (("presupuesto", presupuesto), ("notas", notas)):
+            nueva[tabla] = None
+            if documento is not None:
+                nueva[tabla] = insertar(tabla, {"id_cotizacion": nueva["id"], tabla: documento})
+        return nueva
     except requests.exceptions.HTTPError as e:
         console.print(f"[bold red]Error en la solicitud HTTP: {e}[/bold red]")
         return None
@@ -48,6 +88,19 @@ def crear_cotizacion(datos: dict) -> Optional[dict]:
         return None
 
 
+def crear_cotizacion(datos: dict) -> Optional[dict]:
+    """
+    Crea una nueva cotización.
+
+    Args:
+        datos (dict): Datos de la cotización a crear.
+
+    Returns:
+        Optional[dict]: Cotización creada o None si falla.
+    """
+    return crear_cotizacion_completa(datos)
+
+
 def definir_y_crear_cotizacion(cotizacion: Optional[dict] = None) -> dict:
     """Crear una nueva cotización"""
     datos = formulario_cotizacion()
@@ -1,33 +1,30 @@
 from typing import Optional
-import questionary
 from orgm.apps.adm.cliente.find_clients import buscar_clientes
+from orgm.stuff.selector import seleccionar
 from orgm.stuff.spinner import spinner
 
 
-def seleccionar_cliente_por_nombre(termino: str) -> Optional[int]:
-    with spinner(f"Buscando clientes por '{termino}'..."):
-        clientes = buscar_clientes(termino)
-    if not clientes:
-        print("[yellow]No se encontraron clientes[/yellow]")
-        return None
+def _etiqueta_cliente(cliente: dict) -> str:
+    etiqueta = f"{cliente.get('id', '')}: {cliente.get('nombre', '')}"
+    if cliente.get("nombre_comercial"):
+        etiqueta += f" ({cliente['nombre_comercial']})"
+    return etiqueta
 
-    # Manejar tanto diccionarios como objetos
-    opciones = []
-    for c in clientes:
-        if isinstance(c, dict):
-            # Si es un diccionario, usar .get()
-            id_cliente = c.get("id", "")
-            nombre_cliente = c.get("nombre", "")
-        else:
-            # Si es un objeto, usar getattr()
-            id_cliente = getattr(c, "id", "")
-            nombre_cliente = getattr(c, "nombre", "")
 
-        opciones.append(f"{id_cliente}: {nombre_cliente}")
+def seleccionar_cliente_por_nombre(termino: str) -> Optional[int]:
+    """Selector de clientes con filtro mientras se escribe, empezando por `termino`."""
+    from orgm.apps.adm.busqueda_local import LIMITE_SELECTOR, buscador_local
 
-    opciones.append("Cancelar")
-    sel = questionary.select("Seleccione un cliente:", choices=opciones).ask()
-    if sel == "Cancelar":
-        return None
+    with spinner("Cargando clientes..."):
+        buscar = buscador_local("cliente", _etiqueta_cliente)
+    if buscar is None:
+        # Sin copia local: se filtra el resultado de la búsqueda en el servidor
+        with spinner(f"Buscando clientes por '{termino}'..."):
+            clientes = buscar_clientes(termino, LIMITE_SELECTOR)
+        if not clientes:
+            print("[yellow]No se encontraron clientes[/yellow]")
+            return None
+        opciones = [(c.id, _etiqueta_cliente(c.model_dump())) for c in clientes]
+        return seleccionar("Seleccione un cliente:", opciones=opciones)
 
-    return int(sel.split(":")[0])
+    return seleccionar("Seleccione un cliente:", buscar=buscar, texto_inicial=termino or "")
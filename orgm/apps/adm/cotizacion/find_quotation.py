@@ -1,4 +1,3 @@
-from orgm.stuff.initialize_postgrest import initialize
 from rich.console import Console
 from typing import List
 from orgm.apps.adm.cotizacion.find_client import seleccionar_cliente_por_nombre
@@ -24,17 +23,12 @@ def buscar_cotizaciones(termino: str) -> List[dict]:
     Returns:
         List[dict]: Lista de cotizaciones que coinciden con la búsqueda.
     """
-    # Asegurar que las variables estén inicializadas
-    POSTGREST_URL, headers = initialize()
-
     import requests
+    from orgm.apps.adm.backend import consultar
 
     try:
         # Buscar en varios campos
-        query = f"?or=(numero.ilike.*{termino}*,descripcion.ilike.*{termino}*)"
-        response = requests.get(f"{POSTGREST_URL}/cotizacion{query}", headers=headers)
-        response.raise_for_status()
-        return response.json()
+        return consultar("cotizacion", buscar=termino, en=["numero", "descripcion"])
     except requests.exceptions.HTTPError as e:
         console.print(f"[bold red]Error en la solicitud HTTP: {e}[/bold red]")
         return []
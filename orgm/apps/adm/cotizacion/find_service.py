@@ -1,4 +1,3 @@
-from orgm.stuff.initialize_postgrest import initialize
 from rich.console import Console
 from typing import List
 
@@ -15,20 +14,11 @@ def buscar_servicios(termino: str) -> List[dict]:
     Returns:
         List[dict]: Lista de servicios que coinciden con la búsqueda.
     """
-    # Asegurar que las variables estén inicializadas
-    POSTGREST_URL, headers = initialize()
-
     import requests
+    from orgm.apps.adm.backend import consultar
 
     try:
-        # Construir una consulta SQL para búsqueda en texto
-        response = requests.get(
-            f"{POSTGREST_URL}/servicio?or=(concepto.ilike.*{termino}*,descripcion.ilike.*{termino}*)",
-            headers=headers,
-            timeout=10,
-        )
-        response.raise_for_status()
-        return response.json()
+        return consultar("servicio", buscar=termino, en=["concepto", "descripcion"])
     except requests.exceptions.RequestException as e:
         console.print(f"[bold red]Error al buscar servicios: {e}[/bold red]")
         return []
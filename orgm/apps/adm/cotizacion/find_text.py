@@ -0,0 +1,247 @@
+import os
+import re
+import sqlite3
+from typing import List, Optional
+import typer
+from rich.console import Console
+from rich.markup import escape
+from rich.table import Table
+from orgm.stuff.texto import normalizar
+from orgm.stuff.spinner import spinner
+
+console = Console()
+
+# Marcas de las coincidencias en los fragmentos (ver sql/0004_texto_cotizaciones.sql)
+INICIO_MARCA = "«"
+FIN_MARCA = "»"
+
+_MARCA = re.compile(f"{INICIO_MARCA}(.*?){FIN_MARCA}", re.S)
+
+
+def _ruta_indice_local() -> str:
+    from orgm.apps.adm.busqueda_local import RUTA_CACHE_TABLAS
+
+    return os.path.join(RUTA_CACHE_TABLAS, "cotizacion_fts.sqlite")
+
+
+def _raiz(palabra: str) -> str:
+    """Quita el plural, ya que FTS5 no tiene stemmer en español."""
+    if len(palabra) > 5 and palabra.endswith("es"):
+        return palabra[:-2]
+    if len(palabra) > 4 and palabra.endswith("s"):
+        return palabra[:-1]
+    return palabra
+
+
+# Frase entre comillas (con - delante para excluirla) o palabra suelta
+_TOKEN = re.compile(r'(-?)"([^"]*)"?|(\S+)')
+
+
+def _termino_fts5(texto: str, frase: bool) -> str:
+    """Una palabra como prefijo de su raíz, o una frase con las palabras seguidas."""
+    palabras = normalizar(texto).split()
+    if not palabras:
+        return ""
+    if frase or len(palabras) > 1:
+        # "S.R.L." se normaliza como varias palabras: van seguidas
+        return '"' + " ".join(palabras) + '"'
+    return f'"{_raiz(palabras[0])}"*'
+
+
+def _consulta_fts5(texto: str) -> str:
+    """
+    Convierte el texto, con la sintaxis de websearch_to_tsquery() que usa la
+    búsqueda en la base de datos, en una consulta FTS5:
+
+    - palabras: todas deben aparecer, cada una como prefijo de su raíz
+      ("subestaciones" también encuentra "subestación");
+    - "frases entre comillas": las palabras seguidas;
+    - or: uno u otro lado, que son grupos de términos ("a b or c" es
+      "(a y b) o c", como en PostgreSQL);
+    - -palabra o -"frase": excluida.
+
+    FTS5 no tiene un NOT sin operando izquierdo, así que un grupo que solo
+    tiene exclusiones se omite.
+    """
+    grupos = [([], [])]
+    for negado, frase, palabra in _TOKEN.findall(texto or ""):
+        if palabra.lower() == "or":
+            if grupos[-1] != ([], []):
+                grupos.append(([], []))
+            continue
+        if palabra.startswith("-") and len(palabra) > 1:
+            negado, palabra = "-", palabra[1:]
+        termino = _termino_fts5(frase or palabra, frase=not palabra)
+        if termino:
+            grupos[-1][1 if negado else 0].append(termino)
+
+    expresiones = []
+    for incluidos, excluidos in grupos:
+        if not incluidos:
+            continue
+        expresion = " AND ".join(incluidos)
+        for termino in excluidos:
+            expresion = f"({expresion}) NOT {termino}"
+        expresiones.append(f"({expresion})")
+    return " OR ".join(expresiones)
+
+
+def _indice_local(filas: list[dict], version: str) -> sqlite3.Connection:
+    """
+    Base SQLite con un índice FTS5 de las descripciones. Se reconstruye solo
+    cuando cambia la copia local de la tabla de cotizaciones.
+    """
+    ruta = _ruta_indice_local()
+    os.makedirs(os.path.dirname(ruta), exist_ok=True)
+    conexion = sqlite3.connect(ruta)
+    conexion.execute("CREATE TABLE IF NOT EXISTS meta (clave TEXT PRIMARY KEY, valor TEXT)")
+    actual = conexion.execute("SELECT valor FROM meta WHERE clave = 'version'").fetchone()
+    if actual and actual[0] == version:
+        return conexion
+
+    with conexion:
+        conexion.execute("DROP TABLE IF EXISTS cotizacion_fts")
+        conexion.execute(
+            "CREATE VIRTUAL TABLE cotizacion_fts USING fts5(descripcion, tokenize='unicode61 remove_diacritics 2')"
+        )
+        conexion.executemany(
+            "INSERT INTO cotizacion_fts (rowid, descripcion) VALUES (?, ?)",
+            ((fila["id"], fila.get("descripcion") or "") for fila in filas if fila.get("id") is not None),
+        )
+        conexion.execute("INSERT OR REPLACE INTO meta (clave, valor) VALUES ('version', ?)", (version,))
+    return conexion
+
+
+def buscar_texto_local(texto: str, limite: int = 20) -> Optional[List[dict]]:
+    """
+    Búsqueda de texto con SQLite FTS5 sobre la copia local de las
+    cotizaciones (~/.orgm/cache/tablas). Devuelve las mismas columnas que
+    buscar_cotizaciones_texto() en la base de datos.
+
+    Returns:
+        List[dict]: Cotizaciones ordenadas por relevancia (bm25), o None si
+        no hay copia local.
+    """
+    from orgm.apps.adm.busqueda_local import filas_tabla, version_tabla
+
+    filas = filas_tabla("cotizacion")
+    if filas is None:
+        return None
+    consulta = _consulta_fts5(texto)
+    if not consulta:
+        return []
+
+    conexion = _indice_local(filas, version_tabla("cotizacion"))
+    try:
+        encontradas = conexion.execute(
+            f"""
+            SELECT rowid, -bm25(cotizacion_fts),
+                   snippet(cotizacion_fts, 0, '{INICIO_MARCA}', '{FIN_MARCA}', ' … ', 20)
+            FROM cotizacion_fts
+            WHERE cotizacion_fts MATCH ?
+            ORDER BY bm25(cotizacion_fts), rowid DESC
+            LIMIT ?
+            """,
+            (consulta, limite),
+        ).fetchall()
+    finally:
+        conexion.close()
+
+    por_id = {fila.get("id"): fila for fila in filas}
+    clientes = {c.get("id"): c.get("nombre") for c in filas_tabla("cliente") or []}
+    proyectos = {p.get("id"): p.get("nombre_proyecto") for p in filas_tabla("proyecto") or []}
+    resultado = []
+    for id_cotizacion, rango, fragmento in encontradas:
+        fila = por_id.get(id_cotizacion, {})
+        resultado.append(
+            {
+                "id": id_cotizacion,
+                "id_cliente": fila.get("id_cliente"),
+                "id_proyecto": fila.get("id_proyecto"),
+                "cliente": clientes.get(fila.get("id_cliente")),
+                "proyecto": proyectos.get(fila.get("id_proyecto")),
+                "fecha": fila.get("fecha"),
+                "estado": fila.get("estado"),
+                "moneda": fila.get("moneda"),
+                "total": fila.get("total"),
+                "rango": rango,
+                "fragmento": fragmento,
+            }
+        )
+    return resultado
+
+
+def buscar_texto_cotizaciones(texto: str, limite: int = 20, local: bool = False) -> List[dict]:
+    """
+    Búsqueda de texto completo en la descripción de las cotizaciones.
+
+    Usa la función buscar_cotizaciones_texto() de la base de datos (índice
+    GIN sobre un tsvector en español). Si la función no existe todavía o no
+    hay conexión, busca en la copia local con SQLite FTS5.
+
+    Returns:
+        List[dict]: Cotizaciones con rango y fragmento resaltado.
+    """
+    import requests
+    from sqlalchemy.exc import OperationalError
+    from orgm.apps.adm.backend import FuncionNoEncontrada, llamar
+
+    if not local:
+        try:
+            return llamar("buscar_cotizaciones_texto", texto=texto, limite=limite) or []
+        except FuncionNoEncontrada:
+            console.print(
+                "[yellow]La base de datos no tiene la búsqueda de texto (ejecute 'orgm conf migrate'); se busca en la copia local.[/yellow]"
+            )
+        except (requests.exceptions.ConnectionError, OperationalError):
+            console.print("[yellow]Sin conexión con la base de datos; se busca en la copia local.[/yellow]")
+        except Exception as e:
+            console.print(f"[bold red]Error al buscar en las cotizaciones: {e}[/bold red]")
+            return []
+
+    try:
+        resultado = buscar_texto_local(texto, limite)
+    except sqlite3.Error as e:
+        console.print(f"[bold red]Error en la búsqueda local: {e}[/bold red]")
+        return []
+    if resultado is None:
+        console.print("[bold red]No hay copia local de las cotizaciones para buscar[/bold red]")
+        return []
+    return resultado
+
+
+def _resaltar(fragmento: str) -> str:
+    return _MARCA.sub(lambda m: f"[bold yellow]{m.group(1)}[/bold yellow]", escape(fragmento or ""))
+
+
+def buscar_texto(
+    texto: str = typer.Argument(..., help='Texto a buscar; admite "frases", or y -exclusiones'),
+    limite: int = typer.Option(20, "--limite", "-l", help="Máximo de resultados"),
+    local: bool = typer.Option(False, "--local", help="Buscar solo en la copia local (SQLite FTS5)"),
+):
+    """Busca texto en las descripciones de las cotizaciones, ordenado por relevancia."""
+    with spinner(f"Buscando '{texto}' en las cotizaciones..."):
+        resultados = buscar_texto_cotizaciones(texto, limite, local)
+
+    if not resultados:
+        console.print(f"[yellow]No se encontraron cotizaciones con '{texto}'[/yellow]")
+        return
+
+    tabla = Table(title=f"Cotizaciones con '{escape(texto)}'", show_header=True, header_style="bold magenta")
+    tabla.add_column("ID", style="cyan", justify="right")
+    tabla.add_column("Cliente", style="green")
+    tabla.add_column("Proyecto", style="blue")
+    tabla.add_column("Estado")
+    tabla.add_column("Total", justify="right")
+    tabla.add_column("Fragmento", ratio=1)
+    for fila in resultados:
+        total = fila.get("total")
+        tabla.add_row(
+            str(fila.get("id", "")),
+            escape(fila.get("cliente") or ""),
+            escape(fila.get("proyecto") or ""),
+            fila.get("estado") or "",
+            f"{fila.get('moneda') or ''} {total:,.2f}".strip() if isinstance(total, (int, float)) else "",
+            _resaltar(fila.get("fragmento")),
+        )
+    console.print(tabla)
@@ -1,9 +1,19 @@
 from orgm.apps.adm.cotizacion.ask_client import _preguntar_cliente
 from orgm.apps.adm.cotizacion.select_service import seleccionar_servicio
-from orgm.apps.utils.divisa import obtener_tasa_divisa
+from orgm.apps.utils.divisa import obtener_tasa_divisa, validar_fecha
 from orgm.apps.ai.generate import generate_text
 from orgm.stuff.spinner import spinner
 import questionary
+from datetime import date
+
+
+def _fecha_valida(texto: str):
+    """Validación de questionary: vacía o YYYY-MM-DD."""
+    try:
+        validar_fecha(texto, futura=True)
+    except ValueError:
+        return "Ingrese una fecha válida (YYYY-MM-DD)"
+    return True
 
 
 def formulario_cotizacion(cotizacion=None) -> dict:
@@ -79,9 +89,10 @@ def formulario_cotizacion(cotizacion=None) -> dict:
     ).ask()
 
     # Fecha
-    datos["fecha"] = questionary.text(
-        "Fecha (YYYY-MM-DD):", default=defaults["fecha"]
+    fecha = questionary.text(
+        "Fecha (YYYY-MM-DD):", default=str(defaults["fecha"] or ""), validate=_fecha_valida
     ).ask()
+    datos["fecha"] = validar_fecha(fecha, futura=True) if fecha and fecha.strip() else ""
 
     # Tasa de cambio
     metodo_tasa = questionary.select(
@@ -90,8 +101,13 @@ def formulario_cotizacion(cotizacion=None) -> dict:
         default="API",
     ).ask()
     if metodo_tasa == "API":
+        # Se usa la tasa de la fecha de la cotización (la de hoy si es futura);
+        # si ya está en la caché local no se consulta la API
+        fecha_tasa = date.today()
+        if datos["fecha"]:
+            fecha_tasa = min(date.fromisoformat(datos["fecha"]), fecha_tasa)
         with spinner("Obteniendo tasa de cambio USD->RD$..."):
-            tasa = obtener_tasa_divisa("USD", "DOP", 10)
+            tasa = obtener_tasa_divisa("USD", "DOP", 10, fecha=fecha_tasa.isoformat())
         datos["tasa_moneda"] = tasa or 1.0
     else:
         tasa_str = questionary.text(
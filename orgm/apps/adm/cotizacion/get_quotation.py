@@ -1,4 +1,3 @@
-from orgm.stuff.initialize_postgrest import initialize
 from rich.console import Console
 from typing import Optional
 
@@ -15,18 +14,19 @@ def obtener_cotizacion(id_cotizacion: int) -> Optional[dict]:
     Returns:
         Optional[dict]: Datos de la cotización o None si no se encuentra.
     """
-    # Asegurar que las variables estén inicializadas
-    POSTGREST_URL, headers = initialize()
-
     import requests
+    from orgm.apps.adm.backend import consultar
 
     try:
-        query = f"?select=*,cliente(id,nombre),proyecto(id,nombre_proyecto),servicio(id,nombre,descripcion)&id=eq.{id_cotizacion}"
-        response = requests.get(
-            f"{POSTGREST_URL}/cotizacion{query}", headers=headers
+        result = consultar(
+            "cotizacion",
+            {"id": id_cotizacion},
+            incluir={
+                "cliente": ["id", "nombre"],
+                "proyecto": ["id", "nombre_proyecto"],
+                "servicio": ["id", "nombre", "descripcion"],
+            },
         )
-        response.raise_for_status()
-        result = response.json()
         return result[0] if result else None
     except requests.exceptions.HTTPError as e:
         console.print(f"[bold red]Error en la solicitud HTTP: {e}[/bold red]")
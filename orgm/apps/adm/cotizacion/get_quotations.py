@@ -1,4 +1,3 @@
-from orgm.stuff.initialize_postgrest import initialize
 from rich.console import Console
 from typing import List
 from orgm.apps.adm.cotizacion.show_quotations import mostrar_cotizaciones
@@ -13,17 +12,15 @@ def obtener_cotizaciones() -> List[dict]:
     Returns:
         List[dict]: Lista de cotizaciones.
     """
-    # Asegurar que las variables estén inicializadas
-    POSTGREST_URL, headers = initialize()
-
     import requests
+    from orgm.apps.adm.backend import consultar
 
     try:
         # Consulta con selección de campos específicos de cliente y proyecto
-        query = "?select=*,cliente(id,nombre),proyecto(id,nombre_proyecto)"
-        response = requests.get(f"{POSTGREST_URL}/cotizacion{query}", headers=headers)
-        response.raise_for_status()
-        return response.json()
+        return consultar(
+            "cotizacion",
+            incluir={"cliente": ["id", "nombre"], "proyecto": ["id", "nombre_proyecto"]},
+        )
     except requests.exceptions.HTTPError as e:
         console.print(f"[bold red]Error en la solicitud HTTP: {e}[/bold red]")
         return []
@@ -1,4 +1,3 @@
-from orgm.stuff.initialize_postgrest import initialize
 from rich.console import Console
 from typing import Optional
 
@@ -15,17 +14,11 @@ def obtener_servicio(id_servicio: int) -> Optional[dict]:
     Returns:
         Optional[dict]: Datos del servicio o None si no se encuentra.
     """
-    # Asegurar que las variables estén inicializadas
-    POSTGREST_URL, headers = initialize()
-
     import requests
+    from orgm.apps.adm.backend import consultar
 
     try:
-        response = requests.get(
-            f"{POSTGREST_URL}/servicio?id=eq.{id_servicio}", headers=headers, timeout=10
-        )
-        response.raise_for_status()
-        servicios = response.json()
+        servicios = consultar("servicio", {"id": id_servicio})
         return servicios[0] if servicios else None
     except requests.exceptions.RequestException as e:
         console.print(f"[bold red]Error al obtener servicio: {e}[/bold red]")
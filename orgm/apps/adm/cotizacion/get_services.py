@@ -1,4 +1,3 @@
-from orgm.stuff.initialize_postgrest import initialize
 from rich.console import Console
 from typing import List
 
@@ -7,22 +6,16 @@ console = Console()
 
 def obtener_servicios() -> List[dict]:
     """
-    Obtiene la lista de servicios desde PostgREST.
+    Obtiene la lista de servicios.
 
     Returns:
         List[dict]: Lista de servicios en formato dict.
     """
-    # Asegurar que las variables estén inicializadas
-    POSTGREST_URL, headers = initialize()
-
     import requests
+    from orgm.apps.adm.backend import consultar
 
     try:
-        response = requests.get(
-            f"{POSTGREST_URL}/servicio", headers=headers, timeout=10
-        )
-        response.raise_for_status()
-        return response.json()
+        return consultar("servicio")
     except requests.exceptions.RequestException as e:
         console.print(f"[bold red]Error al obtener servicios: {e}[/bold red]")
         return []
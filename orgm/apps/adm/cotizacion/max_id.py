@@ -1,4 +1,3 @@
-from orgm.stuff.initialize_postgrest import initialize
 from rich.console import Console
 
 console = Console()
@@ -11,22 +10,11 @@ def obtener_id_maximo() -> int:
     Returns:
         int: ID máximo + 1 (siguiente ID disponible).
     """
-    # Asegurar que las variables estén inicializadas
-    POSTGREST_URL, headers = initialize()
-
-    import requests
+    from orgm.apps.adm.backend import siguiente_id
 
     try:
-        response = requests.get(
-            f"{POSTGREST_URL}/cotizacion?select=id", headers=headers
-        )
-        response.raise_for_status()
-        cotizaciones = response.json()
-        return (
-            max(cotizacion["id"] for cotizacion in cotizaciones) + 1
-            if cotizaciones
-            else 1
-        )
+        # Solo se pide la fila con el id mayor en lugar de todos los ids
+        return siguiente_id("cotizacion")
     except Exception as e:
         console.print(
             f"[bold red]Error al obtener ID máximo de cotizaciones: {e}[/bold red]"
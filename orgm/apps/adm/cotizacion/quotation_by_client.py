@@ -1,4 +1,3 @@
-from orgm.stuff.initialize_postgrest import initialize
 from rich.console import Console
 from typing import List, Optional
 
@@ -18,26 +17,18 @@ def cotizaciones_por_cliente(
     Returns:
         List[dict]: Lista de cotizaciones del cliente.
     """
-    # Asegurar que las variables estén inicializadas
-    POSTGREST_URL, headers = initialize()
-
     import requests
+    from orgm.apps.adm.backend import consultar
 
     try:
-        # Construir la URL con el ID del cliente
-        select_query = "select=*,cliente(id,nombre),proyecto(id,nombre_proyecto)"
-        url = f"{POSTGREST_URL}/cotizacion?id_cliente=eq.{id_cliente}&{select_query}"
-
-        # Agregar límite si se especifica
-        if limite is not None:
-            url += f"&limit={limite}"
-
-        # Ordenar por fecha de creación descendente
-        url += "&order=fecha.desc"
-
-        response = requests.get(url, headers=headers)
-        response.raise_for_status()
-        return response.json()
+        # Ordenadas por fecha de creación descendente
+        return consultar(
+            "cotizacion",
+            {"id_cliente": id_cliente},
+            incluir={"cliente": ["id", "nombre"], "proyecto": ["id", "nombre_proyecto"]},
+            orden="fecha.desc",
+            limite=limite,
+        )
     except requests.exceptions.HTTPError as e:
         console.print(f"[bold red]Error en la solicitud HTTP: {e}[/bold red]")
         return []
@@ -1,4 +1,4 @@
-from orgm.stuff.initialize_postgrest import initialize
+from orgm.apps.adm.backend import consultar
 from rich.console import Console
 from typing import List, Optional
 from orgm.stuff.spinner import spinner
@@ -20,23 +20,16 @@ def cotizaciones_por_proyecto(
     Returns:
         List[dict]: Lista de cotizaciones del proyecto.
     """
-    # Asegurar que las variables estén inicializadas
-    POSTGREST_URL, headers = initialize()
-
     try:
-        select_query = "select=*,cliente(id,nombre),proyecto(id,nombre_proyecto)"
-        url = f"{POSTGREST_URL}/cotizacion?id_proyecto=eq.{id_proyecto}&{select_query}"
-
-        # Añadir límite si se especifica
-        if limite:
-            url += f"&limit={limite}"
-        # Ordenar por fecha de creación descendente
-        url += "&order=fecha.desc"
-
+        # Ordenadas por fecha de creación descendente
         with spinner(f"Obteniendo cotizaciones del proyecto {id_proyecto}..."):
-            response = requests.get(url, headers=headers)
-        response.raise_for_status()
-        return response.json()
+            return consultar(
+                "cotizacion",
+                {"id_proyecto": id_proyecto},
+                incluir={"cliente": ["id", "nombre"], "proyecto": ["id", "nombre_proyecto"]},
+                orden="fecha.desc",
+                limite=limite or None,
+            )
     except requests.exceptions.HTTPError as e:
         console.print(f"[bold red]Error en la solicitud HTTP: {e}[/bold red]")
         return []
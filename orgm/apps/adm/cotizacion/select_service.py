@@ -1,8 +1,8 @@
 from rich.console import Console
 from typing import Optional
 from orgm.stuff.spinner import spinner
+from orgm.stuff.selector import seleccionar
 from orgm.apps.adm.cotizacion.get_services import obtener_servicios
-import questionary
 
 console = Console()
 
@@ -22,23 +22,13 @@ def seleccionar_servicio(id_default: Optional[int] = None) -> int:
             id_servicio = getattr(s, "id", "")
             nombre_servicio = getattr(s, "nombre", "") or getattr(s, "concepto", "")
 
-        opciones.append(f"{id_servicio}: {nombre_servicio}")
+        opciones.append((id_servicio, f"{id_servicio}: {nombre_servicio}"))
 
     if not opciones:
         return id_default or 0
 
-    if id_default:
-        opciones_default = next(
-            (o for o in opciones if o.startswith(str(id_default))), opciones[0]
-        )
-    else:
-        opciones_default = opciones[0]
-
-    opciones.append("Cancelar")
-    sel = questionary.select(
-        "Seleccione servicio:", choices=opciones, default=opciones_default
-    ).ask()
-    if sel == "Cancelar":
+    sel = seleccionar("Seleccione servicio:", opciones=opciones, defecto=id_default)
+    if sel is None:
         return id_default or 0
 
-    return int(sel.split(":")[0])
+    return int(sel)
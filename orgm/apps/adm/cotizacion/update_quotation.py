@@ -1,4 +1,3 @@
-from orgm.stuff.initialize_postgrest import initialize
 from rich.console import Console
 from typing import Optional
 from orgm.apps.adm.cotizacion.form_quotation import formulario_cotizacion
@@ -18,22 +17,19 @@ def actualizar_cotizacion(id_cotizacion: int, datos: dict) -> bool:
     Returns:
         bool: True si la actualización fue exitosa, False en caso contrario.
     """
-    # Asegurar que las variables estén inicializadas
-    POSTGREST_URL, headers = initialize()
-
     import requests
+    from orgm.apps.adm.backend import actualizar
+
 
     try:
         # Remover id si está en los datos para evitar conflictos
         if "id" in datos:
             del datos["id"]
 
-        response = requests.patch(
-            f"{POSTGREST_URL}/cotizacion?id=eq.{id_cotizacion}",
-            json=datos,
-            headers=headers,
-        )
-        response.raise_for_status()
+        # Sin filas devueltas: no existe una cotización con ese ID
+        if not actualizar("cotizacion", {"id": id_cotizacion}, datos):
+            console.print(f"[bold red]No se encontró la cotización con ID {id_cotizacion}[/bold red]")
+            return False
         return True
     except requests.exceptions.HTTPError as e:
         console.print(f"[bold red]Error en la solicitud HTTP: {e}[/bold red]")
@@ -49,8 +45,8 @@ def actualizar_cotizacion(id_cotizacion: int, datos: dict) -> bool:
 def definir_y_actualizar_cotizacion(
     id_cotizacion: int, cotizacion: Optional[dict] = None
 ) -> dict:
-    """Modificar una cotización existente"""
-    cot = obtener_cotizacion(id_cotizacion)
+    """Modificar una cotización existente (sin volver a leerla si se pasa `cotizacion`)"""
+    cot = cotizacion or obtener_cotizacion(id_cotizacion)
     if not cot:
         console.print(
             f"[bold red]No se encontró la cotización con ID {id_cotizacion}[/bold red]"
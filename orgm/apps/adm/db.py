@@ -35,14 +35,23 @@ def initialize_db():
     if engine is None and all(
         [DATABASE_USER, DATABASE_PASSWORD, DATABASE_HOST, DATABASE_NAME]
     ):
+        # Conexiones reutilizables: se verifica cada conexión antes de usarla
+        # y se renuevan las que llevan más de 30 minutos abiertas
+        opciones = {
+            "pool_pre_ping": True,
+            "pool_size": int(os.getenv("DATABASE_POOL_SIZE", "5")),
+            "max_overflow": int(os.getenv("DATABASE_MAX_OVERFLOW", "10")),
+            "pool_recycle": 1800,
+        }
         try:
             if DATABASE_SEARCH_PATH:
                 engine = create_engine(
                     DATABASE_URL,
                     connect_args={"options": f"-c search_path={DATABASE_SEARCH_PATH}"},
+                    **opciones,
                 )
             else:
-                engine = create_engine(DATABASE_URL)
+                engine = create_engine(DATABASE_URL, **opciones)
         except Exception as e:
             print(f"[bold red]Error al crear el motor de base de datos: {e}[/bold red]")
 
@@ -235,12 +244,14 @@ class Presupuesto(SQLModel, table=True):
     id: Optional[int] = Field(default=None, primary_key=True)
     id_cotizacion: int = Field(foreign_key="cotizacion.id")
     presupuesto: Dict = Field(default={}, sa_type=JSONB)
+    version: int = Field(default=1)
 
 
 class Notas(SQLModel, table=True):
     id: Optional[int] = Field(default=None, primary_key=True)
     id_cotizacion: int = Field(foreign_key="cotizacion.id")
     notas: Dict = Field(default={}, sa_type=JSONB)
+    version: int = Field(default=1)
 
 
 class Factura(SQLModel, table=True):
@@ -396,8 +407,19 @@ class CategoriaPresupuesto(PartidaPresupuesto):
         return result
 
 
+def crear_tablas():
+    """Crea el esquema y las tablas que falten. Lanza la excepción si falla."""
+    if DATABASE_SEARCH_PATH:
+        with engine.connect() as c:
+            c.execute(text(f"CREATE SCHEMA IF NOT EXISTS {DATABASE_SEARCH_PATH}"))
+            c.commit()
+            print(f"Esquema creado: {DATABASE_SEARCH_PATH}")
+    SQLModel.metadata.create_all(engine)
+    print("[bold green]Tablas creadas correctamente[/bold green]")
+
+
 def create_db_schema():
-    """Create database schema if needed"""
+    """Create database schema if needed and apply pending SQL migrations"""
     if engine is None:
         initialize_db()
 
@@ -408,13 +430,13 @@ def create_db_schema():
         return
 
     try:
-        if DATABASE_SEARCH_PATH:
-            with engine.connect() as c:
-                c.execute(text(f"CREATE SCHEMA IF NOT EXISTS {DATABASE_SEARCH_PATH}"))
-                c.commit()
-                print(f"Esquema creado: {DATABASE_SEARCH_PATH}")
-        SQLModel.metadata.create_all(engine)
-        print("[bold green]Tablas creadas correctamente[/bold green]")
+        crear_tablas()
+
+        # Funciones, columnas e índices adicionales definidos en SQL
+        from orgm.apps.adm.migraciones import aplicar_migraciones
+
+        if not aplicar_migraciones(engine):
+            print("La base de datos ya tiene todas las migraciones")
     except Exception as e:
         print(f"[bold red]Error al crear el esquema: {e}[/bold red]")
 
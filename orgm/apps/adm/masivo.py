@@ -0,0 +1,263 @@
+"""
+Importación y exportación masiva de tablas en CSV o JSONL.
+
+Los archivos se leen y escriben fila por fila: la importación envía lotes
+con backend.insertar_varios (un arreglo JSON por lote en PostgREST, COPY con
+PostgreSQL directo) y la exportación recorre la tabla por páginas con
+backend.iterar, sin cargarla completa en memoria.
+
+Con PostgreSQL directo todo el archivo se importa en una sola transacción:
+si algo falla no queda ningún registro. PostgREST confirma cada lote por
+separado; si falla a mitad se indica la línea desde la que continuar
+(--desde) para no duplicar los lotes ya importados.
+"""
+import csv
+import json
+import time
+import typing
+from pathlib import Path
+from typing import Iterator, Optional
+from rich.console import Console
+
+console = Console()
+
+TAMANO_LOTE = 1000
+
+# Columnas generadas por la base de datos (sql/0003_indices_busqueda.sql):
+# aparecen en las exportaciones pero no se pueden insertar
+COLUMNAS_GENERADAS = {"busqueda"}
+
+
+def _formato(ruta: Path, formato: Optional[str]) -> str:
+    formato = (formato or ruta.suffix.lstrip(".")).lower()
+    if formato == "json":
+        formato = "jsonl"
+    if formato not in ("csv", "jsonl"):
+        raise ValueError(f"Formato no soportado: {formato} (use csv o jsonl)")
+    return formato
+
+
+def leer_registros(ruta: Path, formato: Optional[str] = None) -> Iterator[dict]:
+    """Genera los registros de un archivo CSV (con encabezado) o JSONL."""
+    for _, registro in _registros_numerados(ruta, formato):
+        yield registro
+
+
+def _registros_numerados(ruta: Path, formato: Optional[str] = None) -> Iterator[tuple[int, dict]]:
+    """
+    Genera (línea, registro), donde línea es la última línea del archivo que
+    ocupa el registro: un campo CSV entre comillas puede tener saltos de línea.
+    """
+    formato = _formato(ruta, formato)
+    with open(ruta, newline="", encoding="utf-8-sig") as archivo:
+        if formato == "csv":
+            muestra = archivo.read(8192)
+            archivo.seek(0)
+            try:
+                dialecto = csv.Sniffer().sniff(muestra, delimiters=",;\t|")
+            except csv.Error:
+                dialecto = csv.excel
+            lector = csv.DictReader(archivo, dialect=dialecto)
+            for registro in lector:
+                yield lector.line_num, registro
+        else:
+            for numero, linea in enumerate(archivo, start=1):
+                if linea.strip():
+                    yield numero, json.loads(linea)
+
+
+def _tipo_campo(anotacion):
+    """int, float, dict o str a partir de la anotación del modelo."""
+    for tipo in (anotacion, *typing.get_args(anotacion)):
+        if tipo in (int, float, dict, bool):
+            return tipo
+    return str
+
+
+def convertir_registro(modelo, registro: dict) -> dict:
+    """
+    Convierte los textos de un registro CSV a los tipos del modelo de db.py.
+
+    Los campos numéricos vacíos se quitan para que la base de datos use su
+    valor por defecto. Lanza ValueError si un valor no es válido.
+    """
+    resultado = {}
+    for campo, valor in registro.items():
+        if campo is None:
+            raise ValueError("La fila tiene más columnas que el encabezado")
+        campo = campo.strip()
+        if not campo or campo in COLUMNAS_GENERADAS:
+            continue
+        info = modelo.model_fields.get(campo)
+        if info is None or not isinstance(valor, str):
+            resultado[campo] = valor
+            continue
+        tipo = _tipo_campo(info.annotation)
+        if tipo is str:
+            resultado[campo] = valor
+        elif not valor.strip():
+            continue
+        elif tipo is bool:
+            resultado[campo] = valor.strip().lower() in ("1", "true", "t", "si", "sí", "s", "yes")
+        elif tipo is dict:
+            resultado[campo] = json.loads(valor)
+        else:
+            try:
+                resultado[campo] = tipo(valor.strip())
+            except ValueError:
+                raise ValueError(f"{campo}: '{valor}' no es un número válido") from None
+    return resultado
+
+
+def _id_maximo(ruta: Path, formato: Optional[str]) -> int:
+    """Mayor id numérico presente en el archivo (0 si no hay)."""
+    maximo = 0
+    for registro in leer_registros(ruta, formato):
+        valor = registro.get("id")
+        if isinstance(valor, str) and valor.strip().isdigit():
+            valor = int(valor)
+        if isinstance(valor, int):
+            maximo = max(maximo, valor)
+    return maximo
+
+
+class _Detenida(Exception):
+    """Fila inválida sin --ignorar-errores."""
+
+
+def importar_tabla(
+    tabla: str,
+    modelo,
+    ruta: Path,
+    formato: Optional[str] = None,
+    lote: int = TAMANO_LOTE,
+    ignorar_errores: bool = False,
+    desde: int = 0,
+) -> Optional[int]:
+    """
+    Importa un archivo CSV/JSONL a una tabla en lotes.
+
+    A los registros sin id se les asignan ids consecutivos a partir del
+    máximo actual de la tabla y del archivo (una sola consulta para todo el
+    archivo). Con `desde` se omiten los registros que terminan antes de esa
+    línea del archivo, para continuar una importación interrumpida.
+
+    Returns:
+        int: Registros importados, o None si ocurre un error.
+    """
+    import requests
+    from orgm.apps.adm.backend import insertar_varios, siguiente_id, transaccion
+    from orgm.apps.adm.busqueda_local import invalidar_tabla
+
+    inicio = time.perf_counter()
+    siguiente = None
+    importados = 0
+    errores = 0
+    pendientes = []
+    conexion = None
+    # Última línea del archivo cuyo lote ya quedó confirmado
+    confirmada = max(desde - 1, 0)
+
+    try:
+        with transaccion() as conexion:
+            for numero, registro in _registros_numerados(ruta, formato):
+                if numero < desde:
+                    continue
+                try:
+                    registro = convertir_registro(modelo, registro)
+                except (ValueError, json.JSONDecodeError) as e:
+                    errores += 1
+                    console.print(f"[bold red]Línea {numero}: {e}[/bold red]")
+                    if not ignorar_errores:
+                        raise _Detenida from None
+                    continue
+                if registro.get("id") is None:
+                    if siguiente is None:
+                        # No repetir los ids que trae el propio archivo
+                        siguiente = max(siguiente_id(tabla), _id_maximo(ruta, formato) + 1)
+                    registro["id"] = siguiente
+                    siguiente += 1
+                pendientes.append(registro)
+                if len(pendientes) >= lote:
+                    importados += insertar_varios(tabla, pendientes, conexion)
+                    pendientes = []
+                    if conexion is None:
+                        confirmada = numero
+            if pendientes:
+                importados += insertar_varios(tabla, pendientes, conexion)
+    except _Detenida:
+        invalidar_tabla(tabla)
+        _informar_interrupcion(conexion, importados, confirmada)
+        console.print("[yellow]Use --ignorar-errores para omitir las filas con errores.[/yellow]")
+        return None
+    except requests.exceptions.RequestException as e:
+        invalidar_tabla(tabla)
+        detalle = getattr(e.response, "text", "") if getattr(e, "response", None) is not None else ""
+        console.print(f"[bold red]Error al importar {tabla}: {e} {detalle}[/bold red]")
+        _informar_interrupcion(conexion, importados, confirmada)
+        return None
+    except Exception as e:
+        invalidar_tabla(tabla)
+        console.print(f"[bold red]Error al importar {tabla}: {e}[/bold red]")
+        _informar_interrupcion(conexion, importados, confirmada)
+        return None
+
+    invalidar_tabla(tabla)
+
+    console.print(
+        f"[bold green]{importados} registros importados en {tabla} en {time.perf_counter() - inicio:.1f} s[/bold green]"
+        + (f" [yellow]({errores} filas omitidas)[/yellow]" if errores else "")
+    )
+    return importados
+
+
+def _informar_interrupcion(conexion, importados: int, confirmada: int) -> None:
+    """Qué quedó guardado tras un error y desde dónde continuar."""
+    if conexion is not None:
+        console.print("[yellow]Importación revertida: no se guardó ningún registro.[/yellow]")
+        return
+    console.print(f"[yellow]Registros importados antes del error: {importados}[/yellow]")
+    if importados:
+        console.print(
+            f"[yellow]Para continuar sin duplicarlos, repita el comando con --desde {confirmada + 1}[/yellow]"
+        )
+
+
+def _valor_csv(valor):
+    if isinstance(valor, (dict, list)):
+        return json.dumps(valor, ensure_ascii=False)
+    return "" if valor is None else valor
+
+
+def exportar_tabla(tabla: str, ruta: Path, formato: Optional[str] = None, lote: int = TAMANO_LOTE) -> Optional[int]:
+    """
+    Exporta una tabla a CSV o JSONL recorriéndola por páginas.
+
+    Returns:
+        int: Registros exportados, o None si ocurre un error.
+    """
+    from orgm.apps.adm.backend import iterar
+
+    inicio = time.perf_counter()
+    exportados = 0
+    try:
+        formato = _formato(ruta, formato)
+        with open(ruta, "w", newline="", encoding="utf-8") as archivo:
+            escritor = None
+            for fila in iterar(tabla, orden="id", lote=lote):
+                if formato == "jsonl":
+                    archivo.write(json.dumps(fila, ensure_ascii=False, default=str) + "\n")
+                else:
+                    if escritor is None:
+                        escritor = csv.DictWriter(archivo, fieldnames=list(fila), extrasaction="ignore")
+                        escritor.writeheader()
+                    escritor.writerow({c: _valor_csv(v) for c, v in fila.items()})
+                exportados += 1
+    except Exception as e:
+        console.print(f"[bold red]Error al exportar {tabla}: {e}[/bold red]")
+        return None
+
+    console.print(
+        f"[bold green]{exportados} registros de {tabla} exportados a {ruta} en {time.perf_counter() - inicio:.1f} s[/bold green]"
+    )
+    return exportados
@@ -0,0 +1,112 @@
+"""
+Migraciones versionadas de la base de datos.
+
+Cada archivo orgm/apps/adm/sql/NNNN_nombre.sql es una migración. Las
+aplicadas se registran en la tabla orgm_migraciones, por lo que ejecutar las
+migraciones de nuevo solo aplica las pendientes. Cada una corre en su propia
+transacción, bajo un bloqueo consultivo para que dos equipos no la apliquen a
+la vez.
+
+Los scripts se ejecutan sin parámetros a través del driver, por lo que no
+deben contener el carácter de porcentaje.
+"""
+import hashlib
+from pathlib import Path
+from rich.console import Console
+
+console = Console()
+
+CARPETA_SQL = Path(__file__).parent / "sql"
+
+TABLA_MIGRACIONES = "orgm_migraciones"
+
+
+def migraciones_disponibles() -> list[tuple[str, Path]]:
+    """(versión, ruta) de los scripts SQL, en orden."""
+    resultado = []
+    for ruta in sorted(CARPETA_SQL.glob("*.sql")):
+        version = ruta.stem.split("_", 1)[0]
+        resultado.append((version, ruta))
+    return resultado
+
+
+def _suma(ruta: Path) -> str:
+    return hashlib.sha256(ruta.read_bytes()).hexdigest()
+
+
+def _crear_tabla(conexion) -> None:
+    conexion.exec_driver_sql(
+        f"""
+        CREATE TABLE IF NOT EXISTS {TABLA_MIGRACIONES} (
+            version text PRIMARY KEY,
+            nombre text NOT NULL,
+            suma text NOT NULL,
+            aplicada timestamptz NOT NULL DEFAULT now()
+        )
+        """
+    )
+
+
+def migraciones_aplicadas(engine) -> dict:
+    """{versión: suma} de las migraciones registradas."""
+    with engine.begin() as conexion:
+        _crear_tabla(conexion)
+        filas = conexion.exec_driver_sql(f"SELECT version, suma FROM {TABLA_MIGRACIONES}").all()
+    return {version: suma for version, suma in filas}
+
+
+def aplicar_migraciones(engine=None) -> list[str]:
+    """
+    Aplica las migraciones pendientes.
+
+    Returns:
+        list[str]: Nombres de los scripts aplicados. Lanza la excepción de la
+        base de datos si alguno falla (las anteriores quedan aplicadas).
+    """
+    from sqlalchemy import text
+
+    if engine is None:
+        from orgm.apps.adm import db
+
+        if db.engine is None:
+            db.initialize_db()
+        engine = db.engine
+    if engine is None:
+        raise RuntimeError("Motor de base de datos no inicializado")
+
+    aplicadas = migraciones_aplicadas(engine)
+    nuevas = []
+    for version, ruta in migraciones_disponibles():
+        if version in aplicadas:
+            if aplicadas[version] != _suma(ruta):
+                console.print(
+                    f"[yellow]La migración {ruta.name} cambió después de aplicarse; no se vuelve a ejecutar.[/yellow]"
+                )
+            continue
+
+        with engine.begin() as conexion:
+            conexion.execute(text("SELECT pg_advisory_xact_lock(hashtext(:clave))"), {"clave": TABLA_MIGRACIONES})
+            # Otro proceso pudo aplicarla mientras se esperaba el bloqueo
+            ya_aplicada = conexion.execute(
+                text(f"SELECT 1 FROM {TABLA_MIGRACIONES} WHERE version = :version"), {"version": version}
+            ).first()
+            if ya_aplicada:
+                continue
+            conexion.exec_driver_sql(ruta.read_text(encoding="utf-8"))
+            conexion.execute(
+                text(f"INSERT INTO {TABLA_MIGRACIONES} (version, nombre, suma) VALUES (:version, :nombre, :suma)"),
+                {"version": version, "nombre": ruta.name, "suma": _suma(ruta)},
+            )
+        console.print(f"Script aplicado: {ruta.name}")
+        nuevas.append(ruta.name)
+    return nuevas
+
+
+def estado_migraciones(engine) -> list[tuple[str, bool]]:
+    """(nombre, aplicada) de cada migración disponible."""
+    aplicadas = migraciones_aplicadas(engine)
+    return [(ruta.name, version in aplicadas) for version, ruta in migraciones_disponibles()]
+
+
+if __name__ == "__main__":
+    aplicar_migraciones()
@@ -0,0 +1,25 @@
+import typer
+from rich.console import Console
+
+from orgm.apps.adm.presupuesto.apu import recalcular_precios
+from orgm.apps.adm.presupuesto.importar import importar_presupuesto
+
+console = Console()
+
+app = typer.Typer(help="Comandos para trabajar con presupuestos")
+
+app.command(name="import")(importar_presupuesto)
+app.command(name="precios")(recalcular_precios)
+
+
+@app.callback(invoke_without_command=True)
+def presupuesto_callback(ctx: typer.Context):
+    """
+    Operaciones con presupuestos. Si no se especifica un subcomando, muestra la ayuda.
+    """
+    if ctx.invoked_subcommand is None:
+        console.print(ctx.get_help())
+
+
+if __name__ == "__main__":
+    app()
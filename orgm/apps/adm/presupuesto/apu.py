@@ -0,0 +1,351 @@
+"""
+Análisis de precios unitarios (APU) sobre los catálogos de db.py.
+
+Cada registro de Material, Servicios, ManoDeObra, Indirectos, Herramientas
+y Equipos guarda sus datos de costo en el campo JSONB `descripcion`:
+
+    {"precio": 350.0}                       costo por unidad
+    {"componentes": [...]}                  costo compuesto por otros registros
+    {"porcentaje": 5}                       porcentaje del costo directo
+
+Una partida del presupuesto indica su composición con la clave "apu", que
+MotorPresupuesto conserva al leer y escribir el JSONB:
+
+    {"id": "a1b2c3", "item": "P-1", ..., "apu": [
+        {"tabla": "material", "id": 12, "cantidad": 1.05},
+        {"tabla": "manodeobra", "id": 3, "cantidad": 0.25},
+        {"tabla": "herramientas", "id": 1, "porcentaje": 5}
+    ]}
+"""
+from collections import defaultdict
+import typer
+from rich.console import Console
+from rich.table import Table
+from typing import List
+
+from orgm.apps.adm.presupuesto.motor import MotorPresupuesto
+
+console = Console()
+
+# Tablas de PostgREST que forman los catálogos del APU
+TABLAS_CATALOGO = ("material", "servicios", "manodeobra", "indirectos", "herramientas", "equipos")
+
+
+class MotorAPU:
+    """
+    Calcula el precio unitario de las partidas a partir de los catálogos.
+
+    Los costos unitarios se memorizan y se lleva un grafo de dependencias
+    (registro -> registros compuestos y partidas que lo usan), de modo que
+    un cambio de precio solo recalcula lo afectado, en todos los
+    presupuestos registrados.
+    """
+
+    def __init__(self, catalogos: dict | None = None):
+        # tabla -> {id: registro}
+        self.catalogos = {tabla: {} for tabla in TABLAS_CATALOGO}
+        self.presupuestos = {}
+        self._costos = {}
+        self._calculando = set()
+        # (tabla, id) -> registros compuestos que lo usan
+        self._dependientes = defaultdict(set)
+        # (tabla, id) -> {(clave del presupuesto, posición de la partida)}
+        self._partidas = defaultdict(set)
+        for tabla, registros in (catalogos or {}).items():
+            self.agregar_catalogo(tabla, registros)
+
+    # ------------------------------------------------------------------
+    # Catálogos
+    # ------------------------------------------------------------------
+
+    def agregar_catalogo(self, tabla: str, registros) -> None:
+        """Agrega registros (lista o dict por id) a un catálogo."""
+        tabla = tabla.lower()
+        if isinstance(registros, dict):
+            registros = registros.values()
+        destino = self.catalogos.setdefault(tabla, {})
+        for registro in registros:
+            destino[registro["id"]] = registro
+            for componente in self._datos(registro).get("componentes", []):
+                self._dependientes[self._clave(componente)].add((tabla, registro["id"]))
+        self._costos.clear()
+
+    @staticmethod
+    def _clave(componente: dict) -> tuple:
+        return componente["tabla"].lower(), componente["id"]
+
+    @staticmethod
+    def _datos(registro: dict) -> dict:
+        return registro.get("descripcion") or {}
+
+    def registro(self, tabla: str, id_registro) -> dict:
+        try:
+            return self.catalogos[tabla.lower()][id_registro]
+        except KeyError:
+            raise KeyError(f"No existe el registro {id_registro} en el catálogo {tabla}") from None
+
+    # ------------------------------------------------------------------
+    # Costos
+    # ------------------------------------------------------------------
+
+    def costo_unitario(self, tabla: str, id_registro) -> float:
+        """Costo por unidad de un registro del catálogo (memorizado)."""
+        clave = (tabla.lower(), id_registro)
+        if clave in self._costos:
+            return self._costos[clave]
+        if clave in self._calculando:
+            raise ValueError(f"Composición circular en {tabla} {id_registro}")
+
+        datos = self._datos(self.registro(*clave))
+        self._calculando.add(clave)
+        try:
+            if datos.get("componentes"):
+                costo = self.costo_composicion(datos["componentes"])
+            else:
+                costo = float(datos.get("precio") or 0)
+        finally:
+            self._calculando.discard(clave)
+
+        self._costos[clave] = costo
+        return costo
+
+    def costo_composicion(self, componentes: list) -> float:
+        """
+        Costo de una composición: suma de cantidad x costo unitario, más los
+        componentes por porcentaje aplicados sobre ese costo directo.
+        """
+        directo = 0.0
+        porcentajes = 0.0
+        for componente in componentes:
+            clave = self._clave(componente)
+            porcentaje = componente.get("porcentaje", self._datos(self.registro(*clave)).get("porcentaje"))
+            if porcentaje is not None:
+                porcentajes += float(porcentaje)
+            else:
+                directo += float(componente.get("cantidad", 1)) * self.costo_unitario(*clave)
+        return directo * (1 + porcentajes / 100)
+
+    def precio_partida(self, componentes: list) -> float:
+        return round(self.costo_composicion(componentes), 2)
+
+    # ------------------------------------------------------------------
+    # Presupuestos
+    # ------------------------------------------------------------------
+
+    def registrar_presupuesto(self, clave, presupuesto) -> MotorPresupuesto:
+        """
+        Registra un presupuesto (MotorPresupuesto o su JSONB) y actualiza el
+        precio de las partidas que tienen composición "apu".
+        """
+        motor = presupuesto if isinstance(presupuesto, MotorPresupuesto) else MotorPresupuesto.from_dict(presupuesto)
+        self.quitar_presupuesto(clave)
+        self.presupuestos[clave] = motor
+        indices, precios = [], []
+        for i, extras in enumerate(motor.extras):
+            componentes = extras.get("apu")
+            if not componentes or motor.tiene_hijos[i]:
+                continue
+            for componente in componentes:
+                self._partidas[self._clave(componente)].add((clave, i))
+            precio = self.precio_partida(componentes)
+            if precio != motor.precio[i]:
+                indices.append(i)
+                precios.append(precio)
+        if indices:
+            motor.asignar_precios(indices, precios)
+        return motor
+
+    def quitar_presupuesto(self, clave) -> None:
+        if self.presupuestos.pop(clave, None) is None:
+            return
+        for partidas in self._partidas.values():
+            partidas.difference_update({p for p in partidas if p[0] == clave})
+
+    def afectados(self, claves) -> set:
+        """Registros compuestos que dependen, directa o indirectamente, de `claves`."""
+        resultado = set()
+        pendientes = list(claves)
+        while pendientes:
+            clave = pendientes.pop()
+            if clave in resultado:
+                continue
+            resultado.add(clave)
+            pendientes.extend(self._dependientes.get(clave, ()))
+        return resultado
+
+    def actualizar_precios(self, cambios: dict) -> dict:
+        """
+        Cambia el precio de uno o varios registros y recalcula solo las
+        partidas afectadas en los presupuestos registrados.
+
+        Args:
+            cambios: {(tabla, id): nuevo precio}
+
+        Returns:
+            dict: Partidas recalculadas por clave de presupuesto.
+        """
+        claves = set()
+        for (tabla, id_registro), precio in cambios.items():
+            clave = (tabla.lower(), id_registro)
+            registro = self.registro(*clave)
+            registro["descripcion"] = {**self._datos(registro), "precio": precio}
+            claves.add(clave)
+
+        afectados = self.afectados(claves)
+        for clave in afectados:
+            self._costos.pop(clave, None)
+
+        partidas = set()
+        for clave in afectados:
+            partidas.update(self._partidas.get(clave, ()))
+
+        nuevos = defaultdict(dict)
+        for clave_presupuesto, i in partidas:
+            motor = self.presupuestos[clave_presupuesto]
+            precio = self.precio_partida(motor.extras[i]["apu"])
+            if precio != motor.precio[i]:
+                nuevos[clave_presupuesto][i] = precio
+
+        for clave_presupuesto, precios in nuevos.items():
+            motor = self.presupuestos[clave_presupuesto]
+            # Pocas partidas: se propaga la diferencia; muchas: un recálculo completo
+            if len(precios) * (int(motor.profundidad.max(initial=0)) + 1) < len(motor):
+                for i, precio in precios.items():
+                    motor.actualizar(i, precio=precio)
+            else:
+                motor.asignar_precios(list(precios), list(precios.values()))
+        return {clave: len(precios) for clave, precios in nuevos.items()}
+
+
+def cargar_catalogos(tablas=TABLAS_CATALOGO) -> dict:
+    """Descarga los catálogos del APU desde PostgREST."""
+    from orgm.stuff.initialize_postgrest import initialize
+    from orgm.stuff.http import obtener_sesion, TIMEOUT
+
+    POSTGREST_URL, headers = initialize()
+    sesion = obtener_sesion()
+    catalogos = {}
+    for tabla in tablas:
+        response = sesion.get(
+            f"{POSTGREST_URL}/{tabla}?select=id,nombre,descripcion,unidad",
+            headers=headers,
+            timeout=TIMEOUT,
+        )
+        response.raise_for_status()
+        catalogos[tabla] = response.json()
+    return catalogos
+
+
+def recalcular_presupuestos(cambios: dict, guardar: bool = True) -> tuple[dict, list] | None:
+    """
+    Aplica cambios de precio de los catálogos a todos los presupuestos.
+
+    Descarga catálogos y presupuestos, recalcula solo las partidas que usan
+    los registros modificados y, si `guardar` es True, guarda los registros
+    del catálogo y los cambios de los presupuestos afectados.
+
+    Args:
+        cambios: {(tabla, id): nuevo precio}
+
+    Returns:
+        tuple: (partidas recalculadas por id de presupuesto guardado, ids de
+        los presupuestos que no se pudieron guardar porque otro usuario los
+        modificó), o None si hay error. Volver a ejecutar con los mismos
+        cambios recalcula los presupuestos pendientes.
+    """
+    import requests
+    from orgm.stuff.initialize_postgrest import initialize
+    from orgm.stuff.http import obtener_sesion, TIMEOUT
+    from orgm.apps.adm.presupuesto.cambios import guardar_documento
+
+    POSTGREST_URL, headers = initialize()
+    sesion = obtener_sesion()
+
+    try:
+        motor_apu = MotorAPU(cargar_catalogos())
+        response = sesion.get(f"{POSTGREST_URL}/presupuesto", headers=headers, timeout=TIMEOUT)
+        response.raise_for_status()
+        originales = {}
+        for fila in response.json():
+            if fila.get("presupuesto"):
+                originales[fila["id"]] = (fila["presupuesto"], fila.get("version"))
+                motor_apu.registrar_presupuesto(fila["id"], fila["presupuesto"])
+
+        resumen = motor_apu.actualizar_precios(cambios)
+        if not guardar:
+            return resumen, []
+
+        for tabla, id_registro in cambios:
+            registro = motor_apu.registro(tabla, id_registro)
+            sesion.patch(
+                f"{POSTGREST_URL}/{tabla.lower()}?id=eq.{id_registro}",
+                json={"descripcion": registro["descripcion"]},
+                headers=headers,
+                timeout=TIMEOUT,
+            ).raise_for_status()
+
+        guardados = {}
+        conflictos = []
+        for id_presupuesto, partidas in resumen.items():
+            original, version = originales[id_presupuesto]
+            resultado = guardar_documento(
+                "presupuesto",
+                id_presupuesto,
+                original,
+                motor_apu.presupuestos[id_presupuesto].to_dict(),
+                version,
+            )
+            if resultado is None:
+                conflictos.append(id_presupuesto)
+            else:
+                guardados[id_presupuesto] = partidas
+        return guardados, conflictos
+    except requests.exceptions.RequestException as e:
+        console.print(f"[bold red]Error al recalcular presupuestos: {e}[/bold red]")
+        return None
+    except (KeyError, ValueError) as e:
+        console.print(f"[bold red]Error en la composición del APU: {e}[/bold red]")
+        return None
+
+
+def _leer_cambio(texto: str) -> tuple[tuple[str, int], float]:
+    """Convierte "tabla:id=precio" en ((tabla, id), precio)."""
+    try:
+        registro, precio = texto.split("=", 1)
+        tabla, id_registro = registro.split(":", 1)
+        tabla = tabla.strip().lower()
+        if tabla not in TABLAS_CATALOGO:
+            raise ValueError
+        return (tabla, int(id_registro)), float(precio)
+    except ValueError:
+        raise typer.BadParameter(
+            f"'{texto}' no tiene el formato tabla:id=precio (tablas: {', '.join(TABLAS_CATALOGO)})"
+        ) from None
+
+
+def recalcular_precios(
+    cambios: List[str] = typer.Argument(..., help="Precios nuevos como tabla:id=precio, por ejemplo material:12=350"),
+    simular: bool = typer.Option(False, "--simular", help="Muestra los presupuestos afectados sin guardar nada"),
+):
+    """Cambia precios de los catálogos del APU y recalcula los presupuestos que los usan."""
+    resultado = recalcular_presupuestos(dict(_leer_cambio(c) for c in cambios), guardar=not simular)
+    if resultado is None:
+        raise typer.Exit(code=1)
+    resumen, conflictos = resultado
+
+    if resumen:
+        tabla = Table(title="Presupuestos recalculados" if not simular else "Presupuestos afectados")
+        tabla.add_column("Presupuesto", style="cyan")
+        tabla.add_column("Partidas", justify="right")
+        for id_presupuesto, partidas in sorted(resumen.items()):
+            tabla.add_row(str(id_presupuesto), f"{partidas:,}")
+        console.print(tabla)
+    elif not conflictos:
+        console.print("Ningún presupuesto usa los registros modificados")
+
+    if conflictos:
+        console.print(
+            f"[bold red]No se guardaron los presupuestos {', '.join(map(str, sorted(conflictos)))} porque otro usuario "
+            "los modificó. Vuelva a ejecutar el comando para recalcularlos.[/bold red]"
+        )
+        raise typer.Exit(code=1)
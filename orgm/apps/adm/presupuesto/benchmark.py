@@ -0,0 +1,156 @@
+"""
+Mide el costo de editar una partida en presupuestos sintéticos.
+
+Compara el recálculo completo de CategoriaPresupuesto.get_total() contra
+MotorPresupuesto.calcular_totales() y la propagación de la diferencia con
+MotorPresupuesto.actualizar().
+
+Uso:
+    python -m orgm.apps.adm.presupuesto.benchmark 1000 10000 100000
+"""
+import copy
+import random
+import sys
+import time
+from rich.console import Console
+from rich.table import Table
+
+from orgm.apps.adm.presupuesto.motor import MotorPresupuesto
+
+console = Console()
+
+
+def arbol_sintetico(partidas: int, ramas: int = 8, semilla: int = 0) -> dict:
+    """
+    Genera un presupuesto con el formato JSONB de CategoriaPresupuesto.
+
+    Las categorías tienen hasta `ramas` hijos y las hojas son partidas con
+    cantidades y precios aleatorios en RD$ y USD$.
+    """
+    azar = random.Random(semilla)
+    contador = {"partida": 0, "categoria": 0}
+
+    def partida():
+        contador["partida"] += 1
+        return {
+            "id": f"p{contador['partida']}",
+            "item": f"P-{contador['partida']}",
+            "descripcion": f"Partida {contador['partida']}",
+            "cantidad": azar.choice([1, 2, 5, 10, 2.5, 12.75]),
+            "unidad": azar.choice(["Ud.", "m", "m2", "m3", "kg"]),
+            "moneda": azar.choice(["RD$", "RD$", "USD$"]),
+            "precio": round(azar.uniform(1, 5000), 2),
+            "total": 0.0,
+        }
+
+    def categoria(hijos):
+        contador["categoria"] += 1
+        return {
+            "id": f"c{contador['categoria']}",
+            "item": f"I-{contador['categoria']}",
+            "descripcion": f"Categoria {contador['categoria']}",
+            "cantidad": 1,
+            "unidad": "Ud.",
+            "moneda": "RD$",
+            "precio": 0.0,
+            "total": 0.0,
+            "categoria": "cat1",
+            "children": hijos,
+        }
+
+    # Se agrupan las partidas de abajo arriba hasta que queda una sola raíz
+    nivel = [partida() for _ in range(partidas)]
+    while len(nivel) > 1:
+        agrupado = []
+        i = 0
+        while i < len(nivel):
+            tamano = azar.randint(max(2, ramas // 2), ramas)
+            agrupado.append(categoria(nivel[i:i + tamano]))
+            i += tamano
+        nivel = agrupado
+    return nivel[0] if nivel and "children" in nivel[0] else categoria(nivel)
+
+
+def _medir(funcion, repeticiones: int) -> float:
+    """Tiempo promedio en milisegundos."""
+    inicio = time.perf_counter()
+    for _ in range(repeticiones):
+        funcion()
+    return (time.perf_counter() - inicio) * 1000 / repeticiones
+
+
+def medir(partidas: int, ediciones: int = 200, semilla: int = 0) -> dict:
+    """Mide una edición de partida con cada estrategia sobre un árbol sintético."""
+    from orgm.apps.adm.db import CategoriaPresupuesto
+
+    datos = arbol_sintetico(partidas, semilla=semilla)
+    arbol = CategoriaPresupuesto.from_dict(copy.deepcopy(datos))
+    motor = MotorPresupuesto.from_dict(datos)
+    motor.calcular_totales()
+
+    azar = random.Random(semilla)
+    hojas = [i for i in range(len(motor)) if not motor.es_categoria[i]]
+
+    # Recorrer el árbol hasta una partida al azar cuesta más que la edición misma,
+    # por lo que se escoge fuera de la medición.
+    partidas_arbol = []
+    pila = [arbol]
+    while pila:
+        nodo = pila.pop()
+        hijos = getattr(nodo, "children", None)
+        if hijos:
+            pila.extend(hijos)
+        else:
+            partidas_arbol.append(nodo)
+
+    def editar_arbol():
+        partida = azar.choice(partidas_arbol)
+        partida.cantidad = azar.randint(1, 100)
+        arbol.get_total()
+
+    def editar_motor_completo():
+        i = azar.choice(hojas)
+        motor.cantidad[i] = azar.randint(1, 100)
+        motor.calcular_totales(forzar=True)
+
+    def editar_motor_incremental():
+        motor.actualizar(azar.choice(hojas), cantidad=azar.randint(1, 100))
+
+    repeticiones_completas = max(1, min(ediciones, 2_000_000 // max(partidas, 1)))
+    resultado = {
+        "partidas": partidas,
+        "nodos": len(motor),
+        "profundidad": int(motor.profundidad.max(initial=0)) + 1,
+        "arbol_ms": _medir(editar_arbol, repeticiones_completas),
+        "motor_completo_ms": _medir(editar_motor_completo, repeticiones_completas),
+        "motor_incremental_ms": _medir(editar_motor_incremental, ediciones),
+    }
+
+    # La propagación incremental debe dar el mismo total que el recálculo completo
+    incremental = motor.total_general
+    motor.calcular_totales(forzar=True)
+    resultado["desviacion"] = abs(incremental - motor.total_general)
+    return resultado
+
+
+def main(tamanos: list[int]) -> None:
+    tabla = Table(title="Edición de una partida")
+    for columna in ("Partidas", "Nodos", "Niveles", "get_total() ms", "Motor completo ms", "Motor incremental ms", "Desviación"):
+        tabla.add_column(columna, justify="right")
+
+    for partidas in tamanos:
+        r = medir(partidas)
+        tabla.add_row(
+            f"{r['partidas']:,}",
+            f"{r['nodos']:,}",
+            str(r["profundidad"]),
+            f"{r['arbol_ms']:.3f}",
+            f"{r['motor_completo_ms']:.3f}",
+            f"{r['motor_incremental_ms']:.4f}",
+            f"{r['desviacion']:.2e}",
+        )
+    console.print(tabla)
+
+
+if __name__ == "__main__":
+    main([int(n) for n in sys.argv[1:]] or [1_000, 10_000, 100_000])
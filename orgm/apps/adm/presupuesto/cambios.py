@@ -0,0 +1,235 @@
+"""
+Guardado por diferencias de los documentos JSONB de presupuesto y notas.
+
+Se calcula un parche JSON (RFC 6902) entre el documento cargado y el
+editado y se envía a las funciones aplicar_parche_presupuesto /
+aplicar_parche_notas de PostgREST (orgm/apps/adm/sql/0001_parches_jsonb.sql).
+La columna `version` evita sobrescribir los cambios de otro usuario: si la
+versión no coincide el servidor responde 409 y no se guarda nada.
+
+Si la función no existe en el servidor se envía el documento completo,
+filtrando por la versión cuando la tabla la tiene.
+"""
+import copy
+from rich.console import Console
+
+console = Console()
+
+# Columna JSONB de cada tabla
+CAMPOS_DOCUMENTO = {"presupuesto": "presupuesto", "notas": "notas"}
+
+
+def _escapar(clave) -> str:
+    return str(clave).replace("~", "~0").replace("/", "~1")
+
+
+def diferencia(original, editado, ruta: str = "") -> list[dict]:
+    """
+    Devuelve las operaciones add/remove/replace que convierten `original`
+    en `editado`.
+
+    En las listas se conservan los elementos iguales del principio y del
+    final y solo se comparan, agregan o eliminan los del medio.
+    """
+    if type(original) is not type(editado):
+        return [{"op": "replace", "path": ruta, "value": editado}]
+
+    if isinstance(original, dict):
+        operaciones = []
+        for clave in original:
+            if clave not in editado:
+                operaciones.append({"op": "remove", "path": f"{ruta}/{_escapar(clave)}"})
+        for clave, valor in editado.items():
+            if clave not in original:
+                operaciones.append({"op": "add", "path": f"{ruta}/{_escapar(clave)}", "value": valor})
+            elif original[clave] != valor:
+                operaciones.extend(diferencia(original[clave], valor, f"{ruta}/{_escapar(clave)}"))
+        return operaciones
+
+    if isinstance(original, list):
+        inicio = 0
+        limite = min(len(original), len(editado))
+        while inicio < limite and original[inicio] == editado[inicio]:
+            inicio += 1
+        fin_original, fin_editado = len(original), len(editado)
+        while fin_original > inicio and fin_editado > inicio and original[fin_original - 1] == editado[fin_editado - 1]:
+            fin_original -= 1
+            fin_editado -= 1
+
+        operaciones = []
+        comunes = min(fin_original, fin_editado) - inicio
+        for i in range(inicio, inicio + comunes):
+            operaciones.extend(diferencia(original[i], editado[i], f"{ruta}/{i}"))
+        # Se eliminan de atrás hacia adelante para no mover los índices pendientes
+        for i in range(fin_original - 1, inicio + comunes - 1, -1):
+            operaciones.append({"op": "remove", "path": f"{ruta}/{i}"})
+        for i in range(inicio + comunes, fin_editado):
+            operaciones.append({"op": "add", "path": f"{ruta}/{i}", "value": editado[i]})
+        return operaciones
+
+    if original != editado:
+        return [{"op": "replace", "path": ruta, "value": editado}]
+    return []
+
+
+def aplicar(documento, parche: list[dict]):
+    """Aplica un parche JSON a una copia del documento y la devuelve."""
+    documento = copy.deepcopy(documento)
+    for operacion in parche:
+        partes = [p.replace("~1", "/").replace("~0", "~") for p in operacion["path"].split("/")[1:]]
+        if not partes:
+            if operacion["op"] == "remove":
+                raise ValueError("No se puede eliminar la raíz del documento")
+            documento = copy.deepcopy(operacion["value"])
+            continue
+
+        contenedor = documento
+        for parte in partes[:-1]:
+            contenedor = contenedor[int(parte)] if isinstance(contenedor, list) else contenedor[parte]
+        clave = partes[-1]
+
+        if isinstance(contenedor, list):
+            indice = len(contenedor) if clave == "-" else int(clave)
+            if operacion["op"] == "add":
+                contenedor.insert(indice, copy.deepcopy(operacion["value"]))
+            elif operacion["op"] == "remove":
+                del contenedor[indice]
+            elif operacion["op"] == "replace":
+                contenedor[indice] = copy.deepcopy(operacion["value"])
+            else:
+                raise ValueError(f"Operación no soportada: {operacion['op']}")
+        else:
+            if operacion["op"] in ("add", "replace"):
+                if operacion["op"] == "replace" and clave not in contenedor:
+                    raise KeyError(f"Ruta inexistente: {operacion['path']}")
+                contenedor[clave] = copy.deepcopy(operacion["value"])
+            elif operacion["op"] == "remove":
+                del contenedor[clave]
+            else:
+                raise ValueError(f"Operación no soportada: {operacion['op']}")
+    return documento
+
+
+def guardar_documento(tabla: str, id_fila: int, original, editado, version: int | None = None):
+    """
+    Guarda un documento JSONB enviando solo sus diferencias.
+
+    Args:
+        tabla: "presupuesto" o "notas".
+        id_fila: id de la fila.
+        original: Documento tal como se cargó.
+        editado: Documento modificado.
+        version: Versión de la fila al cargarla (None si la tabla aún no
+            tiene la columna version).
+
+    Returns:
+        La nueva versión (o True si la tabla no tiene versión), o None si
+        otro usuario modificó el documento o si ocurre un error.
+    """
+    import requests
+    from orgm.stuff.initialize_postgrest import initialize
+    from orgm.stuff.http import obtener_sesion, TIMEOUT
+
+    campo = CAMPOS_DOCUMENTO[tabla]
+    parche = diferencia(original, editado)
+    if not parche:
+        return version if version is not None else True
+
+    POSTGREST_URL, headers = initialize()
+    sesion = obtener_sesion()
+
+    try:
+        if version is not None:
+            response = sesion.post(
+                f"{POSTGREST_URL}/rpc/aplicar_parche_{tabla}",
+                json={"p_id": id_fila, "p_version": version, "p_parche": parche},
+                headers=headers,
+                timeout=TIMEOUT,
+            )
+            if response.status_code == 409:
+                console.print(
+                    f"[bold red]El documento {tabla} {id_fila} fue modificado por otro usuario. Vuelva a cargarlo antes de guardar.[/bold red]"
+                )
+                return None
+            # 404: la función no existe en el servidor, se envía el documento completo
+            if response.status_code != 404:
+                response.raise_for_status()
+                filas = response.json()
+                return filas[0]["version"] if filas else version + 1
+
+        filtro = f"id=eq.{id_fila}" + (f"&version=eq.{version}" if version is not None else "")
+        response = sesion.patch(
+            f"{POSTGREST_URL}/{tabla}?{filtro}&select=id",
+            json={campo: editado, **({"version": version + 1} if version is not None else {})},
+            headers=headers,
+            timeout=TIMEOUT,
+        )
+        response.raise_for_status()
+        if version is None:
+            return True
+        if not response.json():
+            # Ninguna fila tenía esa versión
+            console.print(
+                f"[bold red]El documento {tabla} {id_fila} fue modificado por otro usuario. Vuelva a cargarlo antes de guardar.[/bold red]"
+            )
+            return None
+        return version + 1
+    except requests.exceptions.RequestException as e:
+        console.print(f"[bold red]Error al guardar {tabla} {id_fila}: {e}[/bold red]")
+        return None
+
+
+class DocumentoRastreado:
+    """
+    Documento JSONB cargado desde PostgREST que recuerda su estado original
+    para guardar solo los cambios.
+
+    Ejemplo de uso::
+
+        doc = DocumentoRastreado.cargar("presupuesto", 12)
+        doc.documento["children"][0]["precio"] = 150.0
+        doc.guardar()
+    """
+
+    def __init__(self, tabla: str, fila: dict):
+        self.tabla = tabla
+        self.id = fila["id"]
+        self.version = fila.get("version")
+        self.original = fila.get(CAMPOS_DOCUMENTO[tabla]) or {}
+        self.documento = copy.deepcopy(self.original)
+
+    @classmethod
+    def cargar(cls, tabla: str, id_fila: int):
+        """Carga la fila por id. Devuelve None si no existe o si ocurre un error."""
+        import requests
+        from orgm.stuff.initialize_postgrest import initialize
+        from orgm.stuff.http import obtener_sesion, TIMEOUT
+
+        POSTGREST_URL, headers = initialize()
+        try:
+            response = obtener_sesion().get(
+                f"{POSTGREST_URL}/{tabla}?id=eq.{id_fila}", headers=headers, timeout=TIMEOUT
+            )
+            response.raise_for_status()
+            filas = response.json()
+        except requests.exceptions.RequestException as e:
+            console.print(f"[bold red]Error al cargar {tabla} {id_fila}: {e}[/bold red]")
+            return None
+        if not filas:
+            console.print(f"[bold yellow]No se encontró {tabla} con ID {id_fila}[/bold yellow]")
+            return None
+        return cls(tabla, filas[0])
+
+    @property
+    def cambios(self) -> list[dict]:
+        return diferencia(self.original, self.documento)
+
+    def guardar(self) -> bool:
+        """Guarda los cambios. Devuelve False si hubo un conflicto o un error."""
+        resultado = guardar_documento(self.tabla, self.id, self.original, self.documento, self.version)
+        if resultado is None:
+            return False
+        if self.version is not None:
+            self.version = resultado
+        self.original = copy.deepcopy(self.documento)
+        return True
@@ -0,0 +1,515 @@
+"""
+Importación de listas de cantidades (CSV o XLSX) a la tabla presupuesto.
+
+Las filas se leen una a una y se escriben directamente en un archivo JSON
+temporal con el formato de CategoriaPresupuesto.to_dict, por lo que la
+memoria no depende del tamaño del archivo. La jerarquía se deduce de los
+códigos de ítem: I-1 es una categoría, I-1.2 una subcategoría de I-1 y
+P-1.2.3 una partida de I-1.2. Las partidas sin prefijo numérico (P-1, P-2)
+quedan en la última categoría abierta.
+"""
+import csv
+import json
+import os
+import re
+import shutil
+import tempfile
+import uuid
+from pathlib import Path
+import numpy as np
+import typer
+from rich.console import Console
+from rich.table import Table
+from typing import Optional
+
+from orgm.stuff.texto import normalizar
+
+console = Console()
+
+# Filas que se validan juntas
+TAMANO_LOTE = 2000
+
+# Bytes que cada presupuesto acumula en memoria antes de escribirse en su
+# archivo temporal (que solo está abierto mientras se escribe)
+TAMANO_BUFFER = 16 * 1024
+
+# Nombres de columna aceptados (normalizados) para cada campo
+COLUMNAS = {
+    "item": ("item", "codigo", "cod", "no", "numero"),
+    "descripcion": ("descripcion", "concepto", "partida", "detalle"),
+    "cantidad": ("cantidad", "cant", "qty"),
+    "unidad": ("unidad", "ud", "und", "unid", "u m", "um"),
+    "moneda": ("moneda",),
+    "precio": ("precio", "precio unitario", "p u", "pu", "costo unitario"),
+    "id_cotizacion": ("id cotizacion", "cotizacion", "id_cotizacion"),
+}
+
+_CODIGO = re.compile(r"^\s*([IP])\s*-?\s*(\d+(?:\.\d+)*)\s*\.?\s*$", re.IGNORECASE)
+# Símbolos de moneda y espacios que se ignoran en las columnas numéricas
+_MONEDA = re.compile(r"RD\$|US\$|USD|DOP|EUR|\$|€|\s", re.IGNORECASE)
+
+# Formas de escribir un número según el separador decimal
+_SIMPLE = re.compile(r"^\d+$")
+_PUNTO = re.compile(r"^\d*\.\d+$")  # 2.5
+_COMA = re.compile(r"^\d*,\d+$")  # 2,5
+_MILES_COMA = re.compile(r"^\d{1,3}(?:,\d{3})+(?:\.\d+)?$")  # 1,234,567.5
+_MILES_PUNTO = re.compile(r"^\d{1,3}(?:\.\d{3})+(?:,\d+)?$")  # 1.234.567,5
+_COMA_DECIMAL = re.compile(r"^\d+,\d{1,2}$")  # 2,5 o 2,50: nunca separa miles
+
+
+def _mapear_encabezado(fila) -> dict | None:
+    """Devuelve {campo: posición} si la fila parece un encabezado."""
+    posiciones = {}
+    for i, valor in enumerate(fila):
+        nombre = normalizar(valor).replace("_", " ")
+        for campo, nombres in COLUMNAS.items():
+            if campo not in posiciones and nombre in nombres:
+                posiciones[campo] = i
+    if "descripcion" in posiciones and ("cantidad" in posiciones or "precio" in posiciones):
+        return posiciones
+    return None
+
+
+def leer_filas(archivo: str, hoja: Optional[str] = None):
+    """
+    Genera las filas del archivo como listas de valores, sin cargarlo completo.
+    """
+    if Path(archivo).suffix.lower() in (".xlsx", ".xlsm"):
+        try:
+            from openpyxl import load_workbook
+        except ImportError:
+            raise ImportError("Se requiere el paquete openpyxl. Instale con pip install openpyxl")
+
+        libro = load_workbook(archivo, read_only=True, data_only=True)
+        try:
+            hoja_activa = libro[hoja] if hoja else libro.active
+            for fila in hoja_activa.iter_rows(values_only=True):
+                yield list(fila)
+        finally:
+            libro.close()
+        return
+
+    with open(archivo, "r", encoding="utf-8-sig", newline="") as f:
+        yield from csv.reader(f, _dialecto(f))
+
+
+def _dialecto(f):
+    """Detecta el dialecto de un CSV abierto y vuelve al inicio."""
+    muestra = f.read(4096)
+    f.seek(0)
+    try:
+        return csv.Sniffer().sniff(muestra, delimiters=",;\t|")
+    except csv.Error:
+        return csv.excel
+
+
+def separador_decimal(archivo: str) -> Optional[str]:
+    """
+    Separador decimal de los números escritos como texto en el archivo.
+
+    Un CSV separado por ";" usa coma decimal (así lo exporta Excel en
+    español) y uno separado por "," usa punto. Para XLSX y los demás
+    delimitadores se devuelve None y se decide valor por valor.
+    """
+    if Path(archivo).suffix.lower() in (".xlsx", ".xlsm"):
+        return None
+    with open(archivo, "r", encoding="utf-8-sig", newline="") as f:
+        delimitador = _dialecto(f).delimiter
+    return {";": ",", ",": "."}.get(delimitador)
+
+
+def _numero(texto: str, decimal: Optional[str]) -> float:
+    """
+    Convierte un número escrito como texto según el separador decimal del
+    archivo. Devuelve NaN si no es un número o si es ambiguo (por ejemplo,
+    "1,234" o "1.500" cuando no se conoce el separador).
+    """
+    negativo = texto.startswith("-")
+    texto = texto[1:] if negativo else texto
+    if _SIMPLE.match(texto):
+        valor = texto
+    elif decimal == ",":
+        if _COMA.match(texto):
+            valor = texto.replace(",", ".")
+        elif _MILES_PUNTO.match(texto):
+            valor = texto.replace(".", "").replace(",", ".")
+        elif _PUNTO.match(texto) and not _MILES_PUNTO.match(texto):
+            valor = texto
+        else:
+            return np.nan
+    elif decimal == ".":
+        if _PUNTO.match(texto):
+            valor = texto
+        elif _MILES_COMA.match(texto):
+            valor = texto.replace(",", "")
+        else:
+            # "2,5" en un archivo con punto decimal: no se adivina
+            return np.nan
+    else:
+        if _COMA_DECIMAL.match(texto):
+            valor = texto.replace(",", ".")
+        elif _MILES_COMA.match(texto) and "." in texto:
+            valor = texto.replace(",", "")
+        elif _MILES_PUNTO.match(texto) and "," in texto:
+            valor = texto.replace(".", "").replace(",", ".")
+        elif _PUNTO.match(texto) and not _MILES_PUNTO.match(texto):
+            valor = texto
+        else:
+            return np.nan
+    return -float(valor) if negativo else float(valor)
+
+
+def _texto(valor) -> str:
+    return "" if valor is None else str(valor).strip()
+
+
+def _numeros(valores: list, filas: list[int], campo: str, errores: list, decimal: Optional[str] = None) -> np.ndarray:
+    """
+    Convierte una columna del lote a float64 con el separador decimal del
+    archivo. Los valores vacíos valen 0 y los inválidos o ambiguos quedan
+    como NaN y se registran en `errores`.
+    """
+    numeros = np.empty(len(valores))
+    for i, v in enumerate(valores):
+        if isinstance(v, (int, float)):
+            numeros[i] = v
+        else:
+            texto = _MONEDA.sub("", "" if v is None else str(v))
+            numeros[i] = _numero(texto, decimal) if texto else 0.0
+
+    invalidos = ~np.isfinite(numeros) | (numeros < 0)
+    for i in np.flatnonzero(invalidos):
+        errores.append((filas[i], campo, _texto(valores[i])))
+    return numeros
+
+
+class _EscritorPresupuesto:
+    """
+    Escribe un presupuesto como JSON a medida que llegan las filas.
+
+    Cada categoría abierta se guarda en una pila con su número de ítem y la
+    suma de sus hijos; el total se escribe al cerrarla, después de "children".
+    """
+
+    def __init__(self, id_cotizacion, nombre: str, moneda: str):
+        self.id_cotizacion = id_cotizacion
+        self.moneda = moneda
+        self.partidas = 0
+        self.categorias = 0
+        self.reubicadas = 0
+        self._total_raiz = 0.0
+        descriptor, self.ruta = tempfile.mkstemp(suffix=".json")
+        os.close(descriptor)
+        self._pendiente = []
+        self._tamano_pendiente = 0
+        # Pila de categorías abiertas: [número de ítem, total, tiene hijos]
+        self.pila = []
+        self._abrir({"item": "I-0", "descripcion": nombre}, ())
+
+    def _escribir(self, texto: str):
+        self._pendiente.append(texto)
+        self._tamano_pendiente += len(texto)
+        if self._tamano_pendiente >= TAMANO_BUFFER:
+            self._volcar()
+
+    def _volcar(self):
+        """Agrega lo acumulado al archivo y lo cierra enseguida."""
+        if self._pendiente:
+            with open(self.ruta, "a", encoding="utf-8") as f:
+                f.write("".join(self._pendiente))
+            self._pendiente = []
+            self._tamano_pendiente = 0
+
+    @staticmethod
+    def _nodo(datos: dict, moneda: str) -> dict:
+        return {
+            "id": uuid.uuid4().hex[:6],
+            "item": datos.get("item") or "P-1",
+            "descripcion": datos.get("descripcion") or "",
+            "cantidad": datos.get("cantidad", 1),
+            "unidad": datos.get("unidad") or "Ud.",
+            "moneda": datos.get("moneda") or moneda,
+            "precio": datos.get("precio", 0.0),
+        }
+
+    def _separador(self):
+        if self.pila:
+            if self.pila[-1][2]:
+                self._escribir(", ")
+            self.pila[-1][2] = True
+
+    def _abrir(self, datos: dict, numero: tuple):
+        self._separador()
+        nodo = self._nodo({**datos, "cantidad": 1, "precio": 0.0, "unidad": "Ud."}, self.moneda)
+        nodo["categoria"] = "cat1"
+        texto = json.dumps(nodo, ensure_ascii=False)
+        self._escribir(texto[:-1] + ', "children": [')
+        self.pila.append([numero, 0.0, False])
+
+    def _cerrar(self):
+        _, total, _ = self.pila.pop()
+        self._escribir(f'], "total": {json.dumps(total)}}}')
+        if self.pila:
+            self.pila[-1][1] += total
+        else:
+            self._total_raiz = total
+
+    def _ubicar(self, padre: tuple | None):
+        """Cierra categorías hasta que la abierta sea `padre`."""
+        if padre is None:
+            return
+        for posicion in range(len(self.pila) - 1, -1, -1):
+            if self.pila[posicion][0] == padre:
+                while len(self.pila) > posicion + 1:
+                    self._cerrar()
+                return
+        # El padre no está abierto: la fila queda en la categoría actual
+        self.reubicadas += 1
+
+    def agregar(self, datos: dict, tipo: str, numero: tuple):
+        if tipo == "I":
+            self._ubicar(numero[:-1])
+            self._abrir(datos, numero)
+            self.categorias += 1
+            return
+
+        self._ubicar(numero[:-1] if len(numero) > 1 else None)
+        self._separador()
+        nodo = self._nodo(datos, self.moneda)
+        nodo["total"] = round(nodo["cantidad"] * nodo["precio"], 2)
+        self._escribir(json.dumps(nodo, ensure_ascii=False))
+        self.pila[-1][1] += nodo["total"]
+        self.partidas += 1
+
+    def terminar(self) -> str:
+        """Cierra todas las categorías y devuelve la ruta del JSON."""
+        while self.pila:
+            self._cerrar()
+        self._volcar()
+        return self.ruta
+
+    @property
+    def total(self) -> float:
+        return self._total_raiz if not self.pila else self.pila[0][1]
+
+
+def _lotes(filas, inicio: int):
+    """Agrupa las filas con contenido en lotes de TAMANO_LOTE."""
+    lote = []
+    for numero_fila, fila in enumerate(filas, start=inicio):
+        if not any(_texto(v) for v in fila):
+            continue
+        lote.append((numero_fila, fila))
+        if len(lote) >= TAMANO_LOTE:
+            yield lote
+            lote = []
+    if lote:
+        yield lote
+
+
+def _validar_lote(lote: list, posiciones: dict, errores: list, decimal: Optional[str] = None):
+    """Valida un lote y genera (número de fila, tipo, número de ítem, datos)."""
+    filas = [n for n, _ in lote]
+
+    def columna(campo):
+        i = posiciones.get(campo)
+        return [fila[i] if i is not None and i < len(fila) else None for _, fila in lote]
+
+    cantidades = _numeros(columna("cantidad"), filas, "cantidad", errores, decimal)
+    precios = _numeros(columna("precio"), filas, "precio", errores, decimal)
+    validos = np.isfinite(cantidades) & np.isfinite(precios) & (cantidades >= 0) & (precios >= 0)
+
+    items, descripciones, unidades = columna("item"), columna("descripcion"), columna("unidad")
+    monedas, cotizaciones = columna("moneda"), columna("id_cotizacion")
+
+    for k in range(len(lote)):
+        if not validos[k]:
+            continue
+        item = _texto(items[k])
+        coincidencia = _CODIGO.match(item)
+        if coincidencia:
+            tipo = coincidencia.group(1).upper()
+            numero = tuple(int(p) for p in coincidencia.group(2).split("."))
+            item = f"{tipo}-{coincidencia.group(2)}"
+        else:
+            tipo, numero = "P", ()
+
+        cantidad = float(cantidades[k])
+        precio = float(precios[k])
+        yield filas[k], tipo, numero, {
+            "item": item,
+            "descripcion": _texto(descripciones[k]),
+            "cantidad": int(cantidad) if cantidad.is_integer() else cantidad,
+            "unidad": _texto(unidades[k]),
+            "moneda": _texto(monedas[k]),
+            "precio": precio,
+            "id_cotizacion": _texto(cotizaciones[k]),
+        }
+
+
+class _Cuerpo:
+    """Cuerpo de solicitud formado por un prefijo, un archivo y un sufijo, leído por bloques."""
+
+    def __init__(self, ruta: str, prefijo: str, sufijo: str):
+        self.ruta = ruta
+        self.prefijo = prefijo.encode("utf-8")
+        self.sufijo = sufijo.encode("utf-8")
+
+    def __len__(self):
+        return len(self.prefijo) + os.path.getsize(self.ruta) + len(self.sufijo)
+
+    def __iter__(self):
+        from orgm.stuff.http import TAMANO_BLOQUE
+
+        yield self.prefijo
+        with open(self.ruta, "rb") as f:
+            while bloque := f.read(TAMANO_BLOQUE):
+                yield bloque
+        yield self.sufijo
+
+
+def _id_cotizacion(valor: str) -> int | None:
+    try:
+        return int(float(valor))
+    except ValueError:
+        return None
+
+
+def _subir(ruta: str, id_cotizacion, reemplazar: bool) -> bool:
+    """
+    Envía el presupuesto a PostgREST en una sola solicitud, leyendo del disco.
+    Con `reemplazar`, si la cotización aún no tiene presupuesto se crea.
+    """
+    import requests
+    from orgm.stuff.initialize_postgrest import initialize
+    from orgm.stuff.http import obtener_sesion, TIMEOUT
+
+    POSTGREST_URL, headers = initialize()
+    headers = {**headers, "Content-Type": "application/json", "Prefer": "return=minimal"}
+
+    try:
+        if reemplazar:
+            cuerpo = _Cuerpo(ruta, '{"presupuesto": ', "}")
+            # Se pide solo el id de las filas modificadas para saber si existía
+            response = obtener_sesion().patch(
+                f"{POSTGREST_URL}/presupuesto?id_cotizacion=eq.{id_cotizacion}&select=id",
+                data=cuerpo,
+                headers={**headers, "Prefer": "return=representation", "Content-Length": str(len(cuerpo))},
+                timeout=TIMEOUT,
+            )
+            response.raise_for_status()
+            if response.json():
+                return True
+        cuerpo = _Cuerpo(ruta, f'{{"id_cotizacion": {json.dumps(id_cotizacion)}, "presupuesto": ', "}")
+        response = obtener_sesion().post(
+            f"{POSTGREST_URL}/presupuesto",
+            data=cuerpo,
+            headers={**headers, "Content-Length": str(len(cuerpo))},
+            timeout=TIMEOUT,
+        )
+        response.raise_for_status()
+        return True
+    except requests.exceptions.RequestException as e:
+        console.print(f"[bold red]Error al subir el presupuesto de la cotización {id_cotizacion}: {e}[/bold red]")
+        return False
+
+
+def importar_presupuesto(
+    archivo: str = typer.Argument(..., help="Archivo CSV o XLSX con la lista de cantidades"),
+    cotizacion: Optional[int] = typer.Option(
+        None, "--cotizacion", "-c", help="ID de la cotización (si el archivo no tiene columna de cotización)"
+    ),
+    hoja: Optional[str] = typer.Option(None, "--hoja", help="Hoja del libro XLSX (por defecto la activa)"),
+    moneda: str = typer.Option("RD$", "--moneda", help="Moneda de las partidas sin moneda"),
+    reemplazar: bool = typer.Option(False, "--reemplazar", help="Reemplaza el presupuesto existente de la cotización (lo crea si no tiene)"),
+    ignorar_errores: bool = typer.Option(False, "--ignorar-errores", help="Omite las filas inválidas y sube el resto"),
+    validar: bool = typer.Option(False, "--validar", help="Solo valida el archivo, sin subir nada"),
+    salida: Optional[str] = typer.Option(None, "--salida", "-o", help="Guarda el JSON generado en esta carpeta"),
+):
+    """Importa una lista de cantidades a la tabla presupuesto, una solicitud por cotización."""
+    if not os.path.exists(archivo):
+        console.print(f"[bold red]Error: El archivo {archivo} no existe[/bold red]")
+        raise typer.Exit(code=1)
+
+    try:
+        filas = leer_filas(archivo, hoja)
+        posiciones = None
+        numero_fila = 0
+        for numero_fila, fila in enumerate(filas, start=1):
+            posiciones = _mapear_encabezado(fila)
+            if posiciones:
+                break
+    except ImportError as e:
+        console.print(f"[bold red]{e}[/bold red]")
+        raise typer.Exit(code=1)
+
+    if not posiciones:
+        console.print("[bold red]Error: No se encontró una fila de encabezado con descripción y cantidad o precio[/bold red]")
+        raise typer.Exit(code=1)
+    if cotizacion is None and "id_cotizacion" not in posiciones:
+        console.print("[bold red]Error: Indique la cotización con --cotizacion o incluya una columna de cotización[/bold red]")
+        raise typer.Exit(code=1)
+
+    nombre = Path(archivo).stem
+    decimal = separador_decimal(archivo)
+    escritores = {}
+    errores = []
+    with console.status("Leyendo filas...") as estado:
+        for lote in _lotes(filas, numero_fila + 1):
+            for fila, tipo, numero, datos in _validar_lote(lote, posiciones, errores, decimal):
+                id_cotizacion = cotizacion if cotizacion is not None else _id_cotizacion(datos["id_cotizacion"])
+                if id_cotizacion is None:
+                    errores.append((fila, "id_cotizacion", datos["id_cotizacion"]))
+                    continue
+                if id_cotizacion not in escritores:
+                    escritores[id_cotizacion] = _EscritorPresupuesto(id_cotizacion, nombre, moneda)
+                escritores[id_cotizacion].agregar(datos, tipo, numero)
+            estado.update(f"Leídas {lote[-1][0]:,} filas...")
+
+    rutas = {id_cotizacion: escritor.terminar() for id_cotizacion, escritor in escritores.items()}
+    try:
+        if errores:
+            tabla = Table(title=f"{len(errores)} valores inválidos")
+            for columna in ("Fila", "Campo", "Valor"):
+                tabla.add_column(columna)
+            for fila, campo, valor in errores[:20]:
+                tabla.add_row(str(fila), campo, valor)
+            console.print(tabla)
+            console.print(
+                "[dim]Los números con separador ambiguo (1,234 o 1.500 sin otro separador) no se interpretan; "
+                "escríbalos sin separador de miles.[/dim]"
+            )
+            if not ignorar_errores and not validar:
+                console.print("[bold yellow]No se subió nada. Corrija el archivo o use --ignorar-errores[/bold yellow]")
+                raise typer.Exit(code=1)
+
+        resumen = Table(title="Presupuestos importados")
+        for columna in ("Cotización", "Categorías", "Partidas", "Total", "Jerarquía inferida"):
+            resumen.add_column(columna)
+        for id_cotizacion, escritor in escritores.items():
+            resumen.add_row(
+                str(id_cotizacion),
+                f"{escritor.categorias:,}",
+                f"{escritor.partidas:,}",
+                "{:,.2f}".format(escritor.total),
+                f"{escritor.reubicadas:,} filas" if escritor.reubicadas else "-",
+            )
+        console.print(resumen)
+
+        if salida:
+            os.makedirs(salida, exist_ok=True)
+            for id_cotizacion, ruta in rutas.items():
+                destino = os.path.join(salida, f"presupuesto_{id_cotizacion}.json")
+                shutil.copyfile(ruta, destino)
+                console.print(f"JSON guardado en {destino}")
+
+        if validar:
+            return
+
+        fallidas = [c for c, ruta in rutas.items() if not _subir(ruta, c, reemplazar)]
+        if fallidas:
+            raise typer.Exit(code=1)
+        console.print(f"[bold green]Se importaron {len(rutas)} presupuestos[/bold green]")
+    finally:
+        for ruta in rutas.values():
+            os.remove(ruta)
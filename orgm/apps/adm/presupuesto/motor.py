@@ -0,0 +1,332 @@
+import uuid
+import numpy as np
+
+# Claves conocidas de los nodos en el formato JSONB de PartidaPresupuesto /
+# CategoriaPresupuesto. Cualquier otra clave se conserva tal cual.
+_CLAVES_PARTIDA = ("id", "item", "descripcion", "cantidad", "unidad", "moneda", "precio", "total")
+
+
+def _redondear(valores: np.ndarray) -> np.ndarray:
+    """
+    Redondea a 2 decimales con el mismo resultado que round() de Python.
+
+    np.round escala por 100 antes de redondear y puede diferir en los casos
+    que quedan justo en la mitad; solo esos se recalculan uno a uno.
+    """
+    resultado = np.round(valores, 2)
+    dudosos = np.abs(np.abs(valores * 100) % 1 - 0.5) < 1e-6
+    if dudosos.any():
+        resultado[dudosos] = [round(float(v), 2) for v in valores[dudosos]]
+    return resultado
+
+
+def _numero(valor: float, entero: bool):
+    """Devuelve el valor como int si así venía en el documento original."""
+    if entero and float(valor).is_integer():
+        return int(valor)
+    return float(valor)
+
+
+class MotorPresupuesto:
+    """
+    Presupuesto en columnas NumPy, equivalente al árbol de
+    CategoriaPresupuesto / PartidaPresupuesto.
+
+    Los nodos se guardan en preorden: cada categoría va seguida de todo su
+    subárbol, y `padre` contiene el índice del padre de cada nodo (-1 para
+    las raíces). Los totales de las categorías se calculan con sumas por
+    segmento, nivel por nivel desde el más profundo, y las filas de la
+    tabla se formatean solo cuando se piden.
+
+    Ejemplo de uso::
+
+        motor = MotorPresupuesto.from_dict(presupuesto.presupuesto)
+        motor.cambio_moneda("USD$", 1 / 60)
+        total = motor.total_general
+        presupuesto.presupuesto = motor.to_dict()
+    """
+
+    def __init__(self):
+        self.ids = []
+        self.items = []
+        self.descripciones = []
+        self.unidades = []
+        self.categorias = []
+        self.extras = []
+        self.monedas = []
+        self.moneda = np.zeros(0, dtype=np.int32)
+        self.cantidad = np.zeros(0)
+        self.precio = np.zeros(0)
+        self.total = np.zeros(0)
+        self.padre = np.zeros(0, dtype=np.int64)
+        self.profundidad = np.zeros(0, dtype=np.int32)
+        self.es_categoria = np.zeros(0, dtype=bool)
+        self.tiene_hijos = np.zeros(0, dtype=bool)
+        self.cantidad_entera = np.zeros(0, dtype=bool)
+        self.precio_entero = np.zeros(0, dtype=bool)
+        self._es_lista = False
+        self._totales_validos = False
+        self._indices = None
+
+    def __len__(self) -> int:
+        return len(self.ids)
+
+    # ------------------------------------------------------------------
+    # Conversión desde y hacia el formato JSONB
+    # ------------------------------------------------------------------
+
+    def _codigo_moneda(self, moneda: str) -> int:
+        try:
+            return self.monedas.index(moneda)
+        except ValueError:
+            self.monedas.append(moneda)
+            return len(self.monedas) - 1
+
+    @classmethod
+    def from_dict(cls, data):
+        """
+        Construye el motor desde el diccionario de `CategoriaPresupuesto.to_dict`
+        o desde una lista de nodos.
+        """
+        motor = cls()
+        motor._es_lista = isinstance(data, list)
+        raices = data if motor._es_lista else [data] if data else []
+
+        cantidad, precio, total, padre, profundidad = [], [], [], [], []
+        es_categoria, tiene_hijos, cantidad_entera, precio_entero, moneda = [], [], [], [], []
+
+        # Recorrido en preorden sin recursión
+        pila = [(nodo, -1, 0) for nodo in reversed(raices)]
+        while pila:
+            nodo, indice_padre, nivel = pila.pop()
+            indice = len(motor.ids)
+            hijos = nodo.get("children")
+            categoria = hijos is not None
+
+            motor.ids.append(nodo.get("id"))
+            motor.items.append(nodo.get("item", "I-1" if categoria else "P-1"))
+            motor.descripciones.append(nodo.get("descripcion", "Categoria" if categoria else "Partida"))
+            motor.unidades.append(nodo.get("unidad", "Ud."))
+            motor.categorias.append(nodo.get("categoria", "cat1") if categoria else None)
+            motor.extras.append(
+                {k: v for k, v in nodo.items() if k not in _CLAVES_PARTIDA and k not in ("categoria", "children")}
+            )
+
+            valor_cantidad = nodo.get("cantidad", 1)
+            valor_precio = nodo.get("precio", 0.0)
+            cantidad.append(valor_cantidad)
+            precio.append(valor_precio)
+            total.append(nodo.get("total", 0.0))
+            cantidad_entera.append(isinstance(valor_cantidad, int))
+            precio_entero.append(isinstance(valor_precio, int))
+            moneda.append(motor._codigo_moneda(nodo.get("moneda", "RD$")))
+            padre.append(indice_padre)
+            profundidad.append(nivel)
+            es_categoria.append(categoria)
+            tiene_hijos.append(bool(hijos))
+
+            for hijo in reversed(hijos or []):
+                pila.append((hijo, indice, nivel + 1))
+
+        motor.cantidad = np.asarray(cantidad, dtype=np.float64)
+        motor.precio = np.asarray(precio, dtype=np.float64)
+        motor.total = np.asarray(total, dtype=np.float64)
+        motor.padre = np.asarray(padre, dtype=np.int64)
+        motor.profundidad = np.asarray(profundidad, dtype=np.int32)
+        motor.es_categoria = np.asarray(es_categoria, dtype=bool)
+        motor.tiene_hijos = np.asarray(tiene_hijos, dtype=bool)
+        motor.cantidad_entera = np.asarray(cantidad_entera, dtype=bool)
+        motor.precio_entero = np.asarray(precio_entero, dtype=bool)
+        motor.moneda = np.asarray(moneda, dtype=np.int32)
+        return motor
+
+    @classmethod
+    def desde_arbol(cls, raiz):
+        """Construye el motor desde un CategoriaPresupuesto."""
+        return cls.from_dict(raiz.to_dict())
+
+    def to_dict(self):
+        """
+        Devuelve el presupuesto en el mismo formato JSONB que
+        `CategoriaPresupuesto.to_dict`, con los totales actualizados.
+        """
+        self.calcular_totales()
+        nodos = []
+        raices = []
+        for i in range(len(self)):
+            if not self.ids[i]:
+                # Solo se generan ids para los nodos que no lo tenían
+                self.ids[i] = uuid.uuid4().hex[:6]
+                self._indices = None
+            nodo = {
+                "id": self.ids[i],
+                "item": self.items[i],
+                "descripcion": self.descripciones[i],
+                "cantidad": _numero(self.cantidad[i], self.cantidad_entera[i]),
+                "unidad": self.unidades[i],
+                "moneda": self.monedas[self.moneda[i]],
+                "precio": _numero(self.precio[i], self.precio_entero[i]),
+                "total": float(self.total[i]),
+            }
+            nodo.update(self.extras[i])
+            if self.es_categoria[i]:
+                nodo["categoria"] = self.categorias[i]
+                nodo["children"] = []
+            nodos.append(nodo)
+            if self.padre[i] < 0:
+                raices.append(nodo)
+            else:
+                nodos[self.padre[i]]["children"].append(nodo)
+
+        if self._es_lista:
+            return raices
+        return raices[0] if raices else {}
+
+    def a_arbol(self):
+        """Devuelve el presupuesto como CategoriaPresupuesto."""
+        from orgm.apps.adm.db import CategoriaPresupuesto
+
+        return CategoriaPresupuesto.from_dict(self.to_dict())
+
+    # ------------------------------------------------------------------
+    # Cálculos
+    # ------------------------------------------------------------------
+
+    def indice(self, id_nodo: str) -> int:
+        """Devuelve la posición del nodo con ese id."""
+        if self._indices is None:
+            self._indices = {id_nodo: i for i, id_nodo in enumerate(self.ids) if id_nodo}
+        try:
+            return self._indices[id_nodo]
+        except KeyError:
+            raise KeyError(f"No existe el nodo {id_nodo} en el presupuesto") from None
+
+    def calcular_totales(self, forzar: bool = False) -> np.ndarray:
+        """
+        Recalcula todos los totales.
+
+        Las partidas y las categorías sin hijos valen round(cantidad * precio, 2);
+        las categorías con hijos valen la suma de los totales de sus hijos.
+
+        Args:
+            forzar: Recalcula aunque los totales estén al día, por ejemplo para
+                descartar el error de redondeo acumulado tras muchas ediciones.
+        """
+        if self._totales_validos and not forzar:
+            return self.total
+        n = len(self)
+        hojas = ~self.tiene_hijos
+        total = np.where(hojas, _redondear(self.cantidad * self.precio), 0.0)
+
+        # Suma por segmentos, desde el nivel más profundo hacia la raíz
+        for nivel in range(int(self.profundidad.max(initial=0)), 0, -1):
+            en_nivel = self.profundidad == nivel
+            total += np.bincount(self.padre[en_nivel], weights=total[en_nivel], minlength=n)
+
+        self.total = total
+        self._totales_validos = True
+        return self.total
+
+    def actualizar(self, nodo, cantidad: float | None = None, precio: float | None = None) -> float:
+        """
+        Cambia la cantidad o el precio de una partida y propaga la diferencia
+        solo a sus categorías ascendentes, sin recorrer el resto del árbol.
+
+        Args:
+            nodo: id o posición de la partida.
+            cantidad: Nueva cantidad (opcional).
+            precio: Nuevo precio (opcional).
+
+        Returns:
+            float: Diferencia aplicada al total de la partida.
+        """
+        i = nodo if isinstance(nodo, (int, np.integer)) else self.indice(nodo)
+        if self.tiene_hijos[i]:
+            raise ValueError("Solo se puede editar una partida o una categoría sin hijos")
+        self.calcular_totales()
+
+        if cantidad is not None:
+            self.cantidad[i] = cantidad
+            self.cantidad_entera[i] = isinstance(cantidad, int)
+        if precio is not None:
+            self.precio[i] = precio
+            self.precio_entero[i] = isinstance(precio, int)
+
+        nuevo = round(float(self.cantidad[i]) * float(self.precio[i]), 2)
+        diferencia = nuevo - float(self.total[i])
+        self.total[i] = nuevo
+        if diferencia:
+            for padre in self.ascendentes(i):
+                self.total[padre] += diferencia
+        return diferencia
+
+    def asignar_precios(self, indices, precios) -> None:
+        """
+        Cambia el precio de varias partidas a la vez. Los totales se
+        recalculan completos la próxima vez que se pidan, lo que resulta más
+        barato que propagar cada cambio cuando son muchos.
+        """
+        indices = np.asarray(indices, dtype=np.int64)
+        self.precio[indices] = precios
+        self.precio_entero[indices] = False
+        self._totales_validos = False
+
+    def ascendentes(self, i: int) -> list[int]:
+        """Posiciones de las categorías que contienen al nodo `i`, de abajo arriba."""
+        resultado = []
+        padre = int(self.padre[i])
+        while padre >= 0:
+            resultado.append(padre)
+            padre = int(self.padre[padre])
+        return resultado
+
+    @property
+    def total_general(self) -> float:
+        """Suma de los totales de los nodos raíz."""
+        self.calcular_totales()
+        return float(self.total[self.padre < 0].sum())
+
+    def cambio_moneda(self, moneda: str = "RD$", tasa: float = 1) -> int:
+        """
+        Convierte a `moneda` el precio de todas las partidas de otra moneda,
+        igual que `CategoriaPresupuesto.cambio_moneda`, en una sola operación.
+
+        Returns:
+            int: Número de partidas convertidas.
+        """
+        if tasa == 1:
+            return 0
+        codigo = self._codigo_moneda(moneda)
+        convertir = ~self.es_categoria & (self.precio > 0) & (self.moneda != codigo)
+        self.precio[convertir] = _redondear(self.precio[convertir] * tasa)
+        self.precio_entero[convertir] = False
+        self.moneda[convertir] = codigo
+        self._totales_validos = False
+        return int(convertir.sum())
+
+    # ------------------------------------------------------------------
+    # Tabla
+    # ------------------------------------------------------------------
+
+    def fila(self, i: int) -> list:
+        """Fila de la tabla del nodo `i`, con el mismo formato que set_datos."""
+        self.calcular_totales()
+        return [
+            self.items[i],
+            self.descripciones[i],
+            _numero(self.cantidad[i], self.cantidad_entera[i]),
+            self.unidades[i],
+            self.monedas[self.moneda[i]],
+            "{:,.2f}".format(self.precio[i]),
+            "{:,.2f}".format(self.total[i]),
+        ]
+
+    def filas(self, inicio: int = 0, fin: int | None = None):
+        """Genera las filas de la tabla en preorden, formateándolas al pedirlas."""
+        fin = len(self) if fin is None else min(fin, len(self))
+        for i in range(inicio, fin):
+            yield self.fila(i)
+
+    def to_table(self) -> list:
+        """Equivalente a `CategoriaPresupuesto.to_table`."""
+        return list(self.filas())
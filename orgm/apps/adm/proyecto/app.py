@@ -3,6 +3,8 @@ from rich.console import Console
 
 
 from orgm.apps.adm.proyecto.gui import iniciar_gui
+from orgm.apps.adm.proyecto.bulk_projects import importar_proyectos, exportar_proyectos
+from orgm.apps.adm.proyecto.sync_locations import sincronizar
 
 # Crear consola para salida con Rich
 console = Console()
@@ -14,6 +16,9 @@ app = typer.Typer(help="Comandos para interactuar con datos de clientes")
 # El docstring de ai_prompt se usará como ayuda
 
 app.command(name="gui")(iniciar_gui)
+app.command(name="import")(importar_proyectos)
+app.command(name="export")(exportar_proyectos)
+app.command(name="ubicaciones-sync")(sincronizar)
 
 
 @app.callback(invoke_without_command=True)
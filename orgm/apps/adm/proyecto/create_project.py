@@ -1,6 +1,5 @@
 from typing import Optional, Dict
 from orgm.apps.adm.db import Proyecto
-from orgm.stuff.initialize_postgrest import initialize
 from rich.console import Console
 from orgm.apps.adm.proyecto.max_id import obtener_id_maximo
 from orgm.apps.adm.proyecto.form_project import formulario_proyecto
@@ -11,12 +10,8 @@ console = Console()
 
 def crear_proyecto(proyecto_data: Dict) -> Optional[Proyecto]:
     """Crea un nuevo proyecto"""
-    # Asegurar que las variables estén inicializadas
-
-    POSTGREST_URL, headers = initialize()
-
-    import requests
     from orgm.apps.adm.db import Proyecto
+    from orgm.apps.adm.backend import insertar
     from orgm.apps.ai.generate import generate_text
 
     try:
@@ -39,12 +34,8 @@ def crear_proyecto(proyecto_data: Dict) -> Optional[Proyecto]:
         if "id" not in proyecto_data:
             proyecto_data["id"] = obtener_id_maximo()
 
-        response = requests.post(
-            f"{POSTGREST_URL}/proyecto", headers=headers, json=proyecto_data, timeout=10
-        )
-        response.raise_for_status()
-
-        nuevo_proyecto = Proyecto.parse_obj(response.json()[0])
+        fila = insertar("proyecto", proyecto_data)
+        nuevo_proyecto = Proyecto.parse_obj(fila)
         console.print(
             f"[bold green]Proyecto creado correctamente con ID: {nuevo_proyecto.id}[/bold green]"
         )
@@ -1,9 +1,7 @@
 from typing import List
 from orgm.apps.adm.db import Ubicacion
-from orgm.stuff.initialize_postgrest import initialize
 from rich.console import Console
-from orgm.stuff.spinner import spinner
-from orgm.apps.adm.proyecto.locations import obtener_ubicaciones
+from orgm.stuff.selector import seleccionar
 
 import questionary
 from typing import Optional
@@ -14,20 +12,14 @@ console = Console()
 
 def buscar_ubicaciones(termino: str) -> List[Ubicacion]:
     """Busca ubicaciones por provincia, distrito o distrito municipal"""
-    POSTGREST_URL, headers = initialize()
-
-    import requests
     from orgm.apps.adm.db import Ubicacion
+    from orgm.apps.adm.busqueda_local import buscar_servidor
+    from orgm.apps.adm.proyecto.indice_ubicaciones import filtrar_ubicaciones
 
     try:
-        response = requests.get(
-            f"{POSTGREST_URL}/ubicacion?or=(provincia.ilike.*{termino}*,distrito.ilike.*{termino}*,distritomunicipal.ilike.*{termino}*)",
-            headers=headers,
-            timeout=10,
-        )
-        response.raise_for_status()
-
-        ubicaciones_data = response.json()
+        ubicaciones_data = filtrar_ubicaciones(termino)
+        if ubicaciones_data is None:
+            ubicaciones_data = buscar_servidor("ubicacion", termino)
         ubicaciones = [
             Ubicacion.model_validate(ubicacion) for ubicacion in ubicaciones_data
         ]
@@ -37,55 +29,64 @@ def buscar_ubicaciones(termino: str) -> List[Ubicacion]:
         return []
 
 
+def _elegir(mensaje: str, opciones: List[str]) -> Optional[str]:
+    """Elige una opción escribiendo parte de ella; None si se cancela."""
+    if not opciones:
+        return None
+    if len(opciones) == 1:
+        console.print(f"{mensaje} [cyan]{opciones[0]}[/cyan]")
+        return opciones[0]
+    return seleccionar(mensaje, opciones=[(opcion, opcion) for opcion in opciones])
+
+
 def seleccionar_ubicacion() -> Optional[str]:
-    """Permite al usuario buscar y seleccionar una ubicación"""
-    # Primera pregunta: ¿cómo quiere buscar la ubicación?
+    """
+    Permite al usuario elegir una ubicación: provincia, distrito y distrito
+    municipal en cascada, o escribiendo cualquier parte del nombre. Usa el
+    índice local de ubicaciones, sin consultar el servidor.
+    """
+    from orgm.apps.adm.proyecto import indice_ubicaciones
+
+    if indice_ubicaciones.cargar_indice() is None:
+        console.print(
+            "[bold red]No hay ubicaciones disponibles. Ejecute 'orgm proyecto ubicaciones-sync' con conexión.[/bold red]"
+        )
+        return None
+
     metodo_busqueda = questionary.select(
         "¿Cómo desea seleccionar la ubicación?",
-        choices=["Buscar por nombre", "Ver todas las ubicaciones", "Cancelar"],
+        choices=["Provincia, distrito y municipio", "Buscar por nombre", "Cancelar"],
     ).ask()
 
-    if metodo_busqueda == "Cancelar":
-        return None
-
-    ubicaciones = []
-    if metodo_busqueda == "Buscar por nombre":
-        termino = questionary.text(
-            "Ingrese término de búsqueda (provincia, distrito o municipio):"
-        ).ask()
-        if not termino:
-            print("[yellow]Búsqueda cancelada[/yellow]")
+    if metodo_busqueda == "Provincia, distrito y municipio":
+        provincia = _elegir("Provincia:", indice_ubicaciones.provincias())
+        if provincia is None:
+            return None
+        distrito = _elegir("Distrito:", indice_ubicaciones.distritos(provincia))
+        if distrito is None:
+            return None
+        municipio = _elegir(
+            "Distrito municipal:", [m for _, m in indice_ubicaciones.municipios(provincia, distrito)]
+        )
+        if municipio is None:
+            return None
+    elif metodo_busqueda == "Buscar por nombre":
+        ubicaciones = {u["id"]: u for u in indice_ubicaciones.filas_ubicaciones()}
+        opciones = [
+            (id_ubicacion, f"{u['distritomunicipal']}, {u['distrito']}, {u['provincia']}")
+            for id_ubicacion, u in ubicaciones.items()
+        ]
+        id_ubicacion = seleccionar("Ubicación (provincia, distrito o municipio):", opciones=opciones)
+        if id_ubicacion is None:
             return None
-        with spinner(f"Buscando ubicaciones por '{termino}'..."):
-            ubicaciones = buscar_ubicaciones(termino)
-    elif metodo_busqueda == "Ver todas las ubicaciones":
-        with spinner("Obteniendo todas las ubicaciones..."):
-            ubicaciones = obtener_ubicaciones()
+        ubicacion = ubicaciones[id_ubicacion]
+        provincia, distrito, municipio = (
+            ubicacion["provincia"],
+            ubicacion["distrito"],
+            ubicacion["distritomunicipal"],
+        )
     else:
         return None
 
-    if not ubicaciones:
-        print("[yellow]No se encontraron ubicaciones[/yellow]")
-        return None
-
-    # Crear las opciones para el selector
-    opciones = [
-        f"{u.id}: {u.provincia}, {u.distrito}, {u.distritomunicipal}"
-        for u in ubicaciones
-    ]
-    opciones.append("Cancelar")
-
-    seleccion = questionary.select("Seleccione una ubicación:", choices=opciones).ask()
-
-    if seleccion == "Cancelar":
-        return None
-
-    # Extraer el ID seleccionado
-    id_ubicacion = seleccion.split(":")[0].strip()
-    ubicacion = next((u for u in ubicaciones if str(u.id) == id_ubicacion), None)
-
-    if not ubicacion:
-        return None
-
     # Devolver una cadena formateada con la ubicación
-    return f"{ubicacion.provincia}, {ubicacion.distrito}, {ubicacion.distritomunicipal}"
+    return f"{provincia}, {distrito}, {municipio}"
@@ -1,7 +1,6 @@
-import requests
-from typing import List
+from typing import List, Optional
 from orgm.apps.adm.db import Proyecto
-from orgm.stuff.initialize_postgrest import initialize
+from orgm.apps.adm.backend import consultar
 from rich.console import Console
 from orgm.apps.adm.proyecto.get_projects import mostrar_proyectos
 
@@ -9,21 +8,25 @@ from orgm.apps.adm.proyecto.get_projects import mostrar_proyectos
 console = Console()
 
 
-def buscar_proyectos(termino: str) -> List[Proyecto]:
-    """Busca proyectos por nombre"""
-    # Asegurar que las variables estén inicializadas
-    POSTGREST_URL, headers = initialize()
+def buscar_proyectos(termino: str, limite: Optional[int] = None) -> List[Proyecto]:
+    """
+    Busca proyectos por nombre. Sin `limite` devuelve todas las
+    coincidencias (listado de la CLI); la interfaz gráfica y los selectores
+    pasan un límite.
+    """
+    from orgm.apps.adm.busqueda_local import buscar_local, buscar_servidor
+
+    if termino and termino.strip():
+        proyectos_data = buscar_local("proyecto", termino, limite)
+        if proyectos_data is not None:
+            return [Proyecto.model_validate(proyecto) for proyecto in proyectos_data]
 
     try:
-        # Usamos el operador ILIKE de PostgreSQL para búsqueda case-insensitive
-        response = requests.get(
-            f"{POSTGREST_URL}/proyecto?or=(nombre_proyecto.ilike.*{termino}*,descripcion.ilike.*{termino}*,ubicacion.ilike.*{termino}*)",
-            headers=headers,
-            timeout=10,
-        )
-        response.raise_for_status()
-
-        proyectos_data = response.json()
+        # Sin copia local: ILIKE en la columna "busqueda" del servidor
+        if termino and termino.strip():
+            proyectos_data = buscar_servidor("proyecto", termino, limite)
+        else:
+            proyectos_data = consultar("proyecto", limite=limite)
         proyectos = [Proyecto.model_validate(proyecto) for proyecto in proyectos_data]
         return proyectos
     except Exception as e:
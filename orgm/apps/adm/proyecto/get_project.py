@@ -1,6 +1,5 @@
 from typing import Optional
 from orgm.apps.adm.db import Proyecto
-from orgm.stuff.initialize_postgrest import initialize
 from rich.console import Console
 from rich.table import Table
 
@@ -9,20 +8,11 @@ console = Console()
 
 def obtener_proyecto(id_proyecto: int) -> Optional[Proyecto]:
     """Obtiene un proyecto por su ID"""
-    # Asegurar que las variables estén inicializadas
-
-    POSTGREST_URL, headers = initialize()
-
-    import requests
     from orgm.apps.adm.db import Proyecto
+    from orgm.apps.adm.backend import consultar
 
     try:
-        response = requests.get(
-            f"{POSTGREST_URL}/proyecto?id=eq.{id_proyecto}", headers=headers, timeout=10
-        )
-        response.raise_for_status()
-
-        proyectos_data = response.json()
+        proyectos_data = consultar("proyecto", {"id": id_proyecto})
         if not proyectos_data:
             console.print(
                 f"[yellow]No se encontró el proyecto con ID {id_proyecto}[/yellow]"
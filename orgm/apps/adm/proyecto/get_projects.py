@@ -1,6 +1,5 @@
 from typing import List
 from orgm.apps.adm.db import Proyecto
-from orgm.stuff.initialize_postgrest import initialize
 from rich.console import Console
 from rich.table import Table
 
@@ -8,20 +7,12 @@ console = Console()
 
 
 def obtener_proyectos() -> List[Proyecto]:
-    """Obtiene todos los proyectos desde PostgREST"""
-    # Asegurar que las variables estén inicializadas
-    POSTGREST_URL, headers = initialize()
-
-    import requests
+    """Obtiene todos los proyectos"""
     from orgm.apps.adm.db import Proyecto
+    from orgm.apps.adm.backend import consultar
 
     try:
-        response = requests.get(
-            f"{POSTGREST_URL}/proyecto", headers=headers, timeout=10
-        )
-        response.raise_for_status()
-
-        proyectos_data = response.json()
+        proyectos_data = consultar("proyecto")
         proyectos = [Proyecto.model_validate(proyecto) for proyecto in proyectos_data]
         return proyectos
     except Exception as e:
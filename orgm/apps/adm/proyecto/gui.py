@@ -10,6 +10,7 @@ from nicegui import ui
 from typing import List, Optional
 from functools import partial
 from orgm.apps.adm.proyecto.find_project import buscar_proyectos
+from orgm.apps.adm.busqueda_local import LIMITE_INTERACTIVO
 from orgm.apps.adm.proyecto.get_project import obtener_proyecto
 from orgm.apps.adm.proyecto.update_project import actualizar_proyecto
 from orgm.apps.adm.proyecto.create_project import crear_proyecto
@@ -131,7 +132,7 @@ class ProyectoGUI:
                 self.proyectos_encontrados = [proyecto] if proyecto else []
             except ValueError:
                 # Si no es un ID, buscar por término
-                self.proyectos_encontrados = buscar_proyectos(termino) or []
+                self.proyectos_encontrados = buscar_proyectos(termino, LIMITE_INTERACTIVO) or []
         finally:
             spinner.delete()
 
@@ -0,0 +1,167 @@
+"""
+Índice local de ubicaciones (provincia -> distrito -> distrito municipal).
+
+Las ubicaciones casi no cambian, así que se guardan en un archivo JSON
+comprimido con la jerarquía anidada:
+
+    {"formato": 1, "generado": "...", "suma": "...", "total": N,
+     "provincias": {"Santo Domingo": {"Santo Domingo Oeste": [[id, "Los Alcarrizos"], ...]}}}
+
+Se busca en ~/.orgm/ubicaciones.json.gz (escrito por `orgm proyecto
+ubicaciones-sync`) y en orgm/data/ubicaciones.json.gz (escrito con
+`--paquete` en una copia del código fuente), y se usa el más reciente. El
+paquete publicado no incluye el índice: se requiere una sincronización, que
+se hace sola la primera vez que se necesita. A partir de ahí seleccionar o
+buscar ubicaciones no hace ninguna petición.
+"""
+import gzip
+import hashlib
+import json
+import os
+from datetime import datetime
+from pathlib import Path
+from typing import Optional
+from rich.console import Console
+from orgm.stuff.texto import normalizar
+
+console = Console()
+
+FORMATO = 1
+
+ARCHIVO_PAQUETE = Path(__file__).resolve().parents[3] / "data" / "ubicaciones.json.gz"
+ARCHIVO_USUARIO = Path(os.path.expanduser("~")) / ".orgm" / "ubicaciones.json.gz"
+
+_indice = None
+_filas = None
+
+
+def construir_indice(filas: list[dict]) -> dict:
+    """Índice jerárquico a partir de las filas de la tabla ubicacion."""
+    provincias = {}
+    for fila in sorted(
+        filas,
+        key=lambda f: (
+            normalizar(f.get("provincia")),
+            normalizar(f.get("distrito")),
+            normalizar(f.get("distritomunicipal")),
+        ),
+    ):
+        distritos = provincias.setdefault(fila.get("provincia") or "", {})
+        distritos.setdefault(fila.get("distrito") or "", []).append([fila["id"], fila.get("distritomunicipal") or ""])
+    suma = hashlib.sha256(json.dumps(provincias, ensure_ascii=False, sort_keys=True).encode("utf-8")).hexdigest()
+    return {
+        "formato": FORMATO,
+        "generado": datetime.now().isoformat(timespec="seconds"),
+        "suma": suma,
+        "total": len(filas),
+        "provincias": provincias,
+    }
+
+
+def guardar_indice(indice: dict, ruta: Path) -> None:
+    ruta.parent.mkdir(parents=True, exist_ok=True)
+    temporal = ruta.with_name(ruta.name + ".tmp")
+    with gzip.open(temporal, "wt", encoding="utf-8") as f:
+        json.dump(indice, f, ensure_ascii=False, separators=(",", ":"))
+    os.replace(temporal, ruta)
+
+
+def _leer(ruta: Path) -> Optional[dict]:
+    try:
+        with gzip.open(ruta, "rt", encoding="utf-8") as f:
+            indice = json.load(f)
+    except (OSError, ValueError):
+        return None
+    if indice.get("formato") != FORMATO or not isinstance(indice.get("provincias"), dict):
+        return None
+    return indice
+
+
+def cargar_indice(sincronizar_si_falta: bool = True) -> Optional[dict]:
+    """
+    El índice más reciente entre el del paquete y el del usuario. Si no hay
+    ninguno se descarga una vez (sincronizar_ubicaciones).
+
+    Returns:
+        dict: Índice de ubicaciones, o None si no hay índice ni conexión.
+    """
+    global _indice
+    if _indice is None:
+        disponibles = [i for i in (_leer(ARCHIVO_PAQUETE), _leer(ARCHIVO_USUARIO)) if i]
+        if disponibles:
+            _indice = max(disponibles, key=lambda i: i.get("generado", ""))
+        elif sincronizar_si_falta:
+            console.print("[yellow]No hay índice local de ubicaciones; se descarga una sola vez.[/yellow]")
+            _indice = sincronizar_ubicaciones()
+    return _indice
+
+
+def sincronizar_ubicaciones(ruta: Path = ARCHIVO_USUARIO) -> Optional[dict]:
+    """
+    Descarga la tabla ubicacion y reescribe el índice en `ruta`.
+
+    Returns:
+        dict: El índice nuevo, o None si ocurre un error.
+    """
+    global _indice
+    from orgm.apps.adm.backend import iterar
+
+    try:
+        indice = construir_indice(list(iterar("ubicacion", orden="id")))
+        guardar_indice(indice, ruta)
+    except Exception as e:
+        console.print(f"[bold red]Error al sincronizar las ubicaciones: {e}[/bold red]")
+        return None
+    _indice = indice
+    return indice
+
+
+def filas_ubicaciones() -> Optional[list[dict]]:
+    """Ubicaciones del índice como filas de la tabla (id, provincia, distrito, distritomunicipal)."""
+    global _filas
+    indice = cargar_indice()
+    if indice is None:
+        return None
+    if _filas is None or _filas[0] is not indice:
+        filas = [
+            {"id": id_ubicacion, "provincia": provincia, "distrito": distrito, "distritomunicipal": municipio}
+            for provincia, distritos in indice["provincias"].items()
+            for distrito, municipios in distritos.items()
+            for id_ubicacion, municipio in municipios
+        ]
+        textos = [normalizar(f"{f['provincia']} {f['distrito']} {f['distritomunicipal']}") for f in filas]
+        _filas = (indice, filas, textos)
+    return _filas[1]
+
+
+def provincias() -> list[str]:
+    indice = cargar_indice()
+    return list(indice["provincias"]) if indice else []
+
+
+def distritos(provincia: str) -> list[str]:
+    indice = cargar_indice()
+    return list(indice["provincias"].get(provincia, {})) if indice else []
+
+
+def municipios(provincia: str, distrito: str) -> list[tuple[int, str]]:
+    """(id, distrito municipal) de un distrito."""
+    indice = cargar_indice()
+    if not indice:
+        return []
+    return [tuple(m) for m in indice["provincias"].get(provincia, {}).get(distrito, [])]
+
+
+def filtrar_ubicaciones(termino: str) -> Optional[list[dict]]:
+    """
+    Ubicaciones cuya provincia, distrito o distrito municipal contiene todas
+    las palabras de `termino` (sin acentos ni mayúsculas).
+
+    Returns:
+        list[dict]: Filas encontradas, o None si no hay índice.
+    """
+    filas = filas_ubicaciones()
+    if filas is None:
+        return None
+    palabras = normalizar(termino).split()
+    return [fila for fila, texto in zip(filas, _filas[2]) if all(p in texto for p in palabras)]
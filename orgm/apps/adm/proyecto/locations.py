@@ -1,4 +1,3 @@
-from orgm.stuff.initialize_postgrest import initialize
 from rich.console import Console
 from typing import List
 from orgm.apps.adm.db import Ubicacion
@@ -8,20 +7,15 @@ console = Console()
 
 
 def obtener_ubicaciones() -> List[Ubicacion]:
-    """Obtiene todas las ubicaciones disponibles"""
-    # Asegurar que las variables estén inicializadas
-    POSTGREST_URL, headers = initialize()
-
-    import requests
+    """Obtiene todas las ubicaciones disponibles (del índice local si existe)"""
     from orgm.apps.adm.db import Ubicacion
+    from orgm.apps.adm.backend import consultar
+    from orgm.apps.adm.proyecto.indice_ubicaciones import filas_ubicaciones
 
     try:
-        response = requests.get(
-            f"{POSTGREST_URL}/ubicacion", headers=headers, timeout=10
-        )
-        response.raise_for_status()
-
-        ubicaciones_data = response.json()
+        ubicaciones_data = filas_ubicaciones()
+        if ubicaciones_data is None:
+            ubicaciones_data = consultar("ubicacion")
         ubicaciones = [
             Ubicacion.model_validate(ubicacion) for ubicacion in ubicaciones_data
         ]
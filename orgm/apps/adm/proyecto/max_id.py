@@ -1,4 +1,3 @@
-from orgm.stuff.initialize_postgrest import initialize
 from rich.console import Console
 
 console = Console()
@@ -11,18 +10,10 @@ def obtener_id_maximo() -> int:
     Returns:
         int: ID máximo + 1 (siguiente ID disponible).
     """
-    # Asegurar que las variables estén inicializadas
-    POSTGREST_URL, headers = initialize()
-
-    import requests
+    from orgm.apps.adm.backend import siguiente_id
 
     try:
-        response = requests.get(
-            f"{POSTGREST_URL}/proyecto?select=id", headers=headers, timeout=10
-        )
-        response.raise_for_status()
-        proyectos = response.json()
-        return max(proyecto["id"] for proyecto in proyectos) + 1 if proyectos else 1
+        return siguiente_id("proyecto")
     except Exception as e:
         console.print(
             f"[bold red]Error al obtener ID máximo de proyectos: {e}[/bold red]"
@@ -8,6 +8,7 @@ from orgm.apps.adm.proyecto.get_project import (
 )
 from orgm.apps.adm.proyecto.form_project import formulario_proyecto
 from orgm.apps.adm.proyecto.find_project import buscar_proyectos
+from orgm.apps.adm.busqueda_local import completador_busqueda
 from orgm.apps.adm.proyecto.update_project import actualizar_proyecto
 from orgm.apps.adm.proyecto.create_project import crear_proyecto
 from orgm.apps.adm.proyecto.gui import iniciar_gui
@@ -44,7 +45,11 @@ def menu():
             mostrar_proyectos(proyectos)
 
         elif accion == "Buscar proyectos":
-            termino = questionary.text("Término de búsqueda:").ask()
+            termino = questionary.autocomplete(
+                "Término de búsqueda:",
+                choices=[],
+                completer=completador_busqueda("proyecto", "nombre_proyecto"),
+            ).ask()
             if termino:
                 with spinner(f"Buscando proyectos por '{termino}'..."):
                     proyectos = buscar_proyectos(termino)
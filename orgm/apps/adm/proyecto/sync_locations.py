@@ -0,0 +1,33 @@
+import typer
+from rich.console import Console
+from orgm.stuff.spinner import spinner
+
+console = Console()
+
+
+def sincronizar(
+    paquete: bool = typer.Option(
+        False, "--paquete", help="Escribir el índice en orgm/data de la copia del código fuente en lugar de ~/.orgm"
+    ),
+):
+    """Descarga las ubicaciones y actualiza el índice local (provincia, distrito y distrito municipal)."""
+    from orgm.apps.adm.proyecto.indice_ubicaciones import (
+        ARCHIVO_PAQUETE,
+        ARCHIVO_USUARIO,
+        cargar_indice,
+        sincronizar_ubicaciones,
+    )
+
+    anterior = cargar_indice(sincronizar_si_falta=False)
+    ruta = ARCHIVO_PAQUETE if paquete else ARCHIVO_USUARIO
+    with spinner("Descargando ubicaciones..."):
+        indice = sincronizar_ubicaciones(ruta)
+    if indice is None:
+        raise typer.Exit(code=1)
+
+    if anterior and anterior.get("suma") == indice["suma"]:
+        console.print(f"[green]Las ubicaciones no han cambiado ({indice['total']} registros)[/green]")
+    else:
+        console.print(
+            f"[bold green]{indice['total']} ubicaciones de {len(indice['provincias'])} provincias guardadas en {ruta}[/bold green]"
+        )
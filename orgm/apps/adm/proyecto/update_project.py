@@ -1,7 +1,6 @@
-import requests
 from typing import Optional, Dict
 from orgm.apps.adm.db import Proyecto
-from orgm.stuff.initialize_postgrest import initialize
+from orgm.apps.adm.backend import actualizar
 from rich.console import Console
 from orgm.apps.adm.proyecto.get_project import obtener_proyecto
 from orgm.apps.ai.generate import generate_text
@@ -13,38 +12,27 @@ console = Console()
 
 def actualizar_proyecto(id_proyecto: int, proyecto_data: Dict) -> Optional[Proyecto]:
     """Actualiza un proyecto existente"""
-    # Asegurar que las variables estén inicializadas
-
-    POSTGREST_URL, headers = initialize()
-
     try:
-        # Verificar que el proyecto existe
-        proyecto_existente = obtener_proyecto(id_proyecto)
-        if not proyecto_existente:
-            return None
-
-        # Si la descripción está vacía, generarla automáticamente
+        # Si la descripción está vacía, generarla automáticamente. Solo se lee
+        # el proyecto si los datos no traen el nombre.
         if "descripcion" in proyecto_data and not proyecto_data["descripcion"]:
-            nombre = proyecto_data.get(
-                "nombre_proyecto", proyecto_existente.nombre_proyecto
-            )
+            nombre = proyecto_data.get("nombre_proyecto")
+            if not nombre:
+                proyecto_existente = obtener_proyecto(id_proyecto)
+                if not proyecto_existente:
+                    return None
+                nombre = proyecto_existente.nombre_proyecto
             descripcion = generate_text(nombre, "descripcion_electromecanica")
             print(f"Descripción generada: {descripcion}")
             if descripcion:
                 proyecto_data["descripcion"] = descripcion
 
-        update_headers = headers.copy()
-        update_headers["Prefer"] = "return=representation"
-
-        response = requests.patch(
-            f"{POSTGREST_URL}/proyecto?id=eq.{id_proyecto}",
-            headers=update_headers,
-            json=proyecto_data,
-            timeout=10,
-        )
-        response.raise_for_status()
-
-        proyecto_actualizado = Proyecto.parse_obj(response.json()[0])
+        # Sin filas devueltas: no existe un proyecto con ese ID
+        filas = actualizar("proyecto", {"id": id_proyecto}, proyecto_data)
+        if not filas:
+            console.print(f"[bold red]Proyecto con ID {id_proyecto} no encontrado[/bold red]")
+            return None
+        proyecto_actualizado = Proyecto.parse_obj(filas[0])
         console.print(
             f"[bold green]Proyecto actualizado correctamente: [blue]{proyecto_actualizado.nombre_proyecto}[/blue][/bold green] \n"
             f"[bold green]Descripción: [blue]{proyecto_actualizado.descripcion}[/blue][/bold green] \n"
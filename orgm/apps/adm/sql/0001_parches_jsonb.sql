@@ -0,0 +1,127 @@
+-- Parches JSON (RFC 6902) para los documentos JSONB de presupuesto y notas,
+-- con control de concurrencia optimista por número de versión.
+
+ALTER TABLE presupuesto ADD COLUMN IF NOT EXISTS version integer NOT NULL DEFAULT 1;
+ALTER TABLE notas ADD COLUMN IF NOT EXISTS version integer NOT NULL DEFAULT 1;
+
+-- Toda modificación incrementa la versión, también las que no usan parches.
+CREATE OR REPLACE FUNCTION incrementar_version() RETURNS trigger
+LANGUAGE plpgsql AS $$
+BEGIN
+    NEW.version := OLD.version + 1;
+    RETURN NEW;
+END
+$$;
+
+DROP TRIGGER IF EXISTS presupuesto_version ON presupuesto;
+CREATE TRIGGER presupuesto_version BEFORE UPDATE ON presupuesto
+    FOR EACH ROW EXECUTE FUNCTION incrementar_version();
+
+DROP TRIGGER IF EXISTS notas_version ON notas;
+CREATE TRIGGER notas_version BEFORE UPDATE ON notas
+    FOR EACH ROW EXECUTE FUNCTION incrementar_version();
+
+-- Convierte un JSON Pointer ("/children/0/precio") en una ruta de jsonb.
+CREATE OR REPLACE FUNCTION jsonb_ruta(puntero text) RETURNS text[]
+LANGUAGE sql IMMUTABLE AS $$
+    SELECT coalesce(
+        array_agg(replace(replace(parte, '~1', '/'), '~0', '~') ORDER BY n),
+        '{}'::text[]
+    )
+    FROM unnest(string_to_array(substr(puntero, 2), '/')) WITH ORDINALITY AS t(parte, n)
+$$;
+
+-- Aplica las operaciones add, remove y replace de un parche JSON.
+CREATE OR REPLACE FUNCTION jsonb_aplicar_parche(documento jsonb, parche jsonb) RETURNS jsonb
+LANGUAGE plpgsql IMMUTABLE AS $$
+DECLARE
+    operacion jsonb;
+    ruta text[];
+    padre text[];
+    largo integer;
+    indice integer;
+BEGIN
+    FOR operacion IN SELECT * FROM jsonb_array_elements(parche) LOOP
+        ruta := jsonb_ruta(operacion->>'path');
+        largo := cardinality(ruta);
+        padre := ruta[1:largo - 1];
+
+        IF largo = 0 THEN
+            IF operacion->>'op' IN ('add', 'replace') THEN
+                documento := operacion->'value';
+                CONTINUE;
+            END IF;
+            RAISE EXCEPTION USING MESSAGE = 'No se puede eliminar la raíz del documento';
+        END IF;
+
+        CASE operacion->>'op'
+            WHEN 'replace' THEN
+                IF documento #> ruta IS NULL THEN
+                    RAISE EXCEPTION USING MESSAGE = 'Ruta inexistente: ' || (operacion->>'path');
+                END IF;
+                documento := jsonb_set(documento, ruta, operacion->'value', false);
+            WHEN 'add' THEN
+                IF jsonb_typeof(documento #> padre) = 'array' THEN
+                    IF ruta[largo] = '-' THEN
+                        indice := jsonb_array_length(documento #> padre);
+                    ELSE
+                        indice := ruta[largo]::integer;
+                    END IF;
+                    IF indice >= jsonb_array_length(documento #> padre) THEN
+                        -- Al final del arreglo: jsonb_set agrega el elemento
+                        ruta[largo] := indice::text;
+                        documento := jsonb_set(documento, ruta, operacion->'value', true);
+                    ELSE
+                        documento := jsonb_insert(documento, ruta, operacion->'value');
+                    END IF;
+                ELSE
+                    documento := jsonb_set(documento, ruta, operacion->'value', true);
+                END IF;
+            WHEN 'remove' THEN
+                IF documento #> ruta IS NULL THEN
+                    RAISE EXCEPTION USING MESSAGE = 'Ruta inexistente: ' || (operacion->>'path');
+                END IF;
+                documento := documento #- ruta;
+            ELSE
+                RAISE EXCEPTION USING MESSAGE = 'Operación no soportada: ' || (operacion->>'op');
+        END CASE;
+    END LOOP;
+    RETURN documento;
+END
+$$;
+
+-- RPC de PostgREST: aplica el parche si la versión coincide. Si otro usuario
+-- guardó antes, responde HTTP 409.
+CREATE OR REPLACE FUNCTION aplicar_parche_presupuesto(p_id integer, p_version integer, p_parche jsonb)
+RETURNS TABLE (id integer, version integer)
+LANGUAGE plpgsql AS $$
+#variable_conflict use_column
+BEGIN
+    RETURN QUERY
+        UPDATE presupuesto AS t
+        SET presupuesto = jsonb_aplicar_parche(t.presupuesto, p_parche)
+        WHERE t.id = p_id AND t.version = p_version
+        RETURNING t.id, t.version;
+    IF NOT FOUND THEN
+        RAISE SQLSTATE 'PT409' USING MESSAGE = 'El presupuesto fue modificado por otro usuario';
+    END IF;
+END
+$$;
+
+CREATE OR REPLACE FUNCTION aplicar_parche_notas(p_id integer, p_version integer, p_parche jsonb)
+RETURNS TABLE (id integer, version integer)
+LANGUAGE plpgsql AS $$
+#variable_conflict use_column
+BEGIN
+    RETURN QUERY
+        UPDATE notas AS t
+        SET notas = jsonb_aplicar_parche(t.notas, p_parche)
+        WHERE t.id = p_id AND t.version = p_version
+        RETURNING t.id, t.version;
+    IF NOT FOUND THEN
+        RAISE SQLSTATE 'PT409' USING MESSAGE = 'Las notas fueron modificadas por otro usuario';
+    END IF;
+END
+$$;
+
+NOTIFY pgrst, 'reload schema';
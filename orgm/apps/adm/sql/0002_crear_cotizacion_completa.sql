@@ -0,0 +1,85 @@
+-- Crea una cotización con su presupuesto y sus notas en una sola
+-- transacción y devuelve la cotización con ambos documentos incluidos.
+--
+-- Solo se insertan las columnas presentes en el JSON, de modo que las demás
+-- toman su valor por defecto. Si no se indica el id se usa el siguiente al
+-- máximo, igual que obtener_id_maximo(), bloqueando la tabla para que dos
+-- creaciones simultáneas no obtengan el mismo.
+
+-- Inserta una fila a partir de un objeto JSON. Se ejecuta con los permisos
+-- de quien llama, pero va en el esquema orgm_privado, que PostgREST no
+-- expone: solo se puede usar desde otras funciones, no desde /rpc.
+CREATE SCHEMA IF NOT EXISTS orgm_privado;
+GRANT USAGE ON SCHEMA orgm_privado TO PUBLIC;
+
+CREATE OR REPLACE FUNCTION orgm_privado.insertar_desde_jsonb(tabla regclass, datos jsonb) RETURNS jsonb
+LANGUAGE plpgsql AS $$
+DECLARE
+    columnas text;
+    fila jsonb;
+BEGIN
+    SELECT string_agg(quote_ident(a.attname), ', ')
+    INTO columnas
+    FROM pg_attribute a
+    WHERE a.attrelid = tabla
+      AND a.attnum > 0
+      AND NOT a.attisdropped
+      AND datos ? a.attname;
+
+    IF columnas IS NULL THEN
+        EXECUTE 'INSERT INTO ' || tabla || ' AS t DEFAULT VALUES RETURNING to_jsonb(t.*)'
+        INTO fila;
+    ELSE
+        EXECUTE 'INSERT INTO ' || tabla || ' AS t (' || columnas || ') '
+             || 'SELECT ' || columnas || ' FROM jsonb_populate_record(NULL::' || tabla || ', $1) '
+             || 'RETURNING to_jsonb(t.*)'
+        INTO fila
+        USING datos;
+    END IF;
+    RETURN fila;
+END
+$$;
+
+CREATE OR REPLACE FUNCTION crear_cotizacion_completa(
+    p_cotizacion jsonb,
+    p_presupuesto jsonb DEFAULT NULL,
+    p_notas jsonb DEFAULT NULL
+) RETURNS jsonb
+LANGUAGE plpgsql AS $$
+DECLARE
+    datos jsonb := p_cotizacion;
+    cotizacion_creada jsonb;
+    presupuesto_creado jsonb;
+    notas_creadas jsonb;
+BEGIN
+    IF NOT datos ? 'id' OR datos->'id' = 'null'::jsonb THEN
+        LOCK TABLE cotizacion IN SHARE ROW EXCLUSIVE MODE;
+        datos := datos || jsonb_build_object(
+            'id', (SELECT coalesce(max(id), 0) + 1 FROM cotizacion)
+        );
+    END IF;
+
+    cotizacion_creada := orgm_privado.insertar_desde_jsonb('cotizacion', datos);
+
+    IF p_presupuesto IS NOT NULL THEN
+        presupuesto_creado := orgm_privado.insertar_desde_jsonb('presupuesto', jsonb_build_object(
+            'id_cotizacion', cotizacion_creada->'id',
+            'presupuesto', p_presupuesto
+        ));
+    END IF;
+
+    IF p_notas IS NOT NULL THEN
+        notas_creadas := orgm_privado.insertar_desde_jsonb('notas', jsonb_build_object(
+            'id_cotizacion', cotizacion_creada->'id',
+            'notas', p_notas
+        ));
+    END IF;
+
+    RETURN cotizacion_creada || jsonb_build_object(
+        'presupuesto', presupuesto_creado,
+        'notas', notas_creadas
+    );
+END
+$$;
+
+NOTIFY pgrst, 'reload schema';
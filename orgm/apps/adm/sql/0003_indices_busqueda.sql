@@ -0,0 +1,89 @@
+-- Índices para las búsquedas con ILIKE '*texto*' de clientes, proyectos y
+-- ubicaciones, que de otro modo recorren la tabla completa.
+--
+-- pg_trgm permite usar índices GIN con ILIKE y similitud; la columna
+-- generada "busqueda" guarda los campos de búsqueda en minúsculas y sin
+-- acentos para comparar "Jose" con "José". También se indexan las claves
+-- foráneas usadas para filtrar cotizaciones y pagos.
+--
+-- Sin copia local, orgm busca en el servidor con busqueda=ilike.*texto*
+-- y el texto pasado por orgm.stuff.texto.sin_acentos(), que normaliza igual
+-- que sin_acentos() (busqueda_local.buscar_servidor).
+
+CREATE EXTENSION IF NOT EXISTS pg_trgm;
+CREATE EXTENSION IF NOT EXISTS unaccent;
+
+-- unaccent() no es IMMUTABLE (depende del search_path), por lo que no puede
+-- usarse en columnas generadas. Se envuelve indicando el esquema y el
+-- diccionario, que es la forma habitual de fijarlo.
+DO $$
+DECLARE
+    esquema text;
+BEGIN
+    SELECT quote_ident(n.nspname) INTO esquema
+    FROM pg_extension e JOIN pg_namespace n ON n.oid = e.extnamespace
+    WHERE e.extname = 'unaccent';
+
+    EXECUTE 'CREATE OR REPLACE FUNCTION sin_acentos(texto text) RETURNS text '
+        || 'LANGUAGE sql IMMUTABLE PARALLEL SAFE STRICT AS '
+        || quote_literal(
+            'SELECT lower(' || esquema || '.unaccent('
+            || quote_literal(esquema || '.unaccent') || '::regdictionary, texto))'
+        );
+END
+$$;
+
+ALTER TABLE cliente ADD COLUMN IF NOT EXISTS busqueda text GENERATED ALWAYS AS (
+    sin_acentos(coalesce(nombre, '') || ' ' || coalesce(nombre_comercial, ''))
+) STORED;
+
+ALTER TABLE proyecto ADD COLUMN IF NOT EXISTS busqueda text GENERATED ALWAYS AS (
+    sin_acentos(
+        coalesce(nombre_proyecto, '') || ' ' || coalesce(ubicacion, '') || ' ' || coalesce(descripcion, '')
+    )
+) STORED;
+
+ALTER TABLE ubicacion ADD COLUMN IF NOT EXISTS busqueda text GENERATED ALWAYS AS (
+    sin_acentos(
+        coalesce(provincia, '') || ' ' || coalesce(distrito, '') || ' ' || coalesce(distritomunicipal, '')
+    )
+) STORED;
+
+-- Índices trigram. La clase de operadores se toma del esquema donde esté
+-- instalado pg_trgm, que puede no estar en el search_path.
+DO $$
+DECLARE
+    operadores text;
+    indice text[];
+BEGIN
+    SELECT quote_ident(n.nspname) || '.gin_trgm_ops' INTO operadores
+    FROM pg_extension e JOIN pg_namespace n ON n.oid = e.extnamespace
+    WHERE e.extname = 'pg_trgm';
+
+    FOREACH indice SLICE 1 IN ARRAY ARRAY[
+        ['cliente', 'nombre'],
+        ['cliente', 'nombre_comercial'],
+        ['cliente', 'busqueda'],
+        ['proyecto', 'nombre_proyecto'],
+        ['proyecto', 'descripcion'],
+        ['proyecto', 'ubicacion'],
+        ['proyecto', 'busqueda'],
+        ['ubicacion', 'provincia'],
+        ['ubicacion', 'distrito'],
+        ['ubicacion', 'distritomunicipal'],
+        ['ubicacion', 'busqueda']
+    ] LOOP
+        EXECUTE 'CREATE INDEX IF NOT EXISTS ' || quote_ident(indice[1] || '_' || indice[2] || '_trgm')
+            || ' ON ' || quote_ident(indice[1])
+            || ' USING gin (' || quote_ident(indice[2]) || ' ' || operadores || ')';
+    END LOOP;
+END
+$$;
+
+-- Claves foráneas usadas en filtros (id_cliente=eq.N, etc.)
+CREATE INDEX IF NOT EXISTS cotizacion_id_cliente_idx ON cotizacion (id_cliente);
+CREATE INDEX IF NOT EXISTS cotizacion_id_proyecto_idx ON cotizacion (id_proyecto);
+CREATE INDEX IF NOT EXISTS asignacionpago_id_cotizacion_idx ON asignacionpago (id_cotizacion);
+CREATE INDEX IF NOT EXISTS pagorecibido_id_cliente_idx ON pagorecibido (id_cliente);
+
+NOTIFY pgrst, 'reload schema';
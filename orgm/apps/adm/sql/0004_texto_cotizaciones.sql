@@ -0,0 +1,84 @@
+-- Búsqueda de texto completo en la descripción de las cotizaciones.
+--
+-- La configuración es_sin_acentos es la española (stemmer incluido) con
+-- unaccent antes, para que "subestacion" encuentre "subestaciones". El
+-- tsvector no se guarda en una columna, que aparecería en select=* y en la
+-- copia local completa de la tabla: se indexa la expresión con GIN y
+-- buscar_cotizaciones_texto() filtra con la misma expresión para usar el
+-- índice. La función ordena por relevancia y devuelve un fragmento
+-- resaltado de cada cotización.
+
+DO $$
+DECLARE
+    esquema text;
+BEGIN
+    IF NOT EXISTS (SELECT 1 FROM pg_ts_config WHERE cfgname = 'es_sin_acentos') THEN
+        SELECT quote_ident(n.nspname) INTO esquema
+        FROM pg_extension e JOIN pg_namespace n ON n.oid = e.extnamespace
+        WHERE e.extname = 'unaccent';
+
+        CREATE TEXT SEARCH CONFIGURATION es_sin_acentos (COPY = pg_catalog.spanish);
+        EXECUTE 'ALTER TEXT SEARCH CONFIGURATION es_sin_acentos '
+            || 'ALTER MAPPING FOR hword, hword_part, word WITH '
+            || esquema || '.unaccent, spanish_stem';
+    END IF;
+END
+$$;
+
+CREATE INDEX IF NOT EXISTS cotizacion_descripcion_fts_idx ON cotizacion
+    USING gin (to_tsvector('es_sin_acentos', coalesce(descripcion, '')));
+
+-- El texto se interpreta como en un buscador web: palabras (todas deben
+-- aparecer), "frases entre comillas", "or" y -exclusiones. El fragmento
+-- marca las coincidencias entre « y », y solo se calcula para las filas
+-- devueltas porque ts_headline lee la descripción completa.
+CREATE OR REPLACE FUNCTION buscar_cotizaciones_texto(texto text, limite integer DEFAULT 20)
+RETURNS TABLE (
+    id integer,
+    id_cliente integer,
+    id_proyecto integer,
+    cliente text,
+    proyecto text,
+    fecha text,
+    estado text,
+    moneda text,
+    total double precision,
+    rango real,
+    fragmento text
+)
+LANGUAGE sql STABLE AS $$
+    WITH consulta AS (
+        SELECT websearch_to_tsquery('es_sin_acentos', texto) AS q
+    ),
+    mejores AS (
+        SELECT
+            c.id, c.id_cliente, c.id_proyecto, c.fecha, c.estado, c.moneda, c.total, c.descripcion,
+            ts_rank_cd(to_tsvector('es_sin_acentos', coalesce(c.descripcion, '')), consulta.q) AS rango
+        FROM cotizacion c, consulta
+        WHERE to_tsvector('es_sin_acentos', coalesce(c.descripcion, '')) @@ consulta.q
+        ORDER BY rango DESC, c.id DESC
+        LIMIT limite
+    )
+    SELECT
+        m.id,
+        m.id_cliente,
+        m.id_proyecto,
+        cl.nombre::text,
+        p.nombre_proyecto::text,
+        m.fecha::text,
+        m.estado::text,
+        m.moneda::text,
+        m.total::double precision,
+        m.rango::real,
+        ts_headline(
+            'es_sin_acentos', m.descripcion, consulta.q,
+            'StartSel=«, StopSel=», MaxFragments=2, MaxWords=20, MinWords=8, FragmentDelimiter=" … "'
+        )
+    FROM mejores m
+    CROSS JOIN consulta
+    LEFT JOIN cliente cl ON cl.id = m.id_cliente
+    LEFT JOIN proyecto p ON p.id = m.id_proyecto
+    ORDER BY m.rango DESC, m.id DESC;
+$$;
+
+NOTIFY pgrst, 'reload schema';
@@ -4,6 +4,7 @@ import json
 from pathlib import Path
 from rich.console import Console
 from orgm.stuff.header import get_headers_json
+from orgm.stuff.http import invalidar_cache
 import questionary
 
 console = Console()
@@ -83,6 +84,7 @@ def ai_config_upload() -> None:
             timeout=15,
         )
         response.raise_for_status()
+        invalidar_cache(f"{API_URL}/configs")
 
         console.print(
             f"[bold green]Configuración '{config_name}' subida correctamente.[/bold green]"
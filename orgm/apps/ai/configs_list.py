@@ -3,6 +3,7 @@ import requests
 import json
 from rich.console import Console
 from orgm.stuff.header import get_headers_json
+from orgm.stuff.http import obtener_en_cache
 
 console = Console()
 
@@ -20,7 +21,7 @@ def ai_configs_list() -> None:
     headers = get_headers_json()
 
     try:
-        response = requests.get(f"{API_URL}/configs", headers=headers, timeout=10)
+        response = obtener_en_cache(f"{API_URL}/configs", headers=headers, timeout=10)
         response.raise_for_status()
 
         configs = response.json()
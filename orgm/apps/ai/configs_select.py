@@ -3,6 +3,7 @@ import requests
 import json
 from rich.console import Console
 from orgm.stuff.header import get_headers_json
+from orgm.stuff.http import obtener_en_cache
 from typing import List, Optional
 
 console = Console()
@@ -21,7 +22,7 @@ def ai_configs_select() -> Optional[List[str]]:
     headers = get_headers_json()
 
     try:
-        response = requests.get(f"{API_URL}/configs", headers=headers, timeout=10)
+        response = obtener_en_cache(f"{API_URL}/configs", headers=headers, timeout=10)
         response.raise_for_status()
 
         configs = response.json()
@@ -4,6 +4,7 @@ from orgm.apps.conf.env_file import env_file
 from orgm.apps.conf.env_edit import env_edit
 from orgm.apps.conf.ayuda import mostrar_ayuda
 from orgm.apps.conf.menu import menu
+from orgm.apps.conf.migrate import migrar
 
 app = typer.Typer(help="Comandos de Configuración de ORGM")
 
@@ -12,6 +13,7 @@ app.command(name="env-file")(env_file)
 app.command(name="env-edit")(env_edit)
 app.command(name="ayuda")(mostrar_ayuda)
 app.command(name="help")(mostrar_ayuda)
+app.command(name="migrate")(migrar)
 
 
 @app.callback(invoke_without_command=True)
@@ -0,0 +1,51 @@
+import typer
+from rich.console import Console
+from rich.table import Table
+
+console = Console()
+
+
+def migrar(
+    estado: bool = typer.Option(False, "--estado", help="Solo muestra las migraciones aplicadas y pendientes"),
+):
+    """
+    Crea las tablas que falten y aplica las migraciones SQL pendientes
+    (DATABASE_USER, DATABASE_PASSWORD, DATABASE_HOST, DATABASE_NAME).
+    Se puede ejecutar varias veces: solo aplica lo que falta. Termina con
+    código 1 si alguna migración falla.
+    """
+    from orgm.apps.adm import db
+    from orgm.apps.adm.migraciones import aplicar_migraciones, estado_migraciones
+
+    if db.engine is None:
+        db.initialize_db()
+    if db.engine is None:
+        console.print(
+            "[bold red]Configure DATABASE_USER, DATABASE_PASSWORD, DATABASE_HOST y DATABASE_NAME para migrar la base de datos[/bold red]"
+        )
+        raise typer.Exit(code=1)
+
+    fallo = False
+    if not estado:
+        try:
+            db.crear_tablas()
+            if not aplicar_migraciones(db.engine):
+                console.print("La base de datos ya tiene todas las migraciones")
+        except Exception as e:
+            console.print(f"[bold red]Error al migrar la base de datos: {e}[/bold red]")
+            fallo = True
+
+    try:
+        migraciones = estado_migraciones(db.engine)
+    except Exception as e:
+        console.print(f"[bold red]Error al consultar las migraciones: {e}[/bold red]")
+        raise typer.Exit(code=1)
+
+    tabla = Table(title="Migraciones")
+    tabla.add_column("Script", style="cyan")
+    tabla.add_column("Estado")
+    for nombre, aplicada in migraciones:
+        tabla.add_row(nombre, "[green]aplicada[/green]" if aplicada else "[yellow]pendiente[/yellow]")
+    console.print(tabla)
+    if fallo:
+        raise typer.Exit(code=1)
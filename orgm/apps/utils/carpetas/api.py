@@ -2,6 +2,7 @@ import requests
 import json
 from typing import Dict, List, Optional
 from orgm.stuff.initialize_postgrest import initialize
+from orgm.stuff.http import obtener_en_cache
 from rich.console import Console
 
 console = Console()
@@ -22,8 +23,9 @@ def obtener_servicios() -> List[Dict]:
     
     try:
         # Realizar solicitud GET a la tabla de servicios
-        response = requests.get(
-            f"{postgrest_url}/servicio?select=id,nombre",
+        response = obtener_en_cache(
+            f"{postgrest_url}/servicio",
+            params={"select": "id,nombre"},
             headers=headers
         )
         
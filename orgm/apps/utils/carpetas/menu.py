@@ -2,6 +2,7 @@ import questionary
 import os
 
 from orgm.qstyle import custom_style_fancy
+from orgm.stuff.selector import seleccionar, filtro_opciones
 
 from rich.console import Console
 
@@ -39,35 +40,35 @@ def menu():
             style=custom_style_fancy
         ).ask()
         
-        # Buscar clientes que coincidan con el nombre
-        clientes = buscar_clientes(nombre_cliente)
-        
-        if not clientes or len(clientes) == 0:
-            console.print("No se encontraron clientes con ese nombre", style="bold red")
-            return menu()
-        
-        # Crear lista de opciones para selección de cliente
-        opciones_clientes = [
-            f"{cliente['id']} - {cliente['nombre']} ({cliente['nombre_comercial'] or 'Sin nombre comercial'})" 
-            for cliente in clientes
-        ]
-        
-        # Agregar opción para volver al menú
-        opciones_clientes.append("Volver al menú")
-        
+        # Selector con filtro mientras se escribe sobre el índice local de
+        # clientes; sin copia local se filtran los encontrados en el servidor
+        from orgm.apps.adm.busqueda_local import buscador_local
+
+        def etiqueta_cliente(cliente):
+            return f"{cliente['id']} - {cliente['nombre']} ({cliente.get('nombre_comercial') or 'Sin nombre comercial'})"
+
+        buscar = buscador_local("cliente", etiqueta_cliente)
+        if buscar is None:
+            clientes = buscar_clientes(nombre_cliente)
+
+            if not clientes or len(clientes) == 0:
+                console.print("No se encontraron clientes con ese nombre", style="bold red")
+                return menu()
+
+            buscar = filtro_opciones([(cliente["id"], etiqueta_cliente(cliente)) for cliente in clientes])
+            nombre_cliente = ""
+
         # Preguntar cuál cliente desea seleccionar
-        cliente_seleccionado = questionary.select(
+        id_cliente = seleccionar(
             "Seleccione un cliente",
-            choices=opciones_clientes,
-            style=custom_style_fancy
-        ).ask()
-        
-        if cliente_seleccionado == "Volver al menú":
+            buscar=buscar,
+            texto_inicial=nombre_cliente or "",
+            estilo=custom_style_fancy,
+        )
+
+        if id_cliente is None:
             return menu()
-        
-        # Extraer el ID del cliente
-        id_cliente = int(cliente_seleccionado.split(" - ")[0])
-        
+
         # Buscar cotizaciones de ese cliente
         cotizaciones = buscar_cotizaciones(id_cliente)
         
@@ -77,26 +78,20 @@ def menu():
         
         # Crear lista de opciones para selección de cotización
         opciones_cotizaciones = [
-            f"{cot['id']} - {cot['servicio']['nombre']} - {cot['proyecto']['nombre_proyecto']}" 
+            (cot["id"], f"{cot['id']} - {cot['servicio']['nombre']} - {cot['proyecto']['nombre_proyecto']}")
             for cot in cotizaciones
         ]
-        
-        # Agregar opción para volver al menú
-        opciones_cotizaciones.append("Volver al menú")
-        
+
         # Preguntar cuál cotización desea seleccionar
-        cotizacion_seleccionada = questionary.select(
+        id_cotizacion = seleccionar(
             "Seleccione una cotización",
-            choices=opciones_cotizaciones,
-            style=custom_style_fancy
-        ).ask()
-        
-        if cotizacion_seleccionada == "Volver al menú":
+            opciones=opciones_cotizaciones,
+            estilo=custom_style_fancy,
+        )
+
+        if id_cotizacion is None:
             return menu()
-        
-        # Extraer el ID de la cotización
-        id_cotizacion = int(cotizacion_seleccionada.split(" - ")[0])
-        
+
         # Crear carpeta con la cotización seleccionada
         crear_carpeta_proyecto(id_cotizacion)
         console.print(f"Carpeta creada exitosamente para la cotización {id_cotizacion}", style="bold green")
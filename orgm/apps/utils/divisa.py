@@ -1,30 +1,317 @@
 
 import os
+import sqlite3
+import threading
+import time
+from contextlib import contextmanager
+from datetime import date
 import requests
 from orgm.stuff.initialize_api import initialize
 
-def obtener_tasa_divisa(desde: str = "USD", a: str = "DOP", cantidad: float = 1) -> float | None:
-    """Obtiene la tasa de cambio entre dos divisas"""
+RUTA_CACHE_DIVISAS = os.path.join(os.path.expanduser("~"), ".orgm", "divisas.sqlite")
 
-    API_URL, headers = initialize()
+# Segundos que una tasa del día se considera vigente. Las tasas de fechas
+# pasadas no cambian y no vencen, siempre que se sepa que son de esa fecha
+# (la API devolvió la fecha pedida o vienen de un CSV); si no, vencen igual
+# que las del día.
+TTL_DIVISA = int(os.getenv("DIVISA_TTL", "3600"))
+
+# Tasas en memoria: (desde, a, fecha) -> (tasa, momento en que se obtuvo, confirmada)
+_memoria = {}
+_bloqueo = threading.Lock()
+_en_curso = set()
 
+
+@contextmanager
+def _conexion():
+    """Abre la caché en disco dentro de una transacción y la cierra al salir."""
+    os.makedirs(os.path.dirname(RUTA_CACHE_DIVISAS), exist_ok=True)
+    conexion = sqlite3.connect(RUTA_CACHE_DIVISAS, timeout=10)
     try:
-        response = requests.post(
-            f"{API_URL}/divisa",
-            json={"desde": desde, "a": a, "cantidad": cantidad},
-            timeout=10,
+        with conexion:
+            conexion.execute(
+                "CREATE TABLE IF NOT EXISTS tasas ("
+                "desde TEXT NOT NULL, a TEXT NOT NULL, fecha TEXT NOT NULL, "
+                "tasa REAL NOT NULL, obtenida REAL NOT NULL, "
+                "PRIMARY KEY (desde, a, fecha))"
+            )
+            columnas = [fila[1] for fila in conexion.execute("PRAGMA table_info(tasas)")]
+            if "confirmada" not in columnas:
+                # Las tasas guardadas antes de esta columna no se consideran confirmadas
+                conexion.execute("ALTER TABLE tasas ADD COLUMN confirmada INTEGER NOT NULL DEFAULT 0")
+            yield conexion
+    finally:
+        conexion.close()
+
+
+def validar_fecha(fecha: str | date | None, futura: bool = False) -> str:
+    """
+    Fecha de una tasa en formato YYYY-MM-DD (hoy si está vacía).
+
+    Raises:
+        ValueError: Si la fecha no es una fecha ISO válida, o si es futura y
+        `futura` es False.
+    """
+    if isinstance(fecha, date):
+        valor = fecha
+    elif not fecha or not fecha.strip():
+        return date.today().isoformat()
+    else:
+        valor = date.fromisoformat(fecha.strip()[:10])
+    if valor > date.today() and not futura:
+        raise ValueError(f"La fecha {valor.isoformat()} es futura")
+    return valor.isoformat()
+
+
+def guardar_tasa(
+    desde: str, a: str, fecha: str, tasa: float, obtenida: float | None = None, confirmada: bool = False
+) -> None:
+    """
+    Guarda una tasa en memoria y en la caché en disco. `confirmada` indica
+    que se sabe que la tasa es de esa fecha.
+    """
+    obtenida = obtenida or time.time()
+    clave = (desde.upper(), a.upper(), fecha)
+    with _bloqueo:
+        _memoria[clave] = (tasa, obtenida, confirmada)
+    with _conexion() as conexion:
+        conexion.execute(
+            "INSERT OR REPLACE INTO tasas (desde, a, fecha, tasa, obtenida, confirmada) VALUES (?, ?, ?, ?, ?, ?)",
+            (*clave, tasa, obtenida, int(confirmada)),
         )
-        response.raise_for_status()
-        # Quitado: print("Divisa response:", response.json())
-        return response.json().get(
-            "resultado"
-        )  # Devuelve None si 'resultado' no existe
+
+
+def tasa_en_cache(desde: str, a: str, fecha: str) -> tuple[float, float, bool] | None:
+    """
+    Busca una tasa en memoria o en disco. Si solo existe la tasa inversa
+    se usa su recíproco.
+
+    Returns:
+        tuple: (tasa, momento en que se obtuvo, confirmada) o None.
+    """
+    desde, a = desde.upper(), a.upper()
+    with _bloqueo:
+        if (desde, a, fecha) in _memoria:
+            return _memoria[(desde, a, fecha)]
+        if (a, desde, fecha) in _memoria:
+            tasa, obtenida, confirmada = _memoria[(a, desde, fecha)]
+            return 1 / tasa, obtenida, confirmada
+
+    try:
+        with _conexion() as conexion:
+            fila = conexion.execute(
+                "SELECT desde, tasa, obtenida, confirmada FROM tasas "
+                "WHERE fecha = ? AND ((desde = ? AND a = ?) OR (desde = ? AND a = ?)) "
+                "ORDER BY desde = ? DESC LIMIT 1",
+                (fecha, desde, a, a, desde, desde),
+            ).fetchone()
+    except sqlite3.Error:
+        return None
+    if not fila:
+        return None
+
+    origen, tasa, obtenida, confirmada = fila
+    if origen != desde:
+        tasa = 1 / tasa
+    with _bloqueo:
+        _memoria[(desde, a, fecha)] = (tasa, obtenida, bool(confirmada))
+    return tasa, obtenida, bool(confirmada)
+
+
+def consultar_tasa_api(desde: str, a: str, fecha: str | None = None) -> tuple[float | None, bool]:
+    """
+    Consulta la tasa unitaria en API_URL/divisa, sin usar la caché.
+
+    Para fechas distintas de hoy se envía el campo "fecha" (YYYY-MM-DD). Si
+    la API no devuelve esa misma fecha en la respuesta no se puede saber si
+    la tomó en cuenta.
+
+    Returns:
+        tuple: (tasa o None, True si la respuesta confirma la fecha pedida)
+    """
+    API_URL, headers = initialize()
+    payload = {"desde": desde, "a": a, "cantidad": 1}
+    historica = bool(fecha) and fecha != date.today().isoformat()
+    if historica:
+        payload["fecha"] = fecha
+
+    from orgm.stuff.http import obtener_sesion
+
+    response = obtener_sesion().post(
+        f"{API_URL}/divisa", json=payload, headers=headers, timeout=10
+    )
+    response.raise_for_status()
+    datos = response.json()
+    confirmada = historica and str(datos.get("fecha") or "")[:10] == fecha
+    return datos.get("resultado"), confirmada  # None si 'resultado' no existe
+
+
+def _revalidar(desde: str, a: str, fecha: str) -> None:
+    """Actualiza una tasa vencida en segundo plano."""
+    clave = (desde.upper(), a.upper(), fecha)
+    with _bloqueo:
+        if clave in _en_curso:
+            return
+        _en_curso.add(clave)
+
+    def tarea():
+        try:
+            tasa, confirmada = consultar_tasa_api(desde, a, fecha)
+            if tasa:
+                guardar_tasa(desde, a, fecha, tasa, confirmada=confirmada)
+        except Exception:
+            pass
+        finally:
+            with _bloqueo:
+                _en_curso.discard(clave)
+
+    threading.Thread(target=tarea, daemon=True).start()
+
+
+def obtener_tasa_divisa(
+    desde: str = "USD",
+    a: str = "DOP",
+    cantidad: float = 1,
+    fecha: str | None = None,
+    esperar: bool = False,
+) -> float | None:
+    """
+    Obtiene la tasa de cambio entre dos divisas, multiplicada por `cantidad`.
+
+    Las tasas se guardan por (desde, a, fecha) en memoria y en
+    ~/.orgm/divisas.sqlite. Una tasa de hoy, o de una fecha pasada que la API
+    no confirmó, con más de DIVISA_TTL segundos se devuelve igualmente y se
+    actualiza en segundo plano, salvo que `esperar` sea True.
+
+    Args:
+        desde: Moneda de origen.
+        a: Moneda de destino.
+        cantidad: Monto a convertir.
+        fecha: Fecha de la tasa (YYYY-MM-DD). Por defecto, hoy.
+        esperar: Si es True una tasa vencida se consulta antes de responder.
+
+    Returns:
+        float: El monto convertido, o None si la fecha no es válida o no
+        hay tasa disponible.
+    """
+    try:
+        fecha = validar_fecha(fecha)
+    except ValueError as e:
+        print(f"Fecha inválida para la tasa de cambio: {fecha!r} ({e})")
+        return None
+
+    en_cache = tasa_en_cache(desde, a, fecha)
+    if en_cache:
+        tasa, obtenida, confirmada = en_cache
+        if confirmada or time.time() - obtenida < TTL_DIVISA:
+            return tasa * cantidad
+        if not esperar:
+            _revalidar(desde, a, fecha)
+            return tasa * cantidad
+
+    try:
+        tasa, confirmada = consultar_tasa_api(desde, a, fecha)
+        if tasa is None:
+            return en_cache[0] * cantidad if en_cache else None
+        if fecha != date.today().isoformat() and not confirmada:
+            print(f"La API no confirmó la fecha {fecha}; la tasa se guarda como no definitiva.")
+        guardar_tasa(desde, a, fecha, tasa, confirmada=confirmada)
+        return tasa * cantidad
     except requests.exceptions.RequestException as e:
         print(f"Error al conectar con la API de divisas: {e}")
-        return None
     except Exception as e:
         print(f"Error inesperado al obtener tasa de divisa: {e}")
-        return None
+
+    # Sin conexión se usa la última tasa conocida, aunque esté vencida
+    return en_cache[0] * cantidad if en_cache else None
+
+
+def importar_tasas_csv(archivo: str) -> int:
+    """
+    Importa tasas históricas desde un CSV con columnas fecha, desde, a, tasa.
+    Se omiten las filas con fecha o tasa inválida.
+
+    Returns:
+        int: Número de tasas importadas.
+    """
+    import csv
+
+    filas = []
+    with open(archivo, "r", encoding="utf-8-sig", newline="") as f:
+        for fila in csv.DictReader(f):
+            fila = {k.strip().lower(): (v or "").strip() for k, v in fila.items() if k}
+            try:
+                filas.append(
+                    (fila["desde"].upper(), fila["a"].upper(), validar_fecha(fila["fecha"]), float(fila["tasa"]))
+                )
+            except (KeyError, ValueError):
+                continue
+
+    ahora = time.time()
+    with _conexion() as conexion:
+        conexion.executemany(
+            "INSERT OR REPLACE INTO tasas (desde, a, fecha, tasa, obtenida, confirmada) VALUES (?, ?, ?, ?, ?, 1)",
+            [(*fila, ahora) for fila in filas],
+        )
+    with _bloqueo:
+        for desde, a, fecha, tasa in filas:
+            _memoria[(desde, a, fecha)] = (tasa, ahora, True)
+    return len(filas)
+
+
+def completar_historico(
+    desde: str, a: str, inicio: str, fin: str | None = None, trabajadores: int = 4
+) -> dict:
+    """
+    Descarga de la API las tasas diarias que faltan entre dos fechas.
+
+    Las fechas que ya tienen una tasa confirmada no se vuelven a consultar.
+    Solo se guardan las tasas cuya respuesta confirma la fecha pedida; las
+    demás se cuentan como "sin_confirmar", ya que podrían ser la tasa de hoy.
+
+    Returns:
+        dict: Conteo de tasas "descargadas", "existentes", "sin_confirmar" y
+        "errores".
+
+    Raises:
+        ValueError: Si alguna de las fechas no es válida.
+    """
+    from concurrent.futures import ThreadPoolExecutor
+    from datetime import timedelta
+
+    fecha = date.fromisoformat(validar_fecha(inicio))
+    final = date.fromisoformat(validar_fecha(fin))
+    fechas = []
+    while fecha <= final:
+        fechas.append(fecha.isoformat())
+        fecha += timedelta(days=1)
+
+    hoy = date.today().isoformat()
+    resumen = {"descargadas": 0, "existentes": 0, "sin_confirmar": 0, "errores": 0}
+    faltantes = []
+    for f in fechas:
+        en_cache = tasa_en_cache(desde, a, f)
+        if en_cache and (en_cache[2] or f == hoy):
+            resumen["existentes"] += 1
+        else:
+            faltantes.append(f)
+
+    def descargar(f):
+        try:
+            return f, *consultar_tasa_api(desde, a, f)
+        except Exception:
+            return f, None, False
+
+    with ThreadPoolExecutor(max_workers=trabajadores) as pool:
+        for f, tasa, confirmada in pool.map(descargar, faltantes):
+            if not tasa:
+                resumen["errores"] += 1
+            elif confirmada or f == hoy:
+                guardar_tasa(desde, a, f, tasa, confirmada=confirmada)
+                resumen["descargadas"] += 1
+            else:
+                resumen["sin_confirmar"] += 1
+    return resumen
 
 
 if __name__ == "__main__":
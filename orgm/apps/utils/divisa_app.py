@@ -0,0 +1,24 @@
+import typer
+from rich.console import Console
+from orgm.commands.divisa import tasa_divisa_command, convertir_command, backfill_command
+
+console = Console()
+
+app = typer.Typer(help="Tasas de cambio con caché local")
+
+app.command(name="tasa")(tasa_divisa_command)
+app.command(name="convertir")(convertir_command)
+app.command(name="backfill")(backfill_command)
+
+
+@app.callback(invoke_without_command=True)
+def divisa_callback(ctx: typer.Context):
+    """
+    Tasas de cambio. Si no se especifica un subcomando, muestra la tasa USD -> DOP del día.
+    """
+    if ctx.invoked_subcommand is None:
+        tasa_divisa_command("USD", "DOP", 1.0, None)
+
+
+if __name__ == "__main__":
+    app()
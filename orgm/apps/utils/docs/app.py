@@ -5,10 +5,13 @@ from rich.console import Console
 console = Console()
 
 from orgm.apps.utils.docs.menu import menu
+from orgm.apps.utils.docs.firmar_entregables import firmar_entregables
 
 
 app = typer.Typer(help="Comandos para interactuar con documentos")
 
+app.command(name="firmar-lote")(firmar_entregables)
+
 
 @app.callback(invoke_without_command=True)
 def docs_callback(ctx: typer.Context):
@@ -1,5 +1,6 @@
 
 from orgm.apps.utils.docs.leer_csv import leer_csv
+from orgm.apps.utils.docs.reporte import Reporte
 import sys
 import os
 
@@ -27,37 +28,40 @@ def dividir_texto(texto, max_caracteres=30):
     return '<br/>'.join(lineas)
 
 def generar_tabla_planos(datos, archivo_salida="lista_planos.html"):
-    from rich.console import Console
-    from rich.table import Table
+    """
+    Genera la lista de planos / memorias en la terminal y en archivos HTML, CSV y JSON.
 
-    console = Console(record=True)
-    
-    # Crear la tabla
-    table = Table(title="LISTA DE PLANOS / MEMORIAS", show_header=True, header_style="bold white on black")
-    
-    # Agregar columnas
-    table.add_column("N°", justify="center", style="dim", width=8)
-    table.add_column("CÓDIGO", justify="left", width=20)
-    table.add_column("NOMBRE", justify="left", width=30)
-    table.add_column("REVISIÓN", justify="center", style="bold blue", width=10)
-    table.add_column("FECHA", justify="center", width=12)
-    table.add_column("DISCIPLINA", justify="center", width=12)
-    # Agregar filas
-    for i, dato in enumerate(datos, 1):
-        codigo = f"{dato['id_proyecto']}-{dato['id_subproyecto']}-{dato['id_disciplina']}-{dato['ano']}-{dato['numero']}"
-        table.add_row(
-            str(i),
-            codigo,
-            dividir_texto(dato['nombre'], 30).replace('<br/>', '\n'),
-            dato['revision'],
-            dato['fecha'],
-            dato['disciplina']
-        )
+    Args:
+        datos (list): Lista de diccionarios con los datos de los documentos
+        archivo_salida (str): Ruta del reporte; la extensión se reemplaza por la de cada formato
 
-    # Guardar como HTML
-    console.print(table)
-    console.print(f"HTML generado: {archivo_salida}", style="bold green")
-    console.save_html(archivo_salida)
+    Returns:
+        dict: Diccionario formato -> ruta de los archivos generados
+    """
+    columnas = [
+        {"nombre": "N°", "justify": "center", "style": "dim", "width": 8},
+        {"nombre": "CÓDIGO", "justify": "left", "width": 20},
+        {"nombre": "NOMBRE", "justify": "left", "width": 30},
+        {"nombre": "REVISIÓN", "justify": "center", "style": "bold blue", "width": 10},
+        {"nombre": "FECHA", "justify": "center", "width": 12},
+        {"nombre": "DISCIPLINA", "justify": "center", "width": 12},
+    ]
+    ruta_base = os.path.splitext(archivo_salida)[0]
+
+    with Reporte("LISTA DE PLANOS / MEMORIAS", columnas, ruta_base) as reporte:
+        for i, dato in enumerate(datos, 1):
+            codigo = f"{dato['id_proyecto']}-{dato['id_subproyecto']}-{dato['id_disciplina']}-{dato['ano']}-{dato['numero']}"
+            reporte.agregar(
+                str(i),
+                codigo,
+                dividir_texto(dato['nombre'], 30).replace('<br/>', '\n'),
+                dato['revision'],
+                dato['fecha'],
+                dato['disciplina']
+            )
+
+    console.print(f"HTML generado: {reporte.archivos.get('html')}", style="bold green")
+    return reporte.archivos
 
 
 def main():
@@ -1,8 +1,8 @@
 import os
 from rich.console import Console
-from rich.table import Table
+from orgm.apps.utils.docs.reporte import Reporte
 
-console = Console(record=True)
+console = Console()
 
 def existing_documents(datos):
     """
@@ -76,47 +76,39 @@ def mostrar_documentos_existentes(datos, ruta_html: str, solo_datos: bool = Fals
     for disciplina in documentos_por_disciplina:
         documentos_por_disciplina[disciplina].sort(key=lambda x: x.get('numero', ''))
     
-    # Mostrar tabla por disciplina
-    console.print("\n[bold green]== DOCUMENTOS EXISTENTES POR DISCIPLINA ==[/bold green]\n")
-    
-    for disciplina, documentos in sorted(documentos_por_disciplina.items()):
-        table = Table(title=f"Disciplina: {disciplina}")
-        table.add_column("Código", style="cyan")
-        table.add_column("Número", style="yellow")
-        table.add_column("Nombre", style="green")
-        table.add_column("Formato", style="magenta")
-        table.add_column("Proyecto", style="blue")
-        
-        for documento in documentos:
-            formatos = []
-            if documento.get('tiene_docx', False):
-                formatos.append("DOCX")
-            if documento.get('tiene_pdf', False):
-                formatos.append("PDF")
-            
-            formato_str = ", ".join(formatos)
-            
-            table.add_row(
-                documento.get('codigo', ''),
-                documento.get('numero', ''),
-                documento.get('nombre', ''),
-                formato_str,
-                documento.get('proyecto', '')
-            )
-        
-        console.print(table)
-        console.print("\n")
-    
-    # Guardar HTML usando el método save_html de Rich
-    html_dir = str(os.path.join(ruta_html, "documentos_existentes.html")).strip("'").strip('"')
-    console.save_html(html_dir) 
-    
-    # text_dir = str(os.path.join(ruta_html, "documentos_existentes.text")).strip("'").strip('"')
-    # console.save_text(text_dir)
-    # svg_dir = str(os.path.join(ruta_html, "documentos_existentes.svg")).strip("'").strip('"')
-    # console.save_svg(svg_dir)
+    # Mostrar tabla por disciplina y escribir el reporte fila por fila
+    columnas = [
+        {"nombre": "Código", "style": "cyan"},
+        {"nombre": "Número", "style": "yellow"},
+        {"nombre": "Nombre", "style": "green"},
+        {"nombre": "Formato", "style": "magenta"},
+        {"nombre": "Proyecto", "style": "blue"},
+    ]
+    ruta_base = str(os.path.join(ruta_html, "documentos_existentes")).strip("'").strip('"')
+
+    with Reporte(
+        "DOCUMENTOS EXISTENTES POR DISCIPLINA", columnas, ruta_base, estilo_titulo="bold green"
+    ) as reporte:
+        for disciplina, documentos in sorted(documentos_por_disciplina.items()):
+            reporte.seccion(disciplina)
+            for documento in documentos:
+                formatos = []
+                if documento.get('tiene_docx', False):
+                    formatos.append("DOCX")
+                if documento.get('tiene_pdf', False):
+                    formatos.append("PDF")
+                
+                formato_str = ", ".join(formatos)
+                
+                reporte.agregar(
+                    documento.get('codigo', ''),
+                    documento.get('numero', ''),
+                    documento.get('nombre', ''),
+                    formato_str,
+                    documento.get('proyecto', '')
+                )
 
-    console.print(f"El reporte HTML ha sido guardado como '{html_dir}'", style="bold green")
+    console.print(f"El reporte HTML ha sido guardado como '{reporte.archivos.get('html')}'", style="bold green")
     
     # Devolvemos la lista plana para su uso en otras funciones
     return documentos_existentes
\ No newline at end of file
@@ -0,0 +1,71 @@
+import os
+from typing import Optional
+import typer
+from rich.console import Console
+from orgm.apps.utils.firma import firmar_lote
+from orgm.apps.utils.docs.leer_csv import leer_csv
+from orgm.apps.utils.docs.portada import directorios
+
+console = Console()
+
+
+def archivos_a_firmar(ruta: str) -> list[str]:
+    """
+    Obtiene los PDF a firmar desde una carpeta o desde un CSV de portadas.
+
+    Con un CSV se usan los entregables PDF de cada documento que existan.
+    """
+    ruta = ruta.strip().strip('"').strip("'")
+    if os.path.isdir(ruta):
+        return sorted(
+            os.path.join(ruta, f)
+            for f in os.listdir(ruta)
+            if f.lower().endswith(".pdf") and not f.lower().endswith("_signed.pdf")
+        )
+
+    if ruta.lower().endswith(".csv") and os.path.exists(ruta):
+        directorio = os.path.dirname(ruta)
+        datos = leer_csv(ruta)
+        if not datos:
+            return []
+        datos, temp_dir, output_dir = directorios(datos, temp_dir=directorio, output_dir=directorio)
+        rutas = [os.path.join(dato['op_dir_entregables_pdf'], dato['nombre_pdf']) for dato in datos]
+        faltantes = [r for r in rutas if not os.path.exists(r)]
+        if faltantes:
+            console.print(f"{len(faltantes)} entregables PDF no existen y se omiten", style="bold yellow")
+        return [r for r in rutas if os.path.exists(r)]
+
+    console.print(f"Error: {ruta} no es una carpeta ni un CSV de portadas", style="bold red")
+    return []
+
+
+def firmar_entregables(
+    ruta: str = typer.Argument(..., help="Carpeta con PDF o archivo portadas.csv"),
+    x_pos: int = typer.Option(100, "--x", "-x", help="Posición X donde colocar la firma"),
+    y_pos: int = typer.Option(100, "--y", "-y", help="Posición Y donde colocar la firma"),
+    ancho: int = typer.Option(200, "--ancho", "-a", help="Ancho de la firma"),
+    salida: Optional[str] = typer.Option(
+        None, "--salida", "-s", help="Carpeta para los PDF firmados"
+    ),
+    trabajadores: int = typer.Option(
+        4, "--trabajadores", "-t", help="Número de firmas simultáneas"
+    ),
+    reiniciar: bool = typer.Option(
+        False, "--reiniciar", help="Ignora el diario y firma todos los archivos"
+    ),
+) -> None:
+    """Firma en lote los PDF de una carpeta o los entregables de un CSV, reanudando si se interrumpe"""
+    archivos = archivos_a_firmar(ruta)
+    if not archivos:
+        console.print("No se encontraron PDF para firmar", style="bold yellow")
+        return
+    console.print(f"Firmando {len(archivos)} archivos...", style="bold blue")
+    firmar_lote(
+        archivos,
+        x_pos,
+        y_pos,
+        ancho,
+        carpeta_salida=salida,
+        trabajadores=trabajadores,
+        reiniciar=reiniciar,
+    )
@@ -0,0 +1,128 @@
+import hashlib
+import os
+from rich.console import Console
+
+console = Console()
+
+RUTA_CACHE_IMAGENES = os.path.join(os.path.expanduser("~"), ".orgm", "cache", "portada")
+
+# Resolución con la que se incrustan las imágenes en las portadas
+DPI_PORTADA = int(os.getenv("PORTADA_DPI", "200"))
+
+MM_POR_PULGADA = 25.4
+
+
+def _usar_original(base: str, reducida: str) -> None:
+    """Reemplaza en la caché una reducción inútil por la marca `.original`."""
+    open(f"{base}.original", "wb").close()
+    os.remove(reducida)
+
+
+def preparar_imagen(ruta: str, altura_mm: float, dpi: int = DPI_PORTADA) -> tuple[str, int, int]:
+    """
+    Redimensiona una imagen a la resolución necesaria para su altura en mm.
+
+    El resultado se guarda en la caché con el hash del archivo original, la
+    altura y el DPI en el nombre, por lo que solo se procesa una vez mientras
+    la imagen no cambie. Nunca se agranda una imagen. Si la reducción no es
+    más liviana que el original se guarda en su lugar un archivo vacío
+    `.original`, para no volver a procesarla en el siguiente lote.
+
+    Args:
+        ruta: Ruta de la imagen original.
+        altura_mm: Altura con la que se incrusta en el documento.
+        dpi: Resolución objetivo.
+
+    Returns:
+        tuple: (ruta a usar, bytes originales, bytes de la imagen a usar)
+    """
+    try:
+        from PIL import Image
+    except ImportError:
+        console.print(
+            "Se requiere el paquete pillow para optimizar imágenes. Instale con pip install pillow",
+            style="bold yellow",
+        )
+        tamano = os.path.getsize(ruta)
+        return ruta, tamano, tamano
+
+    with open(ruta, "rb") as f:
+        contenido = f.read()
+    tamano_original = len(contenido)
+    clave = hashlib.sha256(contenido).hexdigest()[:32]
+
+    base = os.path.join(RUTA_CACHE_IMAGENES, f"{clave}-{altura_mm:g}mm-{dpi}")
+    if os.path.exists(f"{base}.original"):
+        return ruta, tamano_original, tamano_original
+    for extension in ("png", "jpg"):
+        en_cache = f"{base}.{extension}"
+        if os.path.exists(en_cache):
+            tamano_cache = os.path.getsize(en_cache)
+            # Versiones anteriores podían dejar en la caché reducciones más pesadas
+            if tamano_cache >= tamano_original:
+                _usar_original(base, en_cache)
+                return ruta, tamano_original, tamano_original
+            return en_cache, tamano_original, tamano_cache
+
+    alto_px = round(altura_mm / MM_POR_PULGADA * dpi)
+
+    with Image.open(ruta) as imagen:
+        if imagen.height <= alto_px:
+            return ruta, tamano_original, tamano_original
+
+        ancho_px = max(1, round(imagen.width * alto_px / imagen.height))
+        # Las imágenes con transparencia o paleta (logos) se mantienen en PNG;
+        # las fotografías se guardan en JPEG
+        transparente = imagen.mode in ("RGBA", "LA", "P", "1") or "transparency" in imagen.info
+        if transparente:
+            reducida = imagen.convert("RGBA").resize((ancho_px, alto_px), Image.LANCZOS)
+            extension, opciones = "png", {"optimize": True}
+        else:
+            reducida = imagen.convert("RGB").resize((ancho_px, alto_px), Image.LANCZOS)
+            extension, opciones = "jpg", {"quality": 90, "optimize": True}
+
+        os.makedirs(RUTA_CACHE_IMAGENES, exist_ok=True)
+        destino = f"{base}.{extension}"
+        temporal = f"{destino}.tmp"
+        reducida.save(temporal, format="PNG" if extension == "png" else "JPEG", dpi=(dpi, dpi), **opciones)
+        os.replace(temporal, destino)
+
+    tamano_nuevo = os.path.getsize(destino)
+    # Si la versión reducida no es más liviana se usa el original
+    if tamano_nuevo >= tamano_original:
+        _usar_original(base, destino)
+        return ruta, tamano_original, tamano_original
+    return destino, tamano_original, tamano_nuevo
+
+
+def preparar_imagenes(imagenes: dict[str, tuple[str, float]], cantidad_documentos: int = 1) -> dict[str, str]:
+    """
+    Prepara un conjunto de imágenes y reporta el espacio ahorrado.
+
+    Args:
+        imagenes: Diccionario nombre -> (ruta, altura en mm).
+        cantidad_documentos: Número de documentos en los que se incrusta cada
+            imagen, para estimar el ahorro total del lote.
+
+    Returns:
+        dict: Diccionario nombre -> ruta de la imagen a incrustar.
+    """
+    rutas = {}
+    ahorro = 0
+    for nombre, (ruta, altura_mm) in imagenes.items():
+        rutas[nombre], original, nuevo = preparar_imagen(ruta, altura_mm)
+        ahorro += original - nuevo
+        if nuevo < original:
+            console.print(
+                f"{nombre}: {original / 1024:.0f} KB -> {nuevo / 1024:.0f} KB",
+                style="dim",
+            )
+
+    if ahorro > 0:
+        total = ahorro * cantidad_documentos
+        console.print(
+            f"Imágenes optimizadas: {ahorro / 1024:.0f} KB menos por portada, "
+            f"{total / (1024 * 1024):.1f} MB en {cantidad_documentos} portadas",
+            style="bold green",
+        )
+    return rutas
@@ -0,0 +1,242 @@
+import hashlib
+import json
+import os
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from rich.console import Console
+from rich.progress import track
+
+console = Console()
+
+RUTA_CACHE_PAGINAS = os.path.join(os.path.expanduser("~"), ".orgm", "cache", "paginas_pdf.json")
+
+ENCABEZADOS = ["N°", "CÓDIGO", "NOMBRE", "REV.", "DISCIPLINA", "PÁGS.", "DESDE", "HASTA"]
+
+
+def hash_archivo(ruta: str, bloque: int = 1024 * 1024) -> str:
+    """Calcula el SHA-256 de un archivo leyéndolo por bloques."""
+    sha = hashlib.sha256()
+    with open(ruta, "rb") as f:
+        for parte in iter(lambda: f.read(bloque), b""):
+            sha.update(parte)
+    return sha.hexdigest()
+
+
+def _contar_paginas(ruta: str) -> int:
+    """Cuenta las páginas de un PDF. Se ejecuta en un proceso aparte."""
+    from PyPDF2 import PdfReader
+
+    return len(PdfReader(ruta, strict=False).pages)
+
+
+def cargar_cache_paginas() -> dict:
+    try:
+        with open(RUTA_CACHE_PAGINAS, "r", encoding="utf-8") as f:
+            return json.load(f)
+    except (FileNotFoundError, json.JSONDecodeError):
+        return {}
+
+
+def guardar_cache_paginas(cache: dict) -> None:
+    os.makedirs(os.path.dirname(RUTA_CACHE_PAGINAS), exist_ok=True)
+    temporal = f"{RUTA_CACHE_PAGINAS}.tmp"
+    with open(temporal, "w", encoding="utf-8") as f:
+        json.dump(cache, f)
+    os.replace(temporal, RUTA_CACHE_PAGINAS)
+
+
+def contar_paginas_pdfs(rutas: list[str], procesos: int | None = None) -> dict:
+    """
+    Obtiene el número de páginas de varios PDF en paralelo.
+
+    Los hashes se calculan en hilos (lectura de disco) y solo los archivos que
+    no están en la caché se abren con PyPDF2 en un pool de procesos.
+
+    Args:
+        rutas: Rutas de los archivos PDF.
+        procesos: Número de procesos para contar páginas (por defecto, CPUs).
+
+    Returns:
+        dict: Diccionario ruta -> número de páginas (None si no se pudo leer).
+    """
+    existentes = [r for r in rutas if os.path.exists(r)]
+    resultado = {r: None for r in rutas}
+    if not existentes:
+        return resultado
+
+    with ThreadPoolExecutor(max_workers=min(8, len(existentes))) as hilos:
+        hashes = dict(zip(existentes, hilos.map(hash_archivo, existentes)))
+
+    cache = cargar_cache_paginas()
+    pendientes = [r for r in existentes if hashes[r] not in cache]
+
+    if pendientes:
+        with ProcessPoolExecutor(max_workers=procesos) as pool:
+            futuros = {r: pool.submit(_contar_paginas, r) for r in pendientes}
+            for ruta in track(pendientes, description="Contando páginas..."):
+                try:
+                    cache[hashes[ruta]] = futuros[ruta].result()
+                except Exception as e:
+                    console.print(f"Error al leer {ruta}: {e}", style="bold red")
+        guardar_cache_paginas(cache)
+
+    for ruta in existentes:
+        resultado[ruta] = cache.get(hashes[ruta])
+
+    console.print(
+        f"Páginas: {len(existentes) - len(pendientes)} desde caché, {len(pendientes)} leídas",
+        style="dim",
+    )
+    return resultado
+
+
+def filas_lista_planos(datos: list[dict]) -> list[list]:
+    """
+    Construye las filas de la lista de planos con paginación acumulada.
+
+    Los datos deben haber pasado por `directorios` para tener las rutas de
+    entregables. Los documentos sin entregable se listan sin páginas.
+    """
+    rutas = [os.path.join(d['op_dir_entregables_pdf'], d['nombre_pdf']) for d in datos]
+    paginas = contar_paginas_pdfs(rutas)
+
+    filas = []
+    acumulado = 0
+    for i, (dato, ruta) in enumerate(zip(datos, rutas), 1):
+        n = paginas.get(ruta)
+        if n:
+            desde, hasta = acumulado + 1, acumulado + n
+            acumulado = hasta
+        else:
+            desde = hasta = ""
+        filas.append([
+            i,
+            dato['codigo'],
+            dato['nombre'],
+            dato['revision'],
+            dato['disciplina'],
+            n if n is not None else "FALTA",
+            desde,
+            hasta,
+        ])
+    return filas
+
+
+def escribir_pdf_lista(filas: list[list], archivo_salida: str, titulo: str) -> str:
+    """Escribe la lista de planos en PDF con reportlab."""
+    from reportlab.lib import colors
+    from reportlab.lib.pagesizes import letter, landscape
+    from reportlab.lib.styles import getSampleStyleSheet
+    from reportlab.lib.units import mm
+    from reportlab.platypus import Paragraph, SimpleDocTemplate, Spacer, Table, TableStyle
+
+    estilos = getSampleStyleSheet()
+    celda = estilos["BodyText"]
+    celda.fontSize = 8
+    celda.leading = 10
+
+    # El nombre se envuelve con Paragraph en lugar de cortar por caracteres
+    datos_tabla = [ENCABEZADOS] + [
+        [str(f[0]), f[1], Paragraph(str(f[2]), celda), *[str(v) for v in f[3:]]]
+        for f in filas
+    ]
+
+    doc = SimpleDocTemplate(
+        archivo_salida,
+        pagesize=landscape(letter),
+        leftMargin=12 * mm,
+        rightMargin=12 * mm,
+        topMargin=12 * mm,
+        bottomMargin=12 * mm,
+        title=titulo,
+    )
+    tabla = Table(
+        datos_tabla,
+        colWidths=[12 * mm, 55 * mm, 95 * mm, 14 * mm, 32 * mm, 16 * mm, 16 * mm, 16 * mm],
+        repeatRows=1,
+    )
+    tabla.setStyle(TableStyle([
+        ("BACKGROUND", (0, 0), (-1, 0), colors.black),
+        ("TEXTCOLOR", (0, 0), (-1, 0), colors.white),
+        ("FONTNAME", (0, 0), (-1, 0), "Helvetica-Bold"),
+        ("FONTSIZE", (0, 0), (-1, -1), 8),
+        ("GRID", (0, 0), (-1, -1), 0.5, colors.grey),
+        ("VALIGN", (0, 0), (-1, -1), "MIDDLE"),
+        ("ALIGN", (3, 1), (-1, -1), "CENTER"),
+        ("ROWBACKGROUNDS", (0, 1), (-1, -1), [colors.white, colors.whitesmoke]),
+    ]))
+    doc.build([Paragraph(titulo, estilos["Title"]), Spacer(1, 4 * mm), tabla])
+    return archivo_salida
+
+
+def escribir_xlsx_lista(filas: list[list], archivo_salida: str, titulo: str) -> str:
+    """Escribe la lista de planos en XLSX con openpyxl en modo write-only."""
+    from openpyxl import Workbook
+    from openpyxl.cell import WriteOnlyCell
+    from openpyxl.styles import Font
+
+    libro = Workbook(write_only=True)
+    hoja = libro.create_sheet(title="Lista de planos")
+    for indice, ancho in enumerate([6, 30, 60, 8, 18, 8, 8, 8]):
+        hoja.column_dimensions[chr(ord("A") + indice)].width = ancho
+
+    negrita = Font(bold=True)
+    encabezado = []
+    for nombre in ENCABEZADOS:
+        c = WriteOnlyCell(hoja, value=nombre)
+        c.font = negrita
+        encabezado.append(c)
+
+    hoja.append([titulo])
+    hoja.append(encabezado)
+    for fila in filas:
+        hoja.append(fila)
+    libro.save(archivo_salida)
+    return archivo_salida
+
+
+def generar_lista_planos(
+    datos: list[dict],
+    directorio_salida: str,
+    nombre: str = "lista_planos",
+    titulo: str = "LISTA DE PLANOS / MEMORIAS",
+) -> dict:
+    """
+    Genera la lista de planos con conteo de páginas en PDF y XLSX.
+
+    Args:
+        datos: Datos del CSV de portadas, ya procesados por `directorios`.
+        directorio_salida: Carpeta donde se guardan los archivos.
+        nombre: Nombre base de los archivos sin extensión.
+        titulo: Título del documento.
+
+    Returns:
+        dict: Diccionario formato -> ruta de los archivos generados.
+    """
+    filas = filas_lista_planos(datos)
+    base = os.path.join(directorio_salida.strip().strip('"').strip("'"), nombre)
+    archivos = {}
+
+    try:
+        archivos["pdf"] = escribir_pdf_lista(filas, f"{base}.pdf", titulo)
+        console.print(f"PDF generado: {archivos['pdf']}", style="bold green")
+    except Exception as e:
+        console.print(f"Error al generar el PDF: {e}", style="bold red")
+
+    try:
+        archivos["xlsx"] = escribir_xlsx_lista(filas, f"{base}.xlsx", titulo)
+        console.print(f"XLSX generado: {archivos['xlsx']}", style="bold green")
+    except ImportError:
+        console.print(
+            "Se requiere el paquete openpyxl para generar XLSX. Instale con pip install openpyxl",
+            style="bold red",
+        )
+    except Exception as e:
+        console.print(f"Error al generar el XLSX: {e}", style="bold red")
+
+    total = sum(f[5] for f in filas if isinstance(f[5], int))
+    faltantes = sum(1 for f in filas if f[5] == "FALTA")
+    console.print(f"Total de páginas: {total}", style="bold blue")
+    if faltantes:
+        console.print(f"Documentos sin entregable PDF: {faltantes}", style="bold yellow")
+
+    return archivos
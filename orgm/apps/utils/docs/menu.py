@@ -6,8 +6,11 @@ from orgm.qstyle import custom_style_fancy
 from orgm.apps.utils.docs.docx_pdf import convertir_docx_a_pdf
 from orgm.apps.utils.docs.unir_docx import unir_documentos_docx
 from orgm.apps.utils.docs.unir_pdf import unir_documentos_pdf
+from orgm.apps.utils.docs.optimizar_pdf import optimizar_pdfs
+from orgm.apps.utils.docs.firmar_entregables import firmar_entregables
 from orgm.apps.utils.docs.last_directory import guardar_ultimo_directorio, obtener_ultimo_directorio
 from orgm.apps.utils.docs.doc_list import generar_tabla_planos
+from orgm.apps.utils.docs.lista_planos import generar_lista_planos
 from orgm.apps.utils.docs.missing_docs import mostrar_documentos_faltantes
 from orgm.apps.utils.docs.existing_docs import mostrar_documentos_existentes
 from orgm.apps.utils.docs.cargar_documentos import copiar_documento
@@ -66,7 +69,7 @@ def imprimir_docx(dato: dict):
 
         console.print(archivos_a_unir, style="bold yellow")
 
-        unir_documentos_pdf(archivos_a_unir, dato['op_dir_entregables_pdf'], dato['nombre_pdf'])
+        return unir_documentos_pdf(archivos_a_unir, dato['op_dir_entregables_pdf'], dato['nombre_pdf'])
 
 def menu():
 
@@ -79,9 +82,12 @@ def menu():
         "Cargar documentos faltantes",
         "Reemplazar documentos existentes",
         "Imprimir lista de memorias",
+        "Generar lista de planos (PDF/XLSX)",
         "Mostrar documentos faltantes",
         "Mostrar documentos existentes",
         "Unir documento con portada",
+        "Optimizar entregables PDF",
+        "Firmar entregables PDF",
         "Preparar entrega",                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                                             
         "Generar portadas desde CSV",
         "Cambiar directorio",
@@ -318,14 +324,14 @@ def menu():
 
                     if imprimir_todos:
                         # Generar tabla con todos los documentos
-                        generar_tabla_planos(datos, archivo_salida=f"{ultimo_directorio}/lista_documentos.pdf")
+                        generar_tabla_planos(datos, archivo_salida=f"{ultimo_directorio}/lista_documentos.html")
                         # Mostrar documentos faltantes
                         mostrar_documentos_faltantes(datos, ruta_html=ultimo_directorio)
                         # Mostrar documentos existentes  
                         mostrar_documentos_existentes(datos, ruta_html=ultimo_directorio)
                     else:
                         # Solo generar la tabla normal
-                        generar_tabla_planos(datos, archivo_salida=f"{ultimo_directorio}/lista_documentos.pdf")
+                        generar_tabla_planos(datos, archivo_salida=f"{ultimo_directorio}/lista_documentos.html")
 
                     return menu()
                 else:
@@ -334,6 +340,62 @@ def menu():
                 console.print(f"Error: {e}", style="bold red")
         return menu()
 
+    elif respuesta == "Generar lista de planos (PDF/XLSX)":
+        archivo_base = obtener_archivo_base(ultimo_directorio)
+        if archivo_base:
+            if ultimo_directorio != os.path.dirname(archivo_base):
+                guardar_ultimo_directorio(os.path.dirname(archivo_base))
+            try:
+                directorio = os.path.dirname(archivo_base)
+                datos = leer_csv(archivo_base)
+                if datos:
+                    datos, temp_dir, output_dir = directorios(datos, temp_dir=directorio, output_dir=directorio)
+                    generar_lista_planos(datos, directorio)
+                else:
+                    console.print("No se encontraron datos en el CSV.", style="bold red")
+            except Exception as e:
+                console.print(f"Error: {e}", style="bold red")
+        return menu()
+
+    elif respuesta == "Optimizar entregables PDF":
+        archivo_base = obtener_archivo_base(ultimo_directorio)
+        if archivo_base:
+            if ultimo_directorio != os.path.dirname(archivo_base):
+                guardar_ultimo_directorio(os.path.dirname(archivo_base))
+            try:
+                directorio = os.path.dirname(archivo_base)
+                datos = leer_csv(archivo_base)
+                if datos:
+                    datos, temp_dir, output_dir = directorios(datos, temp_dir=directorio, output_dir=directorio)
+                    optimizar_pdfs([os.path.join(dato['op_dir_entregables_pdf'], dato['nombre_pdf']) for dato in datos])
+                else:
+                    console.print("No se encontraron datos en el CSV.", style="bold red")
+            except Exception as e:
+                console.print(f"Error: {e}", style="bold red")
+        return menu()
+
+    elif respuesta == "Firmar entregables PDF":
+        archivo_base = obtener_archivo_base(ultimo_directorio)
+        if archivo_base:
+            if ultimo_directorio != os.path.dirname(archivo_base):
+                guardar_ultimo_directorio(os.path.dirname(archivo_base))
+            try:
+                x_pos = questionary.text("Posición X de la firma:", default="100", style=custom_style_fancy).ask()
+                y_pos = questionary.text("Posición Y de la firma:", default="100", style=custom_style_fancy).ask()
+                ancho = questionary.text("Ancho de la firma:", default="200", style=custom_style_fancy).ask()
+                firmar_entregables(
+                    archivo_base,
+                    x_pos=int(x_pos),
+                    y_pos=int(y_pos),
+                    ancho=int(ancho),
+                    salida=None,
+                    trabajadores=4,
+                    reiniciar=False,
+                )
+            except Exception as e:
+                console.print(f"Error: {e}", style="bold red")
+        return menu()
+
     elif respuesta == "Preparar entrega":
         archivo_base = obtener_archivo_base(ultimo_directorio)
         
@@ -395,16 +457,26 @@ def menu():
 
                     ).ask()
                     
+                    optimizar = questionary.confirm(
+                        "¿Desea optimizar los PDF generados?",
+                        default=False,
+                        style=custom_style_fancy
+                    ).ask()
+
                     # Filtrar datos según la selección
+                    generados = []
                     if "Todos" in codigos_seleccionados:
                         for dato in datos:
-                            imprimir_docx(dato)
+                            generados.append(imprimir_docx(dato))
                     elif codigos_seleccionados:
                         for dato in datos:
                             if dato['codigo'] in codigos_seleccionados:
-                                imprimir_docx(dato)
+                                generados.append(imprimir_docx(dato))
                     else:
                         return 'exit'
+
+                    if optimizar:
+                        optimizar_pdfs(generados)
                     
 
             except Exception as e:
@@ -1,10 +1,8 @@
 import os
 from rich.console import Console
-from rich.table import Table
-from rich.panel import Panel
-from orgm.apps.utils.docs.leer_csv import leer_csv
+from orgm.apps.utils.docs.reporte import Reporte
 
-console = Console(record=True)
+console = Console()
 
 def missing_documents(datos):
     """
@@ -69,38 +67,27 @@ def mostrar_documentos_faltantes(datos, ruta_html: str):
     for disciplina in documentos_por_disciplina:
         documentos_por_disciplina[disciplina].sort(key=lambda x: x.get('numero', ''))
     
-    # Mostrar tabla por disciplina
-    console.print("\n[bold blue]== DOCUMENTOS FALTANTES POR DISCIPLINA ==[/bold blue]\n")
-    
-    # Crear una consola específica para guardar el HTML
+    # Mostrar tabla por disciplina y escribir el reporte fila por fila
+    columnas = [
+        {"nombre": "Código", "style": "cyan"},
+        {"nombre": "Número", "style": "yellow"},
+        {"nombre": "Nombre", "style": "green"},
+        {"nombre": "Proyecto", "style": "magenta"},
+    ]
+    ruta_base = str(os.path.join(ruta_html, "documentos_faltantes")).strip("'").strip('"')
 
-    for disciplina, documentos in sorted(documentos_por_disciplina.items()):
-        table = Table(title=f"Disciplina: {disciplina}")
-        table.add_column("Código", style="cyan")
-        table.add_column("Número", style="yellow")
-        table.add_column("Nombre", style="green")
-        table.add_column("Proyecto", style="magenta")
-        
-        for documento in documentos:
-            table.add_row(
-                documento.get('codigo', ''),
-                documento.get('numero', ''),
-                documento.get('nombre', ''),
-                documento.get('proyecto', '')
-            )
-        
-        console.print(table)
-        console.print("\n")
-    
-    # Guardar HTML usando el método save_html de Rich
-    html_dir = str(os.path.join(ruta_html, "documentos_faltantes.html")).strip("'").strip('"')
-    console.save_html(html_dir)
-    # text_dir = str(os.path.join(ruta_html, "documentos_faltantes.text")).strip("'").strip('"')
-    # console.save_text(text_dir)
-    # svg_dir = str(os.path.join(ruta_html, "documentos_faltantes.svg")).strip("'").strip('"')
-    # console.save_svg(svg_dir, theme="github-dark")
-    
-    console.print(f"El reporte HTML ha sido guardado como '{html_dir}'", style="bold blue")
+    with Reporte("DOCUMENTOS FALTANTES POR DISCIPLINA", columnas, ruta_base) as reporte:
+        for disciplina, documentos in sorted(documentos_por_disciplina.items()):
+            reporte.seccion(disciplina)
+            for documento in documentos:
+                reporte.agregar(
+                    documento.get('codigo', ''),
+                    documento.get('numero', ''),
+                    documento.get('nombre', ''),
+                    documento.get('proyecto', '')
+                )
+
+    console.print(f"El reporte HTML ha sido guardado como '{reporte.archivos.get('html')}'", style="bold blue")
     
     # Devolvemos la lista plana para su uso en otras funciones
     return documentos_faltantes
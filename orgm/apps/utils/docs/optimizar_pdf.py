@@ -0,0 +1,258 @@
+import hashlib
+import io
+import os
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from rich.console import Console
+from rich.progress import Progress
+from orgm.apps.utils.docs.reporte import Reporte
+
+console = Console()
+
+# Las imágenes con una resolución mayor a esta se reducen
+DPI_MAXIMO = int(os.getenv("PDF_DPI_MAXIMO", "150"))
+CALIDAD_JPEG = int(os.getenv("PDF_CALIDAD_JPEG", "85"))
+
+
+def _deduplicar(pdf) -> int:
+    """
+    Reemplaza las imágenes, formularios y fuentes repetidas por una sola copia.
+
+    Los documentos unidos suelen repetir el mismo logo y las mismas fuentes en
+    cada parte. Cada objeto indirecto se identifica por su contenido, después
+    de unificar los objetos a los que hace referencia; las copias quedan sin
+    referencias y no se escriben al guardar.
+    """
+    import pikepdf
+
+    canonicos = {}
+    procesados = {}
+    reemplazos = 0
+
+    def unificar(obj, nivel=0):
+        nonlocal reemplazos
+        if nivel > 8 or not isinstance(obj, pikepdf.Object):
+            return obj
+        indirecto = obj.is_indirect
+        if indirecto:
+            if obj.objgen in procesados:
+                return procesados[obj.objgen]
+            # Evita ciclos mientras se procesan los hijos
+            procesados[obj.objgen] = obj
+
+        if isinstance(obj, (pikepdf.Dictionary, pikepdf.Stream)):
+            for clave in list(obj.keys()):
+                if clave not in ("/Parent", "/Length"):
+                    obj[clave] = unificar(obj[clave], nivel + 1)
+        elif isinstance(obj, pikepdf.Array):
+            for i in range(len(obj)):
+                obj[i] = unificar(obj[i], nivel + 1)
+
+        if not indirecto or not isinstance(obj, (pikepdf.Dictionary, pikepdf.Stream)):
+            return obj
+
+        sha = hashlib.sha256()
+        if isinstance(obj, pikepdf.Stream):
+            sha.update(obj.read_raw_bytes())
+        for clave in sorted(k for k in obj.keys() if k != "/Length"):
+            valor = obj[clave]
+            sha.update(clave.encode())
+            if not isinstance(valor, pikepdf.Object):
+                sha.update(repr(valor).encode())
+            elif valor.is_indirect:
+                sha.update(str(valor.objgen).encode())
+            else:
+                sha.update(valor.unparse())
+
+        existente = canonicos.setdefault(sha.hexdigest(), obj)
+        if existente.objgen != obj.objgen:
+            reemplazos += 1
+        procesados[obj.objgen] = existente
+        return existente
+
+    for pagina in pdf.pages:
+        recursos = pagina.obj.get("/Resources")
+        if recursos is None:
+            continue
+        for tipo in ("/XObject", "/Font"):
+            if tipo in recursos:
+                diccionario = recursos[tipo]
+                for nombre in list(diccionario.keys()):
+                    diccionario[nombre] = unificar(diccionario[nombre])
+
+    return reemplazos
+
+
+def _imagenes(recursos, vistas: set, nivel: int = 0):
+    """Recorre las imágenes de unos recursos, incluidas las de formularios."""
+    if recursos is None or "/XObject" not in recursos or nivel > 4:
+        return
+    for xobject in recursos.XObject.values():
+        if xobject.objgen in vistas:
+            continue
+        vistas.add(xobject.objgen)
+        if xobject.get("/Subtype") == "/Image":
+            yield xobject
+        elif xobject.get("/Subtype") == "/Form":
+            yield from _imagenes(xobject.get("/Resources"), vistas, nivel + 1)
+
+
+def _reducir_imagenes(pdf, dpi_maximo: int) -> int:
+    """
+    Reduce las imágenes que superan `dpi_maximo`.
+
+    La resolución se estima con el tamaño de la página, que es el tamaño
+    máximo al que se puede mostrar la imagen. Esto es exacto para anexos
+    escaneados a página completa y conservador para imágenes más pequeñas.
+    """
+    from pikepdf import PdfImage, Name
+    from PIL import Image
+
+    reducidas = 0
+    vistas = set()
+    for pagina in pdf.pages:
+        caja = pagina.mediabox
+        ancho_pulg = abs(float(caja[2]) - float(caja[0])) / 72
+        alto_pulg = abs(float(caja[3]) - float(caja[1])) / 72
+        for imagen in _imagenes(pagina.obj.get("/Resources"), vistas):
+            # Máscaras, imágenes de 1 bit (CCITT/JBIG2) y transparencias se
+            # dejan igual: ya son compactas o no se pueden pasar a JPEG
+            if imagen.get("/ImageMask", False) or "/SMask" in imagen or imagen.get("/BitsPerComponent", 8) != 8:
+                continue
+
+            ancho_px, alto_px = int(imagen.Width), int(imagen.Height)
+            escala = min(dpi_maximo * ancho_pulg / ancho_px, dpi_maximo * alto_pulg / alto_px)
+            if escala >= 1:
+                continue
+
+            try:
+                pil = PdfImage(imagen).as_pil_image()
+            except Exception:
+                continue
+            if pil.mode not in ("RGB", "L"):
+                pil = pil.convert("RGB")
+
+            nuevo = pil.resize((max(1, int(ancho_px * escala)), max(1, int(alto_px * escala))), Image.LANCZOS)
+            buffer = io.BytesIO()
+            nuevo.save(buffer, format="JPEG", quality=CALIDAD_JPEG, optimize=True)
+            if buffer.tell() >= len(imagen.read_raw_bytes()):
+                continue
+
+            imagen.write(buffer.getvalue(), filter=Name.DCTDecode)
+            imagen.Width, imagen.Height = nuevo.width, nuevo.height
+            imagen.ColorSpace = Name.DeviceGray if nuevo.mode == "L" else Name.DeviceRGB
+            imagen.BitsPerComponent = 8
+            for clave in ("/DecodeParms", "/Decode"):
+                if clave in imagen:
+                    del imagen[clave]
+            reducidas += 1
+
+    return reducidas
+
+
+def optimizar_pdf(ruta: str, dpi_maximo: int = DPI_MAXIMO) -> dict:
+    """
+    Optimiza un PDF en su lugar.
+
+    Deduplica imágenes y fuentes, reduce las imágenes por encima de
+    `dpi_maximo` y guarda el archivo linealizado para visualización web.
+    El original solo se reemplaza si el resultado es más pequeño.
+
+    Returns:
+        dict: ruta, antes, despues, duplicados e imagenes reducidas.
+    """
+    import pikepdf
+
+    antes = os.path.getsize(ruta)
+    temporal = f"{ruta}.opt.tmp"
+    with pikepdf.open(ruta) as pdf:
+        duplicados = _deduplicar(pdf)
+        imagenes = _reducir_imagenes(pdf, dpi_maximo)
+        pdf.remove_unreferenced_resources()
+        pdf.save(
+            temporal,
+            linearize=True,
+            object_stream_mode=pikepdf.ObjectStreamMode.generate,
+            compress_streams=True,
+            recompress_flate=True,
+        )
+
+    despues = os.path.getsize(temporal)
+    if despues < antes:
+        os.replace(temporal, ruta)
+    else:
+        os.remove(temporal)
+        despues = antes
+
+    return {
+        "ruta": ruta,
+        "antes": antes,
+        "despues": despues,
+        "duplicados": duplicados,
+        "imagenes": imagenes,
+    }
+
+
+def optimizar_pdfs(rutas: list[str], dpi_maximo: int = DPI_MAXIMO, procesos: int | None = None) -> list[dict]:
+    """
+    Optimiza varios PDF en paralelo y muestra los tamaños antes y después.
+
+    Args:
+        rutas: Rutas de los PDF a optimizar.
+        dpi_maximo: Resolución máxima de las imágenes.
+        procesos: Número de procesos (por defecto, CPUs).
+
+    Returns:
+        list: Resultados de `optimizar_pdf` por archivo.
+    """
+    try:
+        import pikepdf  # noqa: F401
+    except ImportError:
+        console.print(
+            "Se requiere el paquete pikepdf para optimizar PDF. Instale con pip install pikepdf",
+            style="bold red",
+        )
+        return []
+
+    rutas = [r for r in rutas if r and os.path.exists(r)]
+    if not rutas:
+        console.print("No hay archivos PDF para optimizar", style="bold yellow")
+        return []
+
+    resultados = []
+    with ProcessPoolExecutor(max_workers=procesos) as pool, Progress(console=console) as progreso:
+        tarea = progreso.add_task("Optimizando PDF...", total=len(rutas))
+        futuros = {pool.submit(optimizar_pdf, ruta, dpi_maximo): ruta for ruta in rutas}
+        for futuro in as_completed(futuros):
+            try:
+                resultados.append(futuro.result())
+            except Exception as e:
+                progreso.console.print(f"Error al optimizar {futuros[futuro]}: {e}", style="bold red")
+            progreso.advance(tarea)
+
+    columnas = [
+        {"nombre": "Archivo", "style": "cyan"},
+        {"nombre": "Antes (KB)", "justify": "right"},
+        {"nombre": "Después (KB)", "justify": "right"},
+        {"nombre": "Ahorro", "justify": "right", "style": "green"},
+        {"nombre": "Duplicados", "justify": "right"},
+        {"nombre": "Imágenes", "justify": "right"},
+    ]
+    with Reporte("PDF optimizados", columnas) as reporte:
+        for r in sorted(resultados, key=lambda r: r["ruta"]):
+            ahorro = 1 - r["despues"] / r["antes"] if r["antes"] else 0
+            reporte.agregar(
+                os.path.basename(r["ruta"]),
+                f"{r['antes'] / 1024:,.0f}",
+                f"{r['despues'] / 1024:,.0f}",
+                f"{ahorro:.0%}",
+                r["duplicados"],
+                r["imagenes"],
+            )
+
+    antes = sum(r["antes"] for r in resultados)
+    despues = sum(r["despues"] for r in resultados)
+    console.print(
+        f"Total: {antes / (1024 * 1024):.1f} MB -> {despues / (1024 * 1024):.1f} MB",
+        style="bold green",
+    )
+    return resultados
@@ -11,8 +11,12 @@ from rich.console import Console
 from rich.progress import track
 from orgm.apps.utils.docs.leer_csv import leer_csv
 from orgm.apps.utils.docs.docx_pdf import convertir_docx_a_pdf
+from orgm.apps.utils.docs.imagenes import preparar_imagenes
 console = Console()
 
+# Altura en mm de cada imagen en la plantilla; se redimensionan para esa altura
+ALTURAS_MM = {"imagen1": 80, "logo1": 28, "logo2": 4}
+
 def directorios(datos: list[dict], temp_dir: str | None = None, output_dir: str | None = None):
 
     if not datos:
@@ -55,9 +59,11 @@ def generar_portadas(datos=list[dict], temp_dir = str | None == None, output_dir
     datos, temp_dir, output_dir = directorios(datos, temp_dir, output_dir)
 
 
-    imagen1 = os.path.join(temp_dir, "imagen1.png")
-    logo1 = os.path.join(temp_dir, "logo1.png")
-    logo2 = os.path.join(temp_dir, "logo2.png")
+    # Se redimensionan una sola vez para todo el lote
+    imagenes = preparar_imagenes(
+        {nombre: (os.path.join(temp_dir, f"{nombre}.png"), altura) for nombre, altura in ALTURAS_MM.items()},
+        cantidad_documentos=len(datos),
+    )
 
     docx_template = os.path.dirname(os.path.abspath(__file__))
     for parent in range(1, 4):
@@ -85,17 +91,9 @@ def generar_portadas(datos=list[dict], temp_dir = str | None == None, output_dir
             "UBICACION": dato['ubicacion'],
             "PAIS": dato['pais'],
             "FECHA": dato['fecha'],
-            "LOGO1": InlineImage(
-                file, logo1, height=Mm(28)
-            ),
-            "LOGO2": InlineImage(
-                file, logo2, height=Mm(4)
-            ),
-            "IMAGEN1": InlineImage(
-                file, imagen1, height=Mm(80)
-            )
-
         }
+        for nombre, altura in ALTURAS_MM.items():
+            context[nombre.upper()] = InlineImage(file, imagenes[nombre], height=Mm(altura))
         file.render(context, env, autoescape=True)
         file.save(f"{dato['op_dir_portadas_docx']}/{dato['nombre_docx']}")
         if pdf:
@@ -0,0 +1,251 @@
+import csv
+import html
+import json
+import os
+from rich.console import Console
+from rich.table import Table
+
+console = Console()
+
+# Cantidad máxima de filas por sección que se muestran en la terminal.
+# El reporte en disco siempre contiene todas las filas.
+MAX_FILAS_VISTA = 25
+
+FORMATOS_POR_DEFECTO = ("html", "csv", "json")
+
+
+class _EscritorHTML:
+    """Escribe una página HTML con una tabla por sección, fila por fila."""
+
+    def __init__(self, ruta: str, titulo: str, columnas: list[str], nombre_seccion: str):
+        self.ruta = ruta
+        self.columnas = columnas
+        self.nombre_seccion = nombre_seccion
+        self.seccion_abierta = False
+        self.archivo = open(ruta, "w", encoding="utf-8")
+        self.archivo.write(
+            "<!DOCTYPE html>\n<html>\n<head>\n<meta charset=\"utf-8\">\n"
+            f"<title>{html.escape(titulo)}</title>\n"
+            "<style>\n"
+            "body { font-family: sans-serif; margin: 2em; }\n"
+            "table { border-collapse: collapse; margin-bottom: 2em; width: 100%; }\n"
+            "caption { font-weight: bold; text-align: left; padding: 0.5em 0; }\n"
+            "th { background: #000; color: #fff; }\n"
+            "th, td { border: 1px solid #999; padding: 4px 8px; }\n"
+            "</style>\n</head>\n<body>\n"
+            f"<h1>{html.escape(titulo)}</h1>\n"
+        )
+
+    def seccion(self, titulo: str | None):
+        self._cerrar_tabla()
+        self.archivo.write("<table>\n")
+        if titulo:
+            caption = html.escape(f"{self.nombre_seccion}: {titulo}")
+            self.archivo.write(f"<caption>{caption}</caption>\n")
+        encabezado = "".join(f"<th>{html.escape(c)}</th>" for c in self.columnas)
+        self.archivo.write(f"<tr>{encabezado}</tr>\n")
+        self.seccion_abierta = True
+
+    def fila(self, seccion: str | None, valores: list[str]):
+        if not self.seccion_abierta:
+            self.seccion(seccion)
+        celdas = "".join(
+            f"<td>{html.escape(v).replace(chr(10), '<br/>')}</td>" for v in valores
+        )
+        self.archivo.write(f"<tr>{celdas}</tr>\n")
+
+    def _cerrar_tabla(self):
+        if self.seccion_abierta:
+            self.archivo.write("</table>\n")
+            self.seccion_abierta = False
+
+    def cerrar(self):
+        self._cerrar_tabla()
+        self.archivo.write("</body>\n</html>\n")
+        self.archivo.close()
+
+
+class _EscritorCSV:
+    """Escribe las filas en CSV, con la sección como primera columna."""
+
+    def __init__(self, ruta: str, titulo: str, columnas: list[str], nombre_seccion: str):
+        self.ruta = ruta
+        # utf-8-sig para que Excel reconozca los acentos
+        self.archivo = open(ruta, "w", encoding="utf-8-sig", newline="")
+        self.escritor = csv.writer(self.archivo)
+        self.escritor.writerow([nombre_seccion, *columnas])
+
+    def seccion(self, titulo: str | None):
+        pass
+
+    def fila(self, seccion: str | None, valores: list[str]):
+        self.escritor.writerow([seccion or "", *valores])
+
+    def cerrar(self):
+        self.archivo.close()
+
+
+class _EscritorJSON:
+    """Escribe un arreglo JSON de objetos sin mantenerlo en memoria."""
+
+    def __init__(self, ruta: str, titulo: str, columnas: list[str], nombre_seccion: str):
+        self.ruta = ruta
+        self.columnas = columnas
+        self.clave_seccion = nombre_seccion.lower()
+        self.primera = True
+        self.archivo = open(ruta, "w", encoding="utf-8")
+        self.archivo.write("[\n")
+
+    def seccion(self, titulo: str | None):
+        pass
+
+    def fila(self, seccion: str | None, valores: list[str]):
+        registro = {self.clave_seccion: seccion or ""}
+        registro.update(zip(self.columnas, valores))
+        if not self.primera:
+            self.archivo.write(",\n")
+        self.archivo.write(json.dumps(registro, ensure_ascii=False))
+        self.primera = False
+
+    def cerrar(self):
+        self.archivo.write("\n]\n")
+        self.archivo.close()
+
+
+ESCRITORES = {
+    "html": _EscritorHTML,
+    "csv": _EscritorCSV,
+    "json": _EscritorJSON,
+}
+
+
+class Reporte:
+    """
+    Reporte tabular que escribe cada fila directamente a los archivos de salida
+    y muestra en la terminal una vista previa limitada por sección.
+
+    Cada reporte abre sus propios archivos, por lo que no acumula el historial
+    de la consola entre llamadas.
+
+    Ejemplo de uso::
+
+        columnas = [{"nombre": "Código", "style": "cyan"}, {"nombre": "Nombre"}]
+        with Reporte("Documentos", columnas, ruta_base="/tmp/documentos") as reporte:
+            reporte.seccion("ELECTRICA")
+            reporte.agregar("E-01", "Planta baja")
+        print(reporte.archivos)
+    """
+
+    def __init__(
+        self,
+        titulo: str,
+        columnas: list[dict],
+        ruta_base: str | None = None,
+        formatos: tuple = FORMATOS_POR_DEFECTO,
+        max_filas_vista: int = MAX_FILAS_VISTA,
+        mostrar: bool = True,
+        estilo_titulo: str = "bold blue",
+        nombre_seccion: str = "Disciplina",
+    ):
+        """
+        Args:
+            titulo: Título del reporte.
+            columnas: Lista de diccionarios con la clave "nombre" y opcionalmente
+                argumentos de rich para la columna (style, justify, width...).
+            ruta_base: Ruta sin extensión de los archivos a generar. Si es None
+                solo se muestra la vista previa en la terminal.
+            formatos: Formatos de salida a generar ("html", "csv", "json").
+            max_filas_vista: Filas por sección a mostrar en la terminal.
+            mostrar: Si es False no se imprime nada en la terminal.
+            estilo_titulo: Estilo rich del encabezado del reporte.
+            nombre_seccion: Nombre con el que se rotulan las secciones.
+        """
+        self.titulo = titulo
+        self.columnas = columnas
+        self.nombres = [c["nombre"] for c in columnas]
+        self.nombre_seccion = nombre_seccion
+        self.max_filas_vista = max_filas_vista
+        self.mostrar = mostrar
+        self.total = 0
+        self.archivos = {}
+        self._seccion = None
+        self._tabla = None
+        self._filas_seccion = 0
+        self._escritores = []
+
+        if ruta_base:
+            ruta_base = str(ruta_base).strip().strip('"').strip("'")
+            directorio = os.path.dirname(ruta_base)
+            if directorio:
+                os.makedirs(directorio, exist_ok=True)
+            for formato in formatos:
+                if formato not in ESCRITORES:
+                    console.print(
+                        f"Formato de reporte no soportado: {formato}", style="bold red"
+                    )
+                    continue
+                ruta = f"{ruta_base}.{formato}"
+                self._escritores.append(
+                    ESCRITORES[formato](ruta, titulo, self.nombres, nombre_seccion)
+                )
+                self.archivos[formato] = ruta
+
+        if self.mostrar:
+            console.print(f"\n[{estilo_titulo}]== {titulo} ==[/{estilo_titulo}]\n")
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.cerrar()
+        return False
+
+    def seccion(self, titulo: str | None):
+        """Inicia una nueva sección (una tabla por sección)."""
+        self._imprimir_tabla()
+        self._seccion = titulo
+        self._filas_seccion = 0
+        for escritor in self._escritores:
+            escritor.seccion(titulo)
+
+    def agregar(self, *valores):
+        """Agrega una fila a la sección actual."""
+        valores = ["" if v is None else str(v) for v in valores]
+        for escritor in self._escritores:
+            escritor.fila(self._seccion, valores)
+
+        if self.mostrar and self._filas_seccion < self.max_filas_vista:
+            if self._tabla is None:
+                self._tabla = self._nueva_tabla()
+            self._tabla.add_row(*valores)
+
+        self._filas_seccion += 1
+        self.total += 1
+
+    def _nueva_tabla(self) -> Table:
+        titulo = f"{self.nombre_seccion}: {self._seccion}" if self._seccion else None
+        tabla = Table(title=titulo, show_header=True)
+        for columna in self.columnas:
+            opciones = {k: v for k, v in columna.items() if k != "nombre"}
+            tabla.add_column(columna["nombre"], **opciones)
+        return tabla
+
+    def _imprimir_tabla(self):
+        if self._tabla is not None:
+            console.print(self._tabla)
+            ocultas = self._filas_seccion - self.max_filas_vista
+            if ocultas > 0:
+                console.print(
+                    f"... {ocultas} filas más (ver reporte completo)", style="dim"
+                )
+            console.print("\n")
+        self._tabla = None
+
+    def cerrar(self) -> dict:
+        """Cierra los archivos y devuelve un diccionario formato -> ruta."""
+        if self.mostrar:
+            self._imprimir_tabla()
+        for escritor in self._escritores:
+            escritor.cerrar()
+        self._escritores = []
+        return self.archivos
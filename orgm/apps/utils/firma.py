@@ -5,22 +5,37 @@ from rich import print
 
 # Initialize variables as None at module level
 FIRMA_URL = None
+FIRMA_BACKEND = None
 CF_ACCESS_CLIENT_ID = None
 CF_ACCESS_CLIENT_SECRET = None
+# Firma local (firma_local.py)
+FIRMA_IMAGEN = None
+FIRMA_PAGINAS = None
+FIRMA_P12 = None
+FIRMA_P12_PASSWORD = None
 
 
 def initialize():
     """Initialize variables that were previously at module level"""
-    global FIRMA_URL, CF_ACCESS_CLIENT_ID, CF_ACCESS_CLIENT_SECRET
+    global FIRMA_URL, FIRMA_BACKEND, CF_ACCESS_CLIENT_ID, CF_ACCESS_CLIENT_SECRET
+    global FIRMA_IMAGEN, FIRMA_PAGINAS, FIRMA_P12, FIRMA_P12_PASSWORD
 
     import os
     from dotenv import load_dotenv
-    from orgm.apis.header import get_headers_json
+    from orgm.stuff.header import get_headers_json
 
     load_dotenv(override=True)
 
     # Obtener variables de entorno necesarias
     FIRMA_URL = os.getenv("FIRMA_URL")
+    # "servicio" envía el PDF a FIRMA_URL; "local" lo firma en esta máquina
+    FIRMA_BACKEND = os.getenv("FIRMA_BACKEND", "servicio").strip().lower()
+    FIRMA_IMAGEN = os.getenv("FIRMA_IMAGEN")
+    FIRMA_PAGINAS = os.getenv("FIRMA_PAGINAS", "todas")
+    FIRMA_P12 = os.getenv("FIRMA_P12")
+    FIRMA_P12_PASSWORD = os.getenv("FIRMA_P12_PASSWORD")
+    if FIRMA_BACKEND == "local":
+        return True
 
     # Obtener headers usando la función centralizada
     headers = get_headers_json()
@@ -41,6 +56,44 @@ def initialize():
     return True
 
 
+def _enviar_a_firmar(sesion, pdf_path: Path, x1: int, y1: int, ancho: int, archivo_salida: str) -> int:
+    """
+    Envía un PDF al servicio de firma y guarda la respuesta en disco.
+
+    El archivo se sube por bloques y la respuesta se descarga por bloques, sin
+    cargar ninguno de los dos completos en memoria. Lanza una excepción si el
+    servicio responde con error.
+
+    Returns:
+        int: Tamaño en bytes del PDF firmado.
+    """
+    from orgm.stuff.http import CuerpoMultipart, descargar_respuesta, TIMEOUT
+
+    cuerpo = CuerpoMultipart(
+        {"x1": str(x1), "y1": str(y1), "ancho": str(ancho)},
+        {"file": (pdf_path.name, str(pdf_path), "application/pdf")},
+    )
+
+    # Headers con autenticación de Cloudflare Access
+    headers = {
+        "accept": "application/pdf",
+        "Content-Type": cuerpo.content_type,
+        "CF-Access-Client-Id": CF_ACCESS_CLIENT_ID,
+        "CF-Access-Client-Secret": CF_ACCESS_CLIENT_SECRET,
+    }
+
+    response = sesion.post(
+        f"{FIRMA_URL}/firmar-pdf/", headers=headers, data=cuerpo, timeout=TIMEOUT, stream=True
+    )
+    try:
+        response.raise_for_status()
+    except Exception:
+        response.close()
+        raise
+
+    return descargar_respuesta(response, archivo_salida)
+
+
 def firmar_pdf(
     archivo_pdf: str, x1: int, y1: int, ancho: int, archivo_salida: Optional[str] = None
 ) -> Optional[str]:
@@ -58,10 +111,20 @@ def firmar_pdf(
         Ruta al archivo PDF firmado o None si ocurre un error
     """
     # Ensure initialization is done
-    if FIRMA_URL is None:
+    if FIRMA_BACKEND is None:
         initialize()
 
-    import requests
+    if FIRMA_BACKEND == "local":
+        from orgm.apps.utils.firma_local import firmar_pdf_local
+
+        resultado = firmar_pdf_local(archivo_pdf, x1, y1, ancho, archivo_salida)
+        if resultado:
+            print(
+                f"[bold green]PDF firmado correctamente, guardado como {resultado}[/bold green]"
+            )
+        return resultado
+
+    from orgm.stuff.http import obtener_sesion
 
     try:
         # Verificar que el archivo exista
@@ -74,29 +137,7 @@ def firmar_pdf(
         if not archivo_salida:
             archivo_salida = f"firmado_{pdf_path.name}"
 
-        # URL del servicio de firma
-        url = f"{FIRMA_URL}/firmar-pdf/"
-
-        # Headers con autenticación de Cloudflare Access
-        headers = {
-            "accept": "application/pdf",
-            "CF-Access-Client-Id": CF_ACCESS_CLIENT_ID,
-            "CF-Access-Client-Secret": CF_ACCESS_CLIENT_SECRET,
-        }
-
-        # Datos del formulario
-        files = {"file": (pdf_path.name, open(pdf_path, "rb"), "application/pdf")}
-        data = {"x1": str(x1), "y1": str(y1), "ancho": str(ancho)}
-
-        # Realizar la petición
-        response = requests.post(url, headers=headers, files=files, data=data)
-
-        # Verificar respuesta
-        response.raise_for_status()
-
-        # Guardar el archivo PDF firmado
-        with open(archivo_salida, "wb") as f:
-            f.write(response.content)
+        _enviar_a_firmar(obtener_sesion(), pdf_path, x1, y1, ancho, archivo_salida)
 
         print(
             f"[bold green]PDF firmado correctamente, guardado como {archivo_salida}[/bold green]"
@@ -108,6 +149,159 @@ def firmar_pdf(
         return None
 
 
+def _leer_diario(ruta_diario: Path) -> dict:
+    """Lee el diario de un lote. La última entrada de cada archivo prevalece."""
+    import json
+
+    entradas = {}
+    if not ruta_diario.exists():
+        return entradas
+    with open(ruta_diario, "r", encoding="utf-8") as f:
+        for linea in f:
+            try:
+                entrada = json.loads(linea)
+            except ValueError:
+                # Línea incompleta de una ejecución interrumpida
+                continue
+            entradas[entrada["archivo"]] = entrada
+    return entradas
+
+
+def firmar_lote(
+    archivos: list[str],
+    x1: int,
+    y1: int,
+    ancho: int,
+    carpeta_salida: Optional[str] = None,
+    trabajadores: int = 4,
+    diario: Optional[str] = None,
+    reiniciar: bool = False,
+) -> dict:
+    """
+    Firma varios PDF en paralelo con un diario que permite reanudar el lote.
+
+    Cada resultado se agrega al diario (JSON por línea) en cuanto termina. Al
+    volver a ejecutar el lote se omiten los archivos ya firmados cuyo original
+    no ha cambiado y cuyo PDF firmado sigue existiendo.
+
+    Args:
+        archivos: Rutas de los PDF a firmar.
+        x1: Posición X donde colocar la firma
+        y1: Posición Y donde colocar la firma
+        ancho: Ancho de la firma
+        carpeta_salida: Carpeta para los PDF firmados. Si es None, o si es
+            la carpeta del original, se guardan junto al original con el
+            sufijo "_signed".
+        trabajadores: Número de peticiones simultáneas.
+        diario: Ruta del diario. Por defecto `.firma_lote.jsonl` en la carpeta
+            de salida o en la carpeta del primer archivo.
+        reiniciar: Si es True se ignora el diario existente.
+
+    Returns:
+        dict: Conteo de archivos "firmados", "omitidos" y "errores".
+    """
+    import json
+    import os
+    import threading
+    from concurrent.futures import ThreadPoolExecutor, as_completed
+    from datetime import datetime
+    from rich.progress import Progress
+    from orgm.stuff.http import obtener_sesion
+
+    if FIRMA_BACKEND is None and not initialize():
+        return {"firmados": 0, "omitidos": 0, "errores": len(archivos)}
+
+    resumen = {"firmados": 0, "omitidos": 0, "errores": 0}
+    if not archivos:
+        print("[yellow]No hay archivos para firmar[/yellow]")
+        return resumen
+
+    if carpeta_salida:
+        os.makedirs(carpeta_salida, exist_ok=True)
+    ruta_diario = Path(diario or os.path.join(carpeta_salida or os.path.dirname(os.path.abspath(archivos[0])), ".firma_lote.jsonl"))
+    if reiniciar and ruta_diario.exists():
+        ruta_diario.unlink()
+    previas = _leer_diario(ruta_diario)
+
+    pendientes = []
+    for archivo in archivos:
+        pdf_path = Path(archivo).resolve()
+        salida = Path(carpeta_salida).resolve() / pdf_path.name if carpeta_salida else pdf_path
+        # Nunca se sobrescribe el original: el diario compara su fecha de modificación
+        if salida == pdf_path:
+            salida = pdf_path.parent / f"{pdf_path.stem}_signed{pdf_path.suffix}"
+        estado = pdf_path.stat()
+        previa = previas.get(str(pdf_path))
+        if (
+            previa
+            and previa.get("estado") == "ok"
+            and previa.get("tamano") == estado.st_size
+            and previa.get("mtime") == estado.st_mtime
+            and salida.exists()
+        ):
+            resumen["omitidos"] += 1
+            continue
+        pendientes.append((pdf_path, salida, estado))
+
+    if resumen["omitidos"]:
+        print(f"[dim]{resumen['omitidos']} archivos ya firmados según {ruta_diario}[/dim]")
+
+    # Una conexión por trabajador; el servicio de firma es idempotente, así
+    # que también se reintentan los POST
+    sesion = obtener_sesion(conexiones=trabajadores, reintentar_post=True)
+    if FIRMA_BACKEND == "local":
+        from orgm.apps.utils.firma_local import firmar_pdf_local
+    bloqueo = threading.Lock()
+
+    def firmar(pdf_path: Path, salida: Path, estado) -> dict:
+        entrada = {
+            "archivo": str(pdf_path),
+            "salida": str(salida),
+            "tamano": estado.st_size,
+            "mtime": estado.st_mtime,
+        }
+        try:
+            if FIRMA_BACKEND == "local":
+                if not firmar_pdf_local(str(pdf_path), x1, y1, ancho, str(salida)):
+                    raise RuntimeError("No se pudo firmar localmente")
+                entrada["bytes"] = salida.stat().st_size
+            else:
+                entrada["bytes"] = _enviar_a_firmar(sesion, pdf_path, x1, y1, ancho, str(salida))
+            entrada["estado"] = "ok"
+        except Exception as e:
+            entrada["estado"] = "error"
+            entrada["error"] = str(e)
+        entrada["fecha"] = datetime.now().isoformat(timespec="seconds")
+        with bloqueo, open(ruta_diario, "a", encoding="utf-8") as f:
+            f.write(json.dumps(entrada, ensure_ascii=False) + "\n")
+            f.flush()
+            os.fsync(f.fileno())
+        return entrada
+
+    with ThreadPoolExecutor(max_workers=trabajadores) as pool, Progress() as progreso:
+        tarea = progreso.add_task("Firmando PDF...", total=len(pendientes))
+        futuros = [pool.submit(firmar, *pendiente) for pendiente in pendientes]
+        for futuro in as_completed(futuros):
+            entrada = futuro.result()
+            if entrada["estado"] == "ok":
+                resumen["firmados"] += 1
+            else:
+                resumen["errores"] += 1
+                progreso.console.print(
+                    f"[bold red]Error al firmar {entrada['archivo']}: {entrada['error']}[/bold red]"
+                )
+            progreso.advance(tarea)
+
+    print(
+        f"[bold green]Firmados: {resumen['firmados']}[/bold green], "
+        f"omitidos: {resumen['omitidos']}, "
+        f"[bold red]errores: {resumen['errores']}[/bold red]"
+    )
+    if resumen["errores"]:
+        print(f"[yellow]Vuelva a ejecutar el lote para reintentar los errores ({ruta_diario})[/yellow]")
+    return resumen
+
+
 def seleccionar_y_firmar_pdf(x1: int = 100, y1: int = 100, ancho: int = 200):
     """
     Abre un diálogo para seleccionar un archivo PDF, lo firma y guarda
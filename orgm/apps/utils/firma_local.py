@@ -0,0 +1,156 @@
+# -*- coding: utf-8 -*-
+import io
+import os
+from pathlib import Path
+from typing import Optional
+from rich import print
+
+
+def _paginas_a_firmar(total: int, seleccion: str) -> list[int]:
+    """
+    Convierte la selección de páginas en índices (base 0).
+
+    Acepta "todas", "primera", "ultima" o una lista como "1,3,5-7".
+    """
+    seleccion = (seleccion or "todas").strip().lower()
+    if seleccion == "todas":
+        return list(range(total))
+    if seleccion == "primera":
+        return [0] if total else []
+    if seleccion in ("ultima", "última"):
+        return [total - 1] if total else []
+
+    paginas = set()
+    for parte in seleccion.split(","):
+        parte = parte.strip()
+        if not parte:
+            continue
+        if "-" in parte:
+            inicio, fin = parte.split("-", 1)
+            paginas.update(range(int(inicio) - 1, int(fin)))
+        else:
+            paginas.add(int(parte) - 1)
+    return sorted(p for p in paginas if 0 <= p < total)
+
+
+def _crear_sello(ancho_pagina: float, alto_pagina: float, imagen: str, x1: float, y1: float, ancho: float):
+    """Crea con reportlab una página transparente con la imagen de la firma."""
+    from reportlab.lib.utils import ImageReader
+    from reportlab.pdfgen import canvas
+    from PyPDF2 import PdfReader
+
+    lector_imagen = ImageReader(imagen)
+    ancho_img, alto_img = lector_imagen.getSize()
+    alto = ancho * alto_img / ancho_img
+
+    buffer = io.BytesIO()
+    lienzo = canvas.Canvas(buffer, pagesize=(ancho_pagina, alto_pagina))
+    lienzo.drawImage(lector_imagen, x1, y1, width=ancho, height=alto, mask="auto")
+    lienzo.save()
+    buffer.seek(0)
+    return PdfReader(buffer).pages[0]
+
+
+def _firmar_digitalmente(origen: str, destino: str, p12: str, clave: Optional[str]) -> None:
+    """Aplica una firma digital PKCS#12 con pyHanko."""
+    from pyhanko.sign import signers
+    from pyhanko.pdf_utils.incremental_writer import IncrementalPdfFileWriter
+
+    firmante = signers.SimpleSigner.load_pkcs12(
+        pfx_file=p12, passphrase=clave.encode("utf-8") if clave else None
+    )
+    if firmante is None:
+        raise ValueError(f"No se pudo cargar el certificado {p12}")
+
+    with open(origen, "rb") as entrada, open(destino, "wb") as salida:
+        escritor = IncrementalPdfFileWriter(entrada)
+        signers.sign_pdf(
+            escritor,
+            signers.PdfSignatureMetadata(field_name="Firma"),
+            signer=firmante,
+            output=salida,
+        )
+
+
+def firmar_pdf_local(
+    archivo_pdf: str, x1: int, y1: int, ancho: int, archivo_salida: Optional[str] = None
+) -> Optional[str]:
+    """
+    Firma un archivo PDF localmente, sin enviar el archivo al servicio de firma.
+
+    Coloca la imagen de FIRMA_IMAGEN en (x1, y1), en puntos desde la esquina
+    inferior izquierda, con el ancho indicado y la altura proporcional, en
+    las páginas de FIRMA_PAGINAS ("todas" por defecto, "primera", "ultima" o
+    una lista como "1,3-5"). Si FIRMA_P12 está definida se aplica además una
+    firma digital con ese certificado y la clave FIRMA_P12_PASSWORD. Las
+    variables se leen una sola vez, en `firma.initialize()`.
+
+    Args:
+        archivo_pdf: Ruta al archivo PDF a firmar
+        x1: Posición X donde colocar la firma
+        y1: Posición Y donde colocar la firma
+        ancho: Ancho de la firma
+        archivo_salida: Nombre del archivo de salida (opcional)
+
+    Returns:
+        Ruta al archivo PDF firmado o None si ocurre un error
+    """
+    from orgm.apps.utils import firma
+
+    if firma.FIRMA_BACKEND is None:
+        firma.initialize()
+
+    pdf_path = Path(archivo_pdf)
+    if not pdf_path.exists():
+        print(f"[bold red]Error: El archivo {archivo_pdf} no existe[/bold red]")
+        return None
+
+    imagen = firma.FIRMA_IMAGEN
+    if not imagen or not os.path.exists(imagen):
+        print(
+            "[bold red]Error: Se requiere la variable de entorno FIRMA_IMAGEN con la ruta de la imagen de la firma[/bold red]"
+        )
+        return None
+
+    if not archivo_salida:
+        archivo_salida = f"firmado_{pdf_path.name}"
+
+    try:
+        from PyPDF2 import PdfReader, PdfWriter
+
+        lector = PdfReader(str(pdf_path), strict=False)
+        escritor = PdfWriter()
+        paginas = set(_paginas_a_firmar(len(lector.pages), firma.FIRMA_PAGINAS))
+
+        # Un solo sello por tamaño de página
+        sellos = {}
+        for indice, pagina in enumerate(lector.pages):
+            if indice in paginas:
+                tamano = (float(pagina.mediabox.width), float(pagina.mediabox.height))
+                if tamano not in sellos:
+                    sellos[tamano] = _crear_sello(*tamano, imagen, x1, y1, ancho)
+                pagina.merge_page(sellos[tamano])
+            escritor.add_page(pagina)
+
+        temporal = f"{archivo_salida}.part"
+        try:
+            with open(temporal, "wb") as f:
+                escritor.write(f)
+            if firma.FIRMA_P12:
+                _firmar_digitalmente(temporal, archivo_salida, firma.FIRMA_P12, firma.FIRMA_P12_PASSWORD)
+            else:
+                os.replace(temporal, archivo_salida)
+        except ImportError:
+            print(
+                "[bold red]Error: Se requiere el paquete pyhanko para la firma digital. Instale con pip install pyhanko[/bold red]"
+            )
+            return None
+        finally:
+            if os.path.exists(temporal):
+                os.remove(temporal)
+
+        return archivo_salida
+
+    except Exception as e:
+        print(f"[bold red]Error al firmar PDF localmente: {e}[/bold red]")
+        return None
@@ -1,11 +1,26 @@
 import requests
 import os
 from orgm.stuff.header import get_headers_json
+from orgm.apps.utils.rnc.indice import abrir_indice
 
 
 def buscar_empresa_en_dgii(busqueda: str, activo: bool = True):
+    """
+    Busca empresas por nombre o RNC.
+
+    Usa el índice local del padrón de la DGII cuando existe
+    (`orgm rnc index build`) y la API como respaldo.
+    """
+    indice = abrir_indice()
+    if indice is not None:
+        try:
+            resultados = indice.buscar(busqueda, activo)
+            if resultados:
+                return resultados
+        except Exception as e:
+            print(f"Error al buscar en el índice RNC local: {e}")
+
     RNC_URL = os.getenv("RNC_URL")
-    """Busca clientes por nombre o RNC en la API."""
     if not RNC_URL:
         print(
             "Error: La URL de la API RNC no está configurada en las variables de entorno."
@@ -27,3 +42,33 @@ def buscar_empresa_en_dgii(busqueda: str, activo: bool = True):
     except Exception as e:
         print(f"Error inesperado al buscar RNC: {e}")
         return None
+
+
+def consultar_rnc(rnc: str, sesion=None):
+    """
+    Consulta un RNC o cédula exacto en la API, sin usar el índice local.
+
+    Lanza una excepción si la API falla, para que quien consulta en lote
+    pueda distinguir un RNC desconocido de un error de red.
+
+    Returns:
+        dict | None: Registro de la empresa o None si no existe.
+    """
+    RNC_URL = os.getenv("RNC_URL")
+    if not RNC_URL:
+        raise RuntimeError("La URL de la API RNC no está configurada en las variables de entorno.")
+
+    from orgm.stuff.http import obtener_sesion
+
+    sesion = sesion or obtener_sesion()
+    response = sesion.get(
+        f"{RNC_URL}/buscar",
+        json={"busqueda": rnc, "activo": None},
+        headers=get_headers_json(),
+        timeout=15,
+    )
+    response.raise_for_status()
+    for empresa in response.json() or []:
+        if str(empresa.get("rnc", "")).replace("-", "") == rnc:
+            return empresa
+    return None
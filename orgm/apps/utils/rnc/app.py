@@ -3,6 +3,8 @@ from rich.console import Console
 
 # Importar la función que define los argumentos y la lógica
 from orgm.apps.utils.rnc.find import mostrar_busqueda
+from orgm.apps.utils.rnc.verify import verificar_clientes
+from orgm.apps.utils.rnc.index_cmd import construir_indice, actualizar_indice_rnc, info_indice
 
 # Crear consola para salida con Rich
 console = Console()
@@ -13,6 +15,15 @@ app = typer.Typer(help="Comandos para interactuar con datos de clientes")
 # Registrar ai_prompt directamente con el nombre 'prompt'
 # El docstring de ai_prompt se usará como ayuda
 app.command(name="buscar")(mostrar_busqueda)
+app.command(name="find")(mostrar_busqueda)
+app.command(name="verify-clients")(verificar_clientes)
+
+# Subcomandos para el índice local del padrón de la DGII
+index_app = typer.Typer(help="Índice local del padrón de RNC de la DGII")
+index_app.command(name="build")(construir_indice)
+index_app.command(name="update")(actualizar_indice_rnc)
+index_app.command(name="info")(info_indice)
+app.add_typer(index_app, name="index")
 
 
 @app.callback(invoke_without_command=True)
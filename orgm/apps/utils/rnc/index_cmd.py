@@ -0,0 +1,36 @@
+import typer
+from rich.console import Console
+from orgm.apps.utils.rnc.indice import actualizar_indice, abrir_indice, directorio_indice
+
+console = Console()
+
+
+def construir_indice(
+    archivo: str = typer.Argument(..., help="Archivo DGII_RNC.TXT o DGII_RNC.zip"),
+) -> None:
+    """Construye el índice local de RNC a partir del padrón de la DGII"""
+    actualizar_indice(archivo, reemplazar=True)
+
+
+def actualizar_indice_rnc(
+    archivo: str = typer.Argument(..., help="Archivo DGII_RNC.TXT o DGII_RNC.zip"),
+    reemplazar: bool = typer.Option(
+        False, "--reemplazar", help="Elimina los RNC que no estén en el archivo"
+    ),
+) -> None:
+    """Importa un archivo nuevo de la DGII al índice local, conservando los registros existentes"""
+    actualizar_indice(archivo, reemplazar=reemplazar)
+
+
+def info_indice() -> None:
+    """Muestra la información del índice local de RNC"""
+    indice = abrir_indice()
+    if indice is None:
+        console.print(
+            f"[yellow]No hay índice RNC en {directorio_indice()}. Use 'orgm rnc index build <archivo>'[/yellow]"
+        )
+        return
+    console.print(f"Directorio: {indice.directorio}")
+    console.print(f"Registros: {indice.total}")
+    console.print(f"Origen: {indice.meta.get('origen')}")
+    console.print(f"Fecha: {indice.meta.get('fecha')}")
@@ -0,0 +1,381 @@
+import io
+import json
+import math
+import mmap
+import os
+import re
+import shutil
+import zipfile
+from array import array
+from bisect import bisect_left
+from collections import Counter
+from datetime import datetime
+from rich.console import Console
+from orgm.stuff.texto import normalizar, trigramas, similitud
+
+console = Console()
+
+VERSION_INDICE = 1
+
+# Ancho fijo de las claves: RNC (9 dígitos) y cédulas (11 dígitos). Se rellenan
+# con espacios a la derecha para que el orden de bytes sea el orden
+# lexicográfico y los prefijos queden contiguos.
+ANCHO_CLAVE = 11
+
+# Candidatos por trigramas que se comparan con el nombre completo
+MAX_CANDIDATOS = 300
+
+
+def directorio_indice() -> str:
+    return os.getenv("RNC_INDICE") or os.path.join(os.path.expanduser("~"), ".orgm", "rnc")
+
+
+def _clave(rnc: str) -> bytes:
+    return rnc.encode("ascii")[:ANCHO_CLAVE].ljust(ANCHO_CLAVE, b" ")
+
+
+def _abrir_texto(archivo: str):
+    """Abre el archivo de la DGII, comprimido o no, como texto."""
+    if zipfile.is_zipfile(archivo):
+        comprimido = zipfile.ZipFile(archivo)
+        nombres = [n for n in comprimido.namelist() if n.lower().endswith((".txt", ".csv"))]
+        if not nombres:
+            raise ValueError(f"El archivo {archivo} no contiene un .TXT")
+        binario = comprimido.open(nombres[0])
+    else:
+        binario = open(archivo, "rb")
+    # El padrón de la DGII se publica en latin-1; latin-1 nunca falla al decodificar
+    return io.TextIOWrapper(binario, encoding="latin-1", newline="")
+
+
+def leer_archivo_dgii(archivo: str):
+    """
+    Lee el padrón de RNC de la DGII (DGII_RNC.TXT o su .zip).
+
+    Cada línea tiene el formato
+    RNC|RAZÓN SOCIAL|NOMBRE COMERCIAL|ACTIVIDAD|...|FECHA|ESTADO|RÉGIMEN.
+
+    Yields:
+        tuple: (rnc, razon, nombre, descripcion, estado)
+    """
+    with _abrir_texto(archivo) as f:
+        for linea in f:
+            campos = linea.rstrip("\r\n").split("|")
+            rnc = re.sub(r"\D", "", campos[0]) if campos else ""
+            if not rnc or len(campos) < 4:
+                continue
+            estado = campos[9].strip() if len(campos) > 9 else ""
+            yield (
+                rnc,
+                " ".join(campos[1].split()),
+                " ".join(campos[2].split()),
+                " ".join(campos[3].split()),
+                estado,
+            )
+
+
+def _escribir_indice(registros: dict, directorio: str, origen: str) -> int:
+    """
+    Escribe el índice completo en `directorio` de forma atómica.
+
+    Archivos generados:
+        claves.bin: RNC ordenados, ANCHO_CLAVE bytes cada uno.
+        offsets.bin: posición (uint64) de cada registro en registros.bin.
+        registros.bin: registros separados por tabuladores, uno por línea.
+        trigramas.json / postings.bin: para cada trigrama, la lista ordenada
+            (uint32) de registros cuyo nombre lo contiene.
+        meta.json: versión, cantidad de registros y origen.
+    """
+    temporal = f"{directorio}.tmp"
+    shutil.rmtree(temporal, ignore_errors=True)
+    os.makedirs(temporal)
+
+    rncs = sorted(registros, key=_clave)
+    offsets = array("Q")
+    postings = {}
+
+    with open(os.path.join(temporal, "claves.bin"), "wb") as claves, \
+            open(os.path.join(temporal, "registros.bin"), "wb") as datos:
+        posicion = 0
+        for id_registro, rnc in enumerate(rncs):
+            registro = registros[rnc]
+            claves.write(_clave(rnc))
+            linea = ("\t".join(v.replace("\t", " ") for v in (rnc, *registro)) + "\n").encode("utf-8")
+            offsets.append(posicion)
+            datos.write(linea)
+            posicion += len(linea)
+
+            razon, nombre = registro[0], registro[1]
+            for tri in trigramas(razon) | trigramas(nombre):
+                lista = postings.get(tri)
+                if lista is None:
+                    lista = postings[tri] = array("I")
+                lista.append(id_registro)
+        offsets.append(posicion)
+
+    with open(os.path.join(temporal, "offsets.bin"), "wb") as f:
+        offsets.tofile(f)
+
+    vocabulario = {}
+    with open(os.path.join(temporal, "postings.bin"), "wb") as f:
+        inicio = 0
+        for tri in sorted(postings):
+            lista = postings[tri]
+            lista.tofile(f)
+            vocabulario[tri] = [inicio, len(lista)]
+            inicio += len(lista)
+
+    with open(os.path.join(temporal, "trigramas.json"), "w", encoding="utf-8") as f:
+        json.dump(vocabulario, f, ensure_ascii=False, separators=(",", ":"))
+
+    with open(os.path.join(temporal, "meta.json"), "w", encoding="utf-8") as f:
+        json.dump(
+            {
+                "version": VERSION_INDICE,
+                "registros": len(rncs),
+                "origen": os.path.basename(origen),
+                "fecha": datetime.now().isoformat(timespec="seconds"),
+            },
+            f,
+            ensure_ascii=False,
+        )
+
+    anterior = f"{directorio}.old"
+    shutil.rmtree(anterior, ignore_errors=True)
+    if os.path.exists(directorio):
+        os.replace(directorio, anterior)
+    os.replace(temporal, directorio)
+    shutil.rmtree(anterior, ignore_errors=True)
+    return len(rncs)
+
+
+class IndiceRNC:
+    """Índice del padrón de RNC abierto con memoria mapeada."""
+
+    def __init__(self, directorio: str):
+        self.directorio = directorio
+        with open(os.path.join(directorio, "meta.json"), "r", encoding="utf-8") as f:
+            self.meta = json.load(f)
+        if self.meta.get("version") != VERSION_INDICE:
+            raise ValueError("El índice RNC fue creado con otra versión, vuelva a construirlo")
+        with open(os.path.join(directorio, "trigramas.json"), "r", encoding="utf-8") as f:
+            self.vocabulario = json.load(f)
+
+        self._mapas = []
+        self.claves = self._mapear("claves.bin")
+        self.registros = self._mapear("registros.bin")
+        self.offsets = memoryview(self._mapear("offsets.bin")).cast("Q")
+        self.postings = memoryview(self._mapear("postings.bin")).cast("I")
+        self.total = self.meta["registros"]
+        self.firma = os.path.getmtime(os.path.join(directorio, "meta.json"))
+
+    def _mapear(self, nombre: str):
+        with open(os.path.join(self.directorio, nombre), "rb") as f:
+            if os.fstat(f.fileno()).st_size == 0:
+                return b""
+            mapa = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        self._mapas.append(mapa)
+        return mapa
+
+    def _clave_en(self, i: int) -> bytes:
+        return self.claves[i * ANCHO_CLAVE:(i + 1) * ANCHO_CLAVE]
+
+    def _primera_posicion(self, clave: bytes) -> int:
+        """Búsqueda binaria de la primera clave >= `clave`."""
+        bajo, alto = 0, self.total
+        while bajo < alto:
+            medio = (bajo + alto) // 2
+            if self._clave_en(medio) < clave:
+                bajo = medio + 1
+            else:
+                alto = medio
+        return bajo
+
+    def registro(self, i: int) -> dict:
+        linea = self.registros[self.offsets[i]:self.offsets[i + 1]].decode("utf-8").rstrip("\n")
+        rnc, razon, nombre, descripcion, estado = linea.split("\t")
+        return {
+            "rnc": rnc,
+            "razon": razon,
+            "nombre": nombre,
+            "descripcion": descripcion,
+            "estado": estado,
+        }
+
+    def buscar_rnc(self, rnc: str) -> dict | None:
+        """Devuelve el registro de un RNC o cédula exacto."""
+        clave = _clave(rnc)
+        i = self._primera_posicion(clave)
+        if i < self.total and self._clave_en(i) == clave:
+            return self.registro(i)
+        return None
+
+    def buscar_prefijo(self, prefijo: str, limite: int = 20):
+        """Registros cuyo RNC empieza por `prefijo`."""
+        prefijo_bytes = prefijo.encode("ascii")
+        i = self._primera_posicion(prefijo_bytes)
+        while i < self.total and self._clave_en(i).startswith(prefijo_bytes):
+            yield self.registro(i)
+            i += 1
+            limite -= 1
+            if limite <= 0:
+                break
+
+    def _lista(self, tri: str) -> memoryview:
+        inicio, cantidad = self.vocabulario[tri]
+        return self.postings[inicio:inicio + cantidad]
+
+    def buscar_nombre(self, texto: str, limite: int = 20, activo: bool | None = None) -> list[dict]:
+        """
+        Búsqueda aproximada por razón social o nombre comercial.
+
+        Los candidatos se obtienen de las listas de trigramas más raras: un
+        registro que comparte al menos la mitad de los trigramas de la
+        búsqueda aparece en alguna de ellas. Después se ordenan por
+        similitud con el nombre completo.
+        """
+        consulta = normalizar(texto)
+        tris = trigramas(consulta, normalizado=True)
+        if not tris:
+            return []
+
+        umbral = max(1, math.ceil(len(tris) * 0.5))
+        listas = sorted(
+            (self._lista(t) for t in tris if t in self.vocabulario), key=len
+        )
+        if len(listas) < umbral:
+            return []
+
+        generadoras = len(listas) - umbral + 1
+        conteo = Counter()
+        for lista in listas[:generadoras]:
+            conteo.update(lista)
+
+        # Completa el conteo de los mejores candidatos con las listas
+        # restantes mediante búsqueda binaria
+        restantes = listas[generadoras:]
+        candidatos = [i for i, _ in conteo.most_common(MAX_CANDIDATOS * 10)]
+        for id_registro in candidatos:
+            for lista in restantes:
+                posicion = bisect_left(lista, id_registro)
+                if posicion < len(lista) and lista[posicion] == id_registro:
+                    conteo[id_registro] += 1
+
+        candidatos = sorted(
+            (i for i in candidatos if conteo[i] >= umbral), key=lambda i: -conteo[i]
+        )[:MAX_CANDIDATOS]
+
+        resultados = []
+        for id_registro in candidatos:
+            registro = self.registro(id_registro)
+            if activo is not None and (normalizar(registro["estado"]) == "activo") != activo:
+                continue
+            puntaje = 0.0
+            for campo in ("razon", "nombre"):
+                nombre = normalizar(registro[campo])
+                valor = similitud(tris, trigramas(nombre, normalizado=True))
+                if nombre.startswith(consulta):
+                    valor += 0.5
+                puntaje = max(puntaje, valor)
+            resultados.append((puntaje, registro))
+
+        resultados.sort(key=lambda r: -r[0])
+        return [registro for _, registro in resultados[:limite]]
+
+    def buscar(self, busqueda: str, activo: bool | None = True, limite: int = 20) -> list[dict]:
+        """Busca por RNC/cédula (exacto o prefijo) o por nombre."""
+        digitos = re.sub(r"[\s-]", "", busqueda or "")
+        if digitos.isdigit():
+            resultados = list(self.buscar_prefijo(digitos, limite * 5))
+            if activo is not None:
+                resultados = [r for r in resultados if (normalizar(r["estado"]) == "activo") == activo]
+            return resultados[:limite]
+        return self.buscar_nombre(busqueda, limite, activo)
+
+    def __iter__(self):
+        for i in range(self.total):
+            yield self.registro(i)
+
+
+_indice = None
+
+
+def abrir_indice() -> IndiceRNC | None:
+    """
+    Abre el índice local si existe. Se reutiliza entre llamadas y se vuelve
+    a abrir si fue reconstruido.
+    """
+    global _indice
+    directorio = directorio_indice()
+    meta = os.path.join(directorio, "meta.json")
+    if not os.path.exists(meta):
+        return None
+    if _indice is None or _indice.directorio != directorio or _indice.firma != os.path.getmtime(meta):
+        try:
+            _indice = IndiceRNC(directorio)
+        except Exception as e:
+            console.print(f"[bold yellow]No se pudo abrir el índice RNC: {e}[/bold yellow]")
+            _indice = None
+    return _indice
+
+
+def actualizar_indice(archivo: str, reemplazar: bool = False) -> dict | None:
+    """
+    Importa un archivo de la DGII al índice local.
+
+    Los registros del archivo se combinan con los del índice existente. Con
+    `reemplazar` los RNC que no estén en el archivo se eliminan. Si no hay
+    cambios el índice no se reescribe.
+
+    Returns:
+        dict: Conteo de registros nuevos, modificados, eliminados y total.
+    """
+    global _indice
+    if not os.path.exists(archivo):
+        console.print(f"[bold red]Error: El archivo {archivo} no existe[/bold red]")
+        return None
+
+    directorio = directorio_indice()
+    existente = abrir_indice()
+    registros = {}
+    if existente is not None:
+        with console.status("Leyendo índice actual..."):
+            for r in existente:
+                registros[r["rnc"]] = (r["razon"], r["nombre"], r["descripcion"], r["estado"])
+
+    resumen = {"nuevos": 0, "modificados": 0, "eliminados": 0}
+    vistos = set()
+    with console.status(f"Leyendo {os.path.basename(archivo)}..."):
+        for rnc, *valores in leer_archivo_dgii(archivo):
+            valores = tuple(valores)
+            vistos.add(rnc)
+            anterior = registros.get(rnc)
+            if anterior is None:
+                resumen["nuevos"] += 1
+            elif anterior != valores:
+                resumen["modificados"] += 1
+            else:
+                continue
+            registros[rnc] = valores
+
+    if reemplazar:
+        for rnc in [r for r in registros if r not in vistos]:
+            del registros[rnc]
+            resumen["eliminados"] += 1
+
+    if existente is not None and not any(resumen.values()):
+        console.print("[bold green]El índice RNC ya está actualizado[/bold green]")
+        resumen["total"] = existente.total
+        return resumen
+
+    # Libera el índice abierto antes de reemplazar sus archivos
+    _indice = None
+    with console.status("Construyendo índice..."):
+        resumen["total"] = _escribir_indice(registros, directorio, archivo)
+
+    console.print(
+        f"[bold green]Índice RNC actualizado en {directorio}[/bold green]: "
+        f"{resumen['nuevos']} nuevos, {resumen['modificados']} modificados, "
+        f"{resumen['eliminados']} eliminados, {resumen['total']} en total"
+    )
+    return resumen
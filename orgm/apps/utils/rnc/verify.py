@@ -0,0 +1,178 @@
+import csv
+import re
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from difflib import SequenceMatcher
+from typing import Optional
+import typer
+from rich.console import Console
+from rich.progress import Progress
+from orgm.apps.utils.rnc.api import consultar_rnc
+from orgm.apps.utils.rnc.indice import abrir_indice
+from orgm.apps.utils.docs.reporte import Reporte
+from orgm.stuff.texto import normalizar
+
+console = Console()
+
+# Sufijos societarios que no cuentan al comparar nombres
+_SUFIJOS = re.compile(r"\b(s ?r ?l|s ?a ?s|s ?a|e ?i ?r ?l|c ?por ?a|srl|sas|eirl|ltd|inc)\b")
+
+
+def _nombre_comparable(nombre: str) -> str:
+    return " ".join(_SUFIJOS.sub(" ", normalizar(nombre)).split())
+
+
+def similitud_nombres(cliente: dict, empresa: dict) -> float:
+    """Mayor similitud entre los nombres del cliente y los de la DGII."""
+    mejor = 0.0
+    for a in (cliente.get("nombre"), cliente.get("nombre_comercial")):
+        a = _nombre_comparable(a)
+        if not a:
+            continue
+        for b in (empresa.get("razon"), empresa.get("nombre")):
+            b = _nombre_comparable(b)
+            if b:
+                mejor = max(mejor, SequenceMatcher(None, a, b).ratio())
+    return mejor
+
+
+def cargar_clientes(archivo_csv: Optional[str] = None) -> list[dict]:
+    """
+    Obtiene id, nombre, nombre_comercial y numero de los clientes desde un CSV
+    (con encabezados; se acepta "rnc" en lugar de "numero") o desde PostgREST.
+    """
+    if archivo_csv:
+        with open(archivo_csv, "r", encoding="utf-8-sig", newline="") as f:
+            clientes = []
+            for fila in csv.DictReader(f):
+                fila = {k.strip().lower(): (v or "").strip() for k, v in fila.items() if k}
+                fila.setdefault("numero", fila.get("rnc", ""))
+                clientes.append(fila)
+            return clientes
+
+    from orgm.stuff.initialize_postgrest import initialize
+    from orgm.stuff.http import obtener_sesion
+
+    POSTGREST_URL, headers = initialize()
+    if not POSTGREST_URL:
+        return []
+    response = obtener_sesion().get(
+        f"{POSTGREST_URL}/cliente?select=id,nombre,nombre_comercial,numero&order=id",
+        headers=headers,
+        timeout=30,
+    )
+    response.raise_for_status()
+    return response.json()
+
+
+def verificar_clientes(
+    archivo_csv: Optional[str] = typer.Option(
+        None, "--csv", help="CSV con columnas id, nombre, numero. Por defecto se usa PostgREST"
+    ),
+    umbral: float = typer.Option(
+        0.6, "--umbral", "-u", help="Similitud mínima (0-1) para considerar que el nombre coincide"
+    ),
+    trabajadores: int = typer.Option(
+        8, "--trabajadores", "-t", help="Consultas simultáneas a la API cuando no hay índice local"
+    ),
+    salida: Optional[str] = typer.Option(
+        None, "--salida", "-s", help="Ruta sin extensión para guardar el reporte (html, csv, json)"
+    ),
+) -> dict:
+    """Verifica en lote los RNC de los clientes contra el padrón de la DGII"""
+    try:
+        clientes = cargar_clientes(archivo_csv)
+    except Exception as e:
+        console.print(f"[bold red]Error al obtener clientes: {e}[/bold red]")
+        return {}
+    if not clientes:
+        console.print("[bold yellow]No se encontraron clientes.[/bold yellow]")
+        return {}
+
+    numeros = {re.sub(r"\D", "", str(c.get("numero") or "")) for c in clientes}
+    numeros = {n for n in numeros if len(n) in (9, 11)}
+
+    # Cada RNC se consulta una sola vez aunque lo compartan varios clientes
+    encontrados = {}
+    errores = {}
+    indice = abrir_indice()
+    if indice is not None:
+        console.print(f"Usando índice local ({indice.total} registros)", style="dim")
+        for numero in numeros:
+            encontrados[numero] = indice.buscar_rnc(numero)
+    else:
+        from orgm.stuff.http import obtener_sesion
+
+        sesion = obtener_sesion(conexiones=trabajadores)
+        with ThreadPoolExecutor(max_workers=trabajadores) as pool, Progress() as progreso:
+            tarea = progreso.add_task("Consultando RNC...", total=len(numeros))
+            futuros = {pool.submit(consultar_rnc, n, sesion): n for n in numeros}
+            for futuro in as_completed(futuros):
+                numero = futuros[futuro]
+                try:
+                    encontrados[numero] = futuro.result()
+                except Exception as e:
+                    errores[numero] = str(e)
+                progreso.advance(tarea)
+
+    categorias = {
+        "Formato inválido": [],
+        "Desconocido": [],
+        "Inactivo": [],
+        "Nombre distinto": [],
+        "Error de consulta": [],
+    }
+    correctos = 0
+    for cliente in clientes:
+        numero = re.sub(r"\D", "", str(cliente.get("numero") or ""))
+        fila = [cliente.get("id", ""), cliente.get("nombre", ""), cliente.get("numero", "")]
+        if len(numero) not in (9, 11):
+            categorias["Formato inválido"].append(fila + ["", "", ""])
+            continue
+        if numero in errores:
+            categorias["Error de consulta"].append(fila + ["", "", errores[numero]])
+            continue
+        empresa = encontrados.get(numero)
+        if empresa is None:
+            categorias["Desconocido"].append(fila + ["", "", ""])
+            continue
+
+        nombre_dgii = empresa.get("razon") or empresa.get("nombre") or ""
+        estado = empresa.get("estado") or ""
+        parecido = similitud_nombres(cliente, empresa)
+        fila += [nombre_dgii, estado, f"{parecido:.0%}"]
+        if normalizar(estado) != "activo":
+            categorias["Inactivo"].append(fila)
+        elif parecido < umbral:
+            categorias["Nombre distinto"].append(fila)
+        else:
+            correctos += 1
+
+    columnas = [
+        {"nombre": "ID", "justify": "right", "style": "dim"},
+        {"nombre": "Cliente", "style": "green"},
+        {"nombre": "RNC", "style": "cyan"},
+        {"nombre": "Nombre DGII"},
+        {"nombre": "Estado"},
+        {"nombre": "Similitud / Detalle", "justify": "right"},
+    ]
+    with Reporte(
+        "Verificación de RNC de clientes",
+        columnas,
+        ruta_base=salida,
+        nombre_seccion="Resultado",
+    ) as reporte:
+        for categoria, filas in categorias.items():
+            if not filas:
+                continue
+            reporte.seccion(categoria)
+            for fila in filas:
+                reporte.agregar(*fila)
+
+    resumen = {categoria: len(filas) for categoria, filas in categorias.items()}
+    resumen["Correctos"] = correctos
+    console.print(
+        " | ".join(f"{k}: {v}" for k, v in resumen.items()), style="bold blue"
+    )
+    if reporte.archivos:
+        console.print(f"Reporte guardado en: {reporte.archivos.get('html')}", style="bold green")
+    return resumen
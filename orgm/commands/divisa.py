@@ -1,7 +1,8 @@
 # -*- coding: utf-8 -*-
 import typer
 from rich.console import Console
-from orgm.apis.divisa import obtener_tasa_divisa
+from typing import Optional
+from orgm.apps.utils.divisa import obtener_tasa_divisa, importar_tasas_csv, completar_historico
 
 console = Console()
 
@@ -10,12 +11,13 @@ def tasa_divisa_command(
     desde: str = typer.Argument("USD", help="Moneda de origen (ej. USD, EUR, RD$)"),
     a: str = typer.Argument("RD$", help="Moneda de destino (ej. USD, EUR, RD$)"),
     cantidad: float = typer.Argument(1.0, help="Cantidad a convertir"),
+    fecha: Optional[str] = typer.Option(None, "--fecha", "-f", help="Fecha de la tasa (YYYY-MM-DD)"),
 ):
     """Obtiene la tasa de cambio entre dos divisas."""
     console.print(
         f"Obteniendo tasa de {desde.upper()} a {a.upper()} para {cantidad}..."
     )
-    resultado = obtener_tasa_divisa(desde.upper(), a.upper(), cantidad)
+    resultado = obtener_tasa_divisa(desde.upper(), a.upper(), cantidad, fecha=fecha)
 
     if resultado is None:
         console.print("[bold red]Error al obtener la tasa de cambio.[/bold red]")
@@ -30,10 +32,11 @@ def convertir_command(
     desde: str = typer.Argument("USD", help="Moneda de origen (ej. USD, EUR, RD$)"),
     a: str = typer.Argument("RD$", help="Moneda de destino (ej. USD, EUR, RD$)"),
     monto: float = typer.Argument(1, help="Monto a convertir"),
+    fecha: Optional[str] = typer.Option(None, "--fecha", "-f", help="Fecha de la tasa (YYYY-MM-DD)"),
 ):
     """Convierte un monto entre dos divisas."""
     console.print(f"Convirtiendo {monto:.2f} {desde.upper()} a {a.upper()}...")
-    resultado = obtener_tasa_divisa(desde.upper(), a.upper(), monto)
+    resultado = obtener_tasa_divisa(desde.upper(), a.upper(), monto, fecha=fecha)
 
     if resultado is None:
         console.print("[bold red]Error al obtener la tasa de cambio.[/bold red]")
@@ -42,3 +45,36 @@ def convertir_command(
     console.print(
         f"[bold green]{monto:.2f} {desde.upper()} = {resultado:.2f} {a.upper()}[/bold green]"
     )
+
+
+def backfill_command(
+    inicio: str = typer.Argument(..., help="Fecha inicial (YYYY-MM-DD)"),
+    fin: Optional[str] = typer.Argument(None, help="Fecha final (YYYY-MM-DD), por defecto hoy"),
+    desde: str = typer.Option("USD", "--desde", help="Moneda de origen"),
+    a: str = typer.Option("DOP", "--a", help="Moneda de destino"),
+    csv: Optional[str] = typer.Option(
+        None, "--csv", help="Importa un CSV con columnas fecha, desde, a, tasa en lugar de usar la API"
+    ),
+    trabajadores: int = typer.Option(4, "--trabajadores", "-t", help="Consultas simultáneas"),
+):
+    """Guarda en la caché local las tasas históricas para usarlas sin conexión."""
+    if csv:
+        importadas = importar_tasas_csv(csv)
+        console.print(f"[bold green]{importadas} tasas importadas desde {csv}[/bold green]")
+        return
+
+    console.print(f"Descargando tasas {desde.upper()}->{a.upper()} desde {inicio}...")
+    try:
+        resumen = completar_historico(desde.upper(), a.upper(), inicio, fin, trabajadores)
+    except ValueError as e:
+        console.print(f"[bold red]Fecha inválida: {e}[/bold red]")
+        raise typer.Exit(code=1)
+    console.print(
+        f"[bold green]Descargadas: {resumen['descargadas']}[/bold green], "
+        f"ya existentes: {resumen['existentes']}, "
+        f"[bold red]errores: {resumen['errores']}[/bold red]"
+    )
+    if resumen["sin_confirmar"]:
+        console.print(
+            f"[yellow]{resumen['sin_confirmar']} tasas no se guardaron porque la API no confirmó su fecha.[/yellow]"
+        )
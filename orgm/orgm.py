@@ -18,9 +18,12 @@ from orgm.apps.utils.rnc.app import app as rnc_app
 from orgm.apps.adm.cliente.app import app as cliente_app
 from orgm.apps.adm.proyecto.app import app as proyecto_app
 from orgm.apps.adm.cotizacion.app import app as cotizacion_app
+from orgm.apps.adm.presupuesto.app import app as presupuesto_app
 from orgm.menu import menu_principal
 from orgm.apps.utils.docs.app import app as docs_app
 from orgm.apps.utils.carpetas.app import app as carpeta_app
+from orgm.apps.utils.divisa_app import app as divisa_app
+from orgm.apps.adm.buscar_global import buscar_global
 
 console = Console()
 
@@ -44,8 +47,11 @@ class OrgmCLI:
         self.app.add_typer(cliente_app, name="cliente")
         self.app.add_typer(proyecto_app, name="proyecto")
         self.app.add_typer(cotizacion_app, name="cotizacion")
+        self.app.add_typer(presupuesto_app, name="presupuesto")
         self.app.add_typer(docs_app, name="documento")
         self.app.add_typer(carpeta_app, name="carpeta")
+        self.app.add_typer(divisa_app, name="divisa")
+        self.app.command(name="buscar", help="Busca en clientes, proyectos, cotizaciones, servicios y ubicaciones.")(buscar_global)
         # --- Comando de menú ---
         @self.app.command(name="menu", help="Muestra el menú interactivo principal.")
         def menu_command(ctx_menu: typer.Context): # ctx_menu es el contexto de este comando 'menu'
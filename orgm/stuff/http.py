@@ -0,0 +1,386 @@
+import hashlib
+import json
+import os
+import sqlite3
+import threading
+import time
+import uuid
+from contextlib import contextmanager
+from urllib.parse import urlencode, urlsplit
+import requests
+from requests.structures import CaseInsensitiveDict
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+
+# Tiempo de espera por defecto (conexión, lectura) en segundos
+TIMEOUT = (10, 120)
+
+# Tamaño de bloque para subir y descargar archivos
+TAMANO_BLOQUE = 64 * 1024
+
+# Caché de respuestas GET en disco (obtener_en_cache)
+RUTA_CACHE_HTTP = os.path.join(os.path.expanduser("~"), ".orgm", "cache", "http.sqlite")
+
+# Tamaño máximo de la caché; al superarlo se borran las respuestas usadas hace más tiempo
+TAMANO_CACHE_HTTP = int(float(os.getenv("ORGM_CACHE_HTTP_MB", "50")) * 1024 * 1024)
+
+# Segundos que una respuesta se usa sin consultar al servidor, según el
+# último segmento de la ruta. Después se revalida con If-None-Match /
+# If-Modified-Since (un 304 sin cuerpo si no cambió).
+TTL_RUTAS = {
+    "servicio": 24 * 3600,
+    "ubicacion": 7 * 24 * 3600,
+    "tipofactura": 7 * 24 * 3600,
+    "categoria": 24 * 3600,
+    "unidad": 7 * 24 * 3600,
+    "configs": 3600,
+}
+
+# Encabezados de la petición que distinguen respuestas en la caché
+_ENCABEZADOS_CLAVE = (
+    "accept",
+    "accept-profile",
+    "authorization",
+    "if-modified-since",
+    "if-none-match",
+    "prefer",
+    "range",
+    "x-api-key",
+)
+
+_sesiones = {}
+_bloqueo = threading.Lock()
+_bloqueo_cache = threading.Lock()
+_en_curso = {}
+_bloqueo_en_curso = threading.Lock()
+
+
+def obtener_sesion(conexiones: int = 10, reintentos: int = 3, reintentar_post: bool = False) -> requests.Session:
+    """
+    Devuelve una sesión de requests compartida con pool de conexiones y reintentos.
+
+    Las sesiones se reutilizan por configuración para que las conexiones HTTP
+    se mantengan abiertas entre llamadas.
+
+    Args:
+        conexiones: Número máximo de conexiones simultáneas por host.
+        reintentos: Número de reintentos ante errores de red o 429/5xx.
+        reintentar_post: Si también se reintentan peticiones POST. Solo debe
+            usarse cuando el servicio es idempotente.
+
+    Returns:
+        requests.Session: Sesión configurada.
+    """
+    clave = (conexiones, reintentos, reintentar_post)
+    with _bloqueo:
+        sesion = _sesiones.get(clave)
+        if sesion is None:
+            metodos = Retry.DEFAULT_ALLOWED_METHODS
+            if reintentar_post:
+                metodos = metodos | {"POST"}
+            retry = Retry(
+                total=reintentos,
+                backoff_factor=0.5,
+                status_forcelist=(429, 500, 502, 503, 504),
+                allowed_methods=metodos,
+                raise_on_status=False,
+            )
+            adaptador = HTTPAdapter(pool_connections=conexiones, pool_maxsize=conexiones, max_retries=retry)
+            sesion = requests.Session()
+            sesion.mount("http://", adaptador)
+            sesion.mount("https://", adaptador)
+            _sesiones[clave] = sesion
+    return sesion
+
+
+def ttl_ruta(url: str) -> int:
+    """TTL de TTL_RUTAS para una URL (0 si la ruta no está: siempre se revalida)."""
+    ruta = urlsplit(url).path.rstrip("/")
+    return TTL_RUTAS.get(ruta.rsplit("/", 1)[-1], 0)
+
+
+@contextmanager
+def _cache_http():
+    """Abre la caché de respuestas dentro de una transacción y la cierra al salir."""
+    os.makedirs(os.path.dirname(RUTA_CACHE_HTTP), exist_ok=True)
+    conexion = sqlite3.connect(RUTA_CACHE_HTTP, timeout=10)
+    try:
+        with conexion:
+            conexion.execute(
+                "CREATE TABLE IF NOT EXISTS respuestas ("
+                "clave TEXT PRIMARY KEY, url TEXT NOT NULL, estado INTEGER NOT NULL, "
+                "encabezados TEXT NOT NULL, cuerpo BLOB NOT NULL, guardada REAL NOT NULL, "
+                "usada REAL NOT NULL, tamano INTEGER NOT NULL)"
+            )
+            conexion.execute("CREATE INDEX IF NOT EXISTS respuestas_usada ON respuestas (usada)")
+            yield conexion
+    finally:
+        conexion.close()
+
+
+def _url_completa(url: str, params) -> str:
+    if not params:
+        return url
+    consulta = urlencode(sorted(dict(params).items()), doseq=True)
+    return f"{url}{'&' if '?' in url else '?'}{consulta}"
+
+
+def _clave(url: str, headers) -> str:
+    encabezados = {k.lower(): str(v) for k, v in (headers or {}).items() if k.lower() in _ENCABEZADOS_CLAVE}
+    return hashlib.sha256(json.dumps([url, sorted(encabezados.items())]).encode("utf-8")).hexdigest()
+
+
+def _respuesta(url: str, estado: int, encabezados: dict, cuerpo: bytes) -> requests.Response:
+    """Construye una respuesta de requests a partir de lo guardado."""
+    respuesta = requests.Response()
+    respuesta.status_code = estado
+    respuesta.headers = CaseInsensitiveDict(encabezados)
+    respuesta._content = cuerpo
+    respuesta.url = url
+    respuesta.encoding = requests.utils.get_encoding_from_headers(respuesta.headers)
+    respuesta.desde_cache = True
+    return respuesta
+
+
+def _guardar_respuesta(clave: str, url: str, respuesta: requests.Response) -> None:
+    ahora = time.time()
+    cuerpo = respuesta.content
+    with _bloqueo_cache, _cache_http() as conexion:
+        conexion.execute(
+            "INSERT OR REPLACE INTO respuestas (clave, url, estado, encabezados, cuerpo, guardada, usada, tamano) "
+            "VALUES (?, ?, ?, ?, ?, ?, ?, ?)",
+            (clave, url, respuesta.status_code, json.dumps(dict(respuesta.headers)), cuerpo, ahora, ahora, len(cuerpo)),
+        )
+        # Desalojo LRU hasta quedar por debajo del tamaño máximo
+        total = conexion.execute("SELECT COALESCE(SUM(tamano), 0) FROM respuestas").fetchone()[0]
+        if total > TAMANO_CACHE_HTTP:
+            for clave_vieja, tamano in conexion.execute(
+                "SELECT clave, tamano FROM respuestas WHERE clave != ? ORDER BY usada", (clave,)
+            ).fetchall():
+                conexion.execute("DELETE FROM respuestas WHERE clave = ?", (clave_vieja,))
+                total -= tamano
+                if total <= TAMANO_CACHE_HTTP:
+                    break
+
+
+class _PeticionEnCurso:
+    def __init__(self):
+        self.terminada = threading.Event()
+        self.respuesta = None
+        self.error = None
+
+
+def obtener_compartido(
+    url: str,
+    params=None,
+    headers: dict | None = None,
+    timeout=TIMEOUT,
+    sesion: requests.Session | None = None,
+) -> requests.Response:
+    """
+    GET que comparte la respuesta entre peticiones idénticas simultáneas.
+
+    Si otro hilo ya está pidiendo la misma URL con los mismos parámetros y
+    encabezados, se espera a esa respuesta en lugar de repetir la petición.
+    La respuesta no se guarda: una vez terminada, la siguiente llamada vuelve
+    a ir al servidor.
+    """
+    completa = _url_completa(url, params)
+    clave = _clave(completa, headers)
+    with _bloqueo_en_curso:
+        peticion = _en_curso.get(clave)
+        propia = peticion is None
+        if propia:
+            peticion = _en_curso[clave] = _PeticionEnCurso()
+
+    if not propia:
+        peticion.terminada.wait()
+        if peticion.error is not None:
+            raise peticion.error
+        return peticion.respuesta
+
+    try:
+        peticion.respuesta = (sesion or obtener_sesion()).get(completa, headers=headers, timeout=timeout)
+    except Exception as e:
+        peticion.error = e
+        raise
+    finally:
+        with _bloqueo_en_curso:
+            del _en_curso[clave]
+        peticion.terminada.set()
+    return peticion.respuesta
+
+
+def obtener_en_cache(
+    url: str,
+    params=None,
+    headers: dict | None = None,
+    ttl: int | None = None,
+    timeout=TIMEOUT,
+    sesion: requests.Session | None = None,
+) -> requests.Response:
+    """
+    GET con caché de respuestas en disco (~/.orgm/cache/http.sqlite).
+
+    Mientras la respuesta guardada tiene menos de `ttl` segundos se devuelve
+    sin ir a la red. Después se revalida con If-None-Match / If-Modified-Since
+    y, si el servidor responde 304, se reutiliza el cuerpo guardado. Si no hay
+    conexión se devuelve la copia vencida. Las respuestas servidas desde la
+    caché tienen el atributo `desde_cache`.
+
+    Args:
+        url: URL a consultar.
+        params: Parámetros de la consulta (forman parte de la clave).
+        headers: Encabezados de la petición; los de autenticación y formato
+            forman parte de la clave.
+        ttl: Segundos de vigencia; por defecto el de TTL_RUTAS.
+        timeout: Tiempo de espera de la petición.
+        sesion: Sesión a usar; por defecto obtener_sesion().
+
+    Returns:
+        requests.Response: La respuesta, de la red o de la caché.
+    """
+    completa = _url_completa(url, params)
+    clave = _clave(completa, headers)
+    ttl = ttl_ruta(url) if ttl is None else ttl
+
+    guardada = None
+    try:
+        with _cache_http() as conexion:
+            guardada = conexion.execute(
+                "SELECT estado, encabezados, cuerpo, guardada FROM respuestas WHERE clave = ?", (clave,)
+            ).fetchone()
+            if guardada:
+                conexion.execute("UPDATE respuestas SET usada = ? WHERE clave = ?", (time.time(), clave))
+    except sqlite3.Error:
+        guardada = None
+
+    if guardada:
+        estado, encabezados, cuerpo, momento = guardada
+        encabezados = json.loads(encabezados)
+        if time.time() - momento < ttl:
+            return _respuesta(completa, estado, encabezados, cuerpo)
+
+    condicionales = dict(headers or {})
+    if guardada:
+        validadores = CaseInsensitiveDict(encabezados)
+        if validadores.get("ETag"):
+            condicionales["If-None-Match"] = validadores["ETag"]
+        if validadores.get("Last-Modified"):
+            condicionales["If-Modified-Since"] = validadores["Last-Modified"]
+
+    try:
+        respuesta = obtener_compartido(completa, headers=condicionales, timeout=timeout, sesion=sesion)
+    except requests.exceptions.ConnectionError:
+        if guardada:
+            return _respuesta(completa, estado, encabezados, cuerpo)
+        raise
+
+    if respuesta.status_code == 304 and guardada:
+        try:
+            with _cache_http() as conexion:
+                conexion.execute("UPDATE respuestas SET guardada = ? WHERE clave = ?", (time.time(), clave))
+        except sqlite3.Error:
+            pass
+        return _respuesta(completa, estado, encabezados, cuerpo)
+
+    if respuesta.status_code == 200 and "no-store" not in respuesta.headers.get("Cache-Control", ""):
+        try:
+            _guardar_respuesta(clave, completa, respuesta)
+        except sqlite3.Error:
+            pass
+    return respuesta
+
+
+def invalidar_cache(prefijo_url: str) -> None:
+    """Borra de la caché las respuestas cuya URL empieza por `prefijo_url`."""
+    try:
+        with _bloqueo_cache, _cache_http() as conexion:
+            conexion.execute(
+                "DELETE FROM respuestas WHERE substr(url, 1, ?) = ?", (len(prefijo_url), prefijo_url)
+            )
+    except sqlite3.Error:
+        pass
+
+
+class CuerpoMultipart:
+    """
+    Cuerpo multipart/form-data que lee los archivos por bloques al enviarse.
+
+    A diferencia de `files=` de requests no carga los archivos en memoria.
+    Implementa `__len__` para que se envíe con Content-Length, y cada
+    iteración vuelve a leer desde el inicio, por lo que admite reintentos.
+
+    Ejemplo de uso::
+
+        cuerpo = CuerpoMultipart({"x1": "100"}, {"file": ("a.pdf", "/ruta/a.pdf", "application/pdf")})
+        sesion.post(url, data=cuerpo, headers={"Content-Type": cuerpo.content_type})
+    """
+
+    def __init__(self, campos: dict, archivos: dict):
+        """
+        Args:
+            campos: Diccionario nombre -> valor de los campos de texto.
+            archivos: Diccionario nombre -> (nombre de archivo, ruta, tipo MIME).
+        """
+        self.limite = uuid.uuid4().hex
+        self.content_type = f"multipart/form-data; boundary={self.limite}"
+        self._partes = []
+        for nombre, valor in campos.items():
+            encabezado = (
+                f"--{self.limite}\r\n"
+                f'Content-Disposition: form-data; name="{nombre}"\r\n\r\n'
+                f"{valor}\r\n"
+            ).encode("utf-8")
+            self._partes.append((encabezado, None))
+        for nombre, (nombre_archivo, ruta, tipo) in archivos.items():
+            encabezado = (
+                f"--{self.limite}\r\n"
+                f'Content-Disposition: form-data; name="{nombre}"; filename="{nombre_archivo}"\r\n'
+                f"Content-Type: {tipo}\r\n\r\n"
+            ).encode("utf-8")
+            self._partes.append((encabezado, ruta))
+        self._cierre = f"--{self.limite}--\r\n".encode("utf-8")
+
+    def __len__(self) -> int:
+        total = len(self._cierre)
+        for encabezado, ruta in self._partes:
+            total += len(encabezado)
+            if ruta is not None:
+                total += os.path.getsize(ruta) + 2
+        return total
+
+    def __iter__(self):
+        for encabezado, ruta in self._partes:
+            yield encabezado
+            if ruta is not None:
+                with open(ruta, "rb") as f:
+                    for bloque in iter(lambda: f.read(TAMANO_BLOQUE), b""):
+                        yield bloque
+                yield b"\r\n"
+        yield self._cierre
+
+
+def descargar_respuesta(respuesta: requests.Response, destino: str) -> int:
+    """
+    Guarda el cuerpo de una respuesta en disco por bloques.
+
+    Se escribe en un archivo temporal y se renombra al terminar, de modo que
+    una descarga interrumpida nunca deja un archivo incompleto en `destino`.
+
+    Returns:
+        int: Número de bytes escritos.
+    """
+    temporal = f"{destino}.part"
+    escritos = 0
+    try:
+        with open(temporal, "wb") as f:
+            for bloque in respuesta.iter_content(chunk_size=TAMANO_BLOQUE):
+                f.write(bloque)
+                escritos += len(bloque)
+        os.replace(temporal, destino)
+    finally:
+        respuesta.close()
+        if os.path.exists(temporal):
+            os.remove(temporal)
+    return escritos
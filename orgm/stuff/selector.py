@@ -0,0 +1,188 @@
+"""
+Selector con filtro incremental para listas largas.
+
+A diferencia de questionary.select, que dibuja todas las opciones, el
+selector vuelve a buscar en cada tecla (en un índice local o filtrando una
+lista) y solo dibuja las filas visibles. Devuelve el valor de la opción
+elegida, normalmente su id.
+
+Ejemplo de uso::
+
+    id_cliente = seleccionar(
+        "Seleccione un cliente:",
+        buscar=lambda texto: [(c["id"], c["nombre"]) for c in buscar_local("cliente", texto, limite=200)],
+    )
+"""
+from typing import Any, Callable, Iterable, Optional, Sequence, Tuple
+from rich.console import Console
+from rich.markup import escape
+from orgm.stuff.texto import normalizar
+
+console = Console()
+
+# Filas visibles a la vez
+ALTO = 10
+
+# Máximo de resultados que se conservan por búsqueda
+LIMITE = 500
+
+Opcion = Tuple[Any, str]
+
+
+def filtro_opciones(opciones: Sequence[Opcion]) -> Callable[[str], list]:
+    """
+    Búsqueda sobre una lista de (valor, etiqueta): las etiquetas que
+    contienen todas las palabras escritas, sin acentos ni mayúsculas.
+    """
+    normalizadas = [(opcion, normalizar(opcion[1])) for opcion in opciones]
+
+    def buscar(texto: str) -> list:
+        palabras = normalizar(texto).split()
+        return [opcion for opcion, etiqueta in normalizadas if all(p in etiqueta for p in palabras)]
+
+    return buscar
+
+
+def seleccionar(
+    mensaje: str,
+    opciones: Optional[Sequence[Opcion]] = None,
+    buscar: Optional[Callable[[str], Iterable[Opcion]]] = None,
+    texto_inicial: str = "",
+    defecto: Any = None,
+    alto: int = ALTO,
+    limite: int = LIMITE,
+    estilo=None,
+) -> Optional[Any]:
+    """
+    Muestra el selector y devuelve el valor elegido.
+
+    Args:
+        mensaje: Pregunta que se muestra antes del texto de búsqueda.
+        opciones: Lista de (valor, etiqueta) que se filtra con filtro_opciones.
+        buscar: Función texto -> [(valor, etiqueta)] que se llama en cada
+            tecla, en lugar de `opciones`.
+        texto_inicial: Texto de búsqueda con el que empieza.
+        defecto: Valor que queda marcado al abrir, si está en los resultados.
+        alto: Filas visibles.
+        limite: Máximo de resultados por búsqueda.
+        estilo: Estilo de prompt_toolkit/questionary (custom_style_fancy por defecto).
+
+    Returns:
+        El valor de la opción elegida, o None si se cancela (Esc o Ctrl+C).
+    """
+    from prompt_toolkit.application import Application
+    from prompt_toolkit.buffer import Buffer
+    from prompt_toolkit.key_binding import KeyBindings
+    from prompt_toolkit.layout import HSplit, Layout, Window
+    from prompt_toolkit.layout.controls import BufferControl, FormattedTextControl
+    from prompt_toolkit.layout.processors import BeforeInput
+
+    if estilo is None:
+        from orgm.qstyle import custom_style_fancy
+
+        estilo = custom_style_fancy
+    if buscar is None:
+        buscar = filtro_opciones(opciones or [])
+
+    estado = {"resultados": [], "actual": 0, "inicio": 0}
+
+    def mover(posicion: int) -> None:
+        total = len(estado["resultados"])
+        if not total:
+            return
+        actual = max(0, min(total - 1, posicion))
+        estado["actual"] = actual
+        if actual < estado["inicio"]:
+            estado["inicio"] = actual
+        elif actual >= estado["inicio"] + alto:
+            estado["inicio"] = actual - alto + 1
+
+    def actualizar(_=None) -> None:
+        resultados = []
+        for opcion in buscar(entrada.text):
+            resultados.append(opcion)
+            if len(resultados) >= limite:
+                break
+        estado.update(resultados=resultados, actual=0, inicio=0)
+
+    def lineas():
+        resultados = estado["resultados"]
+        if not resultados:
+            return [("class:text", "   Sin resultados\n")]
+        inicio = estado["inicio"]
+        fin = min(inicio + alto, len(resultados))
+        fragmentos = []
+        for i in range(inicio, fin):
+            if i == estado["actual"]:
+                fragmentos += [("class:pointer", " ❯ "), ("class:highlighted", resultados[i][1]), ("", "\n")]
+            else:
+                fragmentos += [("", "   "), ("", resultados[i][1]), ("", "\n")]
+        mas = "+" if len(resultados) >= limite else ""
+        fragmentos.append(
+            ("class:instruction", f"   {inicio + 1}-{fin} de {len(resultados)}{mas} · ↑↓ mover · Enter elegir · Esc cancelar")
+        )
+        return fragmentos
+
+    entrada = Buffer(multiline=False, on_text_changed=actualizar)
+    entrada.text = texto_inicial
+    entrada.cursor_position = len(texto_inicial)
+    actualizar()
+    if defecto is not None:
+        mover(next((i for i, (valor, _) in enumerate(estado["resultados"]) if valor == defecto), 0))
+
+    teclas = KeyBindings()
+
+    @teclas.add("up")
+    @teclas.add("c-p")
+    def _(evento):
+        mover(estado["actual"] - 1)
+
+    @teclas.add("down")
+    @teclas.add("c-n")
+    def _(evento):
+        mover(estado["actual"] + 1)
+
+    @teclas.add("pageup")
+    def _(evento):
+        mover(estado["actual"] - alto)
+
+    @teclas.add("pagedown")
+    def _(evento):
+        mover(estado["actual"] + alto)
+
+    @teclas.add("enter")
+    def _(evento):
+        if estado["resultados"]:
+            evento.app.exit(result=estado["resultados"][estado["actual"]])
+
+    @teclas.add("escape", eager=True)
+    @teclas.add("c-c")
+    def _(evento):
+        evento.app.exit(result=None)
+
+    aplicacion = Application(
+        layout=Layout(
+            HSplit(
+                [
+                    Window(
+                        BufferControl(
+                            entrada,
+                            input_processors=[BeforeInput([("class:qmark", "? "), ("class:question", f"{mensaje} ")])],
+                        ),
+                        height=1,
+                    ),
+                    Window(FormattedTextControl(lineas), dont_extend_height=True),
+                ]
+            ),
+            focused_element=entrada,
+        ),
+        key_bindings=teclas,
+        style=estilo,
+        full_screen=False,
+        erase_when_done=True,
+    )
+    elegida = aplicacion.run()
+    if elegida is None:
+        return None
+    console.print(f"[bold]? {escape(mensaje)}[/bold] [yellow]{escape(elegida[1])}[/yellow]")
+    return elegida[0]
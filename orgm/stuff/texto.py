@@ -0,0 +1,57 @@
+import re
+import unicodedata
+
+_NO_ALFANUMERICO = re.compile(r"[^0-9a-z]+")
+
+
+def normalizar(texto: str | None) -> str:
+    """
+    Normaliza un texto para búsquedas: minúsculas, sin acentos y con los
+    signos de puntuación reemplazados por un solo espacio.
+
+    "Constructora Peña, S.R.L." -> "constructora pena s r l"
+    """
+    if not texto:
+        return ""
+    texto = unicodedata.normalize("NFKD", str(texto).lower())
+    texto = "".join(c for c in texto if not unicodedata.combining(c))
+    return _NO_ALFANUMERICO.sub(" ", texto).strip()
+
+
+def sin_acentos(texto: str | None) -> str:
+    """
+    Minúsculas y sin acentos, conservando la puntuación: lo mismo que la
+    función sin_acentos() de sql/0003_indices_busqueda.sql, con la que se
+    calculan las columnas "busqueda".
+
+    "Constructora Peña, S.R.L." -> "constructora pena, s.r.l."
+    """
+    if not texto:
+        return ""
+    texto = unicodedata.normalize("NFKD", str(texto).lower())
+    return "".join(c for c in texto if not unicodedata.combining(c))
+
+
+def trigramas(texto: str | None, normalizado: bool = False) -> set[str]:
+    """
+    Devuelve el conjunto de trigramas de un texto.
+
+    Cada palabra se rodea de espacios para que los inicios de palabra tengan
+    su propio trigrama y pesen más en la similitud.
+    """
+    if not normalizado:
+        texto = normalizar(texto)
+    if not texto:
+        return set()
+    resultado = set()
+    for palabra in texto.split():
+        palabra = f"  {palabra} "
+        resultado.update(palabra[i:i + 3] for i in range(len(palabra) - 2))
+    return resultado
+
+
+def similitud(a: set[str], b: set[str]) -> float:
+    """Coeficiente de Jaccard entre dos conjuntos de trigramas."""
+    if not a or not b:
+        return 0.0
+    return len(a & b) / len(a | b)
@@ -0,0 +1,230 @@
+"""
+Servidor PostgREST mínimo en memoria para las pruebas del backend.
+
+Implementa solo lo que usa orgm.apps.adm.backend: select con columnas y
+relaciones a uno (cliente(id,nombre) por la columna id_cliente), filtros
+eq/gt, or=(columna.ilike."*texto*"), order, limit/offset, POST y PATCH con
+Prefer: return=representation y funciones en /rpc. Una columna que no existe
+en un filtro responde 400 con el código 42703, como PostgreSQL.
+"""
+import copy
+import json
+import re
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qsl, urlsplit
+
+_RELACION = re.compile(r"^(\w+)\((.*)\)$")
+
+
+def _partes(texto: str) -> list[str]:
+    """Separa por comas fuera de paréntesis y comillas."""
+    partes, actual, nivel, comillas = [], "", 0, False
+    for i, c in enumerate(texto):
+        if c == '"' and (i == 0 or texto[i - 1] != "\\"):
+            comillas = not comillas
+        elif not comillas and c == "(":
+            nivel += 1
+        elif not comillas and c == ")":
+            nivel -= 1
+        if c == "," and nivel == 0 and not comillas:
+            partes.append(actual)
+            actual = ""
+        else:
+            actual += c
+    if actual:
+        partes.append(actual)
+    return partes
+
+
+def _ilike(patron: str) -> re.Pattern:
+    if patron.startswith('"') and patron.endswith('"'):
+        patron = patron[1:-1].replace('\\"', '"').replace("\\\\", "\\")
+    expresion = "".join(".*" if c in "*%" else "." if c == "_" else re.escape(c) for c in patron)
+    return re.compile(f"^{expresion}$", re.IGNORECASE | re.S)
+
+
+def _igual(valor, texto: str) -> bool:
+    if isinstance(valor, bool):
+        return str(valor).lower() == texto
+    if isinstance(valor, (int, float)):
+        try:
+            return valor == float(texto)
+        except ValueError:
+            return False
+    return valor is not None and str(valor) == texto
+
+
+def _orden(filas: list[dict], orden: str) -> list[dict]:
+    for parte in reversed(orden.split(",")):
+        columna, _, direccion = parte.partition(".")
+        filas = sorted(
+            filas,
+            key=lambda f: (f.get(columna) is None, f.get(columna)),
+            reverse=direccion.startswith("desc"),
+        )
+    return filas
+
+
+class PostgrestFalso:
+    """
+    Args:
+        tablas: {tabla: [filas]} con valores ya en forma JSON.
+        columnas: {tabla: [columnas]} en el orden de la tabla.
+        funciones: {nombre: función(**argumentos)} para /rpc.
+    """
+
+    def __init__(self, tablas: dict, columnas: dict, funciones: dict):
+        self.tablas = copy.deepcopy(tablas)
+        self.columnas = columnas
+        self.funciones = funciones
+        self.peticiones = []
+        self._bloqueo = threading.Lock()
+        self._servidor = ThreadingHTTPServer(("127.0.0.1", 0), self._manejador())
+        self.url = f"http://127.0.0.1:{self._servidor.server_port}"
+
+    def __enter__(self):
+        threading.Thread(target=self._servidor.serve_forever, daemon=True).start()
+        return self
+
+    def __exit__(self, *_):
+        self._servidor.shutdown()
+        self._servidor.server_close()
+
+    # ------------------------------------------------------------------
+
+    def _seleccionar(self, tabla: str, fila: dict, seleccion: str) -> dict:
+        resultado = {}
+        for parte in _partes(seleccion):
+            relacion = _RELACION.match(parte)
+            if relacion:
+                nombre, campos = relacion.groups()
+                relacionada = next(
+                    (r for r in self.tablas[nombre] if r.get("id") == fila.get(f"id_{nombre}")), None
+                )
+                resultado[nombre] = self._seleccionar(nombre, relacionada, campos) if relacionada else None
+            elif parte == "*":
+                resultado.update({c: fila.get(c) for c in self.columnas[tabla]})
+            else:
+                resultado[parte] = fila.get(parte)
+        return resultado
+
+    def _columna_desconocida(self, tabla: str, parametros: list[tuple]) -> str | None:
+        for clave, valor in parametros:
+            if clave == "or":
+                nombres = [parte.split(".", 1)[0] for parte in _partes(valor.strip()[1:-1])]
+            elif clave in ("select", "order", "limit", "offset"):
+                continue
+            else:
+                nombres = [clave]
+            for nombre in nombres:
+                if nombre not in self.columnas[tabla]:
+                    return nombre
+        return None
+
+    def _filtrar(self, filas: list[dict], parametros: list[tuple]) -> list[dict]:
+        for clave, valor in parametros:
+            if clave == "or":
+                condiciones = []
+                for parte in _partes(valor.strip()[1:-1]):
+                    columna, operador, patron = parte.split(".", 2)
+                    assert operador == "ilike", operador
+                    condiciones.append((columna, _ilike(patron)))
+                filas = [
+                    f for f in filas
+                    if any(f.get(c) is not None and p.match(str(f.get(c))) for c, p in condiciones)
+                ]
+            elif clave not in ("select", "order", "limit", "offset"):
+                operador, _, texto = valor.partition(".")
+                if operador == "eq":
+                    filas = [f for f in filas if _igual(f.get(clave), texto)]
+                elif operador == "gt":
+                    filas = [f for f in filas if f.get(clave) is not None and f.get(clave) > float(texto)]
+                else:
+                    raise ValueError(f"Operador no soportado: {operador}")
+        return filas
+
+    def _nueva(self, tabla: str, datos: dict) -> dict:
+        fila = {c: None for c in self.columnas[tabla]}
+        fila.update(datos)
+        if fila.get("id") is None:
+            fila["id"] = max((f["id"] for f in self.tablas[tabla]), default=0) + 1
+        return fila
+
+    def _manejador(self):
+        servidor = self
+
+        class Manejador(BaseHTTPRequestHandler):
+            def log_message(self, *_):
+                pass
+
+            def _responder(self, estado: int, cuerpo=None):
+                datos = json.dumps(cuerpo).encode("utf-8") if cuerpo is not None else b""
+                self.send_response(estado)
+                self.send_header("Content-Type", "application/json; charset=utf-8")
+                self.send_header("Content-Length", str(len(datos)))
+                self.end_headers()
+                self.wfile.write(datos)
+
+            def _leer(self):
+                largo = int(self.headers.get("Content-Length") or 0)
+                return json.loads(self.rfile.read(largo) or b"null")
+
+            def _ruta(self):
+                partes = urlsplit(self.path)
+                return partes.path.strip("/"), parse_qsl(partes.query, keep_blank_values=True)
+
+            def do_GET(self):
+                tabla, parametros = self._ruta()
+                servidor.peticiones.append(("GET", self.path))
+                if tabla not in servidor.tablas:
+                    return self._responder(404, {"code": "PGRST205", "message": f"No existe {tabla}"})
+                opciones = dict(parametros)
+                desconocida = servidor._columna_desconocida(tabla, parametros)
+                if desconocida:
+                    return self._responder(
+                        400, {"code": "42703", "message": f"column {tabla}.{desconocida} does not exist"}
+                    )
+                with servidor._bloqueo:
+                    filas = servidor._filtrar(servidor.tablas[tabla], parametros)
+                    if "order" in opciones:
+                        filas = _orden(filas, opciones["order"])
+                    desde = int(opciones.get("offset", 0))
+                    hasta = desde + int(opciones["limit"]) if "limit" in opciones else None
+                    filas = [
+                        servidor._seleccionar(tabla, f, opciones.get("select", "*")) for f in filas[desde:hasta]
+                    ]
+                self._responder(200, filas)
+
+            def do_POST(self):
+                ruta, _ = self._ruta()
+                servidor.peticiones.append(("POST", self.path))
+                cuerpo = self._leer()
+                if ruta.startswith("rpc/"):
+                    funcion = servidor.funciones.get(ruta[4:])
+                    if funcion is None:
+                        return self._responder(404, {"code": "PGRST202", "message": f"No existe {ruta}"})
+                    return self._responder(200, funcion(**(cuerpo or {})))
+                if ruta not in servidor.tablas:
+                    return self._responder(404, {"code": "PGRST205", "message": f"No existe {ruta}"})
+                with servidor._bloqueo:
+                    nuevas = [servidor._nueva(ruta, d) for d in (cuerpo if isinstance(cuerpo, list) else [cuerpo])]
+                    servidor.tablas[ruta].extend(nuevas)
+                if "return=representation" in (self.headers.get("Prefer") or ""):
+                    return self._responder(201, nuevas)
+                self._responder(201)
+
+            def do_PATCH(self):
+                tabla, parametros = self._ruta()
+                servidor.peticiones.append(("PATCH", self.path))
+                cuerpo = self._leer()
+                with servidor._bloqueo:
+                    filas = servidor._filtrar(servidor.tablas[tabla], parametros)
+                    for fila in filas:
+                        fila.update(cuerpo)
+                    filas = copy.deepcopy(filas)
+                if "return=representation" in (self.headers.get("Prefer") or ""):
+                    return self._responder(200, filas)
+                self._responder(204)
+
+        return Manejador
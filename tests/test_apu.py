@@ -0,0 +1,63 @@
+"""
+orgm adm presupuesto precios (orgm.apps.adm.presupuesto.apu): los
+presupuestos que otro usuario modificó no se cuentan como recalculados.
+"""
+import typer
+from typer.testing import CliRunner
+
+from conftest import _usar_postgrest
+from postgrest_falso import PostgrestFalso
+from orgm.apps.adm.presupuesto import apu, cambios
+
+app = typer.Typer()
+app.command()(apu.recalcular_precios)
+
+
+def _presupuesto(precio):
+    return {
+        "id": "r", "item": "I-1", "descripcion": "Obra", "categoria": "cat1", "children": [
+            {"id": "p1", "item": "P-1", "descripcion": "Muro", "cantidad": 2, "precio": precio,
+             "apu": [{"tabla": "material", "id": 1, "cantidad": 1}]},
+        ],
+    }
+
+
+def _servidor():
+    tablas = {tabla: [] for tabla in apu.TABLAS_CATALOGO}
+    tablas["material"] = [{"id": 1, "nombre": "Cemento", "descripcion": {"precio": 100}, "unidad": "saco"}]
+    tablas["presupuesto"] = [
+        {"id": 1, "presupuesto": _presupuesto(100), "version": 1},
+        {"id": 2, "presupuesto": _presupuesto(100), "version": 4},
+    ]
+    columnas = {tabla: ["id", "nombre", "descripcion", "unidad"] for tabla in apu.TABLAS_CATALOGO}
+    columnas["presupuesto"] = ["id", "presupuesto", "version"]
+    return PostgrestFalso(tablas, columnas, {})
+
+
+def test_precios_informa_los_conflictos(monkeypatch):
+    with _servidor() as servidor:
+        _usar_postgrest(monkeypatch, servidor)
+        guardar = cambios.guardar_documento
+
+        def otro_usuario_guarda(tabla, id_fila, *args):
+            if id_fila == 2:
+                servidor.tablas["presupuesto"][1]["version"] = 5
+            return guardar(tabla, id_fila, *args)
+
+        monkeypatch.setattr(cambios, "guardar_documento", otro_usuario_guarda)
+        resultado = CliRunner().invoke(app, ["material:1=150"])
+
+        assert resultado.exit_code == 1, resultado.output
+        assert "No se guardaron los presupuestos 2" in resultado.output
+        assert servidor.tablas["material"][0]["descripcion"] == {"precio": 150.0}
+        guardado, ajeno = servidor.tablas["presupuesto"]
+        assert guardado["version"] == 2
+        assert guardado["presupuesto"]["children"][0]["precio"] == 150
+        assert ajeno["version"] == 5
+        assert ajeno["presupuesto"]["children"][0]["precio"] == 100
+
+
+def test_precios_rechaza_formato_invalido():
+    resultado = CliRunner().invoke(app, ["cemento=150"])
+    assert resultado.exit_code == 2
+    assert "tabla:id=precio" in resultado.output
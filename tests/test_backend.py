@@ -0,0 +1,136 @@
+"""
+Contrato de orgm.apps.adm.backend: PostgREST y PostgreSQL directo devuelven
+las mismas filas, con la forma del JSON de PostgREST.
+"""
+import pytest
+
+from conftest import DATOS
+from orgm.apps.adm import backend as b
+
+INCLUIR = {"cliente": ["id", "nombre"], "proyecto": ["id", "nombre_proyecto"]}
+
+
+def test_consultar_todas_las_columnas(backend):
+    assert b.consultar("cliente", orden="id") == DATOS["cliente"]
+
+
+def test_consultar_columnas_y_orden(backend):
+    filas = b.consultar("cotizacion", columnas=["id", "total"], orden="total.desc,id", limite=3)
+    assert filas == [{"id": 100, "total": 1500.5}, {"id": 101, "total": 200.0}, {"id": 159, "total": 159.0}]
+
+
+def test_consultar_filtros_e_incluir(backend):
+    filas = b.consultar(
+        "cotizacion", filtros={"id_cliente": 1}, columnas=["id", "fecha"], incluir=INCLUIR, orden="id"
+    )
+    assert filas == [
+        {
+            "id": 100,
+            "fecha": "2024-03-01",
+            "cliente": {"id": 1, "nombre": "Constructora Álamo SRL"},
+            "proyecto": {"id": 10, "nombre_proyecto": "Torre Norte"},
+        },
+        {
+            "id": 101,
+            "fecha": "2024-03-05",
+            "cliente": {"id": 1, "nombre": "Constructora Álamo SRL"},
+            "proyecto": {"id": 11, "nombre_proyecto": "Nave Industrial"},
+        },
+    ]
+
+
+def test_consultar_relacion_vacia(backend):
+    (fila,) = b.consultar("cotizacion", filtros={"id": 102}, columnas=["id"], incluir=INCLUIR)
+    assert fila == {"id": 102, "cliente": {"id": 2, "nombre": "Beta Ingeniería"}, "proyecto": None}
+
+
+def test_consultar_buscar_sin_mayusculas(backend):
+    filas = b.consultar("cliente", buscar="INGENIER", en=["nombre", "numero"], columnas=["id"])
+    assert filas == [{"id": 2}]
+    filas = b.consultar("cliente", buscar="00033", en=["nombre", "numero"], columnas=["id"])
+    assert filas == [{"id": 3}]
+
+
+def test_consultar_pagina(backend):
+    filas = b.consultar("cotizacion", columnas=["id"], orden="id", limite=2, desplazamiento=3)
+    assert filas == [{"id": 103}, {"id": 104}]
+
+
+def test_iterar_por_lotes(backend):
+    filas = list(b.iterar("cotizacion", columnas=["id", "total"], incluir={"cliente": ["nombre"]}, lote=25))
+    assert [f["id"] for f in filas] == [f["id"] for f in DATOS["cotizacion"]]
+    assert filas[0] == {"id": 100, "total": 1500.5, "cliente": {"nombre": "Constructora Álamo SRL"}}
+
+
+def test_iterar_pide_paginas_por_id(monkeypatch, sin_cache, postgrest_falso):
+    from conftest import _usar_postgrest
+
+    _usar_postgrest(monkeypatch, postgrest_falso)
+    assert len(list(b.iterar("cotizacion", lote=25))) == len(DATOS["cotizacion"])
+    consultas = [ruta for metodo, ruta in postgrest_falso.peticiones if metodo == "GET"]
+    assert len(consultas) == 3
+    assert all("offset" not in ruta for ruta in consultas)
+    assert "id=gt.124" in consultas[1]
+
+
+def test_insertar_devuelve_la_fila(backend):
+    nueva = {"id": 4, "nombre": "Delta", "numero": "101000044", "creado": "2024-06-30"}
+    assert b.insertar("cliente", nueva) == nueva
+    assert b.consultar("cliente", filtros={"id": 4}) == [nueva]
+
+
+def test_insertar_varios(backend):
+    filas = [{"id": 20 + i, "nombre_proyecto": f"Proyecto {i}", "ubicacion": ""} for i in range(3)]
+    assert b.insertar_varios("proyecto", filas) == 3
+    assert b.consultar("proyecto", filtros={"ubicacion": ""}, orden="id") == filas
+
+
+def test_actualizar_devuelve_las_filas(backend):
+    filas = b.actualizar("cotizacion", {"id": 101}, {"descripcion": "Iluminación exterior", "total": 250.25})
+    assert filas == [
+        {**DATOS["cotizacion"][1], "descripcion": "Iluminación exterior", "total": 250.25},
+    ]
+    assert b.consultar("cotizacion", filtros={"id": 101}, columnas=["total"]) == [{"total": 250.25}]
+
+
+def test_actualizar_sin_coincidencias(backend):
+    assert b.actualizar("cliente", {"id": 999}, {"nombre": "Nadie"}) == []
+
+
+def test_llamar_escalar(backend):
+    assert b.llamar("sumar", a=2, b=3) == 5
+
+
+def test_llamar_con_jsonb(backend):
+    assert b.llamar("contar_claves", datos={"a": 1, "b": [1, 2], "c": {"d": None}}) == 3
+
+
+def test_llamar_tabla(backend):
+    assert b.llamar("cotizaciones_de", cliente_id=1) == [
+        {"id": 100, "total": 1500.5, "fecha": "2024-03-01"},
+        {"id": 101, "total": 200.0, "fecha": "2024-03-05"},
+    ]
+
+
+def test_llamar_funcion_inexistente(backend):
+    with pytest.raises(b.FuncionNoEncontrada):
+        b.llamar("no_existe", x=1)
+
+
+@pytest.mark.parametrize(
+    "funcion, argumentos",
+    [
+        (b.consultar, {"tabla": "cotizacion", "incluir": INCLUIR, "orden": "id"}),
+        (b.consultar, {"tabla": "cliente", "buscar": "constructora", "en": ["nombre"]}),
+        (b.iterar, {"tabla": "cotizacion", "incluir": {"proyecto": ["nombre_proyecto"]}, "lote": 10}),
+        (b.llamar, {"funcion": "cotizaciones_de", "cliente_id": 3}),
+    ],
+)
+def test_mismas_filas_en_ambos_backends(ambos, funcion, argumentos):
+    desde_postgrest, desde_postgres = ambos(funcion, **argumentos)
+    assert desde_postgrest
+    assert desde_postgres == desde_postgrest
+    # Mismos tipos de valor, no solo valores iguales (1500.5 frente a Decimal)
+    assert [{k: type(v) for k, v in f.items()} for f in desde_postgres] == [
+        {k: type(v) for k, v in f.items()} for f in desde_postgrest
+    ]
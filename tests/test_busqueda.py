@@ -0,0 +1,127 @@
+"""
+Búsqueda de clientes, proyectos y ubicaciones (orgm.apps.adm.busqueda_local).
+"""
+from urllib.parse import unquote
+
+from conftest import COLUMNAS, DATOS, _usar_postgrest
+from postgrest_falso import PostgrestFalso
+from orgm.apps.adm.busqueda_local import buscar_servidor
+from orgm.stuff.texto import sin_acentos
+
+
+def test_sin_acentos_como_en_sql():
+    assert sin_acentos("Constructora Peña, S.R.L.") == "constructora pena, s.r.l."
+    assert sin_acentos("ÁLAMO") == "alamo"
+
+
+def test_buscar_servidor_usa_la_columna_busqueda(monkeypatch, sin_cache):
+    # Columna generada de sql/0003: sin_acentos(nombre || ' ' || nombre_comercial)
+    clientes = [{**c, "busqueda": sin_acentos(c["nombre"]) + " "} for c in DATOS["cliente"]]
+    with PostgrestFalso({"cliente": clientes}, {"cliente": COLUMNAS["cliente"] + ["busqueda"]}, {}) as servidor:
+        _usar_postgrest(monkeypatch, servidor)
+
+        assert [f["id"] for f in buscar_servidor("cliente", "ÁLAMO")] == [1]
+        assert 'or=(busqueda.ilike."*alamo*")' in unquote(servidor.peticiones[-1][1])
+
+        # Un RNC se busca en numero
+        assert [f["id"] for f in buscar_servidor("cliente", "00033")] == [3]
+        assert "numero.ilike" in servidor.peticiones[-1][1]
+
+
+def _indice():
+    from orgm.apps.adm.busqueda_local import CAMPOS_BUSQUEDA, IndiceBusqueda
+
+    filas = [{"id": i, "nombre": f"Construcción Civil {i}"} for i in range(1505)]
+    filas += [
+        {"id": 2000, "nombre": "Abreu Ingeniería"},
+        {"id": 2001, "nombre": "Cabrera y Asociados"},
+        {"id": 2002, "nombre": "Alamo SRL"},
+        {"id": 2003, "nombre": "Andrés Batista"},
+    ]
+    return IndiceBusqueda(filas, CAMPOS_BUSQUEDA["cliente"])
+
+
+def test_listado_devuelve_todas_las_coincidencias():
+    indice = _indice()
+    assert len(indice.buscar("construccion", limite=None)) == 1505
+    # Con error de escritura
+    assert len(indice.buscar("construcion", limite=None)) == 1505
+    # Autocompletar y selector conservan el límite
+    assert len(indice.buscar("construccion", limite=20)) == 20
+
+
+def test_listado_sin_coincidencias_lejanas():
+    ids = {f["id"] for f in _indice().buscar("ab", limite=None)}
+    assert ids == {2000, 2001}
+
+
+def test_indice_de_texto_se_reconstruye_al_editar(sin_cache):
+    import time
+    from orgm.apps.adm import busqueda_local
+    from orgm.apps.adm.cotizacion.find_text import buscar_texto_local
+
+    busqueda_local._guardar("cotizacion", [dict(f) for f in DATOS["cotizacion"]], time.time())
+    assert [f["id"] for f in buscar_texto_local("subestaciones")] == [100]
+    version = busqueda_local.version_tabla("cotizacion")
+
+    # Misma fecha de descarga y mismo número de filas, otra descripción
+    busqueda_local.guardar_en_cache("cotizacion", {**DATOS["cotizacion"][1], "descripcion": "Subestación 69 kV"})
+    assert busqueda_local.version_tabla("cotizacion") != version
+    assert sorted(f["id"] for f in buscar_texto_local("subestaciones")) == [100, 101]
+
+
+def test_listado_exige_todas_las_palabras():
+    from orgm.apps.adm.busqueda_local import CAMPOS_BUSQUEDA, IndiceBusqueda
+
+    filas = [
+        {"id": 1, "nombre": "Constructora Peña SRL"},
+        {"id": 2, "nombre": "Constructora Álamo"},
+        {"id": 3, "nombre": "Construcciones Peña"},
+        {"id": 4, "nombre": "Peñalver", "nombre_comercial": "Constructora del Este"},
+    ]
+    indice = IndiceBusqueda(filas, CAMPOS_BUSQUEDA["cliente"])
+    assert {f["id"] for f in indice.buscar("constructora pena", limite=None)} == {1, 4}
+    # Errores de escritura, palabra por palabra
+    assert {f["id"] for f in indice.buscar("constructra pena", limite=None)} == {1, 4}
+    assert {f["id"] for f in indice.buscar("construciones", limite=None)} == {3}
+
+
+def test_busqueda_con_limite_prefiere_prefijos():
+    filas = _indice().buscar("abr", limite=1)
+    assert [f["id"] for f in filas] == [2000]
+
+
+def test_texto_local_con_sintaxis_de_buscador(sin_cache):
+    import time
+    from orgm.apps.adm import busqueda_local
+    from orgm.apps.adm.cotizacion.find_text import buscar_texto_local
+
+    busqueda_local._guardar("cotizacion", [dict(f) for f in DATOS["cotizacion"]], time.time())
+
+    def ids(texto):
+        return sorted(f["id"] for f in buscar_texto_local(texto))
+
+    assert ids("subestacion -led") == [100]
+    assert ids("subestacion -electrica") == []
+    assert ids("iluminacion or planta") == [101, 102]
+    assert ids("subestacion kva or iluminacion -led") == [100]
+    assert ids('"planta de emergencia"') == [102]
+    assert ids('"emergencia planta"') == []
+    assert ids('-"planta de emergencia" emergencia') == []
+    # "or" es un operador, no el prefijo de "orden" u "organización"
+    assert ids("or") == []
+    assert ids("-subestacion") == []
+
+
+def test_buscar_servidor_sin_migracion(backend, monkeypatch):
+    from orgm.apps.adm import busqueda_local
+
+    # Las tablas de prueba no tienen la columna "busqueda" de sql/0003 (ni
+    # todas las columnas con que se calcula)
+    monkeypatch.setattr(busqueda_local, "_sin_columna_busqueda", set())
+    monkeypatch.setattr(
+        busqueda_local, "TABLAS_COLUMNA_BUSQUEDA", {"cliente": ["nombre"], "proyecto": ["nombre_proyecto", "ubicacion"]}
+    )
+    assert [f["id"] for f in buscar_servidor("cliente", "CONSTRUCTORA")] == [1]
+    assert busqueda_local._sin_columna_busqueda == {"cliente"}
+    assert [f["id"] for f in buscar_servidor("proyecto", "norte")] == [10]
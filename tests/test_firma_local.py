@@ -0,0 +1,98 @@
+"""
+Firma local de PDF (orgm.apps.utils.firma_local), sin servicio de firma.
+"""
+import pytest
+from PIL import Image
+from PyPDF2 import PdfReader, PdfWriter
+from reportlab.lib.pagesizes import A4, letter
+from reportlab.pdfgen import canvas
+
+from orgm.apps.utils import firma
+from orgm.apps.utils.firma_local import _paginas_a_firmar, firmar_pdf_local
+
+
+@pytest.mark.parametrize(
+    "seleccion, esperado",
+    [
+        ("todas", [0, 1, 2, 3, 4]),
+        (None, [0, 1, 2, 3, 4]),
+        ("primera", [0]),
+        ("Última", [4]),
+        ("1,3-4", [0, 2, 3]),
+        (" 2 , 2,,9, 4-7", [1, 3, 4]),
+    ],
+)
+def test_paginas_a_firmar(seleccion, esperado):
+    assert _paginas_a_firmar(5, seleccion) == esperado
+
+
+def test_paginas_a_firmar_sin_paginas():
+    assert _paginas_a_firmar(0, "primera") == []
+    assert _paginas_a_firmar(0, "ultima") == []
+
+
+@pytest.fixture
+def documento(tmp_path, monkeypatch):
+    """PDF de tres páginas (carta, A4, carta) y firma local configurada."""
+    ruta = tmp_path / "documento.pdf"
+    lienzo = canvas.Canvas(str(ruta))
+    for tamano in (letter, A4, letter):
+        lienzo.setPageSize(tamano)
+        lienzo.drawString(72, 72, "Contenido")
+        lienzo.showPage()
+    lienzo.save()
+
+    imagen = tmp_path / "firma.png"
+    Image.new("RGBA", (40, 20), (0, 0, 255, 128)).save(imagen)
+    monkeypatch.setattr(firma, "FIRMA_BACKEND", "local")
+    monkeypatch.setattr(firma, "FIRMA_IMAGEN", str(imagen))
+    monkeypatch.setattr(firma, "FIRMA_PAGINAS", "todas")
+    monkeypatch.setattr(firma, "FIRMA_P12", None)
+    return ruta
+
+
+def _imagenes(pagina) -> int:
+    return len(pagina["/Resources"].get("/XObject", {}))
+
+
+def test_firma_las_paginas_seleccionadas(documento, tmp_path, monkeypatch):
+    monkeypatch.setattr(firma, "FIRMA_PAGINAS", "1,2")
+    salida = tmp_path / "firmado.pdf"
+    assert firmar_pdf_local(str(documento), 100, 100, 200, str(salida)) == str(salida)
+
+    paginas = PdfReader(str(salida)).pages
+    assert [_imagenes(p) for p in paginas] == [1, 1, 0]
+    # El tamaño de cada página se conserva
+    assert [tuple(round(float(v)) for v in p.mediabox[2:]) for p in paginas] == [(612, 792), (595, 842), (612, 792)]
+    assert sorted(p.name for p in tmp_path.iterdir()) == ["documento.pdf", "firma.png", "firmado.pdf"]
+
+
+def test_borra_el_temporal_si_falla_la_escritura(documento, tmp_path, monkeypatch):
+    def falla(self, f):
+        f.write(b"%PDF-")
+        raise OSError("disco lleno")
+
+    monkeypatch.setattr(PdfWriter, "write", falla)
+    salida = tmp_path / "firmado.pdf"
+    assert firmar_pdf_local(str(documento), 100, 100, 200, str(salida)) is None
+    assert not salida.exists()
+    assert not (tmp_path / "firmado.pdf.part").exists()
+
+
+def test_borra_el_temporal_si_falla_la_firma_digital(documento, tmp_path, monkeypatch):
+    monkeypatch.setattr(firma, "FIRMA_P12", str(tmp_path / "no_existe.p12"))
+    salida = tmp_path / "firmado.pdf"
+    assert firmar_pdf_local(str(documento), 100, 100, 200, str(salida)) is None
+    assert not (tmp_path / "firmado.pdf.part").exists()
+
+
+def test_lote_no_sobrescribe_el_original(documento, tmp_path):
+    from orgm.apps.utils.firma import firmar_lote
+
+    original = documento.read_bytes()
+    assert firmar_lote([str(documento)], 100, 100, 200, carpeta_salida=str(tmp_path))["firmados"] == 1
+    assert documento.read_bytes() == original
+    assert (tmp_path / "documento_signed.pdf").exists()
+
+    # El diario sigue siendo válido: la segunda ejecución no vuelve a firmar
+    assert firmar_lote([str(documento)], 100, 100, 200, carpeta_salida=str(tmp_path))["omitidos"] == 1
@@ -0,0 +1,24 @@
+"""
+Subida del presupuesto importado (orgm.apps.adm.presupuesto.importar).
+"""
+import json
+
+from conftest import _usar_postgrest
+from postgrest_falso import PostgrestFalso
+from orgm.apps.adm.presupuesto.importar import _subir
+
+
+def test_reemplazar_crea_si_no_existe(monkeypatch, tmp_path):
+    ruta = tmp_path / "presupuesto.json"
+    ruta.write_text(json.dumps({"id": "r", "children": []}), encoding="utf-8")
+    tablas = {"presupuesto": [{"id": 1, "id_cotizacion": 100, "presupuesto": {}}]}
+    with PostgrestFalso(tablas, {"presupuesto": ["id", "id_cotizacion", "presupuesto"]}, {}) as servidor:
+        _usar_postgrest(monkeypatch, servidor)
+
+        assert _subir(str(ruta), 100, reemplazar=True)
+        assert _subir(str(ruta), 101, reemplazar=True)
+
+        filas = servidor.tablas["presupuesto"]
+        assert [(f["id"], f["id_cotizacion"]) for f in filas] == [(1, 100), (2, 101)]
+        assert all(f["presupuesto"] == {"id": "r", "children": []} for f in filas)
+        assert [metodo for metodo, _ in servidor.peticiones] == ["PATCH", "PATCH", "POST"]
@@ -0,0 +1,68 @@
+"""
+Importación masiva (orgm.apps.adm.masivo): una transacción con PostgreSQL
+directo y punto de continuación con PostgREST.
+"""
+from conftest import DATOS, _usar_postgres, _usar_postgrest
+from orgm.apps.adm import backend as b
+from orgm.apps.adm.db import Cliente
+from orgm.apps.adm.masivo import importar_tabla
+
+
+def _archivo(tmp_path, ids):
+    ruta = tmp_path / "clientes.csv"
+    ruta.write_text(
+        "id,nombre,numero\n" + "".join(f"{i},Cliente {n},{n:09d}\n" for n, i in enumerate(ids)),
+        encoding="utf-8",
+    )
+    return ruta
+
+
+def test_importar_asigna_ids(backend, tmp_path):
+    ruta = _archivo(tmp_path, [""] * 5)
+    assert importar_tabla("cliente", Cliente, ruta, lote=2) == 5
+    filas = b.consultar("cliente", columnas=["id", "nombre"], orden="id")
+    assert filas[len(DATOS["cliente"]):] == [{"id": 4 + n, "nombre": f"Cliente {n}"} for n in range(5)]
+
+
+def test_postgres_revierte_todo_el_archivo(monkeypatch, sin_cache, motor_postgres, tmp_path, capsys):
+    _usar_postgres(monkeypatch, motor_postgres)
+    # Los dos primeros lotes se envían antes de llegar al id repetido
+    ruta = _archivo(tmp_path, [10, 11, 12, 13, 1])
+    assert importar_tabla("cliente", Cliente, ruta, lote=2) is None
+    assert len(b.consultar("cliente")) == len(DATOS["cliente"])
+    assert "no se guardó ningún registro" in capsys.readouterr().out
+
+    ruta = _archivo(tmp_path, [10, 11, 12, 13, "x"])
+    assert importar_tabla("cliente", Cliente, ruta, lote=2) is None
+    assert len(b.consultar("cliente")) == len(DATOS["cliente"])
+
+
+def test_postgrest_indica_desde_donde_continuar(monkeypatch, sin_cache, postgrest_falso, tmp_path, capsys):
+    _usar_postgrest(monkeypatch, postgrest_falso)
+    ruta = _archivo(tmp_path, ["", "", "", "", "x", ""])
+    assert importar_tabla("cliente", Cliente, ruta, lote=2) is None
+    assert "--desde 6" in capsys.readouterr().out
+    assert len(postgrest_falso.tablas["cliente"]) == len(DATOS["cliente"]) + 4
+
+    # Corregida la línea 6, se continúa sin duplicar los lotes importados
+    ruta = _archivo(tmp_path, [""] * 6)
+    assert importar_tabla("cliente", Cliente, ruta, lote=2, desde=6) == 2
+    nombres = [f["nombre"] for f in postgrest_falso.tablas["cliente"][len(DATOS["cliente"]):]]
+    assert nombres == [f"Cliente {n}" for n in range(6)]
+    assert len({f["id"] for f in postgrest_falso.tablas["cliente"]}) == len(DATOS["cliente"]) + 6
+
+
+def test_lineas_con_saltos_dentro_de_comillas(monkeypatch, sin_cache, postgrest_falso, tmp_path, capsys):
+    _usar_postgrest(monkeypatch, postgrest_falso)
+    ruta = tmp_path / "clientes.csv"
+    # El primer registro ocupa las líneas 2 y 3
+    ruta.write_text('id,nombre,numero\n,"Cliente\nA",1\n,Cliente B,2\nx,Cliente C,3\n', encoding="utf-8")
+    assert importar_tabla("cliente", Cliente, ruta, lote=2) is None
+    salida = capsys.readouterr().out
+    assert "Línea 5:" in salida
+    assert "--desde 5" in salida
+
+    ruta.write_text('id,nombre,numero\n,"Cliente\nA",1\n,Cliente B,2\n,Cliente C,3\n', encoding="utf-8")
+    assert importar_tabla("cliente", Cliente, ruta, lote=2, desde=5) == 1
+    nombres = [f["nombre"] for f in postgrest_falso.tablas["cliente"][len(DATOS["cliente"]):]]
+    assert nombres == ["Cliente\nA", "Cliente B", "Cliente C"]
@@ -0,0 +1,35 @@
+"""
+orgm conf migrate: aplica las migraciones pendientes y termina con código 1
+si alguna falla.
+"""
+import typer
+from typer.testing import CliRunner
+
+from orgm.apps.adm import db, migraciones
+from orgm.apps.conf.migrate import migrar
+
+app = typer.Typer()
+app.command(name="migrate")(migrar)
+
+
+def _migrar(monkeypatch, motor, carpeta):
+    monkeypatch.setattr(db, "engine", motor)
+    monkeypatch.setattr(migraciones, "CARPETA_SQL", carpeta)
+    return CliRunner().invoke(app, [])
+
+
+def test_migrar_aplica_las_pendientes(monkeypatch, motor_postgres, tmp_path):
+    (tmp_path / "0001_uno.sql").write_text("CREATE TABLE prueba_migracion (id integer);", encoding="utf-8")
+    resultado = _migrar(monkeypatch, motor_postgres, tmp_path)
+    assert resultado.exit_code == 0, resultado.output
+    assert "0001_uno.sql" in resultado.output
+    assert dict(migraciones.migraciones_aplicadas(motor_postgres)).keys() == {"0001"}
+
+
+def test_migrar_termina_con_error_si_falla(monkeypatch, motor_postgres, tmp_path):
+    (tmp_path / "0001_uno.sql").write_text("SELECT 1;", encoding="utf-8")
+    (tmp_path / "0002_dos.sql").write_text("SELECT funcion_que_no_existe();", encoding="utf-8")
+    resultado = _migrar(monkeypatch, motor_postgres, tmp_path)
+    assert resultado.exit_code == 1
+    assert "Error al migrar" in resultado.output
+    assert set(migraciones.migraciones_aplicadas(motor_postgres)) == {"0001"}